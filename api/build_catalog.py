@@ -0,0 +1,470 @@
+"""Build Catalog for the SWG Armory public build browser.
+
+This module keeps a compact SQLite catalog of the summary fields of every
+published build (profession, faction, server, tags, rankings, likes, views)
+next to the build JSON files. Filtering and sorting run against indexed
+catalog tables, so ``PublicBuildBrowser`` only has to open the build
+documents it actually returns. View and like counters are buffered in
+memory and written to the catalog in batches; each batch is also handed to
+an optional ``write_back`` callback so the owner can persist the totals to
+the build files, which stay the source of truth.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+CATALOG_FILE = "build_catalog.db"
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = (
+    "build_id", "player_name", "character_name", "server", "faction", "gcw_rank",
+    "visibility", "build_summary", "professions", "tags", "rankings",
+    "views", "likes", "created_at", "updated_at",
+)
+
+
+def build_id_for(build_data: Dict[str, Any]) -> str:
+    """Return the build ID used for a build's file name and lookups."""
+    return f"{build_data['player_name']}_{build_data['character_name']}"
+
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class BuildCatalog:
+    """Indexed summary store for published builds."""
+
+    def __init__(self, db_path: Path, flush_threshold: int = 50,
+                 flush_interval: float = 5.0,
+                 write_back: Optional[Callable[[Dict[str, Tuple[int, int]]], None]] = None,
+                 on_change: Optional[Callable[[str], None]] = None):
+        """Initialize the catalog.
+
+        Args:
+            db_path: Path of the SQLite catalog file
+            flush_threshold: Buffered counter updates before a batch write
+            flush_interval: Seconds a buffered update may wait before the
+                next update triggers a batch write
+            write_back: Called after each batch write with the new
+                ``(views, likes)`` totals of the builds in the batch
+            on_change: Called with the build ID whenever a row is added,
+                refreshed or removed
+        """
+        self.db_path = Path(db_path)
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self.write_back = write_back
+        self.on_change = on_change
+        self._local = threading.local()
+        self._pending: Dict[str, List[int]] = {}
+        self._pending_updates = 0
+        self._pending_since: Optional[float] = None
+        self._pending_lock = threading.Lock()
+        self.init_schema()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def init_schema(self) -> None:
+        """Create the catalog tables and indexes."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self.connection()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS builds (
+                    build_id TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    file_mtime REAL,
+                    file_size INTEGER,
+                    player_name TEXT,
+                    character_name TEXT,
+                    server TEXT,
+                    faction TEXT,
+                    faction_key TEXT,
+                    gcw_rank INTEGER DEFAULT 0,
+                    visibility TEXT,
+                    build_summary TEXT,
+                    pve_rating REAL,
+                    pvp_rating REAL,
+                    professions TEXT,
+                    tags TEXT,
+                    rankings TEXT,
+                    views INTEGER DEFAULT 0,
+                    likes INTEGER DEFAULT 0,
+                    created_at TEXT,
+                    updated_at TEXT
+                )
+            ''')
+            for table, column in (("build_professions", "profession"),
+                                  ("build_tags", "tag"),
+                                  ("build_damage_types", "damage_type"),
+                                  ("build_rankings", "ranking")):
+                conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        build_id TEXT NOT NULL,
+                        {column} TEXT NOT NULL,
+                        PRIMARY KEY ({column}, build_id)
+                    ) WITHOUT ROWID
+                ''')
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_build ON {table}(build_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_visibility ON builds(visibility)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_faction ON builds(faction_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_gcw_rank ON builds(gcw_rank)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_popularity ON builds(views, likes)")
+
+    def upsert(self, build_data: Dict[str, Any], file_path: Path,
+               keep_counters: bool = True) -> str:
+        """Add or refresh a build's catalog entry.
+
+        Args:
+            build_data: Build document in its JSON form
+            file_path: Path of the build's JSON file
+            keep_counters: Keep the catalog's views/likes for existing builds,
+                which may include increments not yet written to the file
+
+        Returns:
+            The build ID
+        """
+        build_id = build_id_for(build_data)
+        try:
+            stat = file_path.stat()
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            mtime, size = None, None
+        metrics = build_data.get("performance_metrics") or {}
+        professions = list((build_data.get("professions") or {}).values())
+        tags = list(build_data.get("tags") or [])
+        rankings = [r.value if hasattr(r, "value") else r for r in build_data.get("rankings") or []]
+        visibility = build_data.get("visibility", "public")
+        visibility = getattr(visibility, "value", visibility)
+        row = {
+            "build_id": build_id,
+            "file_name": file_path.name,
+            "file_mtime": mtime,
+            "file_size": size,
+            "player_name": build_data.get("player_name"),
+            "character_name": build_data.get("character_name"),
+            "server": build_data.get("server"),
+            "faction": build_data.get("faction"),
+            "faction_key": (build_data.get("faction") or "").lower(),
+            "gcw_rank": build_data.get("gcw_rank", 0) or 0,
+            "visibility": visibility,
+            "build_summary": build_data.get("build_summary", ""),
+            "pve_rating": metrics.get("pve_rating"),
+            "pvp_rating": metrics.get("pvp_rating"),
+            "professions": json.dumps(professions),
+            "tags": json.dumps(tags),
+            "rankings": json.dumps(rankings),
+            "views": build_data.get("views", 0) or 0,
+            "likes": build_data.get("likes", 0) or 0,
+            "created_at": _iso(build_data.get("created_at")),
+            "updated_at": _iso(build_data.get("updated_at")),
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{c}" for c in row)
+        preserved = {"build_id", "views", "likes"} if keep_counters else {"build_id"}
+        updates = ", ".join(f"{c} = excluded.{c}" for c in row if c not in preserved)
+
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                f"INSERT INTO builds ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(build_id) DO UPDATE SET {updates}",
+                row,
+            )
+            side_values = (
+                ("build_professions", {p.lower() for p in professions if p}),
+                ("build_tags", {t.lower() for t in tags if t}),
+                ("build_damage_types", {
+                    (w.get("damage_type") or "").lower()
+                    for w in build_data.get("weapons") or [] if w.get("damage_type")
+                }),
+                ("build_rankings", set(rankings)),
+            )
+            for table, values in side_values:
+                conn.execute(f"DELETE FROM {table} WHERE build_id = ?", (build_id,))
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} VALUES (?, ?)",
+                    [(build_id, value) for value in values],
+                )
+        self._changed(build_id)
+        return build_id
+
+    def remove(self, build_id: str) -> None:
+        """Drop a build from the catalog."""
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM builds WHERE build_id = ?", (build_id,))
+            for table in ("build_professions", "build_tags", "build_damage_types", "build_rankings"):
+                conn.execute(f"DELETE FROM {table} WHERE build_id = ?", (build_id,))
+        self._changed(build_id)
+
+    def _changed(self, build_id: str) -> None:
+        if self.on_change is not None:
+            self.on_change(build_id)
+
+    def record_file(self, build_id: str, file_path: Path, updated_at: Any = None) -> None:
+        """Note a rewrite of a build's file that only changed its counters.
+
+        Stores the file's new mtime and size (and ``updated_at``) so the next
+        sync does not re-parse it.
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                "UPDATE builds SET file_mtime = ?, file_size = ?, "
+                "updated_at = COALESCE(?, updated_at) WHERE build_id = ?",
+                (stat.st_mtime, stat.st_size, _iso(updated_at), build_id),
+            )
+
+    def sync_directory(self, builds_dir: Path) -> int:
+        """Bring the catalog in line with the build files on disk.
+
+        Only new or modified files (by mtime and size) are parsed; entries
+        whose files were removed are dropped.
+
+        Returns:
+            Number of build files parsed
+        """
+        conn = self.connection()
+        known = {
+            row["file_name"]: (row["build_id"], row["file_mtime"], row["file_size"])
+            for row in conn.execute("SELECT build_id, file_name, file_mtime, file_size FROM builds")
+        }
+        seen = set()
+        parsed = 0
+        with os.scandir(builds_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                cached = known.get(entry.name)
+                if cached and cached[1] == stat.st_mtime and cached[2] == stat.st_size:
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        build_data = json.load(f)
+                    self.upsert(build_data, Path(entry.path))
+                    parsed += 1
+                except Exception as e:
+                    logger.error("Error cataloging build %s: %s", entry.path, e)
+        for file_name, (build_id, _, _) in known.items():
+            if file_name not in seen:
+                self.remove(build_id)
+        return parsed
+
+    def add_counts(self, build_id: str, views: int = 0, likes: int = 0) -> None:
+        """Buffer view/like increments, flushing once enough have piled up
+        or the oldest has waited ``flush_interval`` seconds."""
+        now = time.monotonic()
+        with self._pending_lock:
+            pending = self._pending.setdefault(build_id, [0, 0])
+            pending[0] += views
+            pending[1] += likes
+            self._pending_updates += 1
+            if self._pending_since is None:
+                self._pending_since = now
+            should_flush = (self._pending_updates >= self.flush_threshold
+                            or now - self._pending_since >= self.flush_interval)
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered counters in one transaction; returns builds updated."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._pending_updates = 0
+            self._pending_since = None
+        if not pending:
+            return 0
+        conn = self.connection()
+        with conn:
+            conn.executemany(
+                "UPDATE builds SET views = views + ?, likes = likes + ? WHERE build_id = ?",
+                [(views, likes, build_id) for build_id, (views, likes) in pending.items()],
+            )
+            placeholders = ", ".join("?" for _ in pending)
+            totals = {
+                row["build_id"]: (row["views"], row["likes"])
+                for row in conn.execute(
+                    f"SELECT build_id, views, likes FROM builds WHERE build_id IN ({placeholders})",
+                    list(pending),
+                )
+            }
+        if self.write_back is not None and totals:
+            self.write_back(totals)
+        return len(pending)
+
+    def counters(self, build_id: str) -> Tuple[int, int]:
+        """Return ``(views, likes)`` including buffered increments."""
+        row = self.connection().execute(
+            "SELECT views, likes FROM builds WHERE build_id = ?", (build_id,)
+        ).fetchone()
+        views, likes = (row["views"], row["likes"]) if row else (0, 0)
+        with self._pending_lock:
+            pending = self._pending.get(build_id)
+            if pending:
+                views += pending[0]
+                likes += pending[1]
+        return views, likes
+
+    def has(self, build_id: str) -> bool:
+        return self.connection().execute(
+            "SELECT 1 FROM builds WHERE build_id = ?", (build_id,)
+        ).fetchone() is not None
+
+    def file_name(self, build_id: str) -> Optional[str]:
+        row = self.connection().execute(
+            "SELECT file_name FROM builds WHERE build_id = ?", (build_id,)
+        ).fetchone()
+        return row["file_name"] if row else None
+
+    def search(self,
+               query: Optional[str] = None,
+               profession: Optional[str] = None,
+               damage_type: Optional[str] = None,
+               faction: Optional[str] = None,
+               pve_pvp: Optional[str] = None,
+               min_gcw_rank: Optional[int] = None,
+               tags: Optional[List[str]] = None,
+               visibility: Optional[str] = None,
+               ranking: Optional[str] = None,
+               order_by: Optional[str] = None,
+               limit: Optional[int] = None,
+               offset: int = 0) -> List[Dict[str, Any]]:
+        """Return catalog summaries matching the filters.
+
+        Filters have the same semantics as ``PublicBuildBrowser.search_builds``.
+        ``order_by`` is one of ``popularity`` (views + 2 * likes), ``views``,
+        ``likes`` or ``None`` (catalog order).
+        """
+        if order_by:
+            self.flush()
+        clauses: List[str] = []
+        params: List[Any] = []
+        if query:
+            clauses.append("b.build_summary LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(query)}%")
+        if profession:
+            clauses.append("b.build_id IN (SELECT build_id FROM build_professions WHERE profession = ?)")
+            params.append(profession.lower())
+        if damage_type:
+            clauses.append("b.build_id IN (SELECT build_id FROM build_damage_types WHERE damage_type = ?)")
+            params.append(damage_type.lower())
+        if faction:
+            clauses.append("b.faction_key = ?")
+            params.append(faction.lower())
+        if min_gcw_rank:
+            clauses.append("b.gcw_rank >= ?")
+            params.append(min_gcw_rank)
+        if tags:
+            lowered = [t.lower() for t in tags]
+            clauses.append(
+                "b.build_id IN (SELECT build_id FROM build_tags WHERE tag IN "
+                f"({', '.join('?' for _ in lowered)}))"
+            )
+            params.extend(lowered)
+        if pve_pvp:
+            focus = pve_pvp.lower()
+            rating = {"pve": "b.pve_rating", "pvp": "b.pvp_rating"}.get(focus)
+            if rating:
+                clauses.append(
+                    f"(b.build_id IN (SELECT build_id FROM build_tags WHERE tag = ?) "
+                    f"OR {rating} IS NULL OR {rating} >= 5.0)"
+                )
+                params.append(focus)
+        if visibility:
+            clauses.append("b.visibility = ?")
+            params.append(visibility)
+        if ranking:
+            clauses.append("b.build_id IN (SELECT build_id FROM build_rankings WHERE ranking = ?)")
+            params.append(ranking)
+
+        sql = f"SELECT {', '.join('b.' + c for c in SUMMARY_COLUMNS)} FROM builds b"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += {
+            "popularity": " ORDER BY b.views + b.likes * 2 DESC, b.rowid",
+            "views": " ORDER BY b.views DESC, b.rowid",
+            "likes": " ORDER BY b.likes DESC, b.rowid",
+        }.get(order_by, " ORDER BY b.rowid")
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+        results = []
+        for row in self.connection().execute(sql, params):
+            summary = dict(row)
+            for column in ("professions", "tags", "rankings"):
+                summary[column] = json.loads(summary[column] or "[]")
+            results.append(summary)
+        return results
+
+    def statistics(self) -> Dict[str, Any]:
+        """Aggregate build statistics straight from the catalog."""
+        self.flush()
+        conn = self.connection()
+        total, public, featured = conn.execute(
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(visibility = 'public'), 0), "
+            "COALESCE(SUM(visibility = 'featured'), 0) FROM builds"
+        ).fetchone()
+        faction_counts = {
+            row[0]: row[1] for row in conn.execute(
+                "SELECT faction_key, COUNT(*) FROM builds GROUP BY faction_key"
+            )
+        }
+        profession_counts: Dict[str, int] = {}
+        for row in conn.execute("SELECT professions FROM builds"):
+            for profession in json.loads(row[0] or "[]"):
+                profession_counts[profession] = profession_counts.get(profession, 0) + 1
+
+        def top(column: str) -> List[Dict[str, Any]]:
+            return [
+                {
+                    "id": row["build_id"],
+                    "name": f"{row['player_name']} - {row['character_name']}",
+                    column: row[column],
+                }
+                for row in conn.execute(
+                    f"SELECT build_id, player_name, character_name, {column} "
+                    f"FROM builds ORDER BY {column} DESC, rowid LIMIT 5"
+                )
+            ]
+
+        return {
+            "total_builds": total,
+            "public_builds": public,
+            "featured_builds": featured,
+            "faction_distribution": faction_counts,
+            "profession_distribution": profession_counts,
+            "most_viewed": top("views"),
+            "most_liked": top("likes"),
+        }
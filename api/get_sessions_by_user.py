@@ -13,60 +13,25 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from urllib.parse import parse_qs
 import jwt
-import sqlite3
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from api.session_store import SessionStore
+
 
 class SessionAPI:
     """API handler for session data retrieval."""
     
-    def __init__(self):
-        self.db_path = Path("data/swgdb_sessions.db")
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else Path("data/swgdb_sessions.db")
         self.jwt_secret = os.getenv("SWGDB_JWT_SECRET", "default_secret_key")
+        self.store: Optional[SessionStore] = None
         self.init_database()
     
     def init_database(self):
-        """Initialize the database with sessions table."""
+        """Initialize the session store (tables, side tables and indexes)."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Create sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT UNIQUE NOT NULL,
-                    user_hash TEXT NOT NULL,
-                    character_name TEXT,
-                    start_time TEXT,
-                    end_time TEXT,
-                    duration_minutes REAL,
-                    session_data TEXT,
-                    upload_timestamp TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create indexes for performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_user_hash 
-                ON sessions(user_hash)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_session_id 
-                ON sessions(session_id)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_start_time 
-                ON sessions(start_time)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_character_name 
-                ON sessions(character_name)
-            ''')
-            
-            conn.commit()
+        self.store = SessionStore(self.db_path)
     
     def authenticate_user(self, auth_header: str) -> Optional[str]:
         """Authenticate user from Authorization header."""
@@ -85,110 +50,36 @@ class SessionAPI:
     
     def get_sessions_by_user(self, user_hash: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get sessions for a specific user with optional filtering."""
+        return self.get_sessions_page(user_hash, filters)["sessions"]
+    
+    def get_sessions_page(self, user_hash: str, filters: Dict[str, Any] = None,
+                          cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of sessions plus the cursor for the next page.
+        
+        Planet and profession filters run in SQL against indexed side
+        tables; pass the returned ``next_cursor`` back to continue.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Build query with filters
-                query = '''
-                    SELECT session_data 
-                    FROM sessions 
-                    WHERE user_hash = ?
-                '''
-                params = [user_hash]
-                
-                # Add date filters
-                if filters and filters.get('start_date'):
-                    query += ' AND start_time >= ?'
-                    params.append(filters['start_date'])
-                
-                if filters and filters.get('end_date'):
-                    query += ' AND start_time <= ?'
-                    params.append(filters['end_date'])
-                
-                # Add character filter
-                if filters and filters.get('character'):
-                    query += ' AND character_name = ?'
-                    params.append(filters['character'])
-                
-                # Order by start time (newest first)
-                query += ' ORDER BY start_time DESC'
-                
-                # Add limit if specified
-                if filters and filters.get('limit'):
-                    query += ' LIMIT ?'
-                    params.append(filters['limit'])
-                
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                sessions = []
-                for row in rows:
-                    try:
-                        session_data = json.loads(row[0])
-                        
-                        # Apply post-processing filters
-                        if self._should_include_session(session_data, filters):
-                            sessions.append(session_data)
-                    except json.JSONDecodeError:
-                        print(f"Error parsing session data: {row[0][:100]}...")
-                        continue
-                
-                return sessions
-                
+            sessions, next_cursor = self.store.list_sessions(user_hash, filters, cursor)
+            return {"sessions": sessions, "next_cursor": next_cursor}
         except Exception as e:
             print(f"Database error: {e}")
-            return []
-    
-    def _should_include_session(self, session_data: Dict[str, Any], filters: Dict[str, Any]) -> bool:
-        """Apply post-processing filters that require parsing session data."""
-        if not filters:
-            return True
-        
-        # Planet filter
-        if filters.get('planet'):
-            has_planet = False
-            for location in session_data.get('location_data', {}).get('location_events', []):
-                if location.get('planet') == filters['planet']:
-                    has_planet = True
-                    break
-            if not has_planet:
-                return False
-        
-        # Profession filter
-        if filters.get('profession'):
-            profession_breakdown = session_data.get('xp_data', {}).get('profession_breakdown', {})
-            if filters['profession'] not in profession_breakdown:
-                return False
-        
-        return True
+            return {"sessions": [], "next_cursor": None}
     
     def get_session_by_id(self, user_hash: str, session_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific session by ID for a user."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT session_data 
-                    FROM sessions 
-                    WHERE user_hash = ? AND session_id = ?
-                ''', [user_hash, session_id])
-                
-                row = cursor.fetchone()
-                if row:
-                    return json.loads(row[0])
-                return None
-                
+            return self.store.get_session(user_hash, session_id)
         except Exception as e:
             print(f"Database error: {e}")
             return None
     
     def get_session_statistics(self, user_hash: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get aggregated statistics for user sessions."""
-        sessions = self.get_sessions_by_user(user_hash, filters)
-        
-        if not sessions:
+        try:
+            return self.store.statistics(user_hash, filters)
+        except Exception as e:
+            print(f"Database error: {e}")
             return {
                 "total_sessions": 0,
                 "total_xp_gained": 0,
@@ -204,88 +95,12 @@ class SessionAPI:
                 "planets": [],
                 "professions": []
             }
-        
-        stats = {
-            "total_sessions": len(sessions),
-            "total_xp_gained": 0,
-            "total_credits_gained": 0,
-            "total_quests_completed": 0,
-            "total_time_minutes": 0,
-            "total_stuck_events": 0,
-            "total_communication_events": 0,
-            "characters": set(),
-            "planets": set(),
-            "professions": set()
-        }
-        
-        for session in sessions:
-            # XP
-            stats["total_xp_gained"] += session.get("xp_data", {}).get("total_xp_gained", 0)
-            
-            # Credits
-            stats["total_credits_gained"] += session.get("credit_data", {}).get("total_credits_gained", 0)
-            
-            # Quests
-            stats["total_quests_completed"] += session.get("quest_data", {}).get("total_quests_completed", 0)
-            
-            # Time
-            stats["total_time_minutes"] += session.get("duration_minutes", 0)
-            
-            # Events
-            stats["total_stuck_events"] += len(session.get("event_data", {}).get("stuck_events", []))
-            stats["total_communication_events"] += len(session.get("event_data", {}).get("communication_events", []))
-            
-            # Characters
-            if session.get("character_name"):
-                stats["characters"].add(session["character_name"])
-            
-            # Planets
-            for location in session.get("location_data", {}).get("location_events", []):
-                if location.get("planet"):
-                    stats["planets"].add(location["planet"])
-            
-            # Professions
-            for profession in session.get("xp_data", {}).get("profession_breakdown", {}).keys():
-                stats["professions"].add(profession)
-        
-        # Calculate averages
-        if stats["total_sessions"] > 0:
-            stats["average_session_duration"] = stats["total_time_minutes"] / stats["total_sessions"]
-            stats["average_xp_per_session"] = stats["total_xp_gained"] / stats["total_sessions"]
-            stats["average_credits_per_session"] = stats["total_credits_gained"] / stats["total_sessions"]
-        
-        # Convert sets to lists for JSON serialization
-        stats["characters"] = list(stats["characters"])
-        stats["planets"] = list(stats["planets"])
-        stats["professions"] = list(stats["professions"])
-        
-        return stats
     
     def insert_session(self, user_hash: str, session_data: Dict[str, Any]) -> bool:
         """Insert a new session into the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO sessions 
-                    (session_id, user_hash, character_name, start_time, end_time, 
-                     duration_minutes, session_data, upload_timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', [
-                    session_data.get("session_id"),
-                    user_hash,
-                    session_data.get("character_name"),
-                    session_data.get("start_time"),
-                    session_data.get("end_time"),
-                    session_data.get("duration_minutes"),
-                    json.dumps(session_data),
-                    datetime.now().isoformat()
-                ])
-                
-                conn.commit()
-                return True
-                
+            self.store.insert_session(user_hash, session_data)
+            return True
         except Exception as e:
             print(f"Error inserting session: {e}")
             return False
@@ -293,25 +108,26 @@ class SessionAPI:
     def delete_session(self, user_hash: str, session_id: str) -> bool:
         """Delete a session for a user."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    DELETE FROM sessions 
-                    WHERE user_hash = ? AND session_id = ?
-                ''', [user_hash, session_id])
-                
-                conn.commit()
-                return cursor.rowcount > 0
-                
+            return self.store.delete_session(user_hash, session_id)
         except Exception as e:
             print(f"Error deleting session: {e}")
             return False
 
 
+_api: Optional[SessionAPI] = None
+
+
+def get_session_api() -> SessionAPI:
+    """Get the shared SessionAPI instance (and its connection pool)."""
+    global _api
+    if _api is None:
+        _api = SessionAPI()
+    return _api
+
+
 def handle_request(environ, start_response):
     """Handle HTTP request for session API."""
-    api = SessionAPI()
+    api = get_session_api()
     
     # Get request method and path
     method = environ.get('REQUEST_METHOD', 'GET')
@@ -396,9 +212,9 @@ def handle_request(environ, start_response):
                     ])
                     return [json.dumps({"error": "Session not found"})]
             else:
-                # Get sessions with filters
-                sessions = api.get_sessions_by_user(user_hash, filters)
-                response_data = {"sessions": sessions}
+                # Get sessions with filters (keyset-paginated)
+                cursor = query_params.get('cursor', [None])[0]
+                response_data = api.get_sessions_page(user_hash, filters, cursor)
             
             start_response('200 OK', [
                 ('Content-Type', 'application/json'),
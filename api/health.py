@@ -10,6 +10,7 @@ import time
 import json
 import psutil
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -29,6 +30,13 @@ try:
 except ImportError:
     CORE_MODULES_AVAILABLE = False
 
+try:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from perf.profiler import get_profiler
+    PROFILER_AVAILABLE = True
+except ImportError:
+    PROFILER_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Create Flask blueprint
@@ -52,9 +60,37 @@ class HealthChecker:
             'error_rate_warning': 5.0, # errors/min
             'error_rate_critical': 20.0 # errors/min
         }
+        # Primed so later cpu_percent() calls measure since the previous one
+        self._process = psutil.Process()
+        self._process.cpu_percent(interval=None)
         
-    def get_system_health(self) -> Dict[str, Any]:
-        """Get comprehensive system health status."""
+    # Check name -> method name, in report order
+    CHECKS = [
+        ('memory', '_check_memory'),
+        ('cpu', '_check_cpu'),
+        ('disk', '_check_disk_space'),
+        ('database', '_check_database'),
+        ('cache', '_check_cache'),
+        ('logging', '_check_logging'),
+        ('dependencies', '_check_dependencies'),
+        ('configuration', '_check_configuration')
+    ]
+    
+    def run_check(self, check_name: str) -> Dict[str, Any]:
+        """Run a single health check, converting failures into a critical result."""
+        check_func = getattr(self, dict(self.CHECKS)[check_name])
+        try:
+            return check_func()
+        except Exception as e:
+            logger.error(f"Health check {check_name} failed: {e}")
+            return {
+                'status': 'critical',
+                'message': f'Health check failed: {str(e)}',
+                'alert': True
+            }
+    
+    def summarize(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a health report from individual check results."""
         health_data = {
             'timestamp': datetime.utcnow().isoformat(),
             'uptime_seconds': time.time() - self.start_time,
@@ -64,50 +100,41 @@ class HealthChecker:
             'alerts': []
         }
         
-        # Run all health checks
-        checks = [
-            ('memory', self._check_memory),
-            ('cpu', self._check_cpu),
-            ('disk', self._check_disk_space),
-            ('database', self._check_database),
-            ('cache', self._check_cache),
-            ('logging', self._check_logging),
-            ('dependencies', self._check_dependencies),
-            ('configuration', self._check_configuration)
-        ]
-        
         overall_status = 'healthy'
         
-        for check_name, check_func in checks:
-            try:
-                result = check_func()
-                health_data['checks'][check_name] = result
-                
-                # Update overall status
-                if result['status'] == 'critical':
-                    overall_status = 'critical'
-                elif result['status'] == 'warning' and overall_status == 'healthy':
-                    overall_status = 'warning'
-                    
-                # Add alerts
-                if result.get('alert'):
-                    health_data['alerts'].append({
-                        'component': check_name,
-                        'severity': result['status'],
-                        'message': result.get('message', ''),
-                        'timestamp': health_data['timestamp']
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Health check {check_name} failed: {e}")
-                health_data['checks'][check_name] = {
-                    'status': 'critical',
-                    'message': f'Health check failed: {str(e)}',
-                    'alert': True
-                }
+        for check_name, _ in self.CHECKS:
+            result = results.get(check_name)
+            if result is None:
+                continue
+            health_data['checks'][check_name] = result
+            
+            # Update overall status
+            if result['status'] == 'critical':
                 overall_status = 'critical'
+            elif result['status'] == 'warning' and overall_status == 'healthy':
+                overall_status = 'warning'
+                
+            # Add alerts
+            if result.get('alert'):
+                health_data['alerts'].append({
+                    'component': check_name,
+                    'severity': result['status'],
+                    'message': result.get('message', ''),
+                    'timestamp': health_data['timestamp']
+                })
                 
         health_data['status'] = overall_status
+        return health_data
+        
+    def get_system_health(self) -> Dict[str, Any]:
+        """Get comprehensive system health status.
+        
+        Runs every check inline; request handlers should read the
+        ``HealthCollector`` snapshot instead.
+        """
+        health_data = self.summarize({
+            check_name: self.run_check(check_name) for check_name, _ in self.CHECKS
+        })
         
         # Add to history
         self._add_to_history(health_data)
@@ -117,8 +144,7 @@ class HealthChecker:
     def _check_memory(self) -> Dict[str, Any]:
         """Check memory usage."""
         try:
-            process = psutil.Process()
-            memory_info = process.memory_info()
+            memory_info = self._process.memory_info()
             memory_mb = memory_info.rss / 1024 / 1024
             
             status = 'healthy'
@@ -156,8 +182,8 @@ class HealthChecker:
     def _check_cpu(self) -> Dict[str, Any]:
         """Check CPU usage."""
         try:
-            process = psutil.Process()
-            cpu_percent = process.cpu_percent(interval=0.1)
+            # Non-blocking: usage since the previous call
+            cpu_percent = self._process.cpu_percent(interval=None)
             
             status = 'healthy'
             alert = False
@@ -490,21 +516,168 @@ class HealthChecker:
         }
 
 
+class HealthCollector:
+    """Background collector that keeps a health snapshot up to date.
+    
+    Each check runs on its own cadence in a daemon thread and its latest
+    result is published into an immutable snapshot, so probes and the
+    ``/health`` endpoints answer without running any checks themselves.
+    A check whose result is older than ``stale_factor`` times its interval
+    is reported as stale.
+    """
+    
+    # Refresh interval per check, in seconds
+    DEFAULT_INTERVALS = {
+        'memory': 5.0,
+        'cpu': 5.0,
+        'disk': 30.0,
+        'database': 15.0,
+        'cache': 10.0,
+        'logging': 30.0,
+        'dependencies': 300.0,
+        'configuration': 300.0
+    }
+    
+    def __init__(self, checker: HealthChecker,
+                 intervals: Optional[Dict[str, float]] = None,
+                 stale_factor: float = 3.0):
+        self.checker = checker
+        self.intervals = dict(self.DEFAULT_INTERVALS)
+        self.intervals.update(intervals or {})
+        self.stale_factor = stale_factor
+        # check name -> (result, monotonic time, duration ms)
+        self._results: Dict[str, tuple] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._next_due: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+        
+    def start(self) -> None:
+        """Start the collector thread if it is not already running."""
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='HealthCollector', daemon=True
+            )
+            self._thread.start()
+            
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the collector thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            
+    def collect(self, check_names: Optional[List[str]] = None) -> None:
+        """Run the given checks (default: all) and publish a new snapshot."""
+        names = check_names or [name for name, _ in self.checker.CHECKS]
+        results = dict(self._results)
+        for check_name in names:
+            started = time.monotonic()
+            result = self.checker.run_check(check_name)
+            finished = time.monotonic()
+            results[check_name] = (result, finished, (finished - started) * 1000)
+            self._next_due[check_name] = finished + self.intervals.get(check_name, 30.0)
+        self._results = results
+        
+        snapshot = self.checker.summarize({name: entry[0] for name, entry in results.items()})
+        snapshot['collected_at'] = {name: entry[1] for name, entry in results.items()}
+        snapshot['check_duration_ms'] = {name: entry[2] for name, entry in results.items()}
+        self.checker._add_to_history(snapshot)
+        self._snapshot = snapshot
+        
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [
+                name for name, _ in self.checker.CHECKS
+                if self._next_due.get(name, 0.0) <= now
+            ]
+            if due:
+                try:
+                    self.collect(due)
+                except Exception as e:
+                    logger.error(f"Health collector pass failed: {e}")
+            wait = min(self._next_due.values(), default=now + 1.0) - time.monotonic()
+            self._stop.wait(max(0.05, min(wait, 1.0)))
+            
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the latest health report with per-check staleness.
+        
+        Never runs checks; before the first pass completes the status is
+        ``'starting'``.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {
+                'timestamp': datetime.utcnow().isoformat(),
+                'uptime_seconds': time.time() - self.checker.start_time,
+                'status': 'starting',
+                'checks': {},
+                'metrics': {},
+                'alerts': [],
+                'stale_checks': []
+            }
+            
+        now = time.monotonic()
+        health_data = dict(snapshot)
+        collected_at = health_data.pop('collected_at')
+        durations = health_data.pop('check_duration_ms')
+        health_data['uptime_seconds'] = time.time() - self.checker.start_time
+        health_data['checks'] = {}
+        stale_checks = []
+        for check_name, result in snapshot['checks'].items():
+            age = now - collected_at[check_name]
+            max_age = self.intervals.get(check_name, 30.0) * self.stale_factor
+            stale = age > max_age
+            if stale:
+                stale_checks.append(check_name)
+            health_data['checks'][check_name] = dict(
+                result,
+                age_seconds=round(age, 3),
+                stale=stale,
+                duration_ms=round(durations[check_name], 3)
+            )
+        health_data['stale_checks'] = stale_checks
+        if stale_checks and health_data['status'] == 'healthy':
+            health_data['status'] = 'warning'
+        return health_data
+        
+    def is_ready(self) -> bool:
+        """Readiness from the last snapshot (ready unless critical)."""
+        snapshot = self._snapshot
+        return snapshot is not None and snapshot['status'] != 'critical'
+
+
 # Global health checker instance
 health_checker = HealthChecker()
+health_collector = HealthCollector(health_checker)
+
+
+def get_health_collector() -> HealthCollector:
+    """Get the global health collector, starting it on first use."""
+    if not health_collector.running:
+        health_collector.start()
+    return health_collector
 
 
 # Flask routes
 @health_bp.route('/')
 def health_check():
-    """Basic health check endpoint."""
-    health_data = health_checker.get_system_health()
+    """Basic health check endpoint (served from the collector snapshot)."""
+    health_data = get_health_collector().snapshot()
     
     # Return appropriate HTTP status code
     status_code = 200
     if health_data['status'] == 'warning':
         status_code = 200  # Still OK, but with warnings
-    elif health_data['status'] == 'critical':
+    elif health_data['status'] in ('critical', 'starting'):
         status_code = 503  # Service unavailable
         
     return jsonify(health_data), status_code
@@ -513,7 +686,7 @@ def health_check():
 @health_bp.route('/detailed')
 def detailed_health():
     """Detailed health information."""
-    health_data = health_checker.get_system_health()
+    health_data = get_health_collector().snapshot()
     
     # Add additional detailed information
     if CORE_MODULES_AVAILABLE:
@@ -541,7 +714,7 @@ def health_trends():
 @health_bp.route('/metrics')
 def metrics_endpoint():
     """Prometheus-style metrics endpoint."""
-    health_data = health_checker.get_system_health()
+    health_data = get_health_collector().snapshot()
     
     # Generate Prometheus-style metrics
     metrics_lines = []
@@ -555,9 +728,14 @@ def metrics_endpoint():
                 metric_line = f'ms11_{check_name}_{metric_name} {metric_value}'
                 metrics_lines.append(metric_line)
                 
+        # Snapshot age per check
+        if 'age_seconds' in check_data:
+            metrics_lines.append(f'ms11_{check_name}_age_seconds {check_data["age_seconds"]}')
+                
     # Add status as metric (0=healthy, 1=warning, 2=critical)
     status_value = {'healthy': 0, 'warning': 1, 'critical': 2}.get(health_data['status'], 2)
     metrics_lines.append(f'ms11_system_status {status_value}')
+    metrics_lines.append(f'ms11_stale_checks {len(health_data["stale_checks"])}')
     
     # Add uptime
     metrics_lines.append(f'ms11_uptime_seconds {time.time() - health_checker.start_time}')
@@ -565,19 +743,41 @@ def metrics_endpoint():
     # Add alert count
     metrics_lines.append(f'ms11_alerts_total {len(health_data["alerts"])}')
     
+    # Add latency percentiles from the profiler histograms
+    if PROFILER_AVAILABLE:
+        metrics_lines.append(get_profiler().export_latency_prometheus().rstrip('\n'))
+    
     # Return as plain text
     metrics_text = '\n'.join(metrics_lines)
     return Response(metrics_text, mimetype='text/plain')
 
 
+@health_bp.route('/metrics/latency')
+def latency_metrics_endpoint():
+    """Latency histogram percentiles as JSON."""
+    if not PROFILER_AVAILABLE:
+        return jsonify({'message': 'Profiler not available'}), 503
+        
+    window = request.args.get('window', None, type=float)
+    profiler = get_profiler()
+    return jsonify({
+        'lifetime': profiler.get_latency_percentiles(),
+        'rolling': profiler.get_latency_percentiles(
+            window_seconds=window or profiler.latency_histograms.window_seconds
+        )
+    })
+
+
 @health_bp.route('/ready')
 def readiness_check():
-    """Kubernetes readiness probe."""
-    health_data = health_checker.get_system_health()
+    """Kubernetes readiness probe (answered from the collector snapshot)."""
+    collector = get_health_collector()
     
     # Ready if not critical
-    if health_data['status'] != 'critical':
+    if collector.is_ready():
         return jsonify({'status': 'ready'}), 200
+    elif collector.snapshot()['status'] == 'starting':
+        return jsonify({'status': 'not ready', 'reason': 'Health collector starting'}), 503
     else:
         return jsonify({'status': 'not ready', 'reason': 'Critical health issues'}), 503
 
@@ -589,7 +789,8 @@ def liveness_check():
     return jsonify({
         'status': 'alive',
         'timestamp': datetime.utcnow().isoformat(),
-        'uptime': time.time() - health_checker.start_time
+        'uptime': time.time() - health_checker.start_time,
+        'collector_running': health_collector.running
     }), 200
 
 
@@ -621,6 +822,7 @@ def optimize_system():
 def register_health_endpoints(app):
     """Register health endpoints with Flask app."""
     app.register_blueprint(health_bp)
+    get_health_collector()
     logger.info("Health check endpoints registered")
 
 
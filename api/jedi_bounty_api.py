@@ -17,6 +17,7 @@ from flask import Flask, request, jsonify, send_file
 from werkzeug.exceptions import BadRequest, NotFound
 
 from core.jedi_bounty_tracker import get_jedi_bounty_tracker, JediKill, Season
+from api.jedi_bounty_index import get_kill_index
 from utils.license_hooks import requires_license
 from profession_logic.utils.logger import logger
 
@@ -44,53 +45,34 @@ def register_jedi_bounty_routes(app: Flask) -> None:
         - season_id: Filter by season ID
         - date_from: Filter kills from date (ISO format)
         - date_to: Filter kills to date (ISO format)
+        - cursor: Continue after the last kill of a previous page
+        
+        Kills are returned in recorded order. Prefer ``cursor`` (returned as
+        ``next_cursor``) over ``offset`` for deep pages.
         """
         try:
             tracker = get_jedi_bounty_tracker()
+            index = get_kill_index(tracker)
             
             # Parse query parameters
             limit = min(int(request.args.get('limit', 100)), 1000)
             offset = int(request.args.get('offset', 0))
-            target_name = request.args.get('target_name')
-            hunter_name = request.args.get('hunter_name')
-            planet = request.args.get('planet')
-            kill_method = request.args.get('kill_method')
-            season_id = request.args.get('season_id')
-            date_from = request.args.get('date_from')
-            date_to = request.args.get('date_to')
-            
-            # Filter kills
-            filtered_kills = []
-            for kill in tracker.kills:
-                # Apply filters
-                if target_name and target_name.lower() not in kill.target_name.lower():
-                    continue
-                if hunter_name and hunter_name.lower() not in kill.hunter_name.lower():
-                    continue
-                if planet and planet.lower() not in kill.planet.lower():
-                    continue
-                if kill_method and kill_method.lower() not in kill.kill_method.lower():
-                    continue
-                if season_id and kill.season_id != season_id:
-                    continue
-                
-                # Date filtering
-                if date_from or date_to:
-                    kill_date = datetime.fromisoformat(kill.timestamp.replace('Z', '+00:00'))
-                    if date_from:
-                        from_date = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-                        if kill_date < from_date:
-                            continue
-                    if date_to:
-                        to_date = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-                        if kill_date > to_date:
-                            continue
-                
-                filtered_kills.append(kill)
-            
-            # Apply pagination
-            total_count = len(filtered_kills)
-            paginated_kills = filtered_kills[offset:offset + limit]
+            cursor = request.args.get('cursor')
+            
+            result = index.query(
+                target_name=request.args.get('target_name'),
+                hunter_name=request.args.get('hunter_name'),
+                planet=request.args.get('planet'),
+                kill_method=request.args.get('kill_method'),
+                season_id=request.args.get('season_id'),
+                date_from=request.args.get('date_from'),
+                date_to=request.args.get('date_to'),
+                limit=limit,
+                offset=offset,
+                cursor=cursor
+            )
+            total_count = result["total_count"]
+            paginated_kills = result["kills"]
             
             # Convert to dict for JSON serialization
             kills_data = []
@@ -119,7 +101,8 @@ def register_jedi_bounty_routes(app: Flask) -> None:
                 "data": kills_data,
                 "total_count": total_count,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "next_cursor": result["next_cursor"]
             })
             
         except Exception as e:
@@ -162,6 +145,7 @@ def register_jedi_bounty_routes(app: Flask) -> None:
                     raise BadRequest(f"Missing required field: {field}")
             
             tracker = get_jedi_bounty_tracker()
+            index = get_kill_index(tracker)
             
             # Record the kill
             kill_id = tracker.record_jedi_kill(
@@ -179,6 +163,11 @@ def register_jedi_bounty_routes(app: Flask) -> None:
                 notes=data.get('notes')
             )
             
+            kill = tracker.get_kill_by_id(kill_id)
+            if kill:
+                index.add(kill)
+                index.sync_source(tracker.kills)
+            
             return jsonify({
                 "success": True,
                 "kill_id": kill_id,
@@ -258,6 +247,7 @@ def register_jedi_bounty_routes(app: Flask) -> None:
         """
         try:
             tracker = get_jedi_bounty_tracker()
+            index = get_kill_index(tracker)
             success = tracker.delete_kill(kill_id)
             
             if not success:
@@ -266,6 +256,9 @@ def register_jedi_bounty_routes(app: Flask) -> None:
                     "error": "Kill not found"
                 }), 404
             
+            index.remove(kill_id)
+            index.sync_source(tracker.kills)
+            
             return jsonify({
                 "success": True,
                 "message": f"Kill {kill_id} deleted successfully"
@@ -422,10 +415,14 @@ def register_jedi_bounty_routes(app: Flask) -> None:
         ----------
         season_id : str
             ID of the season to get leaderboard for
+        
+        Query Parameters:
+        - limit: Maximum number of hunters to return (default: all)
         """
         try:
             tracker = get_jedi_bounty_tracker()
-            leaderboard = tracker.get_season_leaderboard(season_id)
+            limit = request.args.get('limit', type=int)
+            leaderboard = get_kill_index(tracker).leaderboard(season_id, limit)
             
             return jsonify({
                 "success": True,
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Jedi Bounty Kill Index
+
+In-memory index over the Jedi bounty tracker's kills, used by the kill list
+and season leaderboard endpoints:
+- Hash indexes keyed by season, hunter, target, planet and method, with an
+  n-gram map so substring filters are lookups rather than key scans
+- A sorted timestamp index for date range filters and counts
+- The tracker's recorded order, kept as sequence numbers for keyset cursors
+- Per-season leaderboards maintained incrementally as kills are added or
+  removed
+
+List results keep the order and filter semantics of a plain walk over
+``tracker.kills``; leaderboard entries carry the fields the Hall of Hunters
+page reads from the tracker's leaderboard.
+"""
+
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
+
+# Longest n-gram kept per key; longer substrings are narrowed by one of
+# their n-grams and then checked against the candidate keys
+GRAM_SIZE = 3
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse an ISO timestamp (``Z`` suffix allowed) into epoch seconds."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def encode_cursor(seq: int, kill_id: str) -> str:
+    """Encode a keyset cursor for the kill list."""
+    return f"{seq}:{kill_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    seq, _, kill_id = cursor.partition(':')
+    return int(seq), kill_id
+
+
+def source_signature(kills: List[Any]) -> Tuple[int, Optional[str]]:
+    """O(1) signature of the kill list: its length and last kill id."""
+    return len(kills), kills[-1].kill_id if kills else None
+
+
+def _grams(key: str) -> Set[str]:
+    return {key[start:start + size]
+            for size in range(1, GRAM_SIZE + 1)
+            for start in range(len(key) - size + 1)}
+
+
+class KeyIndex:
+    """Kill ids by lowercased key, with substring lookups over the keys."""
+
+    def __init__(self):
+        self.ids: Dict[str, Set[str]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+
+    def add(self, key: str, kill_id: str) -> None:
+        ids = self.ids.get(key)
+        if ids is None:
+            ids = self.ids[key] = set()
+            for gram in _grams(key):
+                self.grams.setdefault(gram, set()).add(key)
+        ids.add(kill_id)
+
+    def discard(self, key: str, kill_id: str) -> None:
+        ids = self.ids.get(key)
+        if ids is None:
+            return
+        ids.discard(kill_id)
+        if not ids:
+            del self.ids[key]
+            for gram in _grams(key):
+                keys = self.grams[gram]
+                keys.discard(key)
+                if not keys:
+                    del self.grams[gram]
+
+    def exact(self, value: str) -> Set[str]:
+        return set(self.ids.get(value, ()))
+
+    def containing(self, value: str) -> Set[str]:
+        """Ids of every key containing ``value``."""
+        value = value.lower()
+        if len(value) <= GRAM_SIZE:
+            keys: Iterable[str] = self.grams.get(value, ())
+        else:
+            grams = [self.grams.get(value[start:start + GRAM_SIZE], set())
+                     for start in range(len(value) - GRAM_SIZE + 1)]
+            keys = [key for key in min(grams, key=len) if value in key]
+        result: Set[str] = set()
+        for key in keys:
+            result |= self.ids[key]
+        return result
+
+
+class JediKillIndex:
+    """Indexed, paginated view of Jedi bounty kills."""
+
+    def __init__(self, kills: Optional[List[Any]] = None):
+        self._lock = threading.RLock()
+        self.rebuild(kills or [])
+
+    def rebuild(self, kills: List[Any]) -> None:
+        """Index ``kills`` from scratch."""
+        with self._lock:
+            self.kills: Dict[str, Any] = {}
+            self.timestamps: Dict[str, float] = {}
+            self.seqs: Dict[str, int] = {}
+            # Sorted by (seq, kill_id) -> the tracker's recorded order
+            self.order: List[Tuple[int, str]] = []
+            # Sorted by (timestamp, seq, kill_id) for date ranges
+            self.by_time: List[Tuple[float, int, str]] = []
+            self._next_seq = 0
+            self.by_season = KeyIndex()
+            self.by_hunter = KeyIndex()
+            self.by_target = KeyIndex()
+            self.by_planet = KeyIndex()
+            self.by_method = KeyIndex()
+            # season -> hunter -> running totals
+            self.leaderboards: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            self._ranked: Dict[str, List[Dict[str, Any]]] = {}
+            for kill in kills:
+                self._add(kill)
+            self._source = source_signature(kills)
+
+    def is_stale(self, kills: List[Any]) -> bool:
+        """Check for kills added or removed outside the index's own updates.
+
+        Only the length and last kill id are compared, so the check is O(1);
+        kills edited in place outside the API need an explicit
+        :meth:`rebuild`.
+        """
+        return source_signature(kills) != self._source
+
+    def sync_source(self, kills: List[Any]) -> None:
+        """Record the source list state after an incremental update."""
+        with self._lock:
+            self._source = source_signature(kills)
+
+    def _add(self, kill: Any) -> None:
+        kill_id = kill.kill_id
+        if kill_id in self.kills:
+            self._remove(kill_id)
+        seq = self._next_seq
+        self._next_seq += 1
+        timestamp = parse_timestamp(kill.timestamp)
+        self.kills[kill_id] = kill
+        self.timestamps[kill_id] = timestamp
+        self.seqs[kill_id] = seq
+        self.order.append((seq, kill_id))
+        bisect.insort(self.by_time, (timestamp, seq, kill_id))
+
+        self.by_season.add(kill.season_id or '', kill_id)
+        self.by_hunter.add(kill.hunter_name.lower(), kill_id)
+        self.by_target.add(kill.target_name.lower(), kill_id)
+        self.by_planet.add(kill.planet.lower(), kill_id)
+        self.by_method.add(kill.kill_method.lower(), kill_id)
+
+        season = kill.season_id or ''
+        entry = self.leaderboards.setdefault(season, {}).setdefault(kill.hunter_name, {
+            "total_kills": 0,
+            "total_rewards": 0,
+            "planets": {},
+            "kill_times": [],
+        })
+        entry["total_kills"] += 1
+        entry["total_rewards"] += kill.reward_earned or 0
+        entry["planets"][kill.planet] = entry["planets"].get(kill.planet, 0) + 1
+        bisect.insort(entry["kill_times"], (timestamp, kill.timestamp, kill_id))
+        self._ranked.pop(season, None)
+
+    def _remove(self, kill_id: str) -> Optional[Any]:
+        kill = self.kills.pop(kill_id, None)
+        if kill is None:
+            return None
+        timestamp = self.timestamps.pop(kill_id)
+        seq = self.seqs.pop(kill_id)
+        pos = bisect.bisect_left(self.order, (seq, kill_id))
+        if pos < len(self.order) and self.order[pos] == (seq, kill_id):
+            del self.order[pos]
+        pos = bisect.bisect_left(self.by_time, (timestamp, seq, kill_id))
+        if pos < len(self.by_time) and self.by_time[pos] == (timestamp, seq, kill_id):
+            del self.by_time[pos]
+
+        self.by_season.discard(kill.season_id or '', kill_id)
+        self.by_hunter.discard(kill.hunter_name.lower(), kill_id)
+        self.by_target.discard(kill.target_name.lower(), kill_id)
+        self.by_planet.discard(kill.planet.lower(), kill_id)
+        self.by_method.discard(kill.kill_method.lower(), kill_id)
+
+        season = kill.season_id or ''
+        board = self.leaderboards.get(season, {})
+        entry = board.get(kill.hunter_name)
+        if entry is not None:
+            entry["total_kills"] -= 1
+            entry["total_rewards"] -= kill.reward_earned or 0
+            planets = entry["planets"]
+            planets[kill.planet] -= 1
+            if not planets[kill.planet]:
+                del planets[kill.planet]
+            times = entry["kill_times"]
+            pos = bisect.bisect_left(times, (timestamp, kill.timestamp, kill_id))
+            if pos < len(times) and times[pos][2] == kill_id:
+                del times[pos]
+            if entry["total_kills"] <= 0:
+                del board[kill.hunter_name]
+                if not board:
+                    del self.leaderboards[season]
+        self._ranked.pop(season, None)
+        return kill
+
+    def add(self, kill: Any) -> None:
+        """Index a newly recorded kill after the existing ones."""
+        with self._lock:
+            self._add(kill)
+
+    def remove(self, kill_id: str) -> Optional[Any]:
+        """Drop a kill from the index, returning it if present."""
+        with self._lock:
+            return self._remove(kill_id)
+
+    def _time_range(self, oldest: Optional[float], newest: Optional[float]) -> List[Tuple[float, int, str]]:
+        lo = bisect.bisect_left(self.by_time, (oldest,)) if oldest is not None else 0
+        hi = (bisect.bisect_right(self.by_time, (newest, float('inf')))
+              if newest is not None else len(self.by_time))
+        return self.by_time[lo:hi]
+
+    def query(self,
+              target_name: Optional[str] = None,
+              hunter_name: Optional[str] = None,
+              planet: Optional[str] = None,
+              kill_method: Optional[str] = None,
+              season_id: Optional[str] = None,
+              date_from: Optional[str] = None,
+              date_to: Optional[str] = None,
+              limit: int = 100,
+              offset: int = 0,
+              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Return a page of kills in the tracker's recorded order.
+
+        Name, planet and method filters match substrings case-insensitively
+        and ``season_id`` matches exactly, as the original list endpoint did.
+        ``cursor`` continues after the last kill of a previous page;
+        ``offset`` is kept for older clients.
+
+        Returns
+        -------
+        dict
+            ``kills``, ``total_count`` and ``next_cursor``
+        """
+        with self._lock:
+            empty = {"kills": [], "total_count": 0, "next_cursor": None}
+            sets: List[Set[str]] = []
+            if season_id:
+                sets.append(self.by_season.exact(season_id))
+            for index, value in (
+                (self.by_hunter, hunter_name),
+                (self.by_planet, planet),
+                (self.by_method, kill_method),
+                (self.by_target, target_name),
+            ):
+                if value:
+                    sets.append(index.containing(value))
+            if any(not ids for ids in sets):
+                return empty
+
+            oldest = parse_timestamp(date_from) if date_from else None
+            newest = parse_timestamp(date_to) if date_to else None
+
+            if not sets and oldest is None and newest is None:
+                matched = self.order
+            else:
+                sets.sort(key=len)
+                in_range = None
+                if oldest is not None or newest is not None:
+                    in_range = self._time_range(oldest, newest)
+                if in_range is not None and (not sets or len(in_range) <= len(sets[0])):
+                    matched = [(seq, kill_id) for _, seq, kill_id in in_range
+                               if all(kill_id in ids for ids in sets)]
+                else:
+                    def in_window(kill_id: str) -> bool:
+                        timestamp = self.timestamps[kill_id]
+                        return ((oldest is None or timestamp >= oldest)
+                                and (newest is None or timestamp <= newest))
+
+                    matched = [(self.seqs[kill_id], kill_id) for kill_id in sets[0]
+                               if all(kill_id in ids for ids in sets[1:]) and in_window(kill_id)]
+                matched.sort()
+
+            if cursor:
+                start = bisect.bisect_right(matched, decode_cursor(cursor))
+            else:
+                start = offset
+            window = matched[start:start + limit]
+            next_cursor = None
+            if window and start + limit < len(matched):
+                next_cursor = encode_cursor(*window[-1])
+
+            return {
+                "kills": [self.kills[kill_id] for _, kill_id in window],
+                "total_count": len(matched),
+                "next_cursor": next_cursor,
+            }
+
+    def leaderboard(self, season_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the season's hunters ranked by kills, then rewards.
+
+        Each entry has ``hunter_name``, ``total_kills``, ``total_rewards``,
+        ``planets`` and ``last_kill``; the ranking is cached until a kill
+        of the season is added or removed.
+        """
+        with self._lock:
+            ranked = self._ranked.get(season_id)
+            if ranked is None:
+                ranked = sorted(
+                    ({
+                        "hunter_name": hunter,
+                        "total_kills": entry["total_kills"],
+                        "total_rewards": entry["total_rewards"],
+                        "planets": sorted(entry["planets"]),
+                        "last_kill": entry["kill_times"][-1][1],
+                    } for hunter, entry in self.leaderboards.get(season_id, {}).items()),
+                    key=lambda e: (-e["total_kills"], -e["total_rewards"], e["hunter_name"])
+                )
+                self._ranked[season_id] = ranked
+            return [dict(entry) for entry in (ranked[:limit] if limit else ranked)]
+
+
+_kill_index: Optional[JediKillIndex] = None
+_kill_index_lock = threading.Lock()
+
+
+def get_kill_index(tracker: Any) -> JediKillIndex:
+    """Return the shared kill index, rebuilding it if the tracker changed."""
+    global _kill_index
+    with _kill_index_lock:
+        if _kill_index is None:
+            _kill_index = JediKillIndex(tracker.kills)
+        elif _kill_index.is_stale(tracker.kills):
+            _kill_index.rebuild(tracker.kills)
+        return _kill_index
@@ -6,8 +6,12 @@ in the SWG Armory system. It handles build publication, retrieval, and community
 
 from __future__ import annotations
 
+import atexit
 import json
+import logging
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
@@ -16,6 +20,10 @@ from enum import Enum
 from flask import Flask, request, jsonify, current_app
 import yaml
 
+from api.build_catalog import BuildCatalog, CATALOG_FILE
+
+logger = logging.getLogger(__name__)
+
 
 class BuildVisibility(Enum):
     """Enumeration of build visibility levels."""
@@ -63,41 +71,93 @@ class PlayerBuild:
 class PublicBuildBrowser:
     """Manages public build browsing and ranking functionality."""
     
-    def __init__(self, builds_dir: str = "data/player_builds"):
+    def __init__(self, builds_dir: str = "data/player_builds",
+                 cache_size: int = 128, counter_flush_threshold: int = 50,
+                 counter_flush_interval: float = 5.0):
         """Initialize the public build browser.
         
         Args:
             builds_dir: Directory containing player build files
+            cache_size: Maximum number of full build documents kept in memory
+            counter_flush_threshold: View/like updates buffered before they
+                are written back
+            counter_flush_interval: Seconds a buffered view/like may wait
+                before the next update writes the batch back
         """
         self.builds_dir = Path(builds_dir)
         self.builds_dir.mkdir(parents=True, exist_ok=True)
-        self.builds: Dict[str, PlayerBuild] = {}
+        self.cache_size = cache_size
+        # LRU of loaded build documents; the catalog covers every build
+        self.builds: Dict[str, PlayerBuild] = OrderedDict()
+        self._lock = threading.RLock()
+        self.catalog = BuildCatalog(
+            self.builds_dir / CATALOG_FILE,
+            flush_threshold=counter_flush_threshold,
+            flush_interval=counter_flush_interval,
+            write_back=self._write_counters,
+            on_change=self._evict_build,
+        )
         self._load_all_builds()
     
     def _load_all_builds(self) -> None:
-        """Load all published builds from the builds directory."""
+        """Sync the build catalog with the builds directory.
+        
+        Only new or changed build files are parsed; build documents
+        themselves are loaded on demand by ``get_build``.
+        """
         if not self.builds_dir.exists():
             return
+        self.catalog.sync_directory(self.builds_dir)
+    
+    @staticmethod
+    def _build_from_dict(build_data: Dict[str, Any]) -> PlayerBuild:
+        """Create a PlayerBuild from its JSON form."""
+        # Convert datetime strings back to datetime objects
+        build_data['created_at'] = datetime.fromisoformat(build_data['created_at'])
+        build_data['updated_at'] = datetime.fromisoformat(build_data['updated_at'])
         
-        for build_file in self.builds_dir.glob("*.json"):
-            try:
-                with open(build_file, 'r', encoding='utf-8') as f:
-                    build_data = json.load(f)
-                
-                # Convert datetime strings back to datetime objects
-                build_data['created_at'] = datetime.fromisoformat(build_data['created_at'])
-                build_data['updated_at'] = datetime.fromisoformat(build_data['updated_at'])
-                
-                # Convert enums
-                build_data['visibility'] = BuildVisibility(build_data['visibility'])
-                build_data['rankings'] = [BuildRanking(r) for r in build_data['rankings']]
-                
-                build = PlayerBuild(**build_data)
-                build_id = f"{build.player_name}_{build.character_name}"
-                self.builds[build_id] = build
-                
-            except Exception as e:
-                print(f"Error loading build {build_file}: {e}")
+        # Convert enums
+        build_data['visibility'] = BuildVisibility(build_data['visibility'])
+        build_data['rankings'] = [BuildRanking(r) for r in build_data['rankings']]
+        
+        return PlayerBuild(**build_data)
+    
+    @staticmethod
+    def _build_to_dict(build: PlayerBuild) -> Dict[str, Any]:
+        """Convert a PlayerBuild to its JSON form."""
+        build_dict = asdict(build)
+        build_dict['created_at'] = build.created_at.isoformat()
+        build_dict['updated_at'] = build.updated_at.isoformat()
+        build_dict['visibility'] = build.visibility.value
+        build_dict['rankings'] = [r.value for r in build.rankings]
+        return build_dict
+    
+    def _cache_build(self, build_id: str, build: PlayerBuild) -> None:
+        """Insert a build into the LRU, evicting the least recently used."""
+        with self._lock:
+            self.builds[build_id] = build
+            self.builds.move_to_end(build_id)
+            while len(self.builds) > self.cache_size:
+                self.builds.popitem(last=False)
+    
+    def _evict_build(self, build_id: str) -> None:
+        """Drop a build whose catalog row changed from the LRU."""
+        with self._lock:
+            self.builds.pop(build_id, None)
+    
+    def _load_build(self, build_id: str) -> Optional[PlayerBuild]:
+        """Load a build document from disk, with catalog counters applied."""
+        file_name = self.catalog.file_name(build_id)
+        if not file_name:
+            return None
+        try:
+            with open(self.builds_dir / file_name, 'r', encoding='utf-8') as f:
+                build = self._build_from_dict(json.load(f))
+        except Exception as e:
+            logger.error("Error loading build %s: %s", file_name, e)
+            return None
+        build.views, build.likes = self.catalog.counters(build_id)
+        return build
     
     def publish_build(self, build_data: Dict[str, Any]) -> str:
         """Publish a new build to the public directory.
@@ -139,32 +199,66 @@ class PublicBuildBrowser:
             comments=[]
         )
         
-        # Save to file
-        self._save_build(build)
+        # Save to file (republishing resets the counters)
+        self._save_build(build, reset_counters=True)
         
         # Add to memory cache
-        self.builds[build_id] = build
+        self._cache_build(build_id, build)
         
         return build_id
     
-    def _save_build(self, build: PlayerBuild) -> None:
-        """Save a build to the file system.
+    def _save_build(self, build: PlayerBuild, reset_counters: bool = False) -> None:
+        """Save a build to the file system and refresh its catalog entry.
         
         Args:
             build: The build to save
+            reset_counters: Overwrite the catalog's views/likes with the build's
         """
         build_id = f"{build.player_name}_{build.character_name}"
         build_file = self.builds_dir / f"{build_id}.json"
         
-        # Convert to JSON-serializable format
-        build_dict = asdict(build)
-        build_dict['created_at'] = build.created_at.isoformat()
-        build_dict['updated_at'] = build.updated_at.isoformat()
-        build_dict['visibility'] = build.visibility.value
-        build_dict['rankings'] = [r.value for r in build.rankings]
+        with self._lock:
+            if not reset_counters and self.catalog.has(build_id):
+                # The catalog may hold increments not yet in the file
+                self.catalog.flush()
+                build.views, build.likes = self.catalog.counters(build_id)
+            
+            # Convert to JSON-serializable format
+            build_dict = self._build_to_dict(build)
+            
+            with open(build_file, 'w', encoding='utf-8') as f:
+                json.dump(build_dict, f, indent=2, ensure_ascii=False)
+            
+            self.catalog.upsert(build_dict, build_file, keep_counters=not reset_counters)
+            self._cache_build(build_id, build)
+    
+    def _write_counters(self, totals: Dict[str, Tuple[int, int]]) -> None:
+        """Write a batch of flushed view/like totals back to the build files.
         
-        with open(build_file, 'w', encoding='utf-8') as f:
-            json.dump(build_dict, f, indent=2, ensure_ascii=False)
+        Each touched file is rewritten once per batch with its new counts
+        and ``updated_at``, so the files stay the source of truth.
+        """
+        now = datetime.now()
+        with self._lock:
+            for build_id, (views, likes) in totals.items():
+                file_name = self.catalog.file_name(build_id)
+                if not file_name:
+                    continue
+                build_file = self.builds_dir / file_name
+                try:
+                    with open(build_file, 'r', encoding='utf-8') as f:
+                        build_dict = json.load(f)
+                    build_dict['views'], build_dict['likes'] = views, likes
+                    build_dict['updated_at'] = now.isoformat()
+                    with open(build_file, 'w', encoding='utf-8') as f:
+                        json.dump(build_dict, f, indent=2, ensure_ascii=False)
+                except Exception as e:
+                    logger.error("Error writing counters to build %s: %s", file_name, e)
+                    continue
+                self.catalog.record_file(build_id, build_file, now)
+                build = self.builds.get(build_id)
+                if build is not None:
+                    build.views, build.likes, build.updated_at = views, likes, now
     
     def get_build(self, build_id: str) -> Optional[PlayerBuild]:
         """Get a specific build by ID.
@@ -175,7 +269,25 @@ class PublicBuildBrowser:
         Returns:
             PlayerBuild object if found, None otherwise
         """
-        return self.builds.get(build_id)
+        with self._lock:
+            build = self.builds.get(build_id)
+            if build is not None:
+                self.builds.move_to_end(build_id)
+                return build
+        
+        build = self._load_build(build_id)
+        if build is not None:
+            self._cache_build(build_id, build)
+        return build
+    
+    def _load_builds(self, summaries: List[Dict[str, Any]]) -> List[PlayerBuild]:
+        """Load the full builds for a list of catalog summaries."""
+        builds = []
+        for summary in summaries:
+            build = self.get_build(summary['build_id'])
+            if build is not None:
+                builds.append(build)
+        return builds
     
     def get_all_builds(self, visibility: Optional[BuildVisibility] = None) -> List[PlayerBuild]:
         """Get all builds, optionally filtered by visibility.
@@ -185,14 +297,44 @@ class PublicBuildBrowser:
             
         Returns:
             List of matching builds
-        """
-        builds = list(self.builds.values())
-        
-        if visibility:
-            builds = [b for b in builds if b.visibility == visibility]
         
+        Builds already in the LRU are reused; the others are read from
+        their files without being cached, so a full listing does not evict
+        the recently used builds.
+        """
+        self.catalog.flush()
+        builds = []
+        for summary in self.catalog.search(visibility=visibility.value if visibility else None):
+            build_id = summary['build_id']
+            with self._lock:
+                build = self.builds.get(build_id)
+            if build is None:
+                build = self._load_build(build_id)
+            if build is not None:
+                builds.append(build)
         return builds
     
+    def get_build_summaries(self, visibility: Optional[BuildVisibility] = None,
+                            limit: Optional[int] = None, offset: int = 0,
+                            **filters: Any) -> List[Dict[str, Any]]:
+        """Get catalog summaries without loading full build documents.
+        
+        Args:
+            visibility: Optional visibility filter
+            limit: Maximum number of summaries to return
+            offset: Number of summaries to skip
+            **filters: Any ``search_builds`` filter, plus ``order_by``
+            
+        Returns:
+            List of summary dictionaries
+        """
+        return self.catalog.search(
+            visibility=visibility.value if visibility else None,
+            limit=limit,
+            offset=offset,
+            **filters
+        )
+    
     def search_builds(self, 
                      query: Optional[str] = None,
                      profession: Optional[str] = None,
@@ -215,49 +357,15 @@ class PublicBuildBrowser:
         Returns:
             List of matching builds
         """
-        results = []
-        
-        for build in self.builds.values():
-            # Apply filters
-            if query and query.lower() not in build.build_summary.lower():
-                continue
-            
-            if profession and profession.lower() not in [p.lower() for p in build.professions.values()]:
-                continue
-            
-            if faction and build.faction.lower() != faction.lower():
-                continue
-            
-            if min_gcw_rank and build.gcw_rank < min_gcw_rank:
-                continue
-            
-            if tags:
-                if not any(tag.lower() in [t.lower() for t in build.tags] for tag in tags):
-                    continue
-            
-            # Check damage type in weapons
-            if damage_type:
-                weapon_damage_types = []
-                for weapon in build.weapons:
-                    weapon_damage_types.append(weapon.get('damage_type', '').lower())
-                if damage_type.lower() not in weapon_damage_types:
-                    continue
-            
-            # Check PvE/PvP focus in tags or performance metrics
-            if pve_pvp:
-                pve_pvp_lower = pve_pvp.lower()
-                if pve_pvp_lower not in [tag.lower() for tag in build.tags]:
-                    # Check performance metrics
-                    if pve_pvp_lower == 'pve' and 'pve_rating' in build.performance_metrics:
-                        if build.performance_metrics['pve_rating'] < 5.0:
-                            continue
-                    elif pve_pvp_lower == 'pvp' and 'pvp_rating' in build.performance_metrics:
-                        if build.performance_metrics['pvp_rating'] < 5.0:
-                            continue
-            
-            results.append(build)
-        
-        return results
+        return self._load_builds(self.catalog.search(
+            query=query,
+            profession=profession,
+            damage_type=damage_type,
+            faction=faction,
+            pve_pvp=pve_pvp,
+            min_gcw_rank=min_gcw_rank,
+            tags=tags
+        ))
     
     def get_top_builds(self, ranking_type: BuildRanking, limit: int = 10) -> List[PlayerBuild]:
         """Get top builds by ranking type.
@@ -269,37 +377,48 @@ class PublicBuildBrowser:
         Returns:
             List of top builds sorted by ranking
         """
-        # Filter builds that have this ranking
-        ranked_builds = [b for b in self.builds.values() if ranking_type in b.rankings]
-        
         # Sort by views and likes (simple ranking algorithm)
-        ranked_builds.sort(key=lambda b: (b.views + b.likes * 2), reverse=True)
-        
-        return ranked_builds[:limit]
+        return self._load_builds(self.catalog.search(
+            ranking=ranking_type.value,
+            order_by='popularity',
+            limit=limit
+        ))
     
     def increment_views(self, build_id: str) -> None:
         """Increment the view count for a build.
         
+        The count is buffered and written back to the catalog and the
+        build file in batches.
+        
         Args:
             build_id: The ID of the build to update
         """
         build = self.get_build(build_id)
         if build:
             build.views += 1
-            build.updated_at = datetime.now()
-            self._save_build(build)
+            self.catalog.add_counts(build_id, views=1)
     
     def like_build(self, build_id: str) -> None:
         """Like a build.
         
+        The count is buffered and written back to the catalog and the
+        build file in batches.
+        
         Args:
             build_id: The ID of the build to like
         """
         build = self.get_build(build_id)
         if build:
             build.likes += 1
-            build.updated_at = datetime.now()
-            self._save_build(build)
+            self.catalog.add_counts(build_id, likes=1)
+    
+    def flush_counters(self) -> int:
+        """Write buffered view/like counts to the catalog and build files.
+        
+        Returns:
+            Number of builds updated
+        """
+        return self.catalog.flush()
     
     def add_comment(self, build_id: str, commenter: str, comment: str) -> None:
         """Add a comment to a build.
@@ -339,41 +458,12 @@ class PublicBuildBrowser:
         Returns:
             Dictionary containing build statistics
         """
-        total_builds = len(self.builds)
-        public_builds = len([b for b in self.builds.values() if b.visibility == BuildVisibility.PUBLIC])
-        featured_builds = len([b for b in self.builds.values() if b.visibility == BuildVisibility.FEATURED])
-        
-        # Count builds by faction
-        faction_counts = {}
-        for build in self.builds.values():
-            faction = build.faction.lower()
-            faction_counts[faction] = faction_counts.get(faction, 0) + 1
-        
-        # Count builds by profession
-        profession_counts = {}
-        for build in self.builds.values():
-            for profession in build.professions.values():
-                profession_counts[profession] = profession_counts.get(profession, 0) + 1
-        
-        # Most viewed builds
-        most_viewed = sorted(self.builds.values(), key=lambda b: b.views, reverse=True)[:5]
-        
-        # Most liked builds
-        most_liked = sorted(self.builds.values(), key=lambda b: b.likes, reverse=True)[:5]
-        
-        return {
-            'total_builds': total_builds,
-            'public_builds': public_builds,
-            'featured_builds': featured_builds,
-            'faction_distribution': faction_counts,
-            'profession_distribution': profession_counts,
-            'most_viewed': [{'id': f"{b.player_name}_{b.character_name}", 'name': f"{b.player_name} - {b.character_name}", 'views': b.views} for b in most_viewed],
-            'most_liked': [{'id': f"{b.player_name}_{b.character_name}", 'name': f"{b.player_name} - {b.character_name}", 'likes': b.likes} for b in most_liked]
-        }
+        return self.catalog.statistics()
 
 
 # Global instance
 build_browser = PublicBuildBrowser()
+atexit.register(build_browser.flush_counters)
 
 
 def get_build_browser() -> PublicBuildBrowser:
@@ -398,11 +488,23 @@ def register_build_routes(app: Flask) -> None:
         """Get all public builds."""
         try:
             visibility = request.args.get('visibility')
-            if visibility:
-                visibility_enum = BuildVisibility(visibility)
-                builds = build_browser.get_all_builds(visibility=visibility_enum)
-            else:
-                builds = build_browser.get_all_builds()
+            visibility_enum = BuildVisibility(visibility) if visibility else None
+            
+            # Catalog summaries only, without opening the build files
+            if request.args.get('fields') == 'summary':
+                summaries = build_browser.get_build_summaries(
+                    visibility=visibility_enum,
+                    limit=request.args.get('limit', type=int),
+                    offset=request.args.get('offset', 0, type=int),
+                    order_by=request.args.get('sort')
+                )
+                return jsonify({
+                    'success': True,
+                    'builds': summaries,
+                    'total': len(summaries)
+                })
+            
+            builds = build_browser.get_all_builds(visibility=visibility_enum)
             
             # Convert to JSON-serializable format
             builds_data = []
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Session Store for the SWGDB Session API
+
+SQLite storage layer behind ``SessionAPI``. Connections are pooled per
+thread and run in WAL mode so readers never block the uploader. Planets and
+professions are extracted into indexed side tables at insert time, so those
+filters - along with keyset pagination and statistics - run in SQL and only
+the returned rows have their ``session_data`` blob parsed.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+
+def _session_planets(session_data: Dict[str, Any]) -> List[str]:
+    planets = set()
+    for location in session_data.get("location_data", {}).get("location_events", []):
+        if location.get("planet"):
+            planets.add(location["planet"])
+    return sorted(planets)
+
+
+def _session_professions(session_data: Dict[str, Any]) -> List[str]:
+    return sorted(session_data.get("xp_data", {}).get("profession_breakdown", {}).keys())
+
+
+def _session_metrics(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    event_data = session_data.get("event_data", {})
+    return {
+        "total_xp": session_data.get("xp_data", {}).get("total_xp_gained", 0) or 0,
+        "total_credits": session_data.get("credit_data", {}).get("total_credits_gained", 0) or 0,
+        "total_quests": session_data.get("quest_data", {}).get("total_quests_completed", 0) or 0,
+        "stuck_events": len(event_data.get("stuck_events", [])),
+        "communication_events": len(event_data.get("communication_events", [])),
+    }
+
+
+def encode_cursor(start_time: Optional[str], row_id: int) -> str:
+    """Encode a keyset pagination cursor."""
+    return f"{start_time or ''}|{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    start_time, _, row_id = cursor.rpartition("|")
+    return start_time, int(row_id)
+
+
+class SessionStore:
+    """Pooled, WAL-mode SQLite store for uploaded sessions."""
+
+    METRIC_COLUMNS = {
+        "total_xp": "INTEGER DEFAULT 0",
+        "total_credits": "INTEGER DEFAULT 0",
+        "total_quests": "INTEGER DEFAULT 0",
+        "stuck_events": "INTEGER DEFAULT 0",
+        "communication_events": "INTEGER DEFAULT 0",
+        "indexed": "INTEGER DEFAULT 0",
+    }
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self.init_schema()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._pool_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+    def init_schema(self) -> None:
+        """Create tables and indexes, migrating older databases in place."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self.connection()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT UNIQUE NOT NULL,
+                    user_hash TEXT NOT NULL,
+                    character_name TEXT,
+                    start_time TEXT,
+                    end_time TEXT,
+                    duration_minutes REAL,
+                    session_data TEXT,
+                    upload_timestamp TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            for column, ddl in self.METRIC_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE sessions ADD COLUMN {column} {ddl}")
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS session_planets (
+                    session_id TEXT NOT NULL,
+                    planet TEXT NOT NULL,
+                    PRIMARY KEY (planet, session_id)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS session_professions (
+                    session_id TEXT NOT NULL,
+                    profession TEXT NOT NULL,
+                    PRIMARY KEY (profession, session_id)
+                ) WITHOUT ROWID
+            ''')
+
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_user_hash ON sessions(user_hash)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_session_id ON sessions(session_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_start_time ON sessions(start_time)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_character_name ON sessions(character_name)')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_user_start
+                ON sessions(user_hash, start_time DESC, id DESC)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_session_planets_session
+                ON session_planets(session_id)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_session_professions_session
+                ON session_professions(session_id)
+            ''')
+
+        self._backfill_side_tables()
+
+    def _backfill_side_tables(self) -> None:
+        """Index rows written before the side tables existed."""
+        conn = self.connection()
+        rows = conn.execute(
+            "SELECT session_id, session_data FROM sessions WHERE indexed = 0"
+        ).fetchall()
+        if not rows:
+            return
+        with conn:
+            for session_id, blob in rows:
+                try:
+                    session_data = json.loads(blob or "{}")
+                except json.JSONDecodeError:
+                    session_data = {}
+                self._write_side_rows(conn, session_id, session_data)
+
+    def _write_side_rows(self, conn: sqlite3.Connection, session_id: str,
+                         session_data: Dict[str, Any]) -> None:
+        conn.execute("DELETE FROM session_planets WHERE session_id = ?", [session_id])
+        conn.execute("DELETE FROM session_professions WHERE session_id = ?", [session_id])
+        conn.executemany(
+            "INSERT INTO session_planets (session_id, planet) VALUES (?, ?)",
+            [(session_id, planet) for planet in _session_planets(session_data)]
+        )
+        conn.executemany(
+            "INSERT INTO session_professions (session_id, profession) VALUES (?, ?)",
+            [(session_id, profession) for profession in _session_professions(session_data)]
+        )
+        metrics = _session_metrics(session_data)
+        conn.execute('''
+            UPDATE sessions SET total_xp = ?, total_credits = ?, total_quests = ?,
+                stuck_events = ?, communication_events = ?, indexed = 1
+            WHERE session_id = ?
+        ''', [metrics["total_xp"], metrics["total_credits"], metrics["total_quests"],
+              metrics["stuck_events"], metrics["communication_events"], session_id])
+
+    def insert_session(self, user_hash: str, session_data: Dict[str, Any]) -> None:
+        """Insert or replace a session and its side-table rows atomically."""
+        session_id = session_data.get("session_id")
+        conn = self.connection()
+        with conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO sessions
+                (session_id, user_hash, character_name, start_time, end_time,
+                 duration_minutes, session_data, upload_timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                session_id,
+                user_hash,
+                session_data.get("character_name"),
+                session_data.get("start_time"),
+                session_data.get("end_time"),
+                session_data.get("duration_minutes"),
+                json.dumps(session_data),
+                datetime.now().isoformat()
+            ])
+            self._write_side_rows(conn, session_id, session_data)
+
+    def delete_session(self, user_hash: str, session_id: str) -> bool:
+        """Delete a session and its side-table rows."""
+        conn = self.connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM sessions WHERE user_hash = ? AND session_id = ?",
+                [user_hash, session_id]
+            )
+            if cursor.rowcount > 0:
+                conn.execute("DELETE FROM session_planets WHERE session_id = ?", [session_id])
+                conn.execute("DELETE FROM session_professions WHERE session_id = ?", [session_id])
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def _where(user_hash: str, filters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        clauses = ["s.user_hash = ?"]
+        params: List[Any] = [user_hash]
+        filters = filters or {}
+
+        if filters.get("start_date"):
+            clauses.append("s.start_time >= ?")
+            params.append(filters["start_date"])
+        if filters.get("end_date"):
+            clauses.append("s.start_time <= ?")
+            params.append(filters["end_date"])
+        if filters.get("character"):
+            clauses.append("s.character_name = ?")
+            params.append(filters["character"])
+        if filters.get("planet"):
+            clauses.append(
+                "EXISTS (SELECT 1 FROM session_planets p "
+                "WHERE p.planet = ? AND p.session_id = s.session_id)"
+            )
+            params.append(filters["planet"])
+        if filters.get("profession"):
+            clauses.append(
+                "EXISTS (SELECT 1 FROM session_professions f "
+                "WHERE f.profession = ? AND f.session_id = s.session_id)"
+            )
+            params.append(filters["profession"])
+        return " AND ".join(clauses), params
+
+    def list_sessions(self, user_hash: str, filters: Optional[Dict[str, Any]] = None,
+                      cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of sessions, newest first, and the next cursor.
+
+        Only rows on the returned page have their ``session_data`` parsed.
+        """
+        where, params = self._where(user_hash, filters)
+        if cursor:
+            start_time, row_id = decode_cursor(cursor)
+            where += (" AND (COALESCE(s.start_time, '') < ? OR "
+                      "(COALESCE(s.start_time, '') = ? AND s.id < ?))")
+            params.extend([start_time, start_time, row_id])
+
+        limit = (filters or {}).get("limit")
+        query = (f"SELECT s.id, s.start_time, s.session_data FROM sessions s WHERE {where} "
+                 "ORDER BY COALESCE(s.start_time, '') DESC, s.id DESC")
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = self.connection().execute(query, params).fetchall()
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+
+        sessions = []
+        for _, _, blob in rows:
+            try:
+                sessions.append(json.loads(blob))
+            except (TypeError, json.JSONDecodeError):
+                print(f"Error parsing session data: {str(blob)[:100]}...")
+        return sessions, next_cursor
+
+    def get_session(self, user_hash: str, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single session's data."""
+        row = self.connection().execute(
+            "SELECT session_data FROM sessions WHERE user_hash = ? AND session_id = ?",
+            [user_hash, session_id]
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def statistics(self, user_hash: str, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Aggregate session statistics in SQL."""
+        where, params = self._where(user_hash, filters)
+        conn = self.connection()
+        row = conn.execute(f'''
+            SELECT COUNT(*), COALESCE(SUM(s.total_xp), 0), COALESCE(SUM(s.total_credits), 0),
+                   COALESCE(SUM(s.total_quests), 0), COALESCE(SUM(s.duration_minutes), 0),
+                   COALESCE(SUM(s.stuck_events), 0), COALESCE(SUM(s.communication_events), 0)
+            FROM sessions s WHERE {where}
+        ''', params).fetchone()
+        total_sessions = row[0]
+
+        characters = [r[0] for r in conn.execute(
+            f"SELECT DISTINCT s.character_name FROM sessions s WHERE {where} "
+            "AND s.character_name IS NOT NULL AND s.character_name != ''", params)]
+        planets = [r[0] for r in conn.execute(
+            f"SELECT DISTINCT p.planet FROM session_planets p "
+            f"JOIN sessions s ON s.session_id = p.session_id WHERE {where}", params)]
+        professions = [r[0] for r in conn.execute(
+            f"SELECT DISTINCT f.profession FROM session_professions f "
+            f"JOIN sessions s ON s.session_id = f.session_id WHERE {where}", params)]
+
+        stats = {
+            "total_sessions": total_sessions,
+            "total_xp_gained": row[1],
+            "total_credits_gained": row[2],
+            "total_quests_completed": row[3],
+            "total_time_minutes": row[4],
+            "total_stuck_events": row[5],
+            "total_communication_events": row[6],
+            "average_session_duration": row[4] / total_sessions if total_sessions else 0,
+            "average_xp_per_session": row[1] / total_sessions if total_sessions else 0,
+            "average_credits_per_session": row[2] / total_sessions if total_sessions else 0,
+            "characters": characters,
+            "planets": planets,
+            "professions": professions,
+        }
+        return stats
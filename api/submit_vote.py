@@ -7,8 +7,8 @@ with anti-abuse protection and IP tracking.
 from __future__ import annotations
 
 import json
-from typing import Dict, Any, Optional
-from flask import Flask, request, jsonify, current_app
+from typing import Dict, Any, Optional, Callable
+from flask import Flask, Response, request, jsonify, current_app
 from flask_cors import CORS
 
 from core.voting_system import (
@@ -19,6 +19,7 @@ from core.voting_system import (
     get_vote_summary,
     get_top_content
 )
+from api.vote_tally import VoteTallyStore, ReadCache, etag_matches, get_vote_tally_store
 
 
 # Initialize Flask Blueprint
@@ -35,6 +36,63 @@ def register_vote_api(app: Flask) -> None:
     app.register_blueprint(vote_api, url_prefix='/api/votes')
 
 
+# Short-lived cache for the read endpoints; any vote invalidates affected entries
+READ_CACHE_TTL = 5
+read_cache = ReadCache(ttl=READ_CACHE_TTL)
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, 'value', value)
+
+
+def _seed_tallies(store: VoteTallyStore) -> None:
+    """Warm the tally store from the persisted vote records.
+
+    Loading individual votes (not just summaries) keeps flags and lets
+    later re-votes and deletes adjust the right counters after a restart.
+    """
+    votes = get_voting_system().votes
+    for vote in (votes.values() if isinstance(votes, dict) else votes):
+        store.load_vote(
+            vote.vote_id,
+            _enum_value(vote.content_type),
+            vote.content_id,
+            _enum_value(vote.vote_type),
+            status=_enum_value(vote.status),
+            timestamp=vote.updated_at or vote.created_at
+        )
+
+
+def get_tallies() -> VoteTallyStore:
+    """Get the shared vote tally store, seeding it on first use."""
+    return get_vote_tally_store(_seed_tallies)
+
+
+def cached_json(version: str, build: Callable[[], Dict[str, Any]]) -> Response:
+    """Serve a read endpoint through the ETag/TTL cache.
+    
+    Args:
+        version: Tally version the response depends on
+        build: Callable producing the JSON payload on a cache miss
+        
+    Returns:
+        Flask response (304 when the client's ETag still matches)
+    """
+    key = request.full_path
+    cached = read_cache.get(key, version)
+    if cached is None:
+        cached = read_cache.put(key, version, build())
+    body, etag = cached
+    
+    if etag_matches(etag, request.headers.get('If-None-Match', '')):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = f'public, max-age={READ_CACHE_TTL}'
+    return response
+
+
 def get_client_ip() -> str:
     """Get the client's IP address from the request."""
     # Check for forwarded headers (for proxy setups)
@@ -117,6 +175,9 @@ def api_submit_vote():
         )
         
         if success:
+            get_tallies().record_vote(
+                vote_id, content_type.value, data['content_id'], vote_type.value
+            )
             return jsonify({
                 'success': True,
                 'message': message,
@@ -159,28 +220,17 @@ def api_get_vote_summary(content_type: str, content_id: str):
                 'error': f'Invalid content_type. Valid types: {[ct.value for ct in ContentType]}'
             }), 400
         
-        # Get vote summary
-        summary = get_vote_summary(content_type_enum, content_id)
-        
-        if summary:
-            return jsonify({
-                'success': True,
-                'summary': {
-                    'content_type': summary.content_type.value,
-                    'content_id': summary.content_id,
-                    'total_votes': summary.total_votes,
-                    'thumbs_up': summary.thumbs_up,
-                    'thumbs_down': summary.thumbs_down,
-                    'neutral': summary.neutral,
-                    'score': summary.score,
-                    'popularity_rank': summary.popularity_rank,
-                    'last_updated': summary.last_updated
-                }
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'summary': {
+        # Get vote summary from the running tallies
+        tallies = get_tallies()
+        
+        def build() -> Dict[str, Any]:
+            tally = tallies.get(content_type, content_id)
+            if tally is not None and tally.total_votes:
+                summary = tally.to_dict()
+                del summary['flagged']
+                summary['popularity_rank'] = tallies.popularity_rank(content_type, content_id)
+            else:
+                summary = {
                     'content_type': content_type,
                     'content_id': content_id,
                     'total_votes': 0,
@@ -191,7 +241,9 @@ def api_get_vote_summary(content_type: str, content_id: str):
                     'popularity_rank': 0,
                     'last_updated': None
                 }
-            })
+            return {'success': True, 'summary': summary}
+        
+        return cached_json(tallies.etag(content_type), build)
             
     except Exception as e:
         return jsonify({
@@ -281,31 +333,23 @@ def api_get_top_content(content_type: str):
         limit = int(request.args.get('limit', 10))
         min_votes = int(request.args.get('min_votes', 1))
         
-        # Get top content
-        top_content = get_top_content(content_type_enum, limit, min_votes)
-        
-        # Convert to dict for JSON serialization
-        content_data = []
-        for summary in top_content:
-            content_data.append({
-                'content_type': summary.content_type.value,
-                'content_id': summary.content_id,
-                'total_votes': summary.total_votes,
-                'thumbs_up': summary.thumbs_up,
-                'thumbs_down': summary.thumbs_down,
-                'neutral': summary.neutral,
-                'score': summary.score,
-                'popularity_rank': summary.popularity_rank,
-                'last_updated': summary.last_updated
-            })
+        # Get top content from the maintained rankings
+        tallies = get_tallies()
         
-        return jsonify({
-            'success': True,
-            'content_type': content_type,
-            'limit': limit,
-            'min_votes': min_votes,
-            'top_content': content_data
-        })
+        def build() -> Dict[str, Any]:
+            content_data = []
+            for entry in tallies.top(content_type, limit, min_votes):
+                del entry['flagged']
+                content_data.append(entry)
+            return {
+                'success': True,
+                'content_type': content_type,
+                'limit': limit,
+                'min_votes': min_votes,
+                'top_content': content_data
+            }
+        
+        return cached_json(tallies.etag(content_type), build)
         
     except Exception as e:
         return jsonify({
@@ -322,13 +366,15 @@ def api_get_vote_statistics():
         JSON response with vote statistics
     """
     try:
+        tallies = get_tallies()
         voting_system = get_voting_system()
-        stats = voting_system.get_vote_statistics()
         
-        return jsonify({
-            'success': True,
-            'statistics': stats
-        })
+        def build() -> Dict[str, Any]:
+            stats = tallies.statistics()
+            stats['total_reputation_scores'] = len(voting_system.reputation_scores)
+            return {'success': True, 'statistics': stats}
+        
+        return cached_json(tallies.etag(), build)
         
     except Exception as e:
         return jsonify({
@@ -395,6 +441,7 @@ def api_delete_vote(vote_id: str):
         success = voting_system.delete_vote(vote_id)
         
         if success:
+            get_tallies().delete_vote(vote_id)
             return jsonify({
                 'success': True,
                 'message': 'Vote deleted successfully'
@@ -438,6 +485,7 @@ def api_flag_vote(vote_id: str):
         success = voting_system.flag_vote(vote_id, data['reason'])
         
         if success:
+            get_tallies().flag_vote(vote_id)
             return jsonify({
                 'success': True,
                 'message': 'Vote flagged successfully'
@@ -0,0 +1,344 @@
+"""Vote Tally Store for SWGDB.
+
+This module keeps per-content vote counters and per-content-type rankings
+up to date as votes are submitted, deleted and flagged, so the read
+endpoints in ``api.submit_vote`` never rank content from raw votes.
+It also provides the short-TTL response cache with ETags used by those
+endpoints.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+
+VOTE_TYPES = ('thumbs_up', 'thumbs_down', 'neutral')
+
+
+@dataclass
+class ContentTally:
+    """Running vote counters for one piece of content."""
+    content_type: str
+    content_id: str
+    thumbs_up: int = 0
+    thumbs_down: int = 0
+    neutral: int = 0
+    flagged: int = 0
+    last_updated: Optional[str] = None
+
+    @property
+    def total_votes(self) -> int:
+        return self.thumbs_up + self.thumbs_down + self.neutral
+
+    @property
+    def score(self) -> int:
+        return self.thumbs_up - self.thumbs_down
+
+    def rank_key(self) -> Tuple[int, int, str]:
+        """Sort key placing the best content first."""
+        return (-self.score, -self.total_votes, self.content_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['total_votes'] = self.total_votes
+        data['score'] = self.score
+        return data
+
+
+@dataclass
+class _VoteRecord:
+    content_type: str
+    content_id: str
+    vote_type: str
+    active: bool = True
+    flagged: bool = False
+
+
+class VoteTallyStore:
+    """Incrementally maintained vote tallies and rankings.
+
+    Every mutation updates the affected content's counters and moves it
+    within its content type's ranking under a single lock. Statistics are
+    read from running totals, and top-content reads walk the ranking from
+    the best entry until ``limit`` entries qualify.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.generation = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.tallies: Dict[Tuple[str, str], ContentTally] = {}
+        self.votes: Dict[str, _VoteRecord] = {}
+        # content_type -> sorted list of rank keys
+        self.rankings: Dict[str, List[Tuple[int, int, str]]] = {}
+        self.totals = {'thumbs_up': 0, 'thumbs_down': 0, 'neutral': 0, 'flagged': 0}
+        self.votes_by_type: Dict[str, int] = {}
+        self.versions: Dict[str, int] = {}
+        self.version = 0
+        self.stale = False
+
+    def _tally(self, content_type: str, content_id: str) -> ContentTally:
+        key = (content_type, content_id)
+        tally = self.tallies.get(key)
+        if tally is None:
+            tally = ContentTally(content_type, content_id)
+            self.tallies[key] = tally
+        return tally
+
+    def _unrank(self, tally: ContentTally) -> None:
+        ranking = self.rankings.get(tally.content_type)
+        if not ranking:
+            return
+        key = tally.rank_key()
+        pos = bisect.bisect_left(ranking, key)
+        if pos < len(ranking) and ranking[pos] == key:
+            del ranking[pos]
+
+    def _rank(self, tally: ContentTally) -> None:
+        if tally.total_votes:
+            bisect.insort(self.rankings.setdefault(tally.content_type, []), tally.rank_key())
+
+    def _bump(self, content_type: str) -> None:
+        self.version += 1
+        self.versions[content_type] = self.versions.get(content_type, 0) + 1
+
+    def _apply(self, tally: ContentTally, vote_type: str, delta: int) -> None:
+        if vote_type not in VOTE_TYPES:
+            return
+        setattr(tally, vote_type, getattr(tally, vote_type) + delta)
+        self.totals[vote_type] += delta
+        self.votes_by_type[tally.content_type] = (
+            self.votes_by_type.get(tally.content_type, 0) + delta
+        )
+
+    def load_vote(self, vote_id: str, content_type: str, content_id: str,
+                  vote_type: str, status: str = 'active',
+                  timestamp: Optional[str] = None) -> None:
+        """Load a persisted vote record, e.g. when warming the store at startup.
+
+        Deleted votes are remembered but not counted; flagged votes are
+        counted and flagged, as if they had been recorded live.
+        """
+        with self._lock:
+            if status == 'deleted':
+                self.votes[vote_id] = _VoteRecord(content_type, content_id, vote_type, active=False)
+                self._tally(content_type, content_id)
+                return
+            self.record_vote(vote_id, content_type, content_id, vote_type, timestamp)
+            if status == 'flagged':
+                self.flag_vote(vote_id)
+
+    def record_vote(self, vote_id: str, content_type: str, content_id: str,
+                    vote_type: str, timestamp: Optional[str] = None) -> None:
+        """Count a new vote, or move an updated vote to its new type."""
+        with self._lock:
+            tally = self._tally(content_type, content_id)
+            self._unrank(tally)
+            record = self.votes.get(vote_id)
+            if record is not None and record.active:
+                self._apply(tally, record.vote_type, -1)
+                record.vote_type = vote_type
+            else:
+                record = _VoteRecord(content_type, content_id, vote_type)
+                self.votes[vote_id] = record
+            self._apply(tally, vote_type, 1)
+            tally.last_updated = timestamp or time.strftime('%Y-%m-%dT%H:%M:%S')
+            self._rank(tally)
+            self._bump(content_type)
+
+    def delete_vote(self, vote_id: str) -> bool:
+        """Stop counting a vote. Returns ``False`` if the vote is unknown."""
+        with self._lock:
+            record = self.votes.get(vote_id)
+            if record is None:
+                # Vote predates the store; counters can't be adjusted safely
+                self.stale = True
+                return False
+            if not record.active:
+                return True
+            tally = self._tally(record.content_type, record.content_id)
+            self._unrank(tally)
+            self._apply(tally, record.vote_type, -1)
+            if record.flagged:
+                tally.flagged -= 1
+                self.totals['flagged'] -= 1
+            record.active = False
+            self._rank(tally)
+            self._bump(record.content_type)
+            return True
+
+    def flag_vote(self, vote_id: str) -> bool:
+        """Count a vote as flagged for review (it still counts toward score)."""
+        with self._lock:
+            record = self.votes.get(vote_id)
+            if record is None:
+                self.stale = True
+                return False
+            if record.flagged or not record.active:
+                return True
+            record.flagged = True
+            tally = self._tally(record.content_type, record.content_id)
+            tally.flagged += 1
+            self.totals['flagged'] += 1
+            self._bump(record.content_type)
+            return True
+
+    def clear(self) -> None:
+        """Drop all state (used before reseeding)."""
+        with self._lock:
+            self.generation += 1
+            self._reset()
+
+    def get(self, content_type: str, content_id: str) -> Optional[ContentTally]:
+        """Return the tally for one piece of content."""
+        with self._lock:
+            return self.tallies.get((content_type, content_id))
+
+    def popularity_rank(self, content_type: str, content_id: str) -> int:
+        """1-based rank of the content within its type (0 if unranked)."""
+        with self._lock:
+            tally = self.tallies.get((content_type, content_id))
+            if tally is None or not tally.total_votes:
+                return 0
+            return bisect.bisect_left(self.rankings.get(content_type, []), tally.rank_key()) + 1
+
+    def top(self, content_type: str, limit: int = 10, min_votes: int = 1) -> List[Dict[str, Any]]:
+        """Return the best ``limit`` entries with at least ``min_votes`` votes.
+
+        With ``min_votes=1`` this touches exactly ``limit`` ranked entries.
+        Higher thresholds skip low-vote entries as they are walked, which
+        can cover the whole ranking when few entries qualify.
+        """
+        results: List[Dict[str, Any]] = []
+        with self._lock:
+            for rank, (_, total, content_id) in enumerate(self.rankings.get(content_type, []), 1):
+                if len(results) >= limit:
+                    break
+                if -total < min_votes:
+                    continue
+                entry = self.tallies[(content_type, content_id)].to_dict()
+                entry['popularity_rank'] = rank
+                results.append(entry)
+        return results
+
+    def statistics(self) -> Dict[str, Any]:
+        """Return overall counts without touching individual votes.
+
+        Keys match ``VotingSystem.get_vote_statistics``, except
+        ``total_reputation_scores``, which the store does not track.
+        """
+        with self._lock:
+            counted = self.totals['thumbs_up'] + self.totals['thumbs_down'] + self.totals['neutral']
+            return {
+                'total_votes': len(self.votes),
+                'active_votes': counted - self.totals['flagged'],
+                'flagged_votes': self.totals['flagged'],
+                'thumbs_up': self.totals['thumbs_up'],
+                'thumbs_down': self.totals['thumbs_down'],
+                'neutral': self.totals['neutral'],
+                'total_summaries': len(self.tallies),
+                'content_breakdown': dict(self.votes_by_type),
+            }
+
+    def etag(self, content_type: Optional[str] = None) -> str:
+        """Version tag for a content type's data (or everything)."""
+        with self._lock:
+            version = self.version if content_type is None else self.versions.get(content_type, 0)
+            return f'{id(self):x}-{self.generation}-{version}'
+
+
+class ReadCache:
+    """Short-TTL cache of rendered JSON responses with ETags.
+
+    Entries are keyed by request path and query string and tagged with the
+    tally version they were rendered from, so any vote invalidates them
+    before the TTL runs out.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 512,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, str, str, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: str) -> Optional[Tuple[str, str]]:
+        """Return ``(body, etag)`` if a fresh entry exists."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, entry_version, body, etag = entry
+            if entry_version != version or expires < self._clock():
+                del self._entries[key]
+                return None
+            return body, etag
+
+    def put(self, key: str, version: str, payload: Any) -> Tuple[str, str]:
+        """Render ``payload`` and cache it; returns ``(body, etag)``."""
+        body = json.dumps(payload, sort_keys=True)
+        etag = '"' + hashlib.sha1(f'{version}:{body}'.encode('utf-8')).hexdigest() + '"'
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = self._clock()
+                for stale_key in [k for k, e in self._entries.items() if e[0] < now]:
+                    del self._entries[stale_key]
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (self._clock() + self.ttl, version, body, etag)
+        return body, etag
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check an If-None-Match header against ``etag`` (weak comparison).
+
+    Args:
+        etag: Quoted entity tag of the current response
+        if_none_match: Raw header value, a comma-separated list or ``*``
+
+    Returns:
+        True if the client's cached copy is still current
+    """
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == '*' or candidate == etag:
+            return True
+    return False
+
+
+_tally_store: Optional[VoteTallyStore] = None
+_tally_lock = threading.Lock()
+
+
+def get_vote_tally_store(loader: Optional[Callable[[VoteTallyStore], None]] = None) -> VoteTallyStore:
+    """Get the shared tally store, (re)seeding it with ``loader`` when needed.
+
+    Args:
+        loader: Callable that seeds an empty store from persisted votes.
+            Called on first use and whenever the store was marked stale.
+    """
+    global _tally_store
+    with _tally_lock:
+        if _tally_store is None:
+            _tally_store = VoteTallyStore()
+            if loader:
+                loader(_tally_store)
+        elif _tally_store.stale and loader:
+            _tally_store.clear()
+            loader(_tally_store)
+        return _tally_store
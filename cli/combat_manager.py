@@ -11,10 +11,12 @@ import sys
 import time
 from pathlib import Path
 
-# Add combat to path for imports
+# Add combat (and the project root, for the combat package) to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "combat"))
 
 from combat_manager import CombatManager, BuildType, WeaponType, CombatStyle
+from combat.perception_frame import PerceptionFrameBuilder
 
 
 def main():
@@ -80,7 +82,7 @@ Examples:
             print("📋 Parsing skills...")
             print("-" * 50)
             
-            build_info = manager.detect_current_build()
+            build_info = manager.detect_current_build(PerceptionFrameBuilder().build())
             if build_info:
                 print(f"✅ Build Detected:")
                 print(f"   Type: {build_info.build_type.value}")
@@ -120,7 +122,7 @@ Examples:
             print("🔄 Adapting combat settings...")
             print("-" * 50)
             
-            success = manager.auto_adapt_combat()
+            success = manager.auto_adapt_combat(PerceptionFrameBuilder().build())
             if success:
                 print("✅ Auto-adaptation successful!")
                 
@@ -18,6 +18,8 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import re
 
+from combat.perception_frame import PerceptionFrame
+
 # Mock imports for testing (avoiding import issues)
 def run_ocr(image):
     """Mock OCR function for testing."""
@@ -227,15 +229,24 @@ class CombatManager:
             self.logger.error(f"Failed to create combat profile: {e}")
             return None
     
-    def detect_current_build(self) -> Optional[BuildInfo]:
-        """Detect current build via OCR of /skills output."""
+    def detect_current_build(self, frame: Optional[PerceptionFrame] = None) -> Optional[BuildInfo]:
+        """Detect current build via OCR of /skills output.
+
+        With a perception frame the tick's capture and full-screen OCR are
+        reused instead of capturing again.
+        """
         try:
-            # Capture screen and run OCR
-            screen = capture_screen()
-            if screen is None:
-                return None
-            
-            ocr_text = run_ocr(screen)
+            if frame is not None:
+                if frame.image is None:
+                    return None
+                ocr_text = frame.read("screen").text
+            else:
+                # Capture screen and run OCR
+                screen = capture_screen()
+                if screen is None:
+                    return None
+
+                ocr_text = run_ocr(screen)
             if not ocr_text:
                 return None
             
@@ -455,7 +466,7 @@ class CombatManager:
         
         return score
     
-    def auto_adapt_combat(self) -> bool:
+    def auto_adapt_combat(self, frame: Optional[PerceptionFrame] = None) -> bool:
         """Auto-adapt combat behavior based on detected build."""
         # Check if it's time to re-detect build
         if time.time() - self.last_build_check < self.ocr_interval:
@@ -464,7 +475,7 @@ class CombatManager:
         self.last_build_check = time.time()
         
         # Detect current build
-        build_info = self.detect_current_build()
+        build_info = self.detect_current_build(frame)
         if not build_info:
             return False
         
@@ -630,10 +641,10 @@ def get_combat_manager(config_path: Optional[str] = None) -> CombatManager:
         _combat_manager = CombatManager(config_path)
     return _combat_manager
 
-def auto_adapt_combat() -> bool:
+def auto_adapt_combat(frame: Optional[PerceptionFrame] = None) -> bool:
     """Auto-adapt combat behavior."""
     manager = get_combat_manager()
-    return manager.auto_adapt_combat()
+    return manager.auto_adapt_combat(frame)
 
 def get_current_abilities() -> List[str]:
     """Get current abilities."""
@@ -26,6 +26,8 @@ try:
 except ImportError:
     OCR_AVAILABLE = False
 
+from combat.perception_frame import PerceptionFrame, parse_distance
+
 
 class WeaponType(Enum):
     """Types of weapons available in the game."""
@@ -263,21 +265,27 @@ class CombatRangeIntelligence:
         
         self.logger.info("Created default combat range configuration")
     
-    def detect_equipped_weapon(self) -> Optional[WeaponInfo]:
+    def detect_equipped_weapon(self, frame: Optional[PerceptionFrame] = None) -> Optional[WeaponInfo]:
         """
         Auto-detect equipped weapon type using OCR.
+
+        Parameters
+        ----------
+        frame : PerceptionFrame, optional
+            Current tick's perception frame; the weapon slots are read from
+            its capture instead of taking a new screenshot
         
         Returns
         -------
         Optional[WeaponInfo]
             Detected weapon information, or None if detection failed
         """
-        if not OCR_AVAILABLE:
+        if frame is None and not OCR_AVAILABLE:
             return None
         
         try:
-            screenshot = capture_screen()
-            if screenshot is None:
+            read_region = self._region_reader(frame)
+            if read_region is None:
                 return None
             
             # Scan weapon slot regions
@@ -290,7 +298,7 @@ class CombatRangeIntelligence:
             detected_weapon = None
             
             for region in weapon_regions:
-                ocr_result = self.ocr_engine.extract_text_from_screen(screenshot, region)
+                ocr_result = read_region(region)
                 
                 if ocr_result.confidence > 60:
                     text = ocr_result.text.lower()
@@ -328,21 +336,27 @@ class CombatRangeIntelligence:
             self.logger.error(f"Error detecting equipped weapon: {e}")
             return None
     
-    def detect_profession(self) -> Optional[ProfessionType]:
+    def detect_profession(self, frame: Optional[PerceptionFrame] = None) -> Optional[ProfessionType]:
         """
         Detect current profession using OCR.
+
+        Parameters
+        ----------
+        frame : PerceptionFrame, optional
+            Current tick's perception frame; the profession indicators are
+            read from its capture instead of taking a new screenshot
         
         Returns
         -------
         Optional[ProfessionType]
             Detected profession, or None if detection failed
         """
-        if not OCR_AVAILABLE:
+        if frame is None and not OCR_AVAILABLE:
             return None
         
         try:
-            screenshot = capture_screen()
-            if screenshot is None:
+            read_region = self._region_reader(frame)
+            if read_region is None:
                 return None
             
             # Scan profession indicator regions
@@ -355,7 +369,7 @@ class CombatRangeIntelligence:
             detected_profession = None
             
             for region in profession_regions:
-                ocr_result = self.ocr_engine.extract_text_from_screen(screenshot, region)
+                ocr_result = read_region(region)
                 
                 if ocr_result.confidence > 50:
                     text = ocr_result.text.lower()
@@ -380,7 +394,8 @@ class CombatRangeIntelligence:
             self.logger.error(f"Error detecting profession: {e}")
             return None
     
-    def check_combat_range(self, target_distance: float = None) -> RangeCheckResult:
+    def check_combat_range(self, target_distance: float = None,
+                           frame: Optional[PerceptionFrame] = None) -> RangeCheckResult:
         """
         Check if current distance is optimal for combat.
         
@@ -388,6 +403,8 @@ class CombatRangeIntelligence:
         ----------
         target_distance : float, optional
             Distance to target. If None, will attempt to detect from minimap.
+        frame : PerceptionFrame, optional
+            Current tick's perception frame to read the minimap from
             
         Returns
         -------
@@ -399,7 +416,7 @@ class CombatRangeIntelligence:
         try:
             # Get current distance if not provided
             if target_distance is None:
-                target_distance = self._detect_distance_from_minimap()
+                target_distance = self._detect_distance_from_minimap(frame)
             
             self.current_target_distance = target_distance
             
@@ -463,7 +480,8 @@ class CombatRangeIntelligence:
                 confidence=0.0
             )
     
-    def should_reposition(self, target_distance: float = None) -> bool:
+    def should_reposition(self, target_distance: float = None,
+                          frame: Optional[PerceptionFrame] = None) -> bool:
         """
         Determine if repositioning is needed for optimal combat range.
         
@@ -471,16 +489,19 @@ class CombatRangeIntelligence:
         ----------
         target_distance : float, optional
             Distance to target. If None, will attempt to detect from minimap.
+        frame : PerceptionFrame, optional
+            Current tick's perception frame to read the minimap from
             
         Returns
         -------
         bool
             True if repositioning is needed
         """
-        range_result = self.check_combat_range(target_distance)
+        range_result = self.check_combat_range(target_distance, frame)
         return range_result.reposition_needed
     
-    def get_reposition_direction(self, target_distance: float = None) -> str:
+    def get_reposition_direction(self, target_distance: float = None,
+                                 frame: Optional[PerceptionFrame] = None) -> str:
         """
         Get the direction to reposition for optimal range.
         
@@ -488,13 +509,15 @@ class CombatRangeIntelligence:
         ----------
         target_distance : float, optional
             Distance to target. If None, will attempt to detect from minimap.
+        frame : PerceptionFrame, optional
+            Current tick's perception frame to read the minimap from
             
         Returns
         -------
         str
             Direction to move: "forward", "backward", or "none"
         """
-        range_result = self.check_combat_range(target_distance)
+        range_result = self.check_combat_range(target_distance, frame)
         
         if range_result.suggested_action == "move_forward":
             return "forward"
@@ -503,8 +526,26 @@ class CombatRangeIntelligence:
         else:
             return "none"
     
-    def _detect_distance_from_minimap(self) -> float:
+    def _region_reader(self, frame: Optional[PerceptionFrame]):
+        """Get a ``read(region)`` OCR function, or None if there is no capture."""
+        # A frame shares its capture and memoized OCR with the other engines
+        if frame is not None:
+            return frame.read if frame.image is not None else None
+        screenshot = capture_screen()
+        if screenshot is None:
+            return None
+        return lambda region: self.ocr_engine.extract_text_from_screen(screenshot, region)
+
+    def _detect_distance_from_minimap(self, frame: Optional[PerceptionFrame] = None) -> float:
         """Detect distance to target from minimap using OCR."""
+        if frame is not None:
+            reading = frame.read(self.minimap_regions["distance_indicators"])
+            if reading.confidence > 50:
+                distance = parse_distance(reading.text)
+                if distance is not None:
+                    return distance
+            return self._estimate_distance_from_icon_spacing() if frame.image is not None else 0.0
+
         if not OCR_AVAILABLE:
             return 0.0
         
@@ -734,34 +775,37 @@ def get_combat_range_intelligence() -> CombatRangeIntelligence:
     return _combat_range_intelligence
 
 
-def detect_equipped_weapon() -> Optional[WeaponInfo]:
+def detect_equipped_weapon(frame: Optional[PerceptionFrame] = None) -> Optional[WeaponInfo]:
     """Auto-detect equipped weapon type."""
     intelligence = get_combat_range_intelligence()
-    return intelligence.detect_equipped_weapon()
+    return intelligence.detect_equipped_weapon(frame)
 
 
-def detect_profession() -> Optional[ProfessionType]:
+def detect_profession(frame: Optional[PerceptionFrame] = None) -> Optional[ProfessionType]:
     """Detect current profession."""
     intelligence = get_combat_range_intelligence()
-    return intelligence.detect_profession()
+    return intelligence.detect_profession(frame)
 
 
-def check_combat_range(target_distance: float = None) -> RangeCheckResult:
+def check_combat_range(target_distance: float = None,
+                       frame: Optional[PerceptionFrame] = None) -> RangeCheckResult:
     """Check if current distance is optimal for combat."""
     intelligence = get_combat_range_intelligence()
-    return intelligence.check_combat_range(target_distance)
+    return intelligence.check_combat_range(target_distance, frame)
 
 
-def should_reposition(target_distance: float = None) -> bool:
+def should_reposition(target_distance: float = None,
+                      frame: Optional[PerceptionFrame] = None) -> bool:
     """Determine if repositioning is needed for optimal combat range."""
     intelligence = get_combat_range_intelligence()
-    return intelligence.should_reposition(target_distance)
+    return intelligence.should_reposition(target_distance, frame)
 
 
-def get_reposition_direction(target_distance: float = None) -> str:
+def get_reposition_direction(target_distance: float = None,
+                             frame: Optional[PerceptionFrame] = None) -> str:
     """Get the direction to reposition for optimal range."""
     intelligence = get_combat_range_intelligence()
-    return intelligence.get_reposition_direction(target_distance)
+    return intelligence.get_reposition_direction(target_distance, frame)
 
 
 def get_combat_range_status() -> Dict[str, Any]:
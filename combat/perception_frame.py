@@ -0,0 +1,305 @@
+"""
+Per-Tick Perception Frame
+
+A :class:`PerceptionFrame` is what the combat engines see during one combat
+tick.  It holds a single screen capture, OCR text for named screen regions
+and the fields parsed from that text.  Everything is computed lazily and
+memoized for the tick, so however many engines (rotation, range, build
+detection) ask for the toolbar, the action log, the minimap or the target
+frame, the screen is captured once and each region is OCR'd at most once.
+
+A :class:`PerceptionFrameBuilder` makes a fresh frame per tick and keeps
+counters of the captures and OCR calls the frames actually made.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from core.ocr import OCREngine
+    from core.screenshot import capture_screen
+    OCR_AVAILABLE = True
+except ImportError:
+    OCREngine = None
+    capture_screen = None
+    OCR_AVAILABLE = False
+
+
+Region = Optional[Tuple[int, int, int, int]]
+
+# Named regions as (x1, y1, x2, y2) on a 1920x1080 client; ``None`` is the
+# whole screen
+DEFAULT_REGIONS: Dict[str, Region] = {
+    "screen": None,
+    "toolbar": (560, 980, 1360, 1080),
+    "action_log": (0, 760, 560, 1080),
+    "minimap": (350, 250, 500, 400),  # CombatRangeIntelligence distance indicators
+    "target_frame": (760, 20, 1160, 110),
+}
+
+DISTANCE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s?m(?:eters)?\b|(?:distance|range):\s*(\d+(?:\.\d+)?)")
+TARGET_LEVEL_PATTERN = re.compile(r"\b(?:lvl|level|lv)\.?\s*(\d+)", re.IGNORECASE)
+TARGET_HEALTH_PATTERN = re.compile(r"(\d{1,3})\s*%")
+
+# Parsed field -> the region it is parsed from
+PARSED_FIELD_REGIONS: Dict[str, str] = {
+    "action_log_lines": "action_log",
+    "minimap_distance": "minimap",
+    "target": "target_frame",
+}
+
+
+@dataclass(frozen=True)
+class RegionText:
+    """OCR text of one region and the OCR confidence (0-100)."""
+    text: str = ""
+    confidence: float = 0.0
+
+    @property
+    def lower(self) -> str:
+        return self.text.lower()
+
+
+@dataclass(frozen=True)
+class TargetInfo:
+    """Fields parsed from the target frame."""
+    name: str
+    level: Optional[int] = None
+    health_percent: Optional[float] = None
+
+
+def _as_region_text(result: Any) -> RegionText:
+    """Normalize an OCR backend result (plain text or an object with
+    ``text``/``confidence``) to a :class:`RegionText`."""
+    if result is None:
+        return RegionText()
+    if isinstance(result, str):
+        return RegionText(result, 100.0 if result.strip() else 0.0)
+    text = getattr(result, "text", "") or ""
+    confidence = getattr(result, "confidence", None)
+    if confidence is None:
+        confidence = 100.0 if text.strip() else 0.0
+    return RegionText(str(text), float(confidence))
+
+
+def parse_distance(text: str) -> Optional[float]:
+    """First distance reading ("42m", "range: 30", "12 meters") in ``text``."""
+    match = DISTANCE_PATTERN.search(text.lower())
+    if not match:
+        return None
+    return float(match.group(1) or match.group(2))
+
+
+def parse_target(text: str) -> Optional[TargetInfo]:
+    """Target name, level and health from the target frame text."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None
+    level_match = TARGET_LEVEL_PATTERN.search(text)
+    health_match = TARGET_HEALTH_PATTERN.search(text)
+    name = TARGET_LEVEL_PATTERN.sub("", TARGET_HEALTH_PATTERN.sub("", lines[0])).strip(" -()[]:")
+    return TargetInfo(
+        name=name,
+        level=int(level_match.group(1)) if level_match else None,
+        health_percent=min(100.0, float(health_match.group(1))) if health_match else None,
+    )
+
+
+def _default_ocr() -> Optional[Callable[[Any, Region], Any]]:
+    if not OCR_AVAILABLE:
+        return None
+    return OCREngine().extract_text_from_screen
+
+
+class PerceptionFrame:
+    """
+    One combat tick's view of the screen.
+
+    Parameters
+    ----------
+    capture : callable, optional
+        ``capture()`` returning the full screenshot
+    ocr : callable, optional
+        ``ocr(image, region)`` returning text, or a result with ``text`` and
+        ``confidence``
+    regions : dict, optional
+        Region name -> (x1, y1, x2, y2); merged over ``DEFAULT_REGIONS``
+    tick : int
+        Sequence number of the tick the frame belongs to
+    """
+
+    def __init__(self, capture: Optional[Callable[[], Any]] = None,
+                 ocr: Optional[Callable[[Any, Region], Any]] = None,
+                 regions: Optional[Dict[str, Region]] = None, tick: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self._capture = capture
+        self._ocr = ocr
+        self.regions: Dict[str, Region] = {**DEFAULT_REGIONS, **(regions or {})}
+        self.tick = tick
+
+        self.captures = 0
+        self.ocr_calls = 0
+        self._image: Any = None
+        self._captured = False
+        self._texts: Dict[Region, RegionText] = {}
+        self._parsed: Dict[str, Any] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether the frame has both a capture and an OCR backend."""
+        return self._capture is not None and self._ocr is not None
+
+    @property
+    def image(self) -> Any:
+        """The tick's screenshot, captured on first use."""
+        if not self._captured:
+            self._captured = True
+            if self._capture is not None:
+                self.captures += 1
+                try:
+                    self._image = self._capture()
+                except Exception as e:
+                    self.logger.error(f"Screen capture failed: {e}")
+                    self._image = None
+        return self._image
+
+    def read(self, region: Union[str, Region] = "screen") -> RegionText:
+        """
+        OCR text of a named region or an (x1, y1, x2, y2) box.
+
+        Regions resolving to the same box share one OCR call.
+
+        Parameters
+        ----------
+        region : str or tuple
+            Region name (see ``regions``) or box; ``None`` is the whole screen
+
+        Returns
+        -------
+        RegionText
+            Empty if there is no capture or OCR backend
+        """
+        box = self._box(region)
+        cached = self._texts.get(box)
+        if cached is not None:
+            return cached
+
+        result = RegionText()
+        image = self.image
+        if image is not None and self._ocr is not None:
+            self.ocr_calls += 1
+            try:
+                result = _as_region_text(self._ocr(image, box))
+            except Exception as e:
+                self.logger.error(f"OCR failed for region {region}: {e}")
+        self._texts[box] = result
+        return result
+
+    def refresh(self, *regions: str) -> None:
+        """
+        Drop the tick's reading of ``regions`` after the screen changed.
+
+        The next read of one of them captures the screen again; other
+        regions keep the text already read this tick.
+
+        Parameters
+        ----------
+        *regions : str
+            Region names whose text and parsed fields are stale
+        """
+        self._captured = False
+        self._image = None
+        for region in regions:
+            self._texts.pop(self._box(region), None)
+            for field, source in PARSED_FIELD_REGIONS.items():
+                if source == region:
+                    self._parsed.pop(field, None)
+
+    def _box(self, region: Union[str, Region]) -> Region:
+        if isinstance(region, str):
+            if region not in self.regions:
+                raise KeyError(f"Unknown perception region: {region}")
+            region = self.regions[region]
+        return tuple(region) if region is not None else None
+
+    def text(self, region: Union[str, Region] = "screen") -> str:
+        """Lowercased OCR text of ``region``."""
+        return self.read(region).lower
+
+    def _memo(self, key: str, compute: Callable[[], Any]) -> Any:
+        if key not in self._parsed:
+            self._parsed[key] = compute()
+        return self._parsed[key]
+
+    @property
+    def toolbar_text(self) -> str:
+        return self.text("toolbar")
+
+    @property
+    def action_log_lines(self) -> List[str]:
+        """Non-empty, lowercased action log lines."""
+        return self._memo("action_log_lines", lambda: [
+            line.strip() for line in self.text("action_log").splitlines() if line.strip()
+        ])
+
+    @property
+    def minimap_distance(self) -> Optional[float]:
+        """Distance to target read off the minimap, ``None`` if not shown."""
+        return self._memo("minimap_distance", lambda: parse_distance(self.read("minimap").text))
+
+    @property
+    def target(self) -> Optional[TargetInfo]:
+        """Current target parsed from the target frame, ``None`` if empty."""
+        return self._memo("target", lambda: parse_target(self.read("target_frame").text))
+
+
+class PerceptionFrameBuilder:
+    """
+    Build one :class:`PerceptionFrame` per combat tick.
+
+    Parameters
+    ----------
+    capture : callable, optional
+        Screen capture; ``core.screenshot.capture_screen`` if available
+    ocr : callable, optional
+        Region OCR; ``core.ocr.OCREngine().extract_text_from_screen`` if
+        available
+    regions : dict, optional
+        Region overrides passed to every frame
+    """
+
+    def __init__(self, capture: Optional[Callable[[], Any]] = None,
+                 ocr: Optional[Callable[[Any, Region], Any]] = None,
+                 regions: Optional[Dict[str, Region]] = None):
+        self.capture = capture if capture is not None else capture_screen
+        self.ocr = ocr if ocr is not None else _default_ocr()
+        self.regions = dict(regions or {})
+        self.ticks = 0
+        self.last_frame: Optional[PerceptionFrame] = None
+        self._captures = 0
+        self._ocr_calls = 0
+
+    def build(self) -> PerceptionFrame:
+        """Start a new tick and return its (not yet captured) frame."""
+        self._collect()
+        self.ticks += 1
+        self.last_frame = PerceptionFrame(self.capture, self.ocr, self.regions, tick=self.ticks)
+        return self.last_frame
+
+    def _collect(self) -> None:
+        if self.last_frame is not None:
+            self._captures += self.last_frame.captures
+            self._ocr_calls += self.last_frame.ocr_calls
+
+    def stats(self) -> Dict[str, float]:
+        """Ticks built and the captures and OCR calls made across them."""
+        captures = self._captures + (self.last_frame.captures if self.last_frame else 0)
+        ocr_calls = self._ocr_calls + (self.last_frame.ocr_calls if self.last_frame else 0)
+        return {
+            "ticks": self.ticks,
+            "captures": captures,
+            "ocr_calls": ocr_calls,
+            "ocr_calls_per_tick": round(ocr_calls / self.ticks, 3) if self.ticks else 0.0,
+        }
@@ -7,6 +7,7 @@ combat logic based on weapon and profession profiles loaded from JSON files.
 
 import json
 import logging
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -27,6 +28,9 @@ except ImportError:
         return None
     OCR_AVAILABLE = False
 
+from combat.perception_frame import PerceptionFrame, PerceptionFrameBuilder
+from combat.rotation_scheduler import RotationScheduler
+
 
 class WeaponType(Enum):
     """Weapon type enumeration."""
@@ -85,6 +89,15 @@ class CombatProfile:
     max_range: int = 50
 
 
+@dataclass
+class CombatTick:
+    """What one combat tick saw and what each engine did with it."""
+    frame: Optional[PerceptionFrame]
+    executed: List[str] = field(default_factory=list)
+    range_check: Any = None
+    adapted: Optional[bool] = None
+
+
 class RotationEngine:
     """
     Lightweight combat rotation engine that executes rotation logic
@@ -108,6 +121,9 @@ class RotationEngine:
         
         # Test mode for faster execution
         self._test_mode = False
+
+        # Cooldown scheduler for the current profile, built on first use
+        self._scheduler: Optional[RotationScheduler] = None
         
         # Load available profiles
         self.available_profiles = self._load_available_profiles()
@@ -210,6 +226,18 @@ class RotationEngine:
             max_range=profile_data.get("max_range", 50)
         )
     
+    @property
+    def scheduler(self) -> Optional[RotationScheduler]:
+        """Cooldown scheduler for the current profile (rebuilt when it changes)."""
+        if not self.current_profile:
+            return None
+        if self._scheduler is None or self._scheduler.profile is not self.current_profile:
+            emergency = []
+            if "critical_heal" in self.current_profile.emergency_skills:
+                emergency.append(self.current_profile.emergency_skills["critical_heal"])
+            self._scheduler = RotationScheduler(self.current_profile, emergency)
+        return self._scheduler
+
     def is_skill_ready(self, skill_name: str) -> bool:
         """
         Check if a skill is ready (off cooldown).
@@ -244,22 +272,29 @@ class RotationEngine:
         if not self.current_profile:
             return []
         
-        available_skills = []
-        for skill_name, skill_info in self.current_profile.skills.items():
-            if skill_info.is_skill_ready():
-                available_skills.append(skill_name)
-        
-        return available_skills
+        return self.scheduler.ready_skills()
     
-    def scan_toolbar_skills(self) -> List[str]:
+    def scan_toolbar_skills(self, frame: Optional[PerceptionFrame] = None) -> List[str]:
         """
         Scan toolbar for available skills using OCR.
-        
+
+        Parameters
+        ----------
+        frame : PerceptionFrame, optional
+            Current tick's perception frame; its toolbar region is read
+            instead of OCR'ing the whole screen
+
         Returns
         -------
         List[str]
             List of skills found on toolbar
         """
+        if frame is not None:
+            if not self.current_profile:
+                return []
+            toolbar_text = frame.toolbar_text
+            return [name for name in self.current_profile.skills if name.lower() in toolbar_text]
+
         if not OCR_AVAILABLE:
             self.logger.warning("OCR not available, returning empty skill list")
             return []
@@ -283,7 +318,7 @@ class RotationEngine:
             self.logger.error(f"Failed to scan toolbar skills: {e}")
             return []
     
-    def check_action_log(self, skill_name: str) -> bool:
+    def check_action_log(self, skill_name: str, frame: Optional[PerceptionFrame] = None) -> bool:
         """
         Check action log for skill usage confirmation.
         
@@ -291,19 +326,19 @@ class RotationEngine:
         ----------
         skill_name : str
             Name of the skill to check
+        frame : PerceptionFrame, optional
+            Current tick's perception frame; its action log region is read
+            instead of OCR'ing the whole screen
             
         Returns
         -------
         bool
             True if skill was used successfully
         """
-        if not OCR_AVAILABLE or self._test_mode:
+        if self._test_mode or (frame is None and not OCR_AVAILABLE):
             return True  # Assume success in test mode
         
         try:
-            # Extract text from action log region
-            log_text = extract_text_from_screen()
-            
             # Check for skill usage patterns
             skill_patterns = [
                 f"used {skill_name}",
@@ -311,6 +346,13 @@ class RotationEngine:
                 f"{skill_name} hits",
                 f"{skill_name} deals"
             ]
+
+            if frame is not None:
+                return any(pattern.lower() in line
+                           for line in frame.action_log_lines for pattern in skill_patterns)
+
+            # Extract text from action log region
+            log_text = extract_text_from_screen()
             
             for pattern in skill_patterns:
                 if pattern.lower() in log_text.lower():
@@ -322,7 +364,7 @@ class RotationEngine:
             self.logger.error(f"Failed to check action log: {e}")
             return False
     
-    def execute_skill(self, skill_name: str) -> bool:
+    def execute_skill(self, skill_name: str, frame: Optional[PerceptionFrame] = None) -> bool:
         """
         Execute a skill.
         
@@ -330,6 +372,8 @@ class RotationEngine:
         ----------
         skill_name : str
             Name of the skill to execute
+        frame : PerceptionFrame, optional
+            Current tick's perception frame, used to confirm the skill
             
         Returns
         -------
@@ -355,11 +399,14 @@ class RotationEngine:
             self.logger.info(f"Executing skill: {skill_name}")
             
             # Update cooldown
-            skill_info.last_used = time.time()
-            skill_info.is_ready = False
-            
+            self.scheduler.mark_used(skill_name, time.time())
+
+            # The tick's action log predates the cast; confirm against a new one
+            if frame is not None:
+                frame.refresh("action_log")
+
             # Check if skill was successful
-            success = self.check_action_log(skill_name)
+            success = self.check_action_log(skill_name, frame)
             
             if success:
                 self.logger.info(f"Skill '{skill_name}' executed successfully")
@@ -372,9 +419,15 @@ class RotationEngine:
             self.logger.error(f"Failed to execute skill '{skill_name}': {e}")
             return False
     
-    def execute_rotation(self) -> List[str]:
+    def execute_rotation(self, frame: Optional[PerceptionFrame] = None) -> List[str]:
         """
         Execute the current rotation.
+
+        Parameters
+        ----------
+        frame : PerceptionFrame, optional
+            Current tick's perception frame, shared by every skill executed
+            this tick
         
         Returns
         -------
@@ -390,23 +443,21 @@ class RotationEngine:
         # Check for emergency situations first
         emergency_skill = self._check_emergency_skills()
         if emergency_skill:
-            if self.execute_skill(emergency_skill):
+            if self.execute_skill(emergency_skill, frame):
                 executed_skills.append(emergency_skill)
             return executed_skills
         
-        # Execute rotation skills
-        for skill_name in self.current_profile.rotation:
-            if self.is_skill_ready(skill_name):
-                if self.execute_skill(skill_name):
-                    executed_skills.append(skill_name)
-                    break  # Only execute one skill per rotation cycle
-            else:
-                self.logger.debug(f"Skill '{skill_name}' is on cooldown")
+        # Execute rotation skills (ready ones only, in rotation order)
+        scheduler = self.scheduler
+        for skill_name in scheduler.ready_rotation():
+            if self.execute_skill(skill_name, frame):
+                executed_skills.append(skill_name)
+                break  # Only execute one skill per rotation cycle
         
         # If no rotation skills available, try fallback
         if not executed_skills and self.current_profile.fallback:
-            if self.is_skill_ready(self.current_profile.fallback):
-                if self.execute_skill(self.current_profile.fallback):
+            if scheduler.is_ready(self.current_profile.fallback):
+                if self.execute_skill(self.current_profile.fallback, frame):
                     executed_skills.append(self.current_profile.fallback)
         
         return executed_skills
@@ -428,12 +479,101 @@ class RotationEngine:
             return None
         
         # Check for heal threshold (simplified - in practice you'd check actual health)
-        if "critical_heal" in self.current_profile.emergency_skills:
-            heal_skill = self.current_profile.emergency_skills["critical_heal"]
-            if self.is_skill_ready(heal_skill):
-                return heal_skill
-        
-        return None
+        return self.scheduler.ready_emergency()
+
+    def time_until_next_skill(self) -> Optional[float]:
+        """
+        Seconds until a skill can next be used.
+
+        Returns
+        -------
+        Optional[float]
+            0.0 if a skill is ready now, None if no profile or no usable skill
+        """
+        if not self.current_profile:
+            return None
+        return self.scheduler.time_until_next(emergency=not self._test_mode)
+
+    def tick(self, frame_builder: Optional[PerceptionFrameBuilder] = None,
+             range_intelligence: Any = None, combat_manager: Any = None) -> CombatTick:
+        """
+        Run one combat tick over a single perception frame.
+
+        The rotation casts first; the frame's capture, taken to confirm the
+        cast, is then what range checking and build detection read, so the
+        three engines share one screenshot per tick.
+
+        Parameters
+        ----------
+        frame_builder : PerceptionFrameBuilder, optional
+            Builds the tick's perception frame
+        range_intelligence : CombatRangeIntelligence, optional
+            Checks the combat range against the frame
+        combat_manager : CombatManager, optional
+            Re-detects the build from the frame (at its own OCR interval)
+
+        Returns
+        -------
+        CombatTick
+            The frame and what each engine did with it
+        """
+        frame = frame_builder.build() if frame_builder is not None else None
+        result = CombatTick(frame=frame, executed=self.execute_rotation(frame))
+        if range_intelligence is not None:
+            result.range_check = range_intelligence.check_combat_range(frame=frame)
+        if combat_manager is not None:
+            result.adapted = combat_manager.auto_adapt_combat(frame)
+        return result
+
+    def run(self, duration: Optional[float] = None, stop_event: Optional[threading.Event] = None,
+            frame_builder: Optional[PerceptionFrameBuilder] = None,
+            min_interval: float = 0.05, range_intelligence: Any = None,
+            combat_manager: Any = None) -> List[str]:
+        """
+        Run the rotation, sleeping until the next skill comes off cooldown.
+
+        Parameters
+        ----------
+        duration : float, optional
+            Seconds to run for; until ``stop_event`` is set if omitted
+        stop_event : threading.Event, optional
+            Set to stop the loop; also interrupts the sleep
+        frame_builder : PerceptionFrameBuilder, optional
+            Builds the perception frame for each tick; defaults to one over
+            the live screen when OCR is available (outside test mode)
+        min_interval : float
+            Shortest sleep between ticks
+        range_intelligence : CombatRangeIntelligence, optional
+            Range checked every tick (see :meth:`tick`)
+        combat_manager : CombatManager, optional
+            Build detection run every tick (see :meth:`tick`)
+
+        Returns
+        -------
+        List[str]
+            Skills executed, in order
+        """
+        stop_event = stop_event or threading.Event()
+        deadline = None if duration is None else time.monotonic() + duration
+        executed: List[str] = []
+        if frame_builder is None and OCR_AVAILABLE and not self._test_mode:
+            frame_builder = PerceptionFrameBuilder()
+
+        while not stop_event.is_set():
+            executed.extend(self.tick(frame_builder, range_intelligence, combat_manager).executed)
+
+            wait = self.time_until_next_skill()
+            if wait is None:
+                break
+            wait = max(wait, min_interval)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = min(wait, remaining)
+            stop_event.wait(wait)
+
+        return executed
     
     def get_rotation_status(self) -> Dict[str, Any]:
         """
@@ -458,6 +598,7 @@ class RotationEngine:
         }
         
         # Add cooldown information
+        self.scheduler.advance()
         for skill_name, skill_info in self.current_profile.skills.items():
             if not skill_info.is_ready:
                 remaining_cooldown = skill_info.cooldown - (time.time() - skill_info.last_used)
@@ -497,9 +638,14 @@ def load_combat_profile(profile_name: str) -> bool:
     return engine.load_profile(profile_name)
 
 
-def execute_rotation() -> List[str]:
+def execute_rotation(frame: Optional[PerceptionFrame] = None) -> List[str]:
     """
     Execute the current rotation.
+
+    Parameters
+    ----------
+    frame : PerceptionFrame, optional
+        Current tick's perception frame
     
     Returns
     -------
@@ -507,7 +653,7 @@ def execute_rotation() -> List[str]:
         List of skills that were executed
     """
     engine = get_rotation_engine()
-    return engine.execute_rotation()
+    return engine.execute_rotation(frame)
 
 
 def is_skill_ready(skill_name: str) -> bool:
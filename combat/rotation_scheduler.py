@@ -0,0 +1,260 @@
+"""
+Cooldown-Aware Rotation Scheduler
+
+Keeps the skills of a :class:`combat.rotation_engine.CombatProfile` in a
+min-heap keyed on the time each skill comes off cooldown, so the rotation
+engine never polls every skill's cooldown per call.  Skills whose time has
+come move to a ready set; the next skill to use is picked by priority tier
+(emergency, then rotation order, then fallback), and the time of the next
+actionable event tells the combat loop how long it can sleep.
+
+:func:`simulate_rotation` replays a profile against a virtual clock, so
+minutes of game time run in milliseconds for rotation benchmarking.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Priority tiers, lowest value first
+TIER_EMERGENCY = 0
+TIER_ROTATION = 1
+TIER_FALLBACK = 2
+
+# Skills with no cooldown are locked briefly after use (see SkillInfo)
+EXECUTION_LOCK = 0.1
+
+
+class RotationScheduler:
+    """
+    Ready-time heap over a combat profile's skills.
+
+    Parameters
+    ----------
+    profile : CombatProfile
+        Profile whose ``skills`` (``SkillInfo``), ``rotation`` and
+        ``fallback`` are scheduled
+    emergency : iterable of str, optional
+        Emergency skills in priority order
+    clock : callable
+        Time source, ``time.time`` by default
+    """
+
+    def __init__(self, profile, emergency: Optional[Iterable[str]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.profile = profile
+        self.clock = clock
+        self.skills = profile.skills
+        self._order: Dict[str, int] = {name: i for i, name in enumerate(self.skills)}
+        self._rotation_index: Dict[str, int] = {}
+        for index, name in enumerate(profile.rotation):
+            if name in self.skills:
+                self._rotation_index.setdefault(name, index)
+        self.emergency: List[str] = [name for name in (emergency or []) if name in self.skills]
+        self.fallback: Optional[str] = profile.fallback if profile.fallback in self.skills else None
+
+        self._ready_at: Dict[str, float] = {}
+        self._pending: List[Tuple[float, int, str]] = []
+        self._ready: set = set()
+        self._ready_rotation: List[Tuple[int, str]] = []
+        self.resync()
+
+    @staticmethod
+    def ready_time(skill_info) -> float:
+        """Time at which ``skill_info`` comes off cooldown."""
+        if skill_info.is_ready:
+            return float("-inf")
+        return skill_info.last_used + (skill_info.cooldown or EXECUTION_LOCK)
+
+    def resync(self) -> None:
+        """Rebuild the heap from the profile's ``SkillInfo`` state.
+
+        Only needed after cooldowns were changed outside :meth:`mark_used`.
+        """
+        self._ready_at = {name: self.ready_time(info) for name, info in self.skills.items()}
+        self._pending = [(ready_at, self._order[name], name) for name, ready_at in self._ready_at.items()]
+        heapq.heapify(self._pending)
+        self._ready = set()
+        self._ready_rotation = []
+
+    def mark_used(self, skill_name: str, used_at: Optional[float] = None) -> None:
+        """Put a skill on cooldown from ``used_at`` (now by default)."""
+        info = self.skills.get(skill_name)
+        if info is None:
+            return
+        used_at = self.clock() if used_at is None else used_at
+        info.last_used = used_at
+        info.is_ready = False
+        ready_at = self.ready_time(info)
+        self._ready_at[skill_name] = ready_at
+        self._ready.discard(skill_name)
+        heapq.heappush(self._pending, (ready_at, self._order[skill_name], skill_name))
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """Move every skill whose cooldown has expired by ``now`` to the ready set."""
+        now = self.clock() if now is None else now
+        pending = self._pending
+        while pending and pending[0][0] <= now:
+            ready_at, _, name = heapq.heappop(pending)
+            if ready_at != self._ready_at.get(name) or name in self._ready:
+                continue  # superseded by a later mark_used
+            self._ready.add(name)
+            self.skills[name].is_ready = True
+            index = self._rotation_index.get(name)
+            if index is not None:
+                heapq.heappush(self._ready_rotation, (index, name))
+
+    def is_ready(self, skill_name: str, now: Optional[float] = None) -> bool:
+        self.advance(now)
+        return skill_name in self._ready
+
+    def ready_skills(self, now: Optional[float] = None) -> List[str]:
+        """Ready skills in profile order."""
+        self.advance(now)
+        return sorted(self._ready, key=self._order.__getitem__)
+
+    def ready_rotation(self, now: Optional[float] = None) -> List[str]:
+        """Ready rotation skills in rotation order."""
+        self.advance(now)
+        self._ready_rotation = [entry for entry in self._ready_rotation if entry[1] in self._ready]
+        self._ready_rotation.sort()
+        return [name for _, name in self._ready_rotation]
+
+    def ready_emergency(self, now: Optional[float] = None) -> Optional[str]:
+        """Highest-priority ready emergency skill."""
+        self.advance(now)
+        for name in self.emergency:
+            if name in self._ready:
+                return name
+        return None
+
+    def next_action(self, now: Optional[float] = None,
+                    emergency: bool = True) -> Optional[Tuple[int, str]]:
+        """
+        Skill to use now and its tier.
+
+        Parameters
+        ----------
+        now : float, optional
+            Current time
+        emergency : bool
+            Whether the emergency tier is considered
+
+        Returns
+        -------
+        Optional[Tuple[int, str]]
+            ``(tier, skill_name)``, or None if nothing is ready
+        """
+        if emergency:
+            name = self.ready_emergency(now)
+            if name is not None:
+                return TIER_EMERGENCY, name
+        rotation = self.ready_rotation(now)
+        if rotation:
+            return TIER_ROTATION, rotation[0]
+        if self.fallback is not None and self.fallback in self._ready:
+            return TIER_FALLBACK, self.fallback
+        return None
+
+    def next_event_time(self, now: Optional[float] = None, emergency: bool = True) -> Optional[float]:
+        """When the next skill becomes usable (``now`` if one already is)."""
+        now = self.clock() if now is None else now
+        if self.next_action(now, emergency) is not None:
+            return now
+        actionable = set(self._rotation_index)
+        if self.fallback is not None:
+            actionable.add(self.fallback)
+        if emergency:
+            actionable.update(self.emergency)
+        times = [self._ready_at[name] for name in actionable if name not in self._ready]
+        return min(times) if times else None
+
+    def time_until_next(self, now: Optional[float] = None, emergency: bool = True) -> Optional[float]:
+        """Seconds until the next actionable event, None if there is none."""
+        now = self.clock() if now is None else now
+        next_time = self.next_event_time(now, emergency)
+        return None if next_time is None else max(0.0, next_time - now)
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of replaying a rotation for a stretch of game time."""
+    duration: float
+    casts: Dict[str, int] = field(default_factory=dict)
+    timeline: List[Tuple[float, str]] = field(default_factory=list)
+    idle_time: float = 0.0
+    wall_ms: float = 0.0
+
+    @property
+    def total_casts(self) -> int:
+        return sum(self.casts.values())
+
+    @property
+    def casts_per_minute(self) -> float:
+        return self.total_casts / (self.duration / 60.0) if self.duration else 0.0
+
+
+def simulate_rotation(profile, minutes: float, action_time: float = 1.0,
+                      emergency: Optional[Iterable[str]] = None,
+                      keep_timeline: bool = True) -> SimulationResult:
+    """
+    Replay a profile's rotation for ``minutes`` of game time.
+
+    The clock is virtual: between actions it jumps straight to the next
+    cooldown expiry, so the replay takes milliseconds of wall time.  The
+    profile's ``SkillInfo`` objects are copied, not modified.
+
+    Parameters
+    ----------
+    profile : CombatProfile
+        Profile to replay
+    minutes : float
+        Game time to simulate
+    action_time : float
+        Seconds each skill use occupies (global cooldown)
+    emergency : iterable of str, optional
+        Emergency skills, treated as always wanted whenever ready
+    keep_timeline : bool
+        Whether to record every ``(time, skill)`` cast
+
+    Returns
+    -------
+    SimulationResult
+        Casts per skill, the cast timeline and the time spent idle
+    """
+    from copy import deepcopy
+
+    start = time.perf_counter()
+    profile = deepcopy(profile)
+    for info in profile.skills.values():
+        info.last_used = 0.0
+        info.is_ready = True
+
+    clock = [0.0]
+    scheduler = RotationScheduler(profile, emergency, clock=lambda: clock[0])
+    duration = minutes * 60.0
+    result = SimulationResult(duration=duration)
+    use_emergency = bool(scheduler.emergency)
+
+    while clock[0] < duration:
+        now = clock[0]
+        action = scheduler.next_action(now, use_emergency)
+        if action is None:
+            next_time = scheduler.next_event_time(now, use_emergency)
+            if next_time is None:
+                result.idle_time += duration - now
+                break
+            next_time = min(next_time, duration)
+            result.idle_time += next_time - now
+            clock[0] = next_time
+            continue
+        _, name = action
+        scheduler.mark_used(name, now)
+        result.casts[name] = result.casts.get(name, 0) + 1
+        if keep_timeline:
+            result.timeline.append((now, name))
+        clock[0] = now + action_time
+
+    result.wall_ms = (time.perf_counter() - start) * 1000
+    return result
@@ -8,140 +8,178 @@ import glob
 
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
 
-# Import core modules with fallbacks
-try:
-    from core.session_tracker import load_session
-    from core.session_report_dashboard import session_dashboard
-    from core.ms11_license_manager import ms11_license_manager
-    from core import progress_tracker
-    from core.build_manager import BuildManager
-    from core.profile_loader import SESSION_STATE
-    from profiles.special_goals import get_dashboard_data as get_special_goals_data
-    from core.guide_manager import GuideManager, GuideMetadata
-    from core.player_guild_tracker import PlayerGuildTracker
-    from core.player_profile_manager import profile_manager
-    from core.multi_character_profile_manager import multi_character_manager
-    from core.chat_session_manager import chat_session_manager
-    from core.blog_engine import blog_manager
-    from core.macro_safety import macro_safety_manager
-    from core.heroic_support import heroic_support
-    from core.vendor_price_scanner import vendor_price_scanner
-    from core.vendor_price_alerts import vendor_price_alerts
-    from core.steam_discord_bridge import identity_bridge
-    from core.quest_heatmap_tracker import quest_heatmap_tracker
-    from core.tools_manager import tools_manager, submit_player_tool, get_player_tools, get_tool_by_id, increment_tool_views, get_tool_content, get_tools_stats
-    CORE_MODULES_AVAILABLE = True
-except ImportError as e:
-    print(f"[WARNING] Core modules not available: {e}")
-    print("[INFO] Dashboard running in limited mode")
-    CORE_MODULES_AVAILABLE = False
-    
-    # Create fallback implementations
-    def load_session(*args, **kwargs):
-        return {"status": "unavailable"}
-    
-    def session_dashboard(*args, **kwargs):
-        return {"message": "Session dashboard unavailable"}
-        
-    class BuildManager:
-        def __init__(self, *args, **kwargs):
-            pass
-        def get_builds(self):
-            return []
-    
-    SESSION_STATE = {"demo": True}
-    
-    def get_special_goals_data():
-        return {"goals": [], "status": "unavailable"}
-        
-    # Add other fallback implementations as needed
-    class GuideManager:
-        def get_guides(self):
-            return []
-    
-    class PlayerGuildTracker:
-        def __init__(self, *args, **kwargs):
-            pass
-        def get_guilds(self):
-            return []
-    
-    ms11_license_manager = None
-    progress_tracker = None
-    profile_manager = None
-    multi_character_manager = None
-    chat_session_manager = None
-    blog_manager = None
-    macro_safety_manager = None
-    heroic_support = None
-    vendor_price_scanner = None
-    vendor_price_alerts = None
-    identity_bridge = None
-    quest_heatmap_tracker = None
-    tools_manager = None
-    
-    # Additional fallback implementations
-    def analyze_character_build(*args, **kwargs):
-        return {"analysis": "unavailable"}
-    
-    def get_profession_recommendations(*args, **kwargs):
-        return []
-    
-    def get_equipment_recommendations(*args, **kwargs):
+from dashboard.lazy_imports import LazyImport, module_available, resolve
+from dashboard.lazy_routes import LazyRoutesFlask
+from dashboard.response_cache import ResponseCache
+
+# Optional subsystems are imported on first use rather than at startup; see
+# dashboard/lazy_imports.py.  Each name falls back to the limited-mode
+# implementation below when its module can't be imported.
+
+
+# Fallback implementations for limited mode
+def _fallback_load_session(*args, **kwargs):
+    return {"status": "unavailable"}
+
+
+def _fallback_session_dashboard(*args, **kwargs):
+    return {"message": "Session dashboard unavailable"}
+
+
+class _FallbackBuildManager:
+    def __init__(self, *args, **kwargs):
+        pass
+    def get_builds(self):
         return []
-    
-    def cross_character_dashboard(*args, **kwargs):
-        return {"message": "Cross-character dashboard unavailable"}
-    
-    def submit_player_tool(*args, **kwargs):
-        return {"status": "unavailable"}
-    
-    def get_player_tools(*args, **kwargs):
+
+
+def _fallback_special_goals_data():
+    return {"goals": [], "status": "unavailable"}
+
+
+class _FallbackGuideManager:
+    def get_guides(self):
         return []
-    
-    def get_tool_by_id(*args, **kwargs):
-        return None
-    
-    def increment_tool_views(*args, **kwargs):
+
+
+class _FallbackPlayerGuildTracker:
+    def __init__(self, *args, **kwargs):
         pass
-    
-    def get_tool_content(*args, **kwargs):
-        return ""
-    
-    def get_tools_stats(*args, **kwargs):
-        return {"stats": "unavailable"}
-
-# Additional module imports with fallbacks
-try:
-    from core.build_optimizer import analyze_character_build, get_profession_recommendations, get_equipment_recommendations
-    from core.cross_character_session_dashboard import cross_character_dashboard
-    from core.mods_hub_manager import mods_hub_manager, ModCategory, ModType, ModStatus
-    from core.quest_tracker import quest_tracker, QuestCategory, QuestDifficulty, QuestStatus, Planet, RewardType
-    from core.build_loader import get_build_loader
-    from optimizer.gear_advisor import get_gear_advisor, OptimizationType
-    EXTENDED_MODULES_AVAILABLE = True
-except ImportError as e:
-    EXTENDED_MODULES_AVAILABLE = False
-    # Use fallback implementations defined above
-# Final module imports with fallbacks
-try:
-    from api.public_build_browser import register_build_routes, get_build_browser
-    from api.build_showcase_api import register_build_showcase_routes
-    from api.player_encounter_api import register_player_encounter_routes
-    from tracking.item_scanner import get_item_scanner
-    from core.vendor_history_manager import get_vendor_history_manager, VendorHistoryFilter
-    API_MODULES_AVAILABLE = True
-except ImportError as e:
-    API_MODULES_AVAILABLE = False
-    
+    def get_guilds(self):
+        return []
+
+
+def _fallback_analyze_character_build(*args, **kwargs):
+    return {"analysis": "unavailable"}
+
+
+def _fallback_recommendations(*args, **kwargs):
+    return []
+
+
+def _fallback_cross_character_dashboard(*args, **kwargs):
+    return {"message": "Cross-character dashboard unavailable"}
+
+
+def _fallback_submit_player_tool(*args, **kwargs):
+    return {"status": "unavailable"}
+
+
+def _fallback_get_player_tools(*args, **kwargs):
+    return []
+
+
+def _fallback_none(*args, **kwargs):
+    return None
+
+
+def _fallback_get_tool_content(*args, **kwargs):
+    return ""
+
+
+def _fallback_get_tools_stats(*args, **kwargs):
+    return {"stats": "unavailable"}
+
+
+class _FallbackVendorHistoryFilter:
+    pass
+
+
+# Core modules
+CORE_MODULES_AVAILABLE = module_available(
+    "core.session_tracker", "core.session_report_dashboard", "core.ms11_license_manager",
+    "core.progress_tracker", "core.build_manager", "core.profile_loader", "profiles.special_goals",
+    "core.guide_manager", "core.player_guild_tracker", "core.player_profile_manager",
+    "core.multi_character_profile_manager", "core.chat_session_manager", "core.blog_engine",
+    "core.macro_safety", "core.heroic_support", "core.vendor_price_scanner",
+    "core.vendor_price_alerts", "core.steam_discord_bridge", "core.quest_heatmap_tracker",
+    "core.tools_manager",
+)
+if not CORE_MODULES_AVAILABLE:
+    print("[WARNING] Core modules not available")
+    print("[INFO] Dashboard running in limited mode")
+
+load_session = LazyImport("core.session_tracker", "load_session", fallback=_fallback_load_session)
+session_dashboard = LazyImport("core.session_report_dashboard", "session_dashboard",
+                               fallback=_fallback_session_dashboard)
+ms11_license_manager = LazyImport("core.ms11_license_manager", "ms11_license_manager", fallback=None)
+progress_tracker = LazyImport("core.progress_tracker", fallback=None)
+BuildManager = LazyImport("core.build_manager", "BuildManager", fallback=_FallbackBuildManager)
+SESSION_STATE = LazyImport("core.profile_loader", "SESSION_STATE", fallback={"demo": True})
+get_special_goals_data = LazyImport("profiles.special_goals", "get_dashboard_data",
+                                    fallback=_fallback_special_goals_data)
+GuideManager = LazyImport("core.guide_manager", "GuideManager", fallback=_FallbackGuideManager)
+GuideMetadata = LazyImport("core.guide_manager", "GuideMetadata")
+PlayerGuildTracker = LazyImport("core.player_guild_tracker", "PlayerGuildTracker",
+                                fallback=_FallbackPlayerGuildTracker)
+profile_manager = LazyImport("core.player_profile_manager", "profile_manager", fallback=None)
+multi_character_manager = LazyImport("core.multi_character_profile_manager", "multi_character_manager",
+                                     fallback=None)
+chat_session_manager = LazyImport("core.chat_session_manager", "chat_session_manager", fallback=None)
+blog_manager = LazyImport("core.blog_engine", "blog_manager", fallback=None)
+macro_safety_manager = LazyImport("core.macro_safety", "macro_safety_manager", fallback=None)
+heroic_support = LazyImport("core.heroic_support", "heroic_support", fallback=None)
+vendor_price_scanner = LazyImport("core.vendor_price_scanner", "vendor_price_scanner", fallback=None)
+vendor_price_alerts = LazyImport("core.vendor_price_alerts", "vendor_price_alerts", fallback=None)
+identity_bridge = LazyImport("core.steam_discord_bridge", "identity_bridge", fallback=None)
+quest_heatmap_tracker = LazyImport("core.quest_heatmap_tracker", "quest_heatmap_tracker", fallback=None)
+tools_manager = LazyImport("core.tools_manager", "tools_manager", fallback=None)
+submit_player_tool = LazyImport("core.tools_manager", "submit_player_tool",
+                                fallback=_fallback_submit_player_tool)
+get_player_tools = LazyImport("core.tools_manager", "get_player_tools", fallback=_fallback_get_player_tools)
+get_tool_by_id = LazyImport("core.tools_manager", "get_tool_by_id", fallback=_fallback_none)
+increment_tool_views = LazyImport("core.tools_manager", "increment_tool_views", fallback=_fallback_none)
+get_tool_content = LazyImport("core.tools_manager", "get_tool_content", fallback=_fallback_get_tool_content)
+get_tools_stats = LazyImport("core.tools_manager", "get_tools_stats", fallback=_fallback_get_tools_stats)
+
+# Additional modules
+EXTENDED_MODULES_AVAILABLE = module_available(
+    "core.build_optimizer", "core.cross_character_session_dashboard", "core.mods_hub_manager",
+    "core.quest_tracker", "core.build_loader", "optimizer.gear_advisor",
+)
+analyze_character_build = LazyImport("core.build_optimizer", "analyze_character_build",
+                                     fallback=_fallback_analyze_character_build)
+get_profession_recommendations = LazyImport("core.build_optimizer", "get_profession_recommendations",
+                                            fallback=_fallback_recommendations)
+get_equipment_recommendations = LazyImport("core.build_optimizer", "get_equipment_recommendations",
+                                           fallback=_fallback_recommendations)
+cross_character_dashboard = LazyImport("core.cross_character_session_dashboard", "cross_character_dashboard",
+                                       fallback=_fallback_cross_character_dashboard)
+mods_hub_manager = LazyImport("core.mods_hub_manager", "mods_hub_manager")
+ModCategory = LazyImport("core.mods_hub_manager", "ModCategory")
+ModType = LazyImport("core.mods_hub_manager", "ModType")
+ModStatus = LazyImport("core.mods_hub_manager", "ModStatus")
+quest_tracker = LazyImport("core.quest_tracker", "quest_tracker")
+QuestCategory = LazyImport("core.quest_tracker", "QuestCategory")
+QuestDifficulty = LazyImport("core.quest_tracker", "QuestDifficulty")
+QuestStatus = LazyImport("core.quest_tracker", "QuestStatus")
+Planet = LazyImport("core.quest_tracker", "Planet")
+RewardType = LazyImport("core.quest_tracker", "RewardType")
+get_build_loader = LazyImport("core.build_loader", "get_build_loader")
+get_gear_advisor = LazyImport("optimizer.gear_advisor", "get_gear_advisor")
+OptimizationType = LazyImport("optimizer.gear_advisor", "OptimizationType")
+
+# API modules.  Route registration needs the register functions at startup,
+# so only the data accessors are deferred.
+API_MODULES_AVAILABLE = module_available(
+    "api.public_build_browser", "api.build_showcase_api", "api.player_encounter_api",
+    "tracking.item_scanner", "core.vendor_history_manager",
+)
+if API_MODULES_AVAILABLE:
+    try:
+        from api.public_build_browser import register_build_routes
+        from api.build_showcase_api import register_build_showcase_routes
+        from api.player_encounter_api import register_player_encounter_routes
+    except ImportError:
+        API_MODULES_AVAILABLE = False
+
+if not API_MODULES_AVAILABLE:
     # API fallback implementations
     def register_build_routes(app):
         @app.route('/builds')
         def builds():
             return jsonify({"message": "Build browser unavailable"})
     
-    def get_build_browser():
-        return None
-    
     def register_build_showcase_routes(app):
         @app.route('/showcase')
         def showcase():
@@ -149,15 +187,13 @@ except ImportError as e:
     
     def register_player_encounter_routes(app):
         pass
-    
-    def get_item_scanner():
-        return None
-    
-    def get_vendor_history_manager():
-        return None
-    
-    class VendorHistoryFilter:
-        pass
+
+get_build_browser = LazyImport("api.public_build_browser", "get_build_browser", fallback=_fallback_none)
+get_item_scanner = LazyImport("tracking.item_scanner", "get_item_scanner", fallback=_fallback_none)
+get_vendor_history_manager = LazyImport("core.vendor_history_manager", "get_vendor_history_manager",
+                                        fallback=_fallback_none)
+VendorHistoryFilter = LazyImport("core.vendor_history_manager", "VendorHistoryFilter",
+                                 fallback=_FallbackVendorHistoryFilter)
 
 # Runtime session data placeholder
 session_state: dict = {}
@@ -168,14 +204,27 @@ BUILD_DIR = Path(__file__).resolve().parents[1] / "profiles" / "builds"
 # Potential locations for session logs
 LOG_DIRS = [Path("logs"), Path("logs/sessions"), Path("data") / "session_logs", Path("session_logs"), Path("dashboard") / "sessions"]
 
-app = Flask(__name__)
+# Where core.build_loader keeps its data is not known here, so build API
+# responses also expire after this many seconds
+BUILD_CACHE_TTL = 30.0
+
+# How long /status may be served from cache when only in-memory state changed
+STATUS_CACHE_TTL = 5.0
+
+# URL rules are compiled on the first request; see dashboard/lazy_routes.py
+app = LazyRoutesFlask(__name__)
 app.secret_key = 'your-secret-key-here'  # Required for session management
 
-# Initialize guide manager
-guide_manager = GuideManager()
+# Cached responses for read-heavy endpoints, invalidated by data-file changes
+response_cache = ResponseCache()
 
-# Initialize player/guild tracker
-player_guild_tracker = PlayerGuildTracker()
+# Initialize guide manager (on first use)
+guide_manager = LazyImport("core.guide_manager", "GuideManager", fallback=_FallbackGuideManager,
+                           factory=lambda cls: cls())
+
+# Initialize player/guild tracker (on first use)
+player_guild_tracker = LazyImport("core.player_guild_tracker", "PlayerGuildTracker",
+                                  fallback=_FallbackPlayerGuildTracker, factory=lambda cls: cls())
 
 # Register public build browser routes
 register_build_routes(app)
@@ -317,9 +366,33 @@ def _calculate_session_stats(session: Dict[str, Any]) -> Dict[str, Any]:
     return stats
 
 
+def _build_data_dependencies() -> List[Path]:
+    """Files the build API responses are known to depend on (see BUILD_CACHE_TTL)."""
+    return [BUILD_DIR]
+
+
+def _session_log_dependencies() -> List[Path]:
+    """Session files the statistics are derived from.
+
+    Only the ``*.json`` files directly in each log directory are read (see
+    ``_load_session_logs``); the text logs written next to them are not
+    dependencies.
+    """
+    return [directory / "*.json" for directory in LOG_DIRS]
+
+
+def _status_dependencies() -> List[Path]:
+    """Files the status page is derived from."""
+    paths = _session_log_dependencies() + [BUILD_DIR]
+    state = resolve(SESSION_STATE)
+    if isinstance(state, (str, Path)):
+        paths.append(Path(state))
+    return paths
+
+
 def _get_progress(build_name: str | None) -> dict:
     """Return progress details for ``build_name`` using the tracker."""
-    progress_data = progress_tracker.load_session(SESSION_STATE)
+    progress_data = progress_tracker.load_session(resolve(SESSION_STATE))
     completed = progress_data.get("completed_skills", [])
 
     info = {"completed_skills": completed, "next_skill": None, "percent": 0}
@@ -395,6 +468,7 @@ def player_encounters():
 
 
 @app.route("/api/builds")
+@response_cache.cached(_build_data_dependencies, ttl=BUILD_CACHE_TTL)
 def api_builds():
     """API endpoint for community builds data."""
     try:
@@ -489,6 +563,7 @@ def api_select_build(build_id):
 
 
 @app.route("/api/builds/search")
+@response_cache.cached(_build_data_dependencies, ttl=BUILD_CACHE_TTL)
 def api_search_builds_main():
     """API endpoint to search builds with filters."""
     try:
@@ -544,6 +619,7 @@ def api_search_builds_main():
 
 
 @app.route("/api/builds/top-performing")
+@response_cache.cached(_build_data_dependencies, ttl=BUILD_CACHE_TTL)
 def api_top_performing_builds():
     """API endpoint to get top performing builds by category."""
     try:
@@ -575,6 +651,8 @@ def api_top_performing_builds():
 
 
 @app.route("/status")
+@response_cache.cached(_status_dependencies, ttl=STATUS_CACHE_TTL,
+                       vary=lambda: session_state.get("profile", {}).get("skill_build"))
 def status():
     log_path = _latest_session_log()
     data = None
@@ -720,6 +798,7 @@ def api_recent_sessions():
 
 
 @app.route("/api/sessions/stats")
+@response_cache.cached(_session_log_dependencies)
 def api_sessions_stats():
     """API endpoint for aggregate session statistics."""
     filters = {
@@ -735,6 +814,12 @@ def api_sessions_stats():
     return jsonify(stats)
 
 
+@app.route("/api/cache/stats")
+def api_cache_stats():
+    """API endpoint for response cache hit rates."""
+    return jsonify(response_cache.stats())
+
+
 # Cross-Character Session Dashboard Routes
 @app.route("/my-dashboard/sessions")
 def my_dashboard_sessions():
@@ -6126,4 +6211,9 @@ def ms11_admin_remove_license(discord_id):
 
 
 if __name__ == "__main__":
+    import sys
+    if "--profile-imports" in sys.argv:
+        # Per-module import-time breakdown of a cold dashboard start
+        from perf.import_profiler import main as profile_imports_main
+        sys.exit(profile_imports_main(["dashboard.app", "--benchmark", "3"]))
     app.run(host="127.0.0.1", port=8000)
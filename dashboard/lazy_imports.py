@@ -0,0 +1,159 @@
+"""Deferred imports for the dashboard's optional subsystems.
+
+``dashboard/app.py`` references dozens of optional managers (guides, blog,
+vendor scanners, quest tracker, ...) from its route handlers.  Importing
+them all when the app module loads makes every dashboard start pay for
+every subsystem, so the app binds each name to a :class:`LazyImport`
+instead.  The real module is imported the first time a handler touches
+the name; if that import fails, the name resolves to its fallback just
+like the old ``try/except ImportError`` blocks did.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def module_available(*module_names: str) -> bool:
+    """Return ``True`` if every module can be found, without importing it."""
+    for name in module_names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
+
+class LazyImport:
+    """Stand-in for ``from module import attr`` that imports on first use.
+
+    Parameters
+    ----------
+    module : str
+        Module to import
+    attr : str, optional
+        Attribute to take from the module; the module itself if omitted
+    fallback : Any, optional
+        Value used when the import fails.  Without a fallback the
+        ``ImportError`` propagates to the caller on every use.
+    factory : callable, optional
+        Called with the imported value (or the fallback) to build the final
+        object, e.g. to instantiate a manager class once on first use
+    """
+
+    __slots__ = ('_module', '_attr', '_fallback', '_factory', '_value', '_error', '_lock')
+
+    def __init__(self, module: str, attr: Optional[str] = None, fallback: Any = _MISSING,
+                 factory: Optional[Callable[[Any], Any]] = None):
+        object.__setattr__(self, '_module', module)
+        object.__setattr__(self, '_attr', attr)
+        object.__setattr__(self, '_fallback', fallback)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_value', _MISSING)
+        object.__setattr__(self, '_error', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the import has been attempted."""
+        return self._value is not _MISSING or self._error is not None
+
+    def resolve(self) -> Any:
+        """Import (once) and return the real object."""
+        value = self._value
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            if self._value is _MISSING and self._error is None:
+                try:
+                    value = importlib.import_module(self._module)
+                    if self._attr:
+                        try:
+                            value = getattr(value, self._attr)
+                        except AttributeError as e:
+                            raise ImportError(
+                                f"cannot import name {self._attr!r} from {self._module!r}"
+                            ) from e
+                    if self._factory is not None:
+                        value = self._factory(value)
+                    object.__setattr__(self, '_value', value)
+                except ImportError as e:
+                    if self._fallback is _MISSING:
+                        object.__setattr__(self, '_error', e)
+                    else:
+                        logger.warning("Optional dashboard module %s unavailable: %s", self._module, e)
+                        fallback = self._fallback
+                        if self._factory is not None and fallback is not None:
+                            fallback = self._factory(fallback)
+                        object.__setattr__(self, '_value', fallback)
+            if self._error is not None:
+                raise ImportError(
+                    f"{self._module}.{self._attr or ''} is unavailable: {self._error}"
+                ) from self._error
+            return self._value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.resolve()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.resolve()[key]
+
+    def __bool__(self) -> bool:
+        return bool(self.resolve())
+
+    def __eq__(self, other: Any) -> bool:
+        return self.resolve() == resolve(other)
+
+    def __hash__(self) -> int:
+        return hash(self.resolve())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyImport {self._module}:{self._attr or ''} ({state})>"
+
+
+def resolve(value: Any) -> Any:
+    """Unwrap a :class:`LazyImport`; other values are returned unchanged.
+
+    Use this where a lazily imported value is passed to code that checks
+    its type, e.g. a state dict handed to another module.
+    """
+    if isinstance(value, LazyImport):
+        return value.resolve()
+    return value
+
+
+def loaded_imports(namespace: dict) -> dict:
+    """Map each :class:`LazyImport` in ``namespace`` to whether it has loaded."""
+    return {
+        name: value.loaded
+        for name, value in namespace.items()
+        if isinstance(value, LazyImport)
+    }
+
+
+__all__ = ["LazyImport", "module_available", "resolve", "loaded_imports"]
@@ -0,0 +1,89 @@
+"""Deferred URL rule compilation for the dashboard app.
+
+Werkzeug compiles a matcher and a URL builder for every rule as soon as it
+is added, and ``dashboard/app.py`` registers more than 220 of them, which
+made route setup the largest single cost of importing the dashboard.
+:class:`LazyRoutesFlask` keeps the rules (and all endpoint bookkeeping)
+but compiles them the first time the URL map is actually used, i.e. on the
+first request or ``url_for`` call.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, List
+
+from flask import Flask
+from werkzeug.routing import Map
+
+
+class LazyMap(Map):
+    """URL map that compiles added rules on first use."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._pending: List[Any] = []
+        self._pending_lock = threading.Lock()
+        # Only set once every pending rule has been added to the real map
+        self._compiled = True
+        super().__init__(*args, **kwargs)
+
+    @property
+    def pending_rules(self) -> int:
+        """Number of rules added but not yet compiled."""
+        return len(self._pending)
+
+    def add(self, rulefactory: Any) -> None:
+        with self._pending_lock:
+            self._pending.append(rulefactory)
+            self._compiled = False
+
+    def compile_pending(self) -> None:
+        """Compile every rule added so far.
+
+        Callers that find work to do wait on the lock until the map is
+        complete, so no request matches against a partly built map.
+        """
+        if self._compiled:
+            return
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+            for rulefactory in pending:
+                super().add(rulefactory)
+            self._compiled = True
+
+    def bind(self, *args: Any, **kwargs: Any):
+        self.compile_pending()
+        return super().bind(*args, **kwargs)
+
+    def bind_to_environ(self, *args: Any, **kwargs: Any):
+        self.compile_pending()
+        return super().bind_to_environ(*args, **kwargs)
+
+    def iter_rules(self, endpoint: Any = None):
+        self.compile_pending()
+        return super().iter_rules(endpoint)
+
+    def is_endpoint_expecting(self, endpoint: Any, *arguments: str) -> bool:
+        self.compile_pending()
+        return super().is_endpoint_expecting(endpoint, *arguments)
+
+    def update(self) -> None:
+        self.compile_pending()
+        super().update()
+
+    def __repr__(self) -> str:
+        self.compile_pending()
+        return super().__repr__()
+
+
+class LazyRoutesFlask(Flask):
+    """Flask app whose URL rules are compiled on first use.
+
+    View functions are still registered immediately, so duplicate endpoint
+    errors surface at import time as before.
+    """
+
+    url_map_class = LazyMap
+
+
+__all__ = ["LazyMap", "LazyRoutesFlask"]
@@ -0,0 +1,301 @@
+"""Response cache for read-heavy dashboard JSON endpoints.
+
+Endpoints decorated with :meth:`ResponseCache.cached` keep their rendered
+response keyed on the route and normalized query arguments.  An entry stays
+valid while the files it was built from are unchanged (names, mtime and
+size).  Those files are re-checked at most once per ``check_interval`` for
+each set of dependencies, so a burst of requests costs one directory walk
+instead of re-reading and re-aggregating the files each time.  Responses
+carry ``ETag`` and ``Last-Modified``, conditional requests are answered
+with ``304``, and large bodies are gzipped once when cached.
+"""
+
+from __future__ import annotations
+
+import functools
+import glob
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Response, make_response, request
+
+DependencyFunc = Callable[[], Iterable[Path]]
+
+
+@dataclass
+class _CachedResponse:
+    validator: str
+    expires: Optional[float]
+    body: bytes
+    gzipped: Optional[bytes]
+    status: int
+    mimetype: str
+    etag: str
+    last_modified: datetime
+
+
+def _stat_tree(path: Path, entries: list) -> float:
+    """Append ``(path, mtime_ns, size)`` for ``path`` and any files below it.
+
+    Returns the newest mtime seen (epoch seconds), 0 if nothing exists.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 0.0
+    entries.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+    newest = stat.st_mtime
+    if os.path.isdir(path):
+        try:
+            with os.scandir(path) as it:
+                children = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return newest
+        for entry in children:
+            if entry.is_dir(follow_symlinks=False):
+                newest = max(newest, _stat_tree(Path(entry.path), entries))
+            else:
+                try:
+                    child = entry.stat()
+                except OSError:
+                    continue
+                entries.append(f"{entry.path}:{child.st_mtime_ns}:{child.st_size}")
+                newest = max(newest, child.st_mtime)
+    return newest
+
+
+def _stat_glob(pattern: str, entries: list) -> float:
+    """Append ``(path, mtime_ns, size)`` for the files matching ``pattern``.
+
+    Only the matches are stat-ed (no recursion), so other files growing in
+    the same directory do not change the fingerprint.
+    """
+    newest = 0.0
+    for match in sorted(glob.glob(pattern)):
+        try:
+            stat = os.stat(match)
+        except OSError:
+            continue
+        entries.append(f"{match}:{stat.st_mtime_ns}:{stat.st_size}")
+        newest = max(newest, stat.st_mtime)
+    return newest
+
+
+def _roots(paths: Iterable[Path]) -> List[Path]:
+    """Drop paths that sit below another listed path (walked once already)."""
+    unique = sorted({os.path.abspath(p) for p in paths})
+    roots: List[str] = []
+    for path in unique:
+        if not any(path.startswith(root.rstrip(os.sep) + os.sep) for root in roots):
+            roots.append(path)
+    return [Path(p) for p in roots]
+
+
+def fingerprint(paths: Iterable[Path]) -> Tuple[str, float]:
+    """Return a validator for the current state of ``paths`` and their newest mtime.
+
+    A path containing glob characters (``logs/*.json``) covers only its
+    matches; any other path covers itself and every file below it.  The
+    validator covers every file name, so removing a file changes it even
+    when the newest mtime stays the same or moves backwards.
+    """
+    entries: list = []
+    newest = 0.0
+    for path in _roots(paths):
+        if glob.has_magic(str(path)):
+            newest = max(newest, _stat_glob(str(path), entries))
+        else:
+            newest = max(newest, _stat_tree(path, entries))
+    digest = hashlib.blake2b("\n".join(entries).encode("utf-8"), digest_size=16).hexdigest()
+    return digest, newest
+
+
+class ResponseCache:
+    """Per-route response cache invalidated by data-file changes.
+
+    Parameters
+    ----------
+    max_entries : int
+        Cached responses kept (least recently used are evicted)
+    gzip_min_size : int
+        Bodies at least this large are gzipped for clients that accept it
+    check_interval : float
+        Seconds a dependency fingerprint is trusted before the files are
+        stat-ed again
+    clock : callable
+        Time source for TTLs and fingerprint checks
+    """
+
+    def __init__(self, max_entries: int = 256, gzip_min_size: int = 1024,
+                 check_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.gzip_min_size = gzip_min_size
+        self.check_interval = check_interval
+        self._clock = clock
+        self._entries: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._fingerprints: Dict[Tuple[str, ...], Tuple[float, str, float]] = {}
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.counters = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "uncacheable": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the hit rate over all cacheable lookups."""
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["entries"] = entries
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        return counters
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self.counters:
+                self.counters[name] = 0
+
+    @staticmethod
+    def request_key() -> str:
+        """Route plus query arguments in a stable order."""
+        args = sorted(request.args.items(multi=True))
+        query = "&".join(f"{k}={v}" for k, v in args)
+        return f"{request.endpoint}:{request.path}?{query}"
+
+    def _fingerprint(self, paths: Iterable[Path]) -> Tuple[str, float]:
+        """:func:`fingerprint`, reused for ``check_interval`` seconds."""
+        key = tuple(str(p) for p in paths)
+        now = self._clock()
+        with self._lock:
+            checked = self._fingerprints.get(key)
+        if checked is not None and now - checked[0] < self.check_interval:
+            return checked[1], checked[2]
+        validator, newest = fingerprint(key)
+        with self._lock:
+            self._fingerprints[key] = (now, validator, newest)
+        return validator, newest
+
+    def _store(self, key: str, validator: str, ttl: Optional[float], response: Response,
+               newest: float) -> _CachedResponse:
+        body = response.get_data()
+        etag = '"' + hashlib.sha1(validator.encode("utf-8") + body).hexdigest() + '"'
+        # When the entry was built (or the newest file, if its clock runs ahead)
+        last_modified = datetime.fromtimestamp(int(max(newest, time.time())), tz=timezone.utc)
+        with self._lock:
+            previous = self._entries.get(key)
+        if previous is not None and last_modified <= previous.last_modified:
+            # A deleted file can move the newest mtime backwards; the rebuilt
+            # entry must still look newer than the one clients hold
+            last_modified = previous.last_modified + timedelta(seconds=1)
+        entry = _CachedResponse(
+            validator=validator,
+            expires=self._clock() + ttl if ttl is not None else None,
+            body=body,
+            gzipped=gzip.compress(body, 6) if len(body) >= self.gzip_min_size else None,
+            status=response.status_code,
+            mimetype=response.mimetype,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _lookup(self, key: str, validator: str) -> Optional[_CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.validator != validator or (entry.expires is not None and entry.expires < self._clock()):
+                # Left in place until replaced; _store reads its Last-Modified
+                self.counters["invalidations"] += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def _not_modified(entry: _CachedResponse) -> bool:
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(entry.etag.strip('"'))
+        since = request.if_modified_since
+        return since is not None and entry.last_modified <= since
+
+    def _respond(self, entry: _CachedResponse) -> Response:
+        if self._not_modified(entry):
+            self._count("not_modified")
+            response = Response(status=304)
+        else:
+            use_gzip = entry.gzipped is not None and "gzip" in request.accept_encodings
+            response = Response(entry.gzipped if use_gzip else entry.body,
+                                status=entry.status, mimetype=entry.mimetype)
+            if use_gzip:
+                response.headers["Content-Encoding"] = "gzip"
+        if entry.gzipped is not None:
+            response.vary.add("Accept-Encoding")
+        response.headers["ETag"] = entry.etag
+        response.last_modified = entry.last_modified
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def cached(self, dependencies: DependencyFunc, ttl: Optional[float] = None,
+               vary: Optional[Callable[[], Any]] = None) -> Callable:
+        """Decorate a view so its successful responses are cached.
+
+        Parameters
+        ----------
+        dependencies : callable
+            Returns the files, directories or glob patterns the response is
+            built from; it is called per request so patched module paths are
+            honoured
+        ttl : float, optional
+            Also expire entries after this many seconds, for responses that
+            depend on state other than files
+        vary : callable, optional
+            Returns extra state to include in the cache key
+        """
+        def decorator(view: Callable) -> Callable:
+            @functools.wraps(view)
+            def wrapper(*args: Any, **kwargs: Any):
+                if not self.enabled or request.method not in ("GET", "HEAD"):
+                    return view(*args, **kwargs)
+
+                key = self.request_key()
+                if vary is not None:
+                    key += f"|{vary()!r}"
+                validator, newest = self._fingerprint(dependencies())
+
+                entry = self._lookup(key, validator)
+                if entry is not None:
+                    self._count("hits")
+                    return self._respond(entry)
+
+                self._count("misses")
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    self._count("uncacheable")
+                    return response
+                return self._respond(self._store(key, validator, ttl, response, newest))
+            return wrapper
+        return decorator
+
+
+__all__ = ["ResponseCache", "fingerprint"]
@@ -0,0 +1,397 @@
+"""Single-pass aggregation for the public data exporter.
+
+The exporter's summaries are produced by pluggable reducers fed from one
+pass over the data sources:
+
+- Snapshot sources (the progress tracker and heroics index) are parsed
+  once per export and handed to every snapshot reducer.
+- Session logs are append-only, so session reducers keep a checkpointed
+  state and each export only parses logs that appeared since the last run.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+from android_ms11.utils.logging_utils import log_event
+
+
+CHECKPOINT_VERSION = 1
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class Reducer:
+    """Folds exporter records into a state and turns it into a summary.
+
+    Reducers with ``incremental = True`` receive session logs and must keep
+    a JSON-serializable state, which is checkpointed between exports.
+    Other reducers receive snapshot sources and start from a fresh state on
+    every export.
+    """
+
+    name = "reducer"
+    incremental = False
+
+    def initial_state(self) -> Dict[str, Any]:
+        return {}
+
+    def feed_snapshot(self, state: Dict[str, Any], source: str, data: Any) -> None:
+        """Consume a snapshot source such as ``"progress"`` or ``"heroics"``."""
+
+    def feed_session(self, state: Dict[str, Any], session: Dict[str, Any]) -> None:
+        """Consume one parsed session log."""
+
+    def finalize(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the summary, or ``None`` if there was no data."""
+        return None
+
+
+class QuestSummaryReducer(Reducer):
+    """Quest tracking summary from the progress tracker checklists."""
+
+    name = "quest_tracking"
+
+    def initial_state(self) -> Dict[str, Any]:
+        return {"loaded": False, "quests": []}
+
+    def feed_snapshot(self, state: Dict[str, Any], source: str, data: Any) -> None:
+        if source != "progress":
+            return
+        state["loaded"] = True
+        for checklist_name, checklist_data in data.get("checklists", {}).items():
+            if "quest" in checklist_name.lower() or "heroic" in checklist_name.lower():
+                for item in checklist_data.get("items", []):
+                    state["quests"].append({
+                        "name": item.get("name", ""),
+                        "status": item.get("status", "not_started"),
+                        "progress": item.get("progress", 0.0),
+                        "xp_reward": item.get("xp_reward", 0),
+                        "credit_reward": item.get("credit_reward", 0),
+                        "category": item.get("category", ""),
+                        "location": item.get("location", ""),
+                        "created_at": item.get("created_at", ""),
+                        "completed_at": item.get("completed_at", "")
+                    })
+
+    def finalize(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not state["loaded"]:
+            return None
+        quests = state["quests"]
+        cutoff_date = datetime.now() - timedelta(days=7)
+
+        completed_quests = 0
+        active_quests = 0
+        total_xp = 0
+        total_credits = 0
+        recent_completions = []
+        quest_categories: Dict[str, int] = {}
+        for quest in quests:
+            status = quest["status"]
+            if status == "completed":
+                completed_quests += 1
+                total_xp += quest["xp_reward"]
+                total_credits += quest["credit_reward"]
+                if quest["completed_at"]:
+                    try:
+                        if _parse_time(quest["completed_at"]) > cutoff_date:
+                            recent_completions.append(quest)
+                    except (AttributeError, TypeError, ValueError):
+                        pass
+            elif status in ["in_progress", "started"]:
+                active_quests += 1
+            category = quest["category"] or "general"
+            quest_categories[category] = quest_categories.get(category, 0) + 1
+
+        total_quests = len(quests)
+        return {
+            "total_quests": total_quests,
+            "completed_quests": completed_quests,
+            "active_quests": active_quests,
+            "quest_completion_rate": completed_quests / total_quests if total_quests > 0 else 0.0,
+            "total_xp_from_quests": total_xp,
+            "total_credits_from_quests": total_credits,
+            "recent_completions": recent_completions[:10],
+            "quest_categories": quest_categories,
+        }
+
+
+class HeroicReadinessReducer(Reducer):
+    """Heroic readiness from the heroics index and completed checklist items."""
+
+    name = "heroic_readiness"
+    character_level = 80  # Placeholder - would come from character data
+
+    def initial_state(self) -> Dict[str, Any]:
+        return {"heroics": None, "completed": []}
+
+    def feed_snapshot(self, state: Dict[str, Any], source: str, data: Any) -> None:
+        if source == "heroics":
+            state["heroics"] = (data or {}).get("heroics", {})
+        elif source == "progress":
+            completed = set(state["completed"])
+            for checklist_name, checklist_data in data.get("checklists", {}).items():
+                if "heroic" in checklist_name.lower():
+                    for item in checklist_data.get("items", []):
+                        if item.get("status") == "completed":
+                            completed.add(item.get("name", "").lower())
+            state["completed"] = sorted(completed)
+
+    def finalize(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        heroics = state["heroics"]
+        if heroics is None:
+            return None
+        completed = set(state["completed"])
+        character_level = self.character_level
+        total_heroics = len(heroics)
+
+        missing_prerequisites = []
+        if character_level < 80:
+            missing_prerequisites.append(f"Character level {character_level}/80")
+
+        recommended_heroics = []
+        for heroic_info in heroics.values():
+            heroic_name = heroic_info.get("name", "")
+            level_requirement = heroic_info.get("level_requirement", 0)
+            if character_level >= level_requirement and heroic_name.lower() not in completed:
+                recommended_heroics.append({
+                    "name": heroic_name,
+                    "planet": heroic_info.get("planet", ""),
+                    "level_requirement": level_requirement,
+                    "group_size": heroic_info.get("group_size", ""),
+                    "difficulty_tiers": heroic_info.get("difficulty_tiers", [])
+                })
+        recommended_heroics.sort(key=lambda x: x["level_requirement"])
+
+        return {
+            "total_heroics": total_heroics,
+            "completed_heroics": len(completed),
+            "available_heroics": len(recommended_heroics),
+            "heroic_completion_rate": len(completed) / total_heroics if total_heroics > 0 else 0.0,
+            "character_level": character_level,
+            "readiness_score": min(1.0, character_level / 90.0),
+            "missing_prerequisites": missing_prerequisites,
+            "recommended_heroics": recommended_heroics[:5],
+        }
+
+
+class BotMetricsReducer(Reducer):
+    """Running totals over session logs."""
+
+    name = "bot_metrics"
+    incremental = True
+    recent_limit = 20
+
+    def initial_state(self) -> Dict[str, Any]:
+        return {
+            "total_xp_gained": 0,
+            "total_credits_gained": 0,
+            "session_count": 0,
+            "total_session_time": 0.0,
+            "success_sum": 0.0,
+            "success_count": 0,
+            "efficiency_sum": 0.0,
+            "efficiency_count": 0,
+            "profession_levels": {},
+            "recent_activity": [],
+        }
+
+    def feed_session(self, state: Dict[str, Any], session: Dict[str, Any]) -> None:
+        state["total_xp_gained"] += session.get("total_xp_gained", 0)
+        state["total_credits_gained"] += session.get("total_credits_gained", 0)
+        state["session_count"] += 1
+
+        start_time = session.get("start_time")
+        end_time = session.get("end_time")
+        if start_time and end_time:
+            try:
+                duration = (_parse_time(end_time) - _parse_time(start_time)).total_seconds() / 3600
+                state["total_session_time"] += duration
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+        success_rate = session.get("success_rate", 0.0)
+        efficiency_score = session.get("efficiency_score", 0.0)
+        if success_rate is not None:
+            state["success_sum"] += success_rate
+            state["success_count"] += 1
+        if efficiency_score is not None:
+            state["efficiency_sum"] += efficiency_score
+            state["efficiency_count"] += 1
+
+        profession = session.get("profession")
+        character_level = session.get("character_level")
+        if profession and character_level:
+            levels = state["profession_levels"]
+            levels[profession] = max(levels.get(profession, 0), character_level)
+
+        # Only the most recent sessions are ever reported
+        recent = state["recent_activity"]
+        recent.append({
+            "session_id": session.get("session_id", ""),
+            "start_time": start_time,
+            "total_xp_gained": session.get("total_xp_gained", 0),
+            "total_credits_gained": session.get("total_credits_gained", 0),
+            "success_rate": success_rate,
+            "efficiency_score": efficiency_score
+        })
+        recent.sort(key=lambda x: x.get("start_time") or "", reverse=True)
+        del recent[self.recent_limit:]
+
+    def finalize(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        session_count = state["session_count"]
+        if not session_count:
+            return None
+        return {
+            "total_xp_gained": state["total_xp_gained"],
+            "total_credits_gained": state["total_credits_gained"],
+            "profession_levels": dict(state["profession_levels"]),
+            "session_count": session_count,
+            "total_session_time": state["total_session_time"],
+            "average_session_duration": state["total_session_time"] / session_count,
+            "success_rate": (state["success_sum"] / state["success_count"]
+                             if state["success_count"] else 0.0),
+            "efficiency_score": (state["efficiency_sum"] / state["efficiency_count"]
+                                 if state["efficiency_count"] else 0.0),
+            "recent_activity": list(state["recent_activity"]),
+        }
+
+
+def default_reducers() -> List[Reducer]:
+    """Reducers for the summaries published by the exporter."""
+    return [QuestSummaryReducer(), BotMetricsReducer(), HeroicReadinessReducer()]
+
+
+class ExportAggregator:
+    """Feeds every reducer from a single pass over the export sources."""
+
+    def __init__(self, reducers: Iterable[Reducer], checkpoint_path: Optional[Path] = None):
+        """Initialize the aggregator.
+
+        Parameters
+        ----------
+        reducers : iterable of Reducer
+            Reducers to feed; names must be unique
+        checkpoint_path : Path, optional
+            File holding incremental reducer state between runs
+        """
+        self.reducers = list(reducers)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.last_run: Dict[str, Any] = {}
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if self.checkpoint_path is None:
+            return {}
+        try:
+            checkpoint = json.loads(self.checkpoint_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            return {}
+        return checkpoint
+
+    def _save_checkpoint(self, processed: Dict[str, List[int]], states: Dict[str, Any]) -> None:
+        if self.checkpoint_path is None:
+            return
+        try:
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+            tmp.write_text(json.dumps({
+                "version": CHECKPOINT_VERSION,
+                "updated": datetime.now().isoformat(),
+                "processed": processed,
+                "states": states,
+            }))
+            os.replace(tmp, self.checkpoint_path)
+        except OSError as e:
+            log_event(f"[PUBLIC_DATA_EXPORTER] Error saving export checkpoint: {e}")
+
+    def run(self, snapshots: Dict[str, Any], session_files: Iterable[Path]) -> Dict[str, Any]:
+        """Feed all reducers and return their summaries keyed by reducer name.
+
+        Parameters
+        ----------
+        snapshots : dict
+            Parsed snapshot sources keyed by source name; missing sources
+            are simply not fed
+        session_files : iterable of Path
+            Session log files; only files not seen by a previous run (or
+            all of them, if an earlier file changed or disappeared) are
+            parsed
+
+        Returns
+        -------
+        dict
+            Reducer name to summary (``None`` when the reducer had no data)
+        """
+        incremental = [r for r in self.reducers if r.incremental]
+        checkpoint = self._load_checkpoint()
+        processed: Dict[str, List[int]] = checkpoint.get("processed", {})
+        saved_states: Dict[str, Any] = checkpoint.get("states", {})
+
+        signatures: Dict[str, List[int]] = {}
+        paths: Dict[str, Path] = {}
+        for path in session_files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signatures[path.name] = [stat.st_mtime_ns, stat.st_size]
+            paths[path.name] = path
+
+        # Reducer state can't un-count a log, so any rewrite or removal of
+        # an already processed log means starting over
+        rebuilt = (
+            any(signatures.get(name) != signature for name, signature in processed.items())
+            or any(r.name not in saved_states for r in incremental)
+        )
+        if rebuilt:
+            processed = {}
+            saved_states = {}
+
+        states = {
+            r.name: saved_states[r.name] if r.incremental and r.name in saved_states
+            else r.initial_state()
+            for r in self.reducers
+        }
+
+        new_logs = sorted(name for name in signatures if name not in processed)
+        for name in new_logs:
+            processed[name] = signatures[name]
+            try:
+                with open(paths[name], 'r') as f:
+                    session = json.load(f)
+            except Exception as e:
+                log_event(f"[PUBLIC_DATA_EXPORTER] Error processing session file {paths[name]}: {e}")
+                continue
+            for reducer in incremental:
+                reducer.feed_session(states[reducer.name], session)
+
+        for source, data in snapshots.items():
+            for reducer in self.reducers:
+                if not reducer.incremental:
+                    reducer.feed_snapshot(states[reducer.name], source, data)
+
+        if new_logs or rebuilt:
+            self._save_checkpoint(processed, {r.name: states[r.name] for r in incremental})
+
+        self.last_run = {
+            "sessions_processed": len(new_logs),
+            "sessions_total": len(signatures),
+            "rebuilt": rebuilt,
+        }
+        return {r.name: r.finalize(states[r.name]) for r in self.reducers}
+
+
+__all__ = [
+    "Reducer",
+    "QuestSummaryReducer",
+    "BotMetricsReducer",
+    "HeroicReadinessReducer",
+    "ExportAggregator",
+    "default_reducers",
+]
@@ -13,6 +13,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 from android_ms11.utils.logging_utils import log_event
+from exporters.export_aggregator import ExportAggregator, default_reducers
 
 
 @dataclass
@@ -76,261 +77,126 @@ class PublicDataExporter:
         self.export_dir = Path("data/exported")
         self.export_dir.mkdir(parents=True, exist_ok=True)
         
+        # Session log reducer state carried between exports
+        self.aggregator = ExportAggregator(
+            default_reducers(), self.data_dir / "public_export_checkpoint.json"
+        )
+        
         log_event("[PUBLIC_DATA_EXPORTER] Public data exporter initialized")
 
-    def export_quest_tracking_summary(self) -> QuestTrackingSummary:
-        """Export quest tracking summary data."""
+    def _load_snapshots(self) -> Dict[str, Any]:
+        """Parse the snapshot sources shared by the reducers, once each."""
+        snapshots = {}
+        progress_file = self.data_dir / "enhanced_progress_tracker.json"
+        if progress_file.exists():
+            try:
+                with open(progress_file, 'r') as f:
+                    snapshots["progress"] = json.load(f)
+            except Exception as e:
+                log_event(f"[PUBLIC_DATA_EXPORTER] Error loading progress tracker: {e}")
+        
+        heroics_index_file = self.data_dir / "heroics" / "heroics_index.yml"
+        if heroics_index_file.exists():
+            try:
+                with open(heroics_index_file, 'r') as f:
+                    snapshots["heroics"] = yaml.safe_load(f) or {}
+            except Exception as e:
+                log_event(f"[PUBLIC_DATA_EXPORTER] Error loading heroics index: {e}")
+        return snapshots
+
+    def aggregate(self) -> Dict[str, Any]:
+        """Run every reducer over the data and session logs in one pass.
+
+        Session logs already folded into the checkpoint are not parsed
+        again.
+
+        Returns
+        -------
+        dict
+            Reducer name to summary data (``None`` when there was no data)
+        """
+        results = self.aggregator.run(self._load_snapshots(), self.session_logs_dir.glob("*.json"))
+        run = self.aggregator.last_run
+        log_event(f"[PUBLIC_DATA_EXPORTER] Aggregated {run['sessions_processed']}/"
+                  f"{run['sessions_total']} session logs"
+                  + (" (rebuilt)" if run["rebuilt"] else ""))
+        return results
+
+    def export_quest_tracking_summary(self, results: Optional[Dict[str, Any]] = None) -> QuestTrackingSummary:
+        """Export quest tracking summary data.
+        
+        Parameters
+        ----------
+        results : dict, optional
+            Output of :meth:`aggregate`; aggregated on demand if omitted
+        """
         try:
-            # Load quest tracking data
-            progress_file = self.data_dir / "enhanced_progress_tracker.json"
-            if not progress_file.exists():
+            data = (results if results is not None else self.aggregate()).get("quest_tracking")
+            if data is None:
                 log_event("[PUBLIC_DATA_EXPORTER] Progress tracker file not found")
                 return self._create_empty_quest_summary()
             
-            with open(progress_file, 'r') as f:
-                progress_data = json.load(f)
-            
-            # Extract quest data from checklists
-            quests = []
-            for checklist_name, checklist_data in progress_data.get("checklists", {}).items():
-                if "quest" in checklist_name.lower() or "heroic" in checklist_name.lower():
-                    for item in checklist_data.get("items", []):
-                        quests.append({
-                            "name": item.get("name", ""),
-                            "status": item.get("status", "not_started"),
-                            "progress": item.get("progress", 0.0),
-                            "xp_reward": item.get("xp_reward", 0),
-                            "credit_reward": item.get("credit_reward", 0),
-                            "category": item.get("category", ""),
-                            "location": item.get("location", ""),
-                            "created_at": item.get("created_at", ""),
-                            "completed_at": item.get("completed_at", "")
-                        })
-            
-            # Calculate summary statistics
-            total_quests = len(quests)
-            completed_quests = len([q for q in quests if q["status"] == "completed"])
-            active_quests = len([q for q in quests if q["status"] in ["in_progress", "started"]])
-            quest_completion_rate = completed_quests / total_quests if total_quests > 0 else 0.0
-            
-            total_xp_from_quests = sum(q["xp_reward"] for q in quests if q["status"] == "completed")
-            total_credits_from_quests = sum(q["credit_reward"] for q in quests if q["status"] == "completed")
-            
-            # Get recent completions (last 7 days)
-            recent_completions = []
-            cutoff_date = datetime.now() - timedelta(days=7)
-            for quest in quests:
-                if quest["status"] == "completed" and quest["completed_at"]:
-                    try:
-                        completed_date = datetime.fromisoformat(quest["completed_at"].replace("Z", "+00:00"))
-                        if completed_date > cutoff_date:
-                            recent_completions.append(quest)
-                    except:
-                        pass
-            
-            # Categorize quests
-            quest_categories = {}
-            for quest in quests:
-                category = quest["category"] or "general"
-                quest_categories[category] = quest_categories.get(category, 0) + 1
-            
-            summary = QuestTrackingSummary(
-                total_quests=total_quests,
-                completed_quests=completed_quests,
-                active_quests=active_quests,
-                quest_completion_rate=quest_completion_rate,
-                total_xp_from_quests=total_xp_from_quests,
-                total_credits_from_quests=total_credits_from_quests,
-                recent_completions=recent_completions[:10],  # Limit to 10 most recent
-                quest_categories=quest_categories,
-                last_updated=datetime.now().isoformat()
-            )
+            summary = QuestTrackingSummary(**data, last_updated=datetime.now().isoformat())
             
             # Export to JSON
             self._export_to_json("quest_tracking_summary.json", asdict(summary))
             
-            log_event(f"[PUBLIC_DATA_EXPORTER] Exported quest tracking summary: {completed_quests}/{total_quests} completed")
+            log_event(f"[PUBLIC_DATA_EXPORTER] Exported quest tracking summary: "
+                      f"{summary.completed_quests}/{summary.total_quests} completed")
             return summary
             
         except Exception as e:
             log_event(f"[PUBLIC_DATA_EXPORTER] Error exporting quest tracking summary: {e}")
             return self._create_empty_quest_summary()
 
-    def export_bot_metrics(self) -> BotMetrics:
-        """Export bot metrics data."""
+    def export_bot_metrics(self, results: Optional[Dict[str, Any]] = None) -> BotMetrics:
+        """Export bot metrics data.
+        
+        Parameters
+        ----------
+        results : dict, optional
+            Output of :meth:`aggregate`; aggregated on demand if omitted
+        """
         try:
-            # Load session logs
-            session_files = list(self.session_logs_dir.glob("*.json"))
-            if not session_files:
+            data = (results if results is not None else self.aggregate()).get("bot_metrics")
+            if data is None:
                 log_event("[PUBLIC_DATA_EXPORTER] No session log files found")
                 return self._create_empty_bot_metrics()
             
-            # Process session data
-            total_xp_gained = 0
-            total_credits_gained = 0
-            session_count = 0
-            total_session_time = 0.0
-            success_rates = []
-            efficiency_scores = []
-            recent_activity = []
-            profession_levels = {}
-            
-            for session_file in session_files:
-                try:
-                    with open(session_file, 'r') as f:
-                        session_data = json.load(f)
-                    
-                    # Extract metrics
-                    total_xp_gained += session_data.get("total_xp_gained", 0)
-                    total_credits_gained += session_data.get("total_credits_gained", 0)
-                    session_count += 1
-                    
-                    # Calculate session duration
-                    start_time = session_data.get("start_time")
-                    end_time = session_data.get("end_time")
-                    if start_time and end_time:
-                        try:
-                            start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-                            end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-                            duration = (end_dt - start_dt).total_seconds() / 3600  # hours
-                            total_session_time += duration
-                        except:
-                            pass
-                    
-                    # Extract success and efficiency metrics
-                    success_rate = session_data.get("success_rate", 0.0)
-                    efficiency_score = session_data.get("efficiency_score", 0.0)
-                    if success_rate is not None:
-                        success_rates.append(success_rate)
-                    if efficiency_score is not None:
-                        efficiency_scores.append(efficiency_score)
-                    
-                    # Extract profession levels
-                    profession = session_data.get("profession")
-                    character_level = session_data.get("character_level")
-                    if profession and character_level:
-                        profession_levels[profession] = max(profession_levels.get(profession, 0), character_level)
-                    
-                    # Add to recent activity
-                    recent_activity.append({
-                        "session_id": session_data.get("session_id", ""),
-                        "start_time": start_time,
-                        "total_xp_gained": session_data.get("total_xp_gained", 0),
-                        "total_credits_gained": session_data.get("total_credits_gained", 0),
-                        "success_rate": success_rate,
-                        "efficiency_score": efficiency_score
-                    })
-                    
-                except Exception as e:
-                    log_event(f"[PUBLIC_DATA_EXPORTER] Error processing session file {session_file}: {e}")
-                    continue
-            
-            # Calculate averages
-            average_session_duration = total_session_time / session_count if session_count > 0 else 0.0
-            average_success_rate = sum(success_rates) / len(success_rates) if success_rates else 0.0
-            average_efficiency_score = sum(efficiency_scores) / len(efficiency_scores) if efficiency_scores else 0.0
-            
-            # Sort recent activity by start time (most recent first)
-            recent_activity.sort(key=lambda x: x.get("start_time", ""), reverse=True)
-            
-            metrics = BotMetrics(
-                total_xp_gained=total_xp_gained,
-                total_credits_gained=total_credits_gained,
-                profession_levels=profession_levels,
-                session_count=session_count,
-                total_session_time=total_session_time,
-                average_session_duration=average_session_duration,
-                success_rate=average_success_rate,
-                efficiency_score=average_efficiency_score,
-                recent_activity=recent_activity[:20],  # Last 20 sessions
-                last_updated=datetime.now().isoformat()
-            )
+            metrics = BotMetrics(**data, last_updated=datetime.now().isoformat())
             
             # Export to JSON
             self._export_to_json("bot_metrics.json", asdict(metrics))
             
-            log_event(f"[PUBLIC_DATA_EXPORTER] Exported bot metrics: {session_count} sessions, {total_xp_gained} XP")
+            log_event(f"[PUBLIC_DATA_EXPORTER] Exported bot metrics: "
+                      f"{metrics.session_count} sessions, {metrics.total_xp_gained} XP")
             return metrics
             
         except Exception as e:
             log_event(f"[PUBLIC_DATA_EXPORTER] Error exporting bot metrics: {e}")
             return self._create_empty_bot_metrics()
 
-    def export_heroic_readiness(self) -> HeroicReadiness:
-        """Export heroic readiness data."""
+    def export_heroic_readiness(self, results: Optional[Dict[str, Any]] = None) -> HeroicReadiness:
+        """Export heroic readiness data.
+        
+        Parameters
+        ----------
+        results : dict, optional
+            Output of :meth:`aggregate`; aggregated on demand if omitted
+        """
         try:
-            # Load heroics data
-            heroics_index_file = self.data_dir / "heroics" / "heroics_index.yml"
-            if not heroics_index_file.exists():
+            data = (results if results is not None else self.aggregate()).get("heroic_readiness")
+            if data is None:
                 log_event("[PUBLIC_DATA_EXPORTER] Heroics index file not found")
                 return self._create_empty_heroic_readiness()
             
-            with open(heroics_index_file, 'r') as f:
-                heroics_data = yaml.safe_load(f)
-            
-            # Load progress data for completion status
-            progress_file = self.data_dir / "enhanced_progress_tracker.json"
-            completed_heroics = set()
-            if progress_file.exists():
-                with open(progress_file, 'r') as f:
-                    progress_data = json.load(f)
-                
-                # Find completed heroics
-                for checklist_name, checklist_data in progress_data.get("checklists", {}).items():
-                    if "heroic" in checklist_name.lower():
-                        for item in checklist_data.get("items", []):
-                            if item.get("status") == "completed":
-                                completed_heroics.add(item.get("name", "").lower())
-            
-            # Process heroics data
-            total_heroics = len(heroics_data.get("heroics", {}))
-            completed_count = len(completed_heroics)
-            heroic_completion_rate = completed_count / total_heroics if total_heroics > 0 else 0.0
-            
-            # Calculate readiness score based on character level
-            # This is a simplified calculation - in practice, you'd check actual character level
-            character_level = 80  # Placeholder - would come from character data
-            readiness_score = min(1.0, character_level / 90.0)  # Normalize to 90 as max level
-            
-            # Find missing prerequisites
-            missing_prerequisites = []
-            if character_level < 80:
-                missing_prerequisites.append(f"Character level {character_level}/80")
-            
-            # Generate recommended heroics
-            recommended_heroics = []
-            for heroic_id, heroic_info in heroics_data.get("heroics", {}).items():
-                heroic_name = heroic_info.get("name", "")
-                level_requirement = heroic_info.get("level_requirement", 0)
-                
-                if character_level >= level_requirement and heroic_name.lower() not in completed_heroics:
-                    recommended_heroics.append({
-                        "name": heroic_name,
-                        "planet": heroic_info.get("planet", ""),
-                        "level_requirement": level_requirement,
-                        "group_size": heroic_info.get("group_size", ""),
-                        "difficulty_tiers": heroic_info.get("difficulty_tiers", [])
-                    })
-            
-            # Sort by level requirement
-            recommended_heroics.sort(key=lambda x: x["level_requirement"])
-            
-            readiness = HeroicReadiness(
-                total_heroics=total_heroics,
-                completed_heroics=completed_count,
-                available_heroics=len(recommended_heroics),
-                heroic_completion_rate=heroic_completion_rate,
-                character_level=character_level,
-                readiness_score=readiness_score,
-                missing_prerequisites=missing_prerequisites,
-                recommended_heroics=recommended_heroics[:5],  # Top 5 recommendations
-                last_updated=datetime.now().isoformat()
-            )
+            readiness = HeroicReadiness(**data, last_updated=datetime.now().isoformat())
             
             # Export to JSON
             self._export_to_json("heroic_readiness.json", asdict(readiness))
             
-            log_event(f"[PUBLIC_DATA_EXPORTER] Exported heroic readiness: {completed_count}/{total_heroics} completed")
+            log_event(f"[PUBLIC_DATA_EXPORTER] Exported heroic readiness: "
+                      f"{readiness.completed_heroics}/{readiness.total_heroics} completed")
             return readiness
             
         except Exception as e:
@@ -342,10 +208,11 @@ class PublicDataExporter:
         try:
             log_event("[PUBLIC_DATA_EXPORTER] Starting full data export")
             
-            # Export all data types
-            quest_summary = self.export_quest_tracking_summary()
-            bot_metrics = self.export_bot_metrics()
-            heroic_readiness = self.export_heroic_readiness()
+            # One pass over the sources feeds all three summaries
+            results = self.aggregate()
+            quest_summary = self.export_quest_tracking_summary(results)
+            bot_metrics = self.export_bot_metrics(results)
+            heroic_readiness = self.export_heroic_readiness(results)
             
             # Create combined export
             combined_data = {
@@ -9,6 +9,7 @@ import json
 import logging
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
@@ -25,6 +26,14 @@ yaml.add_representer(tuple, tuple_representer)
 import requests
 from bs4 import BeautifulSoup
 
+from importers.scrape_pipeline import CachedFetcher, HTMLCache, HostRateLimiter
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 
 class QuestType(Enum):
     """Types of quests available in SWG."""
@@ -92,13 +101,47 @@ class QuestData:
 class WikiQuestScraper:
     """Scrapes quest data from SWG wikis and generates YAML profiles."""
     
-    def __init__(self):
-        """Initialize the quest scraper."""
+    def __init__(self,
+                 cache_dir: str = "data/cache/wiki_html",
+                 replay: bool = False,
+                 max_workers: int = 1,
+                 parse_workers: int = 0,
+                 requests_per_second: float = 1.0,
+                 page_limit: int = 10):
+        """Initialize the quest scraper.
+        
+        Parameters
+        ----------
+        cache_dir : str
+            Directory of the conditional-request HTML cache
+        replay : bool
+            Read pages from the HTML cache only (fully offline)
+        max_workers : int
+            Maximum concurrent page fetches.  The per-host limit spaces
+            request starts, so more than one worker only helps once
+            ``requests_per_second`` allows a new request before the
+            previous response has arrived.
+        parse_workers : int
+            Processes used to parse pages; ``0`` or ``1`` parses in-process
+        requests_per_second : float
+            Politeness limit per wiki host
+        page_limit : int
+            Maximum quest pages scraped per category
+        """
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'MS11-Quest-Scraper/1.0 (Educational Bot)'
         })
+        self.fetcher = CachedFetcher(
+            session=self.session,
+            cache=HTMLCache(cache_dir),
+            limiter=HostRateLimiter(requests_per_second),
+            max_workers=max_workers,
+            replay=replay
+        )
+        self.parse_workers = parse_workers
+        self.page_limit = page_limit
         
         # Wiki sources
         self.wiki_sources = {
@@ -143,31 +186,7 @@ class WikiQuestScraper:
             category_url = "https://swgr.org/wiki/Category:Quests"
         
         self.logger.info(f"Scraping SWGR wiki: {category_url}")
-        
-        try:
-            response = self.session.get(category_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            quest_links = self._extract_quest_links(soup)
-            
-            quests = []
-            for link in quest_links[:10]:  # Limit for testing
-                try:
-                    quest_data = self._scrape_quest_page(link)
-                    if quest_data:
-                        quests.append(quest_data)
-                        self.logger.info(f"Scraped quest: {quest_data.name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to scrape quest {link}: {e}")
-                
-                time.sleep(1)  # Be respectful to the server
-            
-            return quests
-            
-        except Exception as e:
-            self.logger.error(f"Failed to scrape SWGR wiki: {e}")
-            return []
+        return self._scrape_category(category_url, "SWGR")
     
     def scrape_fandom_wiki(self, category_url: str = None) -> List[QuestData]:
         """Scrape quest data from SWG Fandom wiki.
@@ -186,32 +205,63 @@ class WikiQuestScraper:
             category_url = "https://swg.fandom.com/wiki/Category:Quests"
         
         self.logger.info(f"Scraping Fandom wiki: {category_url}")
+        return self._scrape_category(category_url, "Fandom")
+    
+    def _scrape_category(self, category_url: str, label: str) -> List[QuestData]:
+        """Fetch a category page and its quest pages through the pipeline.
         
-        try:
-            response = self.session.get(category_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            quest_links = self._extract_quest_links(soup)
-            
-            quests = []
-            for link in quest_links[:10]:  # Limit for testing
-                try:
-                    quest_data = self._scrape_quest_page(link)
-                    if quest_data:
-                        quests.append(quest_data)
-                        self.logger.info(f"Scraped quest: {quest_data.name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to scrape quest {link}: {e}")
-                
-                time.sleep(1)  # Be respectful to the server
+        Quest pages are fetched under the per-host rate limit, in category
+        page order, and parsed in-process or in a process pool when
+        ``parse_workers`` asks for one.
+        
+        Parameters
+        ----------
+        category_url : str
+            URL to quest category page
+        label : str
+            Wiki name used in log messages
             
+        Returns
+        -------
+        List[QuestData]
+            List of extracted quest data
+        """
+        try:
+            result = self.fetcher.fetch(category_url)
+            if not result.ok:
+                raise RuntimeError(result.error or f"HTTP {result.status}")
+            
+            soup = BeautifulSoup(result.content, HTML_PARSER)
+            soup.base_url = category_url
+            quest_links = self._extract_quest_links(soup)[:self.page_limit]
+            
+            pages = []
+            for page in self.fetcher.fetch_many(quest_links):
+                if page.ok:
+                    pages.append((page.url, page.content))
+                else:
+                    self.logger.error(f"Failed to scrape quest {page.url}: {page.error}")
+            
+            quests = [q for q in self._parse_pages(pages) if q]
+            for quest_data in quests:
+                self.logger.info(f"Scraped quest: {quest_data.name}")
             return quests
             
         except Exception as e:
-            self.logger.error(f"Failed to scrape Fandom wiki: {e}")
+            self.logger.error(f"Failed to scrape {label} wiki: {e}")
             return []
     
+    def _parse_pages(self, pages: List[Tuple[str, bytes]]) -> List[Optional[QuestData]]:
+        """Parse fetched quest pages, in a process pool when configured."""
+        workers = self.parse_workers or 0
+        if workers <= 1 or len(pages) <= 1:
+            return [self._parse_quest_page(url, content) for url, content in pages]
+        
+        urls = [url for url, _ in pages]
+        contents = [content for _, content in pages]
+        with ProcessPoolExecutor(max_workers=min(workers, len(pages))) as pool:
+            return list(pool.map(_parse_quest_page_worker, urls, contents))
+    
     def _extract_quest_links(self, soup: BeautifulSoup) -> List[str]:
         """Extract quest page links from category page.
         
@@ -235,7 +285,7 @@ class WikiQuestScraper:
                     href = urljoin(soup.base_url, href)
                 links.append(href)
         
-        return list(set(links))  # Remove duplicates
+        return list(dict.fromkeys(links))  # Remove duplicates, keep page order
     
     def _scrape_quest_page(self, url: str) -> Optional[QuestData]:
         """Scrape individual quest page.
@@ -250,11 +300,29 @@ class WikiQuestScraper:
         Optional[QuestData]
             Extracted quest data, or None if failed
         """
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
+        result = self.fetcher.fetch(url)
+        if not result.ok:
+            self.logger.error(f"Failed to scrape quest page {url}: {result.error}")
+            return None
+        return self._parse_quest_page(url, result.content)
+    
+    def _parse_quest_page(self, url: str, content: bytes) -> Optional[QuestData]:
+        """Parse a fetched quest page.
+        
+        Parameters
+        ----------
+        url : str
+            Quest page URL
+        content : bytes
+            Raw page HTML
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        Returns
+        -------
+        Optional[QuestData]
+            Extracted quest data, or None if failed
+        """
+        try:
+            soup = BeautifulSoup(content, HTML_PARSER)
             
             # Extract quest information
             quest_id = self._extract_quest_id(url)
@@ -289,7 +357,7 @@ class WikiQuestScraper:
             return quest_data
             
         except Exception as e:
-            self.logger.error(f"Failed to scrape quest page {url}: {e}")
+            self.logger.error(f"Failed to parse quest page {url}: {e}")
             return None
     
     def _extract_quest_id(self, url: str) -> str:
@@ -795,6 +863,17 @@ class WikiQuestScraper:
         return all_quests
 
 
+def _parse_quest_page_worker(url: str, content: bytes) -> Optional[QuestData]:
+    """Parse a quest page in a worker process.
+    
+    The extraction helpers only need a logger, so the worker skips
+    ``__init__`` and its session and output directory setup.
+    """
+    parser = WikiQuestScraper.__new__(WikiQuestScraper)
+    parser.logger = logging.getLogger(__name__)
+    return parser._parse_quest_page(url, content)
+
+
 # Global instance
 _quest_scraper: Optional[WikiQuestScraper] = None
 
@@ -0,0 +1,235 @@
+"""
+Wiki Scraping Pipeline
+
+This module provides the fetch side of the wiki quest importer:
+- Bounded concurrent fetching
+- Per-host token-bucket politeness limits
+- An on-disk conditional-request cache (ETag / Last-Modified)
+- A replay mode that serves pages from the HTML cache only, so re-imports
+  and tests run fully offline
+
+Parsing is left to the caller (see ``WikiQuestScraper``), which can fan
+pages out to a process pool.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        """Initialize the bucket.
+
+        Parameters
+        ----------
+        rate : float
+            Tokens added per second
+        capacity : float
+            Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; return seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """One token bucket per host."""
+
+    def __init__(self, requests_per_second: float = 1.0, burst: float = 1.0):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Wait for a request slot for ``url``'s host."""
+        return self.bucket(url).acquire()
+
+
+class HTMLCache:
+    """On-disk page cache keyed by URL, storing validators alongside bodies."""
+
+    def __init__(self, cache_dir: str = "data/cache/wiki_html"):
+        # The directory is created on the first write, not here
+        self.cache_dir = Path(cache_dir)
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str):
+        key = self._key(url)
+        return self.cache_dir / f"{key}.html", self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return ``{'content', 'etag', 'last_modified', ...}`` or ``None``."""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            meta["content"] = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def put(self, url: str, content: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        """Store a page body and its validators."""
+        headers = headers or {}
+        body_path, meta_path = self._paths(url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = body_path.with_suffix(".html.tmp")
+        tmp.write_bytes(content)
+        tmp.replace(body_path)
+        meta_path.write_text(json.dumps({
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }), encoding="utf-8")
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one page."""
+    url: str
+    content: Optional[bytes]
+    status: int
+    from_cache: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.content is not None
+
+
+class CachedFetcher:
+    """Concurrent, rate-limited, cache-aware page fetcher."""
+
+    def __init__(self,
+                 session: Any = None,
+                 cache: Optional[HTMLCache] = None,
+                 limiter: Optional[HostRateLimiter] = None,
+                 max_workers: int = 4,
+                 replay: bool = False,
+                 timeout: float = 30.0):
+        """Initialize the fetcher.
+
+        Parameters
+        ----------
+        session : requests.Session-like, optional
+            HTTP session; not needed in replay mode
+        cache : HTMLCache, optional
+            Page cache, required for replay mode
+        limiter : HostRateLimiter, optional
+            Per-host politeness limit
+        max_workers : int
+            Maximum concurrent requests
+        replay : bool
+            Serve pages from the cache only and never touch the network
+        """
+        if replay and cache is None:
+            raise ValueError("Replay mode requires an HTML cache")
+        self.session = session
+        self.cache = cache
+        self.limiter = limiter or HostRateLimiter()
+        self.max_workers = max(1, max_workers)
+        self.replay = replay
+        self.timeout = timeout
+        self.stats = {"network": 0, "not_modified": 0, "replayed": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url: str) -> FetchResult:
+        """Fetch one page, using the cache for validators or replay."""
+        cached = self.cache.get(url) if self.cache else None
+
+        if self.replay:
+            if cached is None:
+                self._count("errors")
+                return FetchResult(url, None, 404, error="not in replay cache")
+            self._count("replayed")
+            return FetchResult(url, cached["content"], 200, from_cache=True)
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        self.limiter.acquire(url)
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            self._count("errors")
+            if cached:
+                return FetchResult(url, cached["content"], 200, from_cache=True, error=str(e))
+            return FetchResult(url, None, 0, error=str(e))
+
+        if response.status_code == 304 and cached:
+            self._count("not_modified")
+            return FetchResult(url, cached["content"], 304, from_cache=True)
+
+        if response.status_code >= 400:
+            self._count("errors")
+            return FetchResult(url, None, response.status_code,
+                               error=f"HTTP {response.status_code}")
+
+        self._count("network")
+        if self.cache:
+            self.cache.put(url, response.content, dict(response.headers))
+        return FetchResult(url, response.content, response.status_code)
+
+    def fetch_many(self, urls: Iterable[str]) -> List[FetchResult]:
+        """Fetch pages concurrently, preserving input order."""
+        urls = list(urls)
+        if len(urls) <= 1 or self.max_workers == 1:
+            return [self.fetch(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)),
+                                thread_name_prefix="WikiFetch") as pool:
+            return list(pool.map(self.fetch, urls))
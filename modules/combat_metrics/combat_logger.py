@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from enum import Enum
 
+from .event_store import ColumnarEventStore, session_file_name
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,19 +95,24 @@ class CombatSession:
 class CombatLogger:
     """Comprehensive combat metrics logging system."""
     
-    def __init__(self, logs_dir: str = "logs/combat"):
+    def __init__(self, logs_dir: str = "logs/combat", columnar: bool = False):
         """Initialize the combat logger.
         
         Parameters
         ----------
         logs_dir : str
             Directory to store combat log files
+        columnar : bool
+            Also write each session to a columnar ``.mscol`` event file
+            whose footer lets session listings skip the JSON
         """
         self.logs_dir = Path(logs_dir)
+        self.columnar = columnar
         self.logs_dir.mkdir(parents=True, exist_ok=True)
         
         self.current_session: Optional[CombatSession] = None
         self.session_history: List[CombatSession] = []
+        self.event_store: Optional[ColumnarEventStore] = None
         
         # Performance tracking
         self.dps_window = 60.0  # seconds for DPS calculation
@@ -140,6 +147,7 @@ class CombatLogger:
             session_id=session_id,
             start_time=datetime.now()
         )
+        self.event_store = ColumnarEventStore(session_id) if self.columnar else None
         
         # Log session start event
         self._log_event(CombatEventType.SESSION_START)
@@ -183,6 +191,7 @@ class CombatLogger:
         
         # Clear current session
         self.current_session = None
+        self.event_store = None
         
         return session_summary
     
@@ -387,6 +396,8 @@ class CombatLogger:
         )
         
         self.current_session.events.append(event)
+        if self.event_store is not None:
+            self.event_store.append(event)
     
     def _add_damage_event(self, damage_dealt: int) -> None:
         """Add a damage event for DPS calculation.
@@ -438,16 +449,30 @@ class CombatLogger:
     def _save_session(self, session: CombatSession) -> None:
         """Save a session to a JSON file.
         
+        With ``columnar`` enabled the session is also written to its
+        columnar event file, whose footer carries the session summary so
+        session listings can skip the event data entirely.
+        
         Parameters
         ----------
         session : CombatSession
             Session to save
         """
+        session_data = session.to_dict()
+        
+        if self.columnar:
+            store = self.event_store
+            if store is None or store.session_id != session.session_id:
+                store = ColumnarEventStore(session.session_id)
+                store.extend(session.events)
+            summary = {k: v for k, v in session_data.items() if k != 'events'}
+            store.write(self.logs_dir / session_file_name(session.session_id), summary)
+        
         filename = f"combat_stats_{session.session_id}.json"
         filepath = self.logs_dir / filename
         
         with open(filepath, 'w') as f:
-            json.dump(session.to_dict(), f, indent=2)
+            json.dump(session_data, f, indent=2)
         
         logger.debug(f"Saved session to: {filepath}")
     
@@ -0,0 +1,265 @@
+"""
+Columnar Event Store - Compact typed-array storage for combat events.
+
+This module provides the on-disk and in-memory event format used by the
+combat metrics system:
+- One typed array per event field instead of one object per event
+- Dictionary-encoded strings (abilities, targets, damage types, ...)
+- A compact binary file per session with a JSON summary footer
+- Footer-only reads so session listings never touch the event columns
+"""
+
+import json
+import math
+import struct
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+FILE_MAGIC = b"MSCOL\x00\x01\x00"
+FOOTER_MAGIC = b"MSCF"
+FORMAT_VERSION = 1
+FILE_SUFFIX = ".mscol"
+
+NULL_ID = -1
+
+# (column name, array typecode)
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "d"),
+    ("event_type", "B"),
+    ("ability", "i"),
+    ("target", "i"),
+    ("damage", "q"),
+    ("damage_type", "i"),
+    ("success", "b"),
+    ("cooldown", "d"),
+    ("xp", "q"),
+    ("enemy_type", "i"),
+    ("rotation", "i"),
+)
+
+_STRING_COLUMNS = {
+    "ability": "ability_name",
+    "target": "target",
+    "damage_type": "damage_type",
+    "enemy_type": "enemy_type",
+    "rotation": "rotation_id",
+}
+
+
+def session_file_name(session_id: str) -> str:
+    """Return the columnar file name for a session."""
+    return f"combat_events_{session_id}{FILE_SUFFIX}"
+
+
+class ColumnarEventStore:
+    """Typed-array column store for the events of one combat session."""
+
+    def __init__(self, session_id: Optional[str] = None):
+        """Initialize an empty store.
+
+        Parameters
+        ----------
+        session_id : str, optional
+            Session the events belong to
+        """
+        self.session_id = session_id
+        self.columns: Dict[str, array] = {name: array(code) for name, code in COLUMNS}
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.event_types: List[str] = []
+        self._event_type_ids: Dict[str, int] = {}
+        self.summary: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    def _encode_string(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_ID
+        code = self._string_ids.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = code
+        return code
+
+    def _encode_event_type(self, value: str) -> int:
+        code = self._event_type_ids.get(value)
+        if code is None:
+            code = len(self.event_types)
+            self.event_types.append(value)
+            self._event_type_ids[value] = code
+        return code
+
+    def event_type_code(self, event_type: Any) -> Optional[int]:
+        """Return the code used for ``event_type`` (enum or value), if any."""
+        return self._event_type_ids.get(getattr(event_type, "value", event_type))
+
+    def string_id(self, value: str) -> Optional[int]:
+        """Return the dictionary id for ``value``, if present."""
+        return self._string_ids.get(value)
+
+    def append(self, event: Any) -> None:
+        """Append a ``CombatEvent`` to the store."""
+        cols = self.columns
+        cols["timestamp"].append(event.timestamp.timestamp())
+        cols["event_type"].append(
+            self._encode_event_type(getattr(event.event_type, "value", event.event_type))
+        )
+        for column, attr in _STRING_COLUMNS.items():
+            cols[column].append(self._encode_string(getattr(event, attr)))
+        cols["damage"].append(NULL_ID if event.damage_dealt is None else int(event.damage_dealt))
+        cols["success"].append(NULL_ID if event.success is None else int(bool(event.success)))
+        cols["cooldown"].append(
+            math.nan if event.cooldown_remaining is None else float(event.cooldown_remaining)
+        )
+        cols["xp"].append(NULL_ID if event.xp_gained is None else int(event.xp_gained))
+
+    def extend(self, events) -> None:
+        """Append several events."""
+        for event in events:
+            self.append(event)
+
+    def ability_usage(self, event_type: Any = "ability_use") -> Dict[str, int]:
+        """Count uses per ability for rows of ``event_type``."""
+        code = self.event_type_code(event_type)
+        if code is None:
+            return {}
+        counts = Counter(
+            a for t, a in zip(self.columns["event_type"], self.columns["ability"])
+            if t == code and a != NULL_ID
+        )
+        return {self.strings[a]: n for a, n in counts.items()}
+
+    def damage_by_ability(self) -> Dict[str, int]:
+        """Sum recorded damage per ability across all rows."""
+        totals: Dict[int, int] = {}
+        for a, d in zip(self.columns["ability"], self.columns["damage"]):
+            if a != NULL_ID and d > 0:
+                totals[a] = totals.get(a, 0) + d
+        return {self.strings[a]: d for a, d in totals.items()}
+
+    def total_damage(self) -> int:
+        """Sum of all recorded damage."""
+        return sum(d for d in self.columns["damage"] if d > 0)
+
+    def count(self, event_type: Any) -> int:
+        """Number of rows of ``event_type``."""
+        code = self.event_type_code(event_type)
+        if code is None:
+            return 0
+        return self.columns["event_type"].count(code)
+
+    def iter_events(self) -> Iterator[Any]:
+        """Decode rows back into ``CombatEvent`` objects."""
+        from .combat_logger import CombatEvent, CombatEventType
+
+        cols = self.columns
+        strings = self.strings
+        for i in range(len(self)):
+            values = {
+                attr: (None if cols[column][i] == NULL_ID else strings[cols[column][i]])
+                for column, attr in _STRING_COLUMNS.items()
+            }
+            damage = cols["damage"][i]
+            success = cols["success"][i]
+            cooldown = cols["cooldown"][i]
+            xp = cols["xp"][i]
+            yield CombatEvent(
+                event_type=CombatEventType(self.event_types[cols["event_type"][i]]),
+                timestamp=datetime.fromtimestamp(cols["timestamp"][i]),
+                damage_dealt=None if damage == NULL_ID else damage,
+                success=None if success == NULL_ID else bool(success),
+                cooldown_remaining=None if math.isnan(cooldown) else cooldown,
+                xp_gained=None if xp == NULL_ID else xp,
+                session_id=self.session_id,
+                **values,
+            )
+
+    def write(self, path: Path, summary: Optional[Dict[str, Any]] = None) -> None:
+        """Write the store to ``path`` with ``summary`` in the footer.
+
+        Parameters
+        ----------
+        path : Path
+            Destination file
+        summary : dict, optional
+            Session-level summary stored in the footer
+        """
+        path = Path(path)
+        if summary is not None:
+            self.summary = summary
+        column_meta = []
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(FILE_MAGIC)
+            for name, code in COLUMNS:
+                data = self.columns[name].tobytes()
+                column_meta.append({
+                    "name": name,
+                    "typecode": code,
+                    "offset": f.tell(),
+                    "length": len(data),
+                })
+                f.write(data)
+            footer = json.dumps({
+                "version": FORMAT_VERSION,
+                "session_id": self.session_id,
+                "rows": len(self),
+                "byteorder": sys.byteorder,
+                "columns": column_meta,
+                "strings": self.strings,
+                "event_types": self.event_types,
+                "summary": self.summary,
+            }, separators=(",", ":")).encode("utf-8")
+            f.write(footer)
+            f.write(struct.pack("<I", len(footer)))
+            f.write(FOOTER_MAGIC)
+        tmp.replace(path)
+
+    @classmethod
+    def read(cls, path: Path) -> "ColumnarEventStore":
+        """Load a full store (footer and columns) from ``path``."""
+        path = Path(path)
+        footer = read_footer(path)
+        store = cls(footer.get("session_id"))
+        store.summary = footer.get("summary", {})
+        store.strings = footer.get("strings", [])
+        store._string_ids = {s: i for i, s in enumerate(store.strings)}
+        store.event_types = footer.get("event_types", [])
+        store._event_type_ids = {s: i for i, s in enumerate(store.event_types)}
+        swap = footer.get("byteorder", sys.byteorder) != sys.byteorder
+        with open(path, "rb") as f:
+            for meta in footer["columns"]:
+                column = array(meta["typecode"])
+                f.seek(meta["offset"])
+                column.frombytes(f.read(meta["length"]))
+                if swap:
+                    column.byteswap()
+                store.columns[meta["name"]] = column
+        return store
+
+
+def read_footer(path: Path) -> Dict[str, Any]:
+    """Read only the footer of a columnar session file.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a columnar session file
+    """
+    with open(path, "rb") as f:
+        header = f.read(len(FILE_MAGIC))
+        if header != FILE_MAGIC:
+            raise ValueError(f"Not a columnar combat file: {path}")
+        f.seek(-(4 + len(FOOTER_MAGIC)), 2)
+        tail = f.read(4 + len(FOOTER_MAGIC))
+        if tail[4:] != FOOTER_MAGIC:
+            raise ValueError(f"Missing footer in columnar combat file: {path}")
+        (length,) = struct.unpack("<I", tail[:4])
+        f.seek(-(4 + len(FOOTER_MAGIC) + length), 2)
+        return json.loads(f.read(length).decode("utf-8"))
@@ -16,11 +16,16 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import statistics
 
+from .event_store import ColumnarEventStore, FILE_SUFFIX, read_footer, session_file_name
+
 logger = logging.getLogger(__name__)
 
+SESSION_INDEX_FILE = "session_index.json"
+SESSION_INDEX_VERSION = 1
+
 
 @dataclass
 class SessionSummary:
@@ -51,19 +56,27 @@ class SessionSummary:
 class CombatSessionManager:
     """Comprehensive combat session management system."""
     
-    def __init__(self, logs_dir: str = "logs/combat"):
+    def __init__(self, logs_dir: str = "logs/combat", max_cached_sessions: int = 32):
         """Initialize the session manager.
         
+        Only session summaries are loaded at startup, from the summary
+        sidecar index when it is up to date. Full session payloads are
+        loaded on demand and kept in a bounded LRU cache.
+        
         Parameters
         ----------
         logs_dir : str
             Directory containing combat session logs
+        max_cached_sessions : int
+            Maximum number of full session payloads kept in memory
         """
         self.logs_dir = Path(logs_dir)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.logs_dir / SESSION_INDEX_FILE
+        self.max_cached_sessions = max_cached_sessions
         
         # Session storage
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.session_summaries: Dict[str, SessionSummary] = {}
         
         # Statistics
@@ -77,7 +90,7 @@ class CombatSessionManager:
         # Load existing sessions
         self._load_existing_sessions()
         
-        logger.info(f"CombatSessionManager initialized with {len(self.sessions)} existing sessions")
+        logger.info(f"CombatSessionManager initialized with {len(self.session_summaries)} existing sessions")
     
     def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Load a session from file.
@@ -93,21 +106,26 @@ class CombatSessionManager:
             Session data if found
         """
         if session_id in self.sessions:
+            self.sessions.move_to_end(session_id)
             return self.sessions[session_id]
         
         # Try to load from file
         filename = f"combat_stats_{session_id}.json"
         filepath = self.logs_dir / filename
+        columnar_path = self.logs_dir / session_file_name(session_id)
         
-        if not filepath.exists():
+        if not filepath.exists() and not columnar_path.exists():
             logger.warning(f"Session file not found: {filepath}")
             return None
         
         try:
-            with open(filepath, 'r') as f:
-                session_data = json.load(f)
+            if filepath.exists():
+                with open(filepath, 'r') as f:
+                    session_data = json.load(f)
+            else:
+                session_data = self._session_from_store(ColumnarEventStore.read(columnar_path))
             
-            self.sessions[session_id] = session_data
+            self._cache_session(session_id, session_data)
             self._create_session_summary(session_data)
             
             logger.info(f"Loaded session: {session_id}")
@@ -137,7 +155,7 @@ class CombatSessionManager:
         
         try:
             # Save to memory
-            self.sessions[session_id] = session_data
+            self._cache_session(session_id, session_data)
             
             # Create summary
             self._create_session_summary(session_data)
@@ -149,6 +167,14 @@ class CombatSessionManager:
             with open(filepath, 'w') as f:
                 json.dump(session_data, f, indent=2)
             
+            # Keep the columnar footer in step with the saved summary
+            store = self.get_session_events(session_id)
+            if store is not None:
+                store.write(
+                    self.logs_dir / session_file_name(session_id),
+                    {k: v for k, v in session_data.items() if k != "events"}
+                )
+            
             logger.info(f"Saved session: {session_id}")
             return True
             
@@ -426,23 +452,120 @@ class CombatSessionManager:
         
         return session_efficiencies[:limit]
     
+    def get_session_events(self, session_id: str) -> Optional[ColumnarEventStore]:
+        """Load the columnar event store for a session.
+        
+        Parameters
+        ----------
+        session_id : str
+            ID of the session
+            
+        Returns
+        -------
+        ColumnarEventStore, optional
+            Event columns if the session has a columnar file
+        """
+        columnar_path = self.logs_dir / session_file_name(session_id)
+        if not columnar_path.exists():
+            return None
+        try:
+            return ColumnarEventStore.read(columnar_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading columnar session {session_id}: {e}")
+            return None
+    
+    def _session_from_store(self, store: ColumnarEventStore) -> Dict[str, Any]:
+        """Rebuild the JSON-style session dict from a columnar store."""
+        session_data = dict(store.summary)
+        session_data["events"] = [event.to_dict() for event in store.iter_events()]
+        return session_data
+    
+    def _cache_session(self, session_id: str, session_data: Dict[str, Any]) -> None:
+        """Keep a full session payload in the bounded LRU cache."""
+        self.sessions[session_id] = session_data
+        self.sessions.move_to_end(session_id)
+        while len(self.sessions) > self.max_cached_sessions:
+            self.sessions.popitem(last=False)
+    
+    def _read_session_index(self) -> Dict[str, Any]:
+        """Read the summary sidecar index, returning its file entries."""
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != SESSION_INDEX_VERSION:
+            return {}
+        return index.get("files", {})
+    
+    def _write_session_index(self, entries: Dict[str, Any]) -> None:
+        """Atomically write the summary sidecar index."""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": SESSION_INDEX_VERSION, "files": entries}, f)
+            tmp_path.replace(self.index_path)
+        except OSError as e:
+            logger.error(f"Error writing session index {self.index_path}: {e}")
+    
+    def _read_summary_data(self, filepath: Path) -> Dict[str, Any]:
+        """Read the session-level fields of a session file."""
+        if filepath.suffix == FILE_SUFFIX:
+            return read_footer(filepath).get("summary", {})
+        with open(filepath, 'r') as f:
+            session_data = json.load(f)
+        return {k: v for k, v in session_data.items() if k != "events"}
+    
     def _load_existing_sessions(self) -> None:
-        """Load existing session files from the logs directory."""
+        """Load session summaries from the logs directory.
+        
+        Summaries come from the sidecar index for files whose mtime and
+        size are unchanged. New or changed files are read (footer only for
+        columnar files) and the index is updated. JSON files are skipped
+        for sessions that also have a columnar file.
+        """
         if not self.logs_dir.exists():
             return
         
-        for filepath in self.logs_dir.glob("combat_stats_*.json"):
+        indexed = self._read_session_index()
+        entries: Dict[str, Any] = {}
+        changed = False
+        
+        candidates = [
+            (filepath, len("combat_events_"), -len(FILE_SUFFIX))
+            for filepath in sorted(self.logs_dir.glob(f"combat_events_*{FILE_SUFFIX}"))
+        ] + [
+            (filepath, len("combat_stats_"), -len(".json"))
+            for filepath in sorted(self.logs_dir.glob("combat_stats_*.json"))
+        ]
+        
+        for filepath, prefix_len, suffix_len in candidates:
+            if filepath.name[prefix_len:suffix_len] in self.session_summaries:
+                continue
             try:
-                with open(filepath, 'r') as f:
-                    session_data = json.load(f)
-                
-                session_id = session_data.get("session_id")
-                if session_id:
-                    self.sessions[session_id] = session_data
-                    self._create_session_summary(session_data)
-                
-            except Exception as e:
-                logger.error(f"Error loading session file {filepath}: {e}")
+                stat = filepath.stat()
+                entry = indexed.get(filepath.name)
+                if entry and entry.get("mtime") == stat.st_mtime and entry.get("size") == stat.st_size:
+                    summary_data = entry.get("summary")
+                else:
+                    changed = True
+                    try:
+                        summary_data = self._read_summary_data(filepath)
+                    except Exception as e:
+                        logger.error(f"Error loading session file {filepath}: {e}")
+                        summary_data = None
+                entries[filepath.name] = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "summary": summary_data
+                }
+                if summary_data:
+                    self._create_session_summary(summary_data)
+            except OSError as e:
+                logger.error(f"Error reading session file {filepath}: {e}")
+        
+        if changed or set(entries) != set(indexed):
+            self._write_session_index(entries)
     
     def _create_session_summary(self, session_data: Dict[str, Any]) -> None:
         """Create a session summary from session data.
@@ -14,7 +14,7 @@ Features:
 import json
 import logging
 import math
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
@@ -30,6 +30,7 @@ except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
 from android_ms11.utils.logging_utils import log_event
+from modules.xp_event_store import XPEventStore, HOUR, profession_skill_key
 
 
 @dataclass
@@ -111,6 +112,7 @@ class ExperimentalXPTracker:
         """
         self.config_path = Path(config_path)
         self.xp_events: List[XPGainEvent] = []
+        self.event_store = XPEventStore(window_seconds=HOUR)
         self.skill_progress: Dict[str, SkillProgress] = {}
         self.profession_analytics: Dict[str, ProfessionAnalytics] = {}
         
@@ -259,14 +261,16 @@ class ExperimentalXPTracker:
         XPGainEvent
             Recorded XP gain event
         """
+        now = datetime.now()
+        
         # Calculate XP rate per hour
-        xp_rate_per_hour = self._calculate_current_xp_rate()
+        xp_rate_per_hour = self._calculate_current_xp_rate(now)
         
         # Calculate skill progress percentage
         skill_progress_percentage = self._calculate_skill_progress_percentage(skill, profession)
         
         event = XPGainEvent(
-            timestamp=datetime.now().isoformat(),
+            timestamp=now.isoformat(),
             amount=amount,
             profession=profession,
             skill=skill,
@@ -281,6 +285,7 @@ class ExperimentalXPTracker:
         )
         
         self.xp_events.append(event)
+        self.event_store.append(now.timestamp(), amount, skill, profession, zone=zone, source=source)
         self.session_xp_gains[skill] += amount
         
         # Update zone efficiency tracking
@@ -288,34 +293,26 @@ class ExperimentalXPTracker:
             self._update_zone_efficiency(zone, amount)
         
         # Update skill progress
-        self._update_skill_progress(event)
+        self._update_skill_progress(event, now)
         
         # Update analytics
-        self._update_analytics(event)
+        self._update_analytics(event, now)
         
         log_event(f"[XP_TRACKER] Recorded {amount} XP for {skill} ({profession}) from {source} in {zone or 'unknown zone'}")
         
         return event
     
-    def _calculate_current_xp_rate(self) -> float:
-        """Calculate current XP rate per hour."""
-        if not self.xp_events:
-            return 0.0
-        
-        # Look at last hour
-        cutoff_time = datetime.now() - timedelta(hours=1)
-        recent_events = [e for e in self.xp_events 
-                        if datetime.fromisoformat(e.timestamp) > cutoff_time]
-        
-        if not recent_events:
+    def _calculate_current_xp_rate(self, now: datetime = None) -> float:
+        """Calculate current XP rate per hour (XP gained in the last hour)."""
+        if not len(self.event_store):
             return 0.0
         
-        total_xp = sum(e.amount for e in recent_events)
-        return total_xp
+        now = now or datetime.now()
+        return float(self.event_store.window_total(now.timestamp()))
     
     def _calculate_skill_progress_percentage(self, skill: str, profession: str) -> float:
         """Calculate skill progress percentage."""
-        skill_key = f"{profession}_{skill}"
+        skill_key = profession_skill_key(profession, skill)
         if skill_key in self.skill_progress:
             progress = self.skill_progress[skill_key]
             # Calculate percentage based on level progression
@@ -328,9 +325,9 @@ class ExperimentalXPTracker:
         self.zone_xp_efficiency[zone]["total_xp"] += xp_amount
         self.zone_xp_efficiency[zone]["events"] += 1
     
-    def _update_skill_progress(self, event: XPGainEvent):
+    def _update_skill_progress(self, event: XPGainEvent, now: datetime = None):
         """Update skill progress tracking with enhanced metrics."""
-        skill_key = f"{event.profession}_{event.skill}"
+        skill_key = profession_skill_key(event.profession, event.skill)
         
         if skill_key not in self.skill_progress:
             self.skill_progress[skill_key] = SkillProgress(
@@ -353,44 +350,41 @@ class ExperimentalXPTracker:
         if event.zone:
             progress.zone_preferences[event.zone] += event.amount
         
-        # Calculate progress rate (last hour)
-        recent_gains = [e for e in progress.gains_history 
-                       if (datetime.now() - datetime.fromisoformat(e.timestamp)).total_seconds() < 3600]
-        if recent_gains:
-            progress.progress_rate = sum(e.amount for e in recent_gains)
-        
-        # Calculate quest completion rate
-        quest_events = [e for e in progress.gains_history if e.source == "quest"]
-        progress.quest_completion_rate = len(quest_events) / max(len(progress.gains_history), 1)
+        # Calculate progress rate (last hour) and quest completion rate
+        stats = self.event_store.key_stats("profession_skill", skill_key)
+        now = now or datetime.now()
+        progress.progress_rate = self.event_store.window_total(now.timestamp(), "profession_skill", skill_key)
+        progress.quest_completion_rate = stats.quest_rate if stats else 0.0
         
         # Detect slowdown
         progress.slowdown_detected = self._detect_skill_slowdown(progress)
     
     def _detect_skill_slowdown(self, progress: SkillProgress) -> bool:
         """Detect if a skill is experiencing slowdown."""
-        if len(progress.gains_history) < 5:
+        stats = self.event_store.key_stats(
+            "profession_skill", profession_skill_key(progress.profession, progress.skill_name)
+        )
+        if stats is None:
             return False
         
-        # Compare recent rate to historical rate
-        recent_events = progress.gains_history[-5:]  # Last 5 events
-        historical_events = progress.gains_history[:-5]  # All but last 5
-        
-        if not historical_events:
+        # Compare the last 5 events to everything before them
+        means = stats.recent_and_historical_means()
+        if means is None:
             return False
         
-        recent_rate = sum(e.amount for e in recent_events) / len(recent_events)
-        historical_rate = sum(e.amount for e in historical_events) / len(historical_events)
-        
+        recent_rate, historical_rate = means
         if historical_rate == 0:
             return False
         
         slowdown_threshold = self.config["analytics_settings"]["slowdown_detection_threshold"]
         return recent_rate < historical_rate * slowdown_threshold
     
-    def _update_analytics(self, event: XPGainEvent):
+    def _update_analytics(self, event: XPGainEvent, now: datetime = None):
         """Update analytics data with enhanced tracking."""
+        now = now or datetime.now()
+        
         # Update hourly rates
-        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
         self.hourly_xp_rates.append({
             "hour": current_hour.isoformat(),
             "xp_gained": event.amount,
@@ -400,9 +394,8 @@ class ExperimentalXPTracker:
         })
         
         # Update daily totals
-        current_day = datetime.now().date()
-        daily_total = sum(e.amount for e in self.xp_events 
-                         if datetime.fromisoformat(e.timestamp).date() == current_day)
+        current_day = now.date()
+        daily_total = self.event_store.day_total(now.timestamp())
         
         self.daily_xp_totals.append({
             "date": current_day.isoformat(),
@@ -479,15 +472,7 @@ class ExperimentalXPTracker:
         float
             XP per hour rate
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_events = [e for e in self.xp_events 
-                        if datetime.fromisoformat(e.timestamp) > cutoff_time]
-        
-        if not recent_events:
-            return 0.0
-        
-        total_xp = sum(e.amount for e in recent_events)
-        return total_xp / hours
+        return self.event_store.rate_per_hour(hours, datetime.now().timestamp())
     
     def detect_leveling_slowdowns(self, threshold: float = 0.5) -> List[Dict[str, Any]]:
         """Detect skills that are leveling slower than expected.
@@ -503,7 +488,10 @@ class ExperimentalXPTracker:
             List of skills with slowdowns
         """
         slowdowns = []
-        avg_rate = statistics.mean([s.progress_rate for s in self.skill_progress.values()])
+        if not self.skill_progress:
+            return slowdowns
+        
+        avg_rate = sum(s.progress_rate for s in self.skill_progress.values()) / len(self.skill_progress)
         
         for progress in self.skill_progress.values():
             if progress.progress_rate < avg_rate * threshold:
@@ -572,16 +560,16 @@ class ExperimentalXPTracker:
         fastest_skill = max(profession_skills, key=lambda x: x.progress_rate)
         slowest_skill = min(profession_skills, key=lambda x: x.progress_rate)
         
-        # Calculate XP per hour for profession
-        profession_events = [e for e in self.xp_events 
-                           if e.profession.lower() == profession.lower()]
-        recent_events = [e for e in profession_events 
-                        if (datetime.now() - datetime.fromisoformat(e.timestamp)).total_seconds() < 3600]
-        xp_per_hour = sum(e.amount for e in recent_events)
-        
-        # Calculate quest completion rate
-        quest_events = [e for e in profession_events if e.source == "quest"]
-        quest_completion_rate = len(quest_events) / max(len(profession_events), 1)
+        # Calculate XP per hour and quest completion rate for profession
+        now = datetime.now().timestamp()
+        profession_names = {s.profession for s in profession_skills}
+        xp_per_hour = sum(self.event_store.window_total(now, "profession", name)
+                          for name in profession_names)
+        profession_stats = [self.event_store.key_stats("profession", name) for name in profession_names]
+        profession_stats = [stats for stats in profession_stats if stats]
+        quest_events = sum(stats.quest_events for stats in profession_stats)
+        event_count = sum(stats.events for stats in profession_stats)
+        quest_completion_rate = quest_events / max(event_count, 1)
         
         # Get optimal zones for profession
         optimal_zones = self.config["professions"].get(profession, {}).get("optimal_zones", [])
@@ -614,29 +602,17 @@ class ExperimentalXPTracker:
         if not self.xp_events:
             return {"error": "No XP events recorded"}
         
-        total_xp = sum(e.amount for e in self.xp_events)
+        store = self.event_store
+        total_xp = store.total_xp
         session_duration = (datetime.now() - self.session_start_time).total_seconds() / 3600 if self.session_start_time else 0
         
-        # XP by source
-        xp_by_source = defaultdict(int)
-        for event in self.xp_events:
-            xp_by_source[event.source] += event.amount
-        
-        # XP by profession
-        xp_by_profession = defaultdict(int)
-        for event in self.xp_events:
-            xp_by_profession[event.profession] += event.amount
-        
-        # XP by zone
-        xp_by_zone = defaultdict(int)
-        for event in self.xp_events:
-            if event.zone:
-                xp_by_zone[event.zone] += event.amount
+        # XP by source, profession and zone (pre-aggregated by the event store)
+        xp_by_source = store.totals("source")
+        xp_by_profession = store.totals("profession")
+        xp_by_zone = store.totals("zone")
         
         # Top gaining skills
-        xp_by_skill = defaultdict(int)
-        for event in self.xp_events:
-            xp_by_skill[event.skill] += event.amount
+        xp_by_skill = store.totals("skill")
         
         top_skills = sorted(xp_by_skill.items(), key=lambda x: x[1], reverse=True)[:5]
         
@@ -644,9 +620,10 @@ class ExperimentalXPTracker:
             "total_xp": total_xp,
             "session_duration_hours": session_duration,
             "xp_per_hour": total_xp / max(session_duration, 1),
-            "xp_by_source": dict(xp_by_source),
-            "xp_by_profession": dict(xp_by_profession),
-            "xp_by_zone": dict(xp_by_zone),
+            "xp_by_source": xp_by_source,
+            "xp_by_profession": xp_by_profession,
+            "xp_by_zone": xp_by_zone,
+            "hourly_xp": [(hour.isoformat(), xp) for hour, xp in store.hourly_series()],
             "top_gaining_skills": dict(top_skills),
             "fastest_progressing_skills": [s.skill_name for s in self.get_fastest_progressing_skills()],
             "slowdowns_detected": self.detect_leveling_slowdowns(),
@@ -683,9 +660,7 @@ class ExperimentalXPTracker:
             fig.suptitle('XP Tracker Analytics Dashboard', fontsize=16, fontweight='bold')
             
             # 1. XP over time
-            timestamps = [datetime.fromisoformat(e.timestamp) for e in self.xp_events]
-            xp_amounts = [e.amount for e in self.xp_events]
-            cumulative_xp = [sum(xp_amounts[:i+1]) for i in range(len(xp_amounts))]
+            timestamps, cumulative_xp = self.event_store.cumulative_series()
             
             axes[0, 0].plot(timestamps, cumulative_xp, marker='o', linewidth=2, markersize=4)
             axes[0, 0].set_title('Cumulative XP Over Time')
@@ -694,9 +669,7 @@ class ExperimentalXPTracker:
             axes[0, 0].tick_params(axis='x', rotation=45)
             
             # 2. XP by source
-            xp_by_source = defaultdict(int)
-            for event in self.xp_events:
-                xp_by_source[event.source] += event.amount
+            xp_by_source = self.event_store.totals("source")
             
             if xp_by_source:
                 sources = list(xp_by_source.keys())
@@ -705,9 +678,7 @@ class ExperimentalXPTracker:
                 axes[0, 1].set_title('XP by Source')
             
             # 3. XP by profession
-            xp_by_profession = defaultdict(int)
-            for event in self.xp_events:
-                xp_by_profession[event.profession] += event.amount
+            xp_by_profession = self.event_store.totals("profession")
             
             if xp_by_profession:
                 professions = list(xp_by_profession.keys())
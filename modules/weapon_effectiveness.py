@@ -0,0 +1,181 @@
+"""Weapon Effectiveness Matrix
+
+Precomputed weapon-versus-enemy effectiveness for :mod:`modules.weapon_swap_system`.
+
+The resistance part of a weapon's score depends only on configuration, so it
+is computed once into a ``weapons x enemy types`` matrix (from an
+``enemy types x damage type`` resistance table).  Range, condition and ammo
+are applied per query as vectorized factors, which makes picking the best
+weapon a single ``argmax`` and lets a whole group of enemies be scored at
+once.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Resistance table columns, in EnemyResistance field order
+RESISTANCE_COLUMNS: Tuple[str, ...] = ("kinetic", "energy", "explosive", "melee", "special")
+
+# Damage types whose resistance reduces effectiveness; special damage
+# ignores resistances
+RESISTED_DAMAGE_TYPES = frozenset({"kinetic", "energy", "explosive", "melee"})
+
+DEFAULT_DISTANCE = 50.0
+
+OUT_OF_RANGE_FACTOR = 0.3
+TOO_CLOSE_FACTOR = 0.8
+TOO_CLOSE_RATIO = 0.3
+NO_AMMO_FACTOR = 0.1
+
+
+class EffectivenessMatrix:
+    """Weapon-by-enemy effectiveness scores with vectorized modifiers.
+
+    Parameters
+    ----------
+    weapons : dict
+        Weapon name -> ``WeaponStats``
+    enemy_resistances : dict
+        Enemy type -> ``EnemyResistance``
+    """
+
+    def __init__(self, weapons: Dict[str, object], enemy_resistances: Dict[str, object]):
+        self.weapon_names: List[str] = list(weapons)
+        self.weapon_index: Dict[str, int] = {name: i for i, name in enumerate(self.weapon_names)}
+        self.enemy_types: List[str] = list(enemy_resistances)
+        # Unknown enemies map to an extra column with no resistances
+        self.enemy_index: Dict[str, int] = {name: i for i, name in enumerate(self.enemy_types)}
+        self.unknown_enemy = len(self.enemy_types)
+
+        self.resistances = np.zeros((len(self.enemy_types) + 1, len(RESISTANCE_COLUMNS)))
+        for row, enemy in enumerate(enemy_resistances.values()):
+            self.resistances[row] = [getattr(enemy, f"{column}_resistance", 0.0) for column in RESISTANCE_COLUMNS]
+
+        # One-hot damage-type rows (all zero for unresisted types) turn the
+        # resistance lookup into a matrix product
+        damage_types = np.zeros((len(self.weapon_names), len(RESISTANCE_COLUMNS)))
+        for row, weapon in enumerate(weapons.values()):
+            damage_type = getattr(weapon.damage_type, "value", weapon.damage_type)
+            if damage_type in RESISTED_DAMAGE_TYPES:
+                damage_types[row, RESISTANCE_COLUMNS.index(damage_type)] = 1.0
+        self.base = 1.0 - damage_types @ self.resistances.T  # weapons x (enemies + 1)
+
+        self.ranges = np.array([float(w.range) for w in weapons.values()])
+        self.condition_factor = np.array([w.condition / 100.0 for w in weapons.values()])
+        self.ammo_factor = np.array([NO_AMMO_FACTOR if w.current_ammo == 0 else 1.0 for w in weapons.values()])
+        self.source_sizes = (len(weapons), len(enemy_resistances))
+
+    def __len__(self) -> int:
+        return len(self.weapon_names)
+
+    def set_condition(self, weapon_name: str, condition: float) -> None:
+        """Update a weapon's condition (percent) without rebuilding."""
+        index = self.weapon_index.get(weapon_name)
+        if index is not None:
+            self.condition_factor[index] = condition / 100.0
+
+    def set_ammo(self, weapon_name: str, ammo: int) -> None:
+        """Update a weapon's ammo count without rebuilding."""
+        index = self.weapon_index.get(weapon_name)
+        if index is not None:
+            self.ammo_factor[index] = NO_AMMO_FACTOR if ammo == 0 else 1.0
+
+    def indices(self, weapon_names: Iterable[str]) -> np.ndarray:
+        """Row indices for ``weapon_names``, skipping unknown weapons."""
+        return np.array([self.weapon_index[name] for name in weapon_names if name in self.weapon_index],
+                        dtype=np.intp)
+
+    def enemy_column(self, enemy_type: Optional[str]) -> int:
+        return self.enemy_index.get(enemy_type, self.unknown_enemy)
+
+    @staticmethod
+    def _range_factor(distances: np.ndarray, ranges: np.ndarray) -> np.ndarray:
+        return np.where(distances > ranges, OUT_OF_RANGE_FACTOR,
+                        np.where(distances < ranges * TOO_CLOSE_RATIO, TOO_CLOSE_FACTOR, 1.0))
+
+    def scores(self, enemy_type: Optional[str], distance: Optional[float],
+               weapons: Optional[np.ndarray] = None) -> np.ndarray:
+        """Effectiveness (0.0 to 1.0) of each weapon against one enemy.
+
+        Parameters
+        ----------
+        enemy_type : str, optional
+            Enemy type; unknown types have no resistances
+        distance : float, optional
+            Distance to the enemy, ``DEFAULT_DISTANCE`` if not known
+        weapons : ndarray, optional
+            Row indices to score (see :meth:`indices`); all weapons if omitted
+
+        Returns
+        -------
+        ndarray
+            Scores in the order of ``weapons``
+        """
+        rows = slice(None) if weapons is None else weapons
+        distance = DEFAULT_DISTANCE if distance is None else float(distance)
+        score = (self.base[rows, self.enemy_column(enemy_type)]
+                 * self._range_factor(np.float64(distance), self.ranges[rows])
+                 * self.condition_factor[rows]
+                 * self.ammo_factor[rows])
+        return np.clip(score, 0.0, 1.0)
+
+    def score(self, weapon_name: str, enemy_type: Optional[str], distance: Optional[float]) -> float:
+        """Effectiveness of one weapon; 0.0 for unknown weapons."""
+        index = self.weapon_index.get(weapon_name)
+        if index is None:
+            return 0.0
+        return float(self.scores(enemy_type, distance, np.array([index], dtype=np.intp))[0])
+
+    def best(self, enemy_type: Optional[str], distance: Optional[float],
+             weapons: np.ndarray) -> Tuple[Optional[str], float]:
+        """Best weapon among ``weapons`` and its score.
+
+        Ties go to the earliest weapon; ``(None, 0.0)`` if nothing scores
+        above zero.
+        """
+        if not len(weapons):
+            return None, 0.0
+        scores = self.scores(enemy_type, distance, weapons)
+        position = int(np.argmax(scores))
+        if scores[position] <= 0.0:
+            return None, 0.0
+        return self.weapon_names[weapons[position]], float(scores[position])
+
+    def score_enemies(self, enemy_types: Sequence[Optional[str]],
+                      distances: Optional[Sequence[Optional[float]]] = None,
+                      weapons: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score every weapon against many enemies at once.
+
+        Parameters
+        ----------
+        enemy_types : sequence
+            Enemy type per enemy
+        distances : sequence, optional
+            Distance per enemy (``None`` entries use ``DEFAULT_DISTANCE``)
+        weapons : ndarray, optional
+            Row indices to score; all weapons if omitted
+
+        Returns
+        -------
+        ndarray
+            ``len(enemy_types) x len(weapons)`` scores
+        """
+        rows = slice(None) if weapons is None else weapons
+        columns = np.array([self.enemy_column(enemy) for enemy in enemy_types], dtype=np.intp)
+        if distances is None:
+            dist = np.full(len(columns), DEFAULT_DISTANCE)
+        else:
+            dist = np.array([DEFAULT_DISTANCE if d is None else float(d) for d in distances])
+        score = (self.base[rows][:, columns].T
+                 * self._range_factor(dist[:, None], self.ranges[rows][None, :])
+                 * self.condition_factor[rows]
+                 * self.ammo_factor[rows])
+        return np.clip(score, 0.0, 1.0)
+
+
+__all__ = [
+    "EffectivenessMatrix",
+    "RESISTANCE_COLUMNS",
+    "DEFAULT_DISTANCE",
+]
@@ -17,6 +17,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 
 from android_ms11.utils.logging_utils import log_event
+from modules.weapon_effectiveness import EffectivenessMatrix
 
 
 class WeaponType(Enum):
@@ -112,6 +113,10 @@ class WeaponSwapSystem:
         self.weapon_history: List[WeaponSwapEvent] = []
         self.weapon_effectiveness: Dict[str, Dict[str, float]] = {}
         
+        # Precomputed effectiveness, rebuilt when weapons or resistances change
+        self._effectiveness: Optional[EffectivenessMatrix] = None
+        self._loadout_rows: Dict[str, Any] = {}
+        
         # Combat context
         self.combat_context = {
             "enemy_type": None,
@@ -166,6 +171,7 @@ class WeaponSwapSystem:
                         priority_rules=loadout_data.get("priority_rules", {})
                     )
                 
+                self.invalidate_effectiveness()
                 log_event(f"[WEAPON_SWAP] Loaded {len(self.weapons)} weapons and {len(self.loadouts)} loadouts")
             else:
                 log_event("[WEAPON_SWAP] No weapon config file found, creating default")
@@ -293,6 +299,36 @@ class WeaponSwapSystem:
                 melee_resistance=0.4
             )
         }
+        self.invalidate_effectiveness()
+    
+    def invalidate_effectiveness(self):
+        """Drop the precomputed effectiveness matrix after config changes."""
+        self._effectiveness = None
+        self._loadout_rows.clear()
+    
+    @property
+    def effectiveness_matrix(self) -> EffectivenessMatrix:
+        """Weapon-by-enemy effectiveness matrix, built on first use."""
+        matrix = self._effectiveness
+        if matrix is None or matrix.source_sizes != (len(self.weapons), len(self.enemy_resistances)):
+            matrix = EffectivenessMatrix(self.weapons, self.enemy_resistances)
+            self._effectiveness = matrix
+            self._loadout_rows.clear()
+        return matrix
+    
+    def _available_rows(self):
+        """Matrix rows of the current loadout's weapons."""
+        matrix = self.effectiveness_matrix
+        rows = self._loadout_rows.get(self.current_loadout)
+        if rows is None:
+            rows = matrix.indices(self.get_available_weapons())
+            self._loadout_rows[self.current_loadout] = rows
+        return rows
+    
+    def _resolve_context(self, enemy_type: str = None, distance: float = None) -> Tuple[Optional[str], Optional[float]]:
+        """Fill in enemy type and distance from the combat context."""
+        return (enemy_type or self.combat_context.get("enemy_type"),
+                distance or self.combat_context.get("distance"))
     
     def set_combat_context(self, enemy_type: str = None, distance: float = None, 
                           enemy_health: int = None, player_health: int = None,
@@ -345,6 +381,7 @@ class WeaponSwapSystem:
             return False
         
         self.current_loadout = loadout_name
+        self._loadout_rows.pop(loadout_name, None)
         loadout = self.loadouts[loadout_name]
         self.current_weapon = loadout.primary_weapon
         
@@ -386,44 +423,8 @@ class WeaponSwapSystem:
         float
             Effectiveness score (0.0 to 1.0)
         """
-        if weapon_name not in self.weapons:
-            return 0.0
-        
-        weapon = self.weapons[weapon_name]
-        enemy_type = enemy_type or self.combat_context.get("enemy_type", "unknown")
-        distance = distance or self.combat_context.get("distance", 50.0)
-        
-        # Base effectiveness
-        effectiveness = 1.0
-        
-        # Range effectiveness
-        if distance > weapon.range:
-            effectiveness *= 0.3  # Out of range penalty
-        elif distance < weapon.range * 0.3:
-            effectiveness *= 0.8  # Too close penalty for ranged weapons
-        
-        # Enemy resistance
-        if enemy_type in self.enemy_resistances:
-            resistance = self.enemy_resistances[enemy_type]
-            damage_type = weapon.damage_type.value
-            
-            if damage_type == "kinetic":
-                effectiveness *= (1.0 - resistance.kinetic_resistance)
-            elif damage_type == "energy":
-                effectiveness *= (1.0 - resistance.energy_resistance)
-            elif damage_type == "explosive":
-                effectiveness *= (1.0 - resistance.explosive_resistance)
-            elif damage_type == "melee":
-                effectiveness *= (1.0 - resistance.melee_resistance)
-        
-        # Weapon condition
-        effectiveness *= (weapon.condition / 100.0)
-        
-        # Ammo availability
-        if weapon.current_ammo == 0:
-            effectiveness *= 0.1  # No ammo penalty
-        
-        return max(0.0, min(1.0, effectiveness))
+        enemy_type, distance = self._resolve_context(enemy_type, distance)
+        return self.effectiveness_matrix.score(weapon_name, enemy_type, distance)
     
     def get_best_weapon(self, enemy_type: str = None, distance: float = None) -> Optional[str]:
         """Get the best weapon for current combat conditions.
@@ -440,21 +441,52 @@ class WeaponSwapSystem:
         str or None
             Name of the best weapon, or None if no suitable weapon
         """
-        available_weapons = self.get_available_weapons()
-        if not available_weapons:
+        if not self.current_loadout:
             return None
         
-        best_weapon = None
-        best_score = 0.0
-        
-        for weapon_name in available_weapons:
-            score = self.calculate_weapon_effectiveness(weapon_name, enemy_type, distance)
-            if score > best_score:
-                best_score = score
-                best_weapon = weapon_name
-        
+        enemy_type, distance = self._resolve_context(enemy_type, distance)
+        best_weapon, _ = self.effectiveness_matrix.best(enemy_type, distance, self._available_rows())
         return best_weapon
     
+    def score_enemy_group(self, enemy_types: List[str],
+                          distances: List[float] = None) -> Dict[str, Any]:
+        """Score the loadout's weapons against a group of enemies at once.
+        
+        Parameters
+        ----------
+        enemy_types : list
+            Type of each enemy in the pull
+        distances : list, optional
+            Distance to each enemy (the context distance is used if omitted)
+            
+        Returns
+        -------
+        dict
+            ``weapons`` scored, per-enemy ``scores`` and ``best_per_enemy``,
+            and ``group_best``, the weapon with the highest mean score
+        """
+        rows = self._available_rows() if self.current_loadout else []
+        if not len(rows) or not enemy_types:
+            return {"weapons": [], "scores": [], "best_per_enemy": [], "group_best": None}
+        
+        matrix = self.effectiveness_matrix
+        if distances is None:
+            distances = [self.combat_context.get("distance")] * len(enemy_types)
+        scores = matrix.score_enemies(enemy_types, distances, rows)
+        weapons = [matrix.weapon_names[row] for row in rows]
+        
+        best_per_enemy = [weapons[i] if row_scores[i] > 0 else None
+                          for row_scores, i in zip(scores, scores.argmax(axis=1))]
+        mean_scores = scores.mean(axis=0)
+        group_index = int(mean_scores.argmax())
+        
+        return {
+            "weapons": weapons,
+            "scores": scores.tolist(),
+            "best_per_enemy": best_per_enemy,
+            "group_best": weapons[group_index] if mean_scores[group_index] > 0 else None,
+        }
+    
     def should_swap_weapon(self, enemy_type: str = None, distance: float = None, 
                           min_improvement: float = 0.2) -> Tuple[bool, Optional[str]]:
         """Determine if weapon should be swapped based on current conditions.
@@ -480,20 +512,17 @@ class WeaponSwapSystem:
         if self.current_loadout and not self.loadouts[self.current_loadout].auto_swap_enabled:
             return False, None
         
-        # Calculate current weapon effectiveness
-        current_effectiveness = self.calculate_weapon_effectiveness(
-            self.current_weapon, enemy_type, distance
-        )
+        if not self.current_loadout:
+            return False, None
         
-        # Find best weapon
-        best_weapon = self.get_best_weapon(enemy_type, distance)
+        # Score current and best weapon from the same matrix lookup
+        enemy_type, distance = self._resolve_context(enemy_type, distance)
+        matrix = self.effectiveness_matrix
+        best_weapon, best_effectiveness = matrix.best(enemy_type, distance, self._available_rows())
         if not best_weapon or best_weapon == self.current_weapon:
             return False, None
         
-        # Calculate best weapon effectiveness
-        best_effectiveness = self.calculate_weapon_effectiveness(
-            best_weapon, enemy_type, distance
-        )
+        current_effectiveness = matrix.score(self.current_weapon, enemy_type, distance)
         
         # Check if improvement is significant enough
         improvement = best_effectiveness - current_effectiveness
@@ -591,6 +620,8 @@ class WeaponSwapSystem:
         """
         if weapon_name in self.weapons:
             self.weapons[weapon_name].current_ammo = max(0, ammo_count)
+            if self._effectiveness is not None:
+                self._effectiveness.set_ammo(weapon_name, self.weapons[weapon_name].current_ammo)
             log_event(f"[WEAPON_SWAP] Updated {weapon_name} ammo: {ammo_count}")
     
     def update_weapon_condition(self, weapon_name: str, condition: float):
@@ -605,6 +636,8 @@ class WeaponSwapSystem:
         """
         if weapon_name in self.weapons:
             self.weapons[weapon_name].condition = max(0.0, min(100.0, condition))
+            if self._effectiveness is not None:
+                self._effectiveness.set_condition(weapon_name, self.weapons[weapon_name].condition)
             log_event(f"[WEAPON_SWAP] Updated {weapon_name} condition: {condition}%")
     
     def get_weapon_history(self, limit: int = 10) -> List[WeaponSwapEvent]:
@@ -630,15 +663,15 @@ class WeaponSwapSystem:
         dict
             Weapon effectiveness statistics by weapon and enemy type
         """
-        stats = {}
-        
-        for weapon_name in self.weapons:
-            stats[weapon_name] = {}
-            for enemy_type in self.enemy_resistances:
-                effectiveness = self.calculate_weapon_effectiveness(weapon_name, enemy_type)
-                stats[weapon_name][enemy_type] = effectiveness
-        
-        return stats
+        matrix = self.effectiveness_matrix
+        enemy_types = list(self.enemy_resistances)
+        distance = self.combat_context.get("distance")
+        scores = matrix.score_enemies(enemy_types, [distance] * len(enemy_types))
+        
+        return {
+            weapon_name: {enemy_type: float(scores[e, w]) for e, enemy_type in enumerate(enemy_types)}
+            for w, weapon_name in enumerate(matrix.weapon_names)
+        }
     
     def export_weapon_data(self, filepath: str = None) -> str:
         """Export weapon data to JSON file.
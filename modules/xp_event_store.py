@@ -0,0 +1,251 @@
+"""
+XP Event Store - Time-indexed XP gains with rolling aggregates.
+
+Backs :class:`modules.experimental_xp_tracker.ExperimentalXPTracker`:
+- Epoch timestamps, amounts and a running XP total in typed arrays, so
+  "XP since t" is a bisect plus one subtraction instead of a scan
+- A rolling window (one hour by default) whose head advances like a deque,
+  keeping per-skill, per-profession, per-zone and per-source window sums,
+  plus per profession/skill pair (the tracker's skill progress key)
+- All-time totals, event counts and quest counts per key
+- Hourly and daily buckets for summaries and charts
+"""
+
+import bisect
+from array import array
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+HOUR = 3600.0
+DAY = 86400.0
+
+NULL_ID = -1
+
+# Event attributes aggregated per key
+DIMENSIONS: Tuple[str, ...] = ("skill", "profession", "zone", "source", "profession_skill")
+
+# Events per skill that count as "recent" for slowdown detection
+RECENT_EVENTS = 5
+
+
+class KeyStats:
+    """Aggregates for one key of a dimension (a skill, zone, source, ...)."""
+
+    __slots__ = ("total_xp", "events", "quest_events", "window_xp", "recent")
+
+    def __init__(self):
+        self.total_xp = 0
+        self.events = 0
+        self.quest_events = 0
+        self.window_xp = 0
+        self.recent: Deque[int] = deque(maxlen=RECENT_EVENTS)
+
+    @property
+    def quest_rate(self) -> float:
+        """Share of events that came from quests."""
+        return self.quest_events / max(self.events, 1)
+
+    def recent_and_historical_means(self) -> Optional[Tuple[float, float]]:
+        """Mean XP of the last few events and of every event before them."""
+        if self.events <= len(self.recent) or not self.recent:
+            return None
+        recent_sum = sum(self.recent)
+        historical = self.events - len(self.recent)
+        return recent_sum / len(self.recent), (self.total_xp - recent_sum) / historical
+
+
+def profession_skill_key(profession: str, skill: str) -> str:
+    """Key for one skill within one profession."""
+    return f"{profession}_{skill}"
+
+
+def _bucket(epoch: float, size: float) -> float:
+    """Start of the local-time bucket (hour or day) containing ``epoch``."""
+    moment = datetime.fromtimestamp(epoch)
+    if size == DAY:
+        moment = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.timestamp()
+
+
+class XPEventStore:
+    """Array-backed, time-ordered store of XP gains.
+
+    Parameters
+    ----------
+    window_seconds : float
+        Length of the rolling window behind the per-key rates
+    max_events : int, optional
+        Keep roughly this many events in the arrays; older ones outside the
+        window are dropped in batches (their contribution to totals and
+        buckets is kept)
+    """
+
+    def __init__(self, window_seconds: float = HOUR, max_events: Optional[int] = None):
+        self.window_seconds = window_seconds
+        self.max_events = max_events
+
+        self.timestamps = array("d")
+        self.amounts = array("q")
+        self.cumulative = array("q")  # running XP total including each event
+        self.keys: Dict[str, array] = {dim: array("i") for dim in DIMENSIONS}
+        self.quest_flags = array("b")
+
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+        self.stats: Dict[str, Dict[str, KeyStats]] = {dim: defaultdict(KeyStats) for dim in DIMENSIONS}
+        self.hourly: Dict[float, int] = defaultdict(int)
+        self.daily: Dict[float, int] = defaultdict(int)
+
+        self.total_xp = 0
+        self.window_xp = 0
+        self._base = 0  # events dropped from the front of the arrays
+        self._head = 0  # first array index inside the rolling window
+        self._dropped_xp = 0  # cumulative total just before index 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_ID
+        code = self._string_ids.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = code
+        return code
+
+    def append(self, epoch: float, amount: int, skill: str, profession: str,
+               zone: Optional[str] = None, source: Optional[str] = None) -> None:
+        """Record a gain at ``epoch`` (seconds).
+
+        Timestamps earlier than the newest stored one are clamped to it so
+        the arrays stay sorted.
+        """
+        if self.timestamps and epoch < self.timestamps[-1]:
+            epoch = self.timestamps[-1]
+        amount = int(amount)
+        is_quest = source == "quest"
+        values = {"skill": skill, "profession": profession, "zone": zone, "source": source,
+                  "profession_skill": profession_skill_key(profession, skill)}
+
+        self.timestamps.append(epoch)
+        self.amounts.append(amount)
+        self.total_xp += amount
+        self.cumulative.append(self.total_xp)
+        self.quest_flags.append(int(is_quest))
+        self.window_xp += amount
+
+        for dim in DIMENSIONS:
+            value = values[dim]
+            self.keys[dim].append(self._encode(value))
+            if value is None:
+                continue
+            stats = self.stats[dim][value]
+            stats.total_xp += amount
+            stats.events += 1
+            stats.quest_events += is_quest
+            stats.window_xp += amount
+            stats.recent.append(amount)
+
+        self.hourly[_bucket(epoch, HOUR)] += amount
+        self.daily[_bucket(epoch, DAY)] += amount
+
+        self.advance(epoch)
+        if self.max_events is not None and len(self.timestamps) > self.max_events:
+            self._compact(len(self.timestamps) - self.max_events)
+
+    def advance(self, now: float) -> None:
+        """Move the window head past events older than ``window_seconds``."""
+        cutoff = now - self.window_seconds
+        timestamps = self.timestamps
+        head = self._head
+        while head < len(timestamps) and timestamps[head] <= cutoff:
+            amount = self.amounts[head]
+            self.window_xp -= amount
+            for dim in DIMENSIONS:
+                code = self.keys[dim][head]
+                if code != NULL_ID:
+                    self.stats[dim][self.strings[code]].window_xp -= amount
+            head += 1
+        self._head = head
+
+    def _compact(self, count: int) -> None:
+        # Only events already outside the window can be dropped
+        count = min(count, self._head)
+        if count <= 0 or count < len(self.timestamps) // 4:
+            return
+        self._dropped_xp = self.cumulative[count - 1]
+        for column in (self.timestamps, self.amounts, self.cumulative, self.quest_flags,
+                       *self.keys.values()):
+            del column[:count]
+        self._base += count
+        self._head -= count
+
+    def xp_since(self, cutoff: float) -> int:
+        """XP from events strictly after ``cutoff`` (bisect + prefix sums)."""
+        index = bisect.bisect_right(self.timestamps, cutoff)
+        before = self.cumulative[index - 1] if index else self._dropped_xp
+        return self.total_xp - before
+
+    def rate_per_hour(self, hours: float, now: float) -> float:
+        """Average XP per hour over the last ``hours`` hours."""
+        if hours <= 0:
+            return 0.0
+        return self.xp_since(now - hours * HOUR) / hours
+
+    def window_total(self, now: float, dimension: Optional[str] = None,
+                     key: Optional[str] = None) -> int:
+        """XP inside the rolling window, overall or for one key."""
+        self.advance(now)
+        if dimension is None:
+            return self.window_xp
+        stats = self.stats[dimension].get(key)
+        return stats.window_xp if stats else 0
+
+    def key_stats(self, dimension: str, key: str) -> Optional[KeyStats]:
+        """Aggregates for ``key`` in ``dimension``, if it has any events."""
+        return self.stats[dimension].get(key)
+
+    def totals(self, dimension: str) -> Dict[str, int]:
+        """All-time XP per key of ``dimension``."""
+        return {key: stats.total_xp for key, stats in self.stats[dimension].items()}
+
+    def day_total(self, epoch: float) -> int:
+        """XP gained on the local day containing ``epoch``."""
+        return self.daily.get(_bucket(epoch, DAY), 0)
+
+    def hourly_series(self) -> List[Tuple[datetime, int]]:
+        """``(hour start, XP)`` for every hour with gains, oldest first."""
+        return [(datetime.fromtimestamp(hour), xp) for hour, xp in sorted(self.hourly.items())]
+
+    def daily_series(self) -> List[Tuple[datetime, int]]:
+        """``(day start, XP)`` for every day with gains, oldest first."""
+        return [(datetime.fromtimestamp(day), xp) for day, xp in sorted(self.daily.items())]
+
+    def cumulative_series(self) -> Tuple[List[datetime], List[int]]:
+        """Event times and the running XP total at each, for stored events."""
+        return [datetime.fromtimestamp(t) for t in self.timestamps], list(self.cumulative)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly snapshot of the aggregates."""
+        return {
+            "events": self._base + len(self.timestamps),
+            "total_xp": self.total_xp,
+            "window_seconds": self.window_seconds,
+            "window_xp": self.window_xp,
+            "hourly": [(moment.isoformat(), xp) for moment, xp in self.hourly_series()],
+            "daily": [(moment.date().isoformat(), xp) for moment, xp in self.daily_series()],
+            "totals": {dim: self.totals(dim) for dim in DIMENSIONS},
+        }
+
+    def clear(self) -> None:
+        """Drop all events and aggregates."""
+        self.__init__(self.window_seconds, self.max_events)
+
+
+__all__ = ["XPEventStore", "KeyStats", "DIMENSIONS", "profession_skill_key"]
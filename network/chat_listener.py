@@ -1,27 +1,28 @@
-import threading
-import time
+from network.chat_pipeline import ChatPipeline, StdinSource
 
 
 def listen_for_chat(callback):
     """Start a background thread that forwards input lines to ``callback``.
 
+    Lines are read by a :class:`~network.chat_pipeline.ChatPipeline`, so a
+    slow callback no longer holds up reading input; it is called once per
+    line, in order.
+
     Returns
     -------
     threading.Thread
         The background thread running the chat loop so callers may join or
-        otherwise manage it.
+        otherwise manage it.  Its ``pipeline`` attribute can be used to
+        stop the listener or add subscribers, even once input is flowing.
     """
 
-    def chat_loop():
-        time.sleep(0.1)
-        while True:
-            try:
-                line = input("")
-            except EOFError:
-                break
-            callback(line)
+    def forward(events):
+        for event in events:
+            callback(event.raw)
 
-    thread = threading.Thread(target=chat_loop, daemon=True)
-    thread.start()
+    pipeline = ChatPipeline([StdinSource()])
+    pipeline.subscribe(forward, name="listen_for_chat")
+    thread = pipeline.start_in_thread()
+    thread.pipeline = pipeline
     # Intentionally do not join so the listener stays active
     return thread
@@ -0,0 +1,648 @@
+"""Asynchronous chat ingestion pipeline.
+
+Lines come from pluggable sources (stdin, a tailed chat log, a local
+socket, or a replay for benchmarking), are parsed into :class:`ChatEvent`
+objects with precompiled channel/sender patterns, and are fanned out to
+subscribers.  Every subscriber has its own bounded queue and worker, so a
+slow subscriber only ever holds back ingestion according to its own
+overflow policy:
+
+``"block"``
+    The source waits for room in the queue (backpressure).
+``"drop_oldest"`` / ``"drop_newest"``
+    Ingestion never waits; events are dropped and counted instead.
+
+Workers hand events to their callback in batches of up to ``batch_size``,
+waiting at most ``batch_timeout`` seconds to fill one.  Coroutine callbacks
+are awaited; plain callbacks run in a worker thread so they cannot stall
+the event loop.  A callback that raises is logged and counted; its batch
+is not retried.
+
+:meth:`ChatPipeline.stop` may be called from any thread.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatEvent:
+    """One parsed chat line."""
+    channel: str
+    message: str
+    sender: Optional[str] = None
+    raw: str = ""
+    log_time: Optional[str] = None  # clock time printed in the log, if any
+    received_at: float = field(default_factory=time.time)
+
+    @property
+    def is_whisper(self) -> bool:
+        return self.channel == "whisper"
+
+
+_TIME_PREFIX = r"^\s*(?:\[(?P<time>\d{1,2}:\d{2}(?::\d{2})?)\]\s*)?"
+
+# (channel, pattern) in match order; a ``channel`` group overrides the name
+DEFAULT_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("whisper", r"\[Whisper from (?P<sender>[^\]]+)\]:\s*(?P<message>.*)$"),
+    ("whisper", r"<(?P<sender>[^>]+?) whispers>:\s*(?P<message>.*)$"),
+    ("whisper", r"Whisper from (?P<sender>[^:]+?):\s*(?P<message>.*)$"),
+    ("whisper", r"(?P<sender>[^\s:\[\]]+) tells you:\s*(?P<message>.*)$"),
+    ("channel", r"\[(?P<channel>[A-Za-z][\w ]*?)\]\s*(?P<sender>[^:\[\]]+?):\s*(?P<message>.*)$"),
+    ("channel", r"\[(?P<channel>[A-Za-z][\w ]*?)\]\s*(?P<message>.*)$"),
+)
+
+
+class ChatParser:
+    """Parse raw chat lines with precompiled patterns.
+
+    Parameters
+    ----------
+    patterns : sequence of (str, str)
+        ``(channel, regex)`` pairs tried in order; each regex must define a
+        ``message`` group and may define ``sender`` and ``channel``
+    default_channel : str
+        Channel for lines no pattern matches
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, str]] = DEFAULT_PATTERNS,
+                 default_channel: str = "system"):
+        self.patterns: List[Tuple[str, Pattern]] = [
+            (channel, re.compile(_TIME_PREFIX + regex, re.IGNORECASE)) for channel, regex in patterns
+        ]
+        self._bare_time = re.compile(_TIME_PREFIX + r"(?P<message>.*)$")
+        self.default_channel = default_channel
+
+    def parse(self, line: str) -> ChatEvent:
+        line = line.rstrip("\r\n")
+        for channel, pattern in self.patterns:
+            match = pattern.match(line)
+            if match:
+                groups = match.groupdict()
+                sender = groups.get("sender")
+                return ChatEvent(
+                    channel=(groups.get("channel") or channel).strip().lower(),
+                    message=groups["message"].strip(),
+                    sender=sender.strip() if sender else None,
+                    raw=line,
+                    log_time=groups.get("time"),
+                )
+        match = self._bare_time.match(line)
+        return ChatEvent(self.default_channel, match.group("message").strip(), raw=line,
+                         log_time=match.group("time"))
+
+
+class ChatSource:
+    """Base class: an async stream of raw chat lines."""
+
+    name = "source"
+
+    def lines(self) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Ask the source to stop producing lines; safe from any thread."""
+
+
+def _wake(queue: "asyncio.Queue") -> None:
+    """Queue the end-of-lines marker for a waiting reader, if there is room.
+
+    A full queue needs no marker: its reader is not waiting and checks the
+    closed flag after the next line.  Runs on the queue's event loop.
+    """
+    if not queue.full():
+        queue.put_nowait(None)
+
+
+def _drain(queue: "asyncio.Queue") -> None:
+    """Empty ``queue`` so producers waiting for room are released."""
+    while not queue.empty():
+        queue.get_nowait()
+
+
+class _ThreadedReader(ChatSource):
+    """Source fed by a blocking ``read()`` running in a daemon thread.
+
+    The thread waits when the hand-off queue is full, so backpressure
+    reaches the blocking reader too.  :meth:`close` ends :meth:`lines`
+    right away, but cannot interrupt a ``read()`` in progress: the thread
+    exits, discarding the line, once that call returns.
+    """
+
+    def __init__(self, read: Callable[[], Optional[str]], maxsize: int = 1024):
+        self._read = read
+        self._maxsize = maxsize
+        self._closed = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+
+    def _run(self, loop: asyncio.AbstractEventLoop, queue: "asyncio.Queue") -> None:
+        try:
+            while not self._closed.is_set():
+                try:
+                    line = self._read()
+                except EOFError:
+                    break
+                if line is None or self._closed.is_set():
+                    break
+                asyncio.run_coroutine_threadsafe(queue.put(line), loop).result()
+        except RuntimeError:
+            return  # event loop already closed
+        finally:
+            if not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(queue.put(None), loop)
+
+    async def lines(self) -> AsyncIterator[str]:
+        self._queue = queue = asyncio.Queue(self._maxsize)
+        self._loop = asyncio.get_running_loop()
+        thread = threading.Thread(target=self._run, args=(self._loop, queue),
+                                  name=f"chat-{self.name}", daemon=True)
+        thread.start()
+        try:
+            while not self._closed.is_set():
+                line = await queue.get()
+                if line is None:
+                    return
+                yield line
+        finally:
+            _drain(queue)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(_wake, self._queue)
+            except RuntimeError:
+                pass  # event loop already closed
+
+
+class StdinSource(_ThreadedReader):
+    """Lines typed on stdin (via :func:`input`) until EOF.
+
+    After :meth:`close` the daemon reader thread stays blocked in
+    :func:`input` until the next line or EOF; it does not keep the process
+    alive.
+    """
+
+    name = "stdin"
+
+    def __init__(self, maxsize: int = 1024):
+        # Looked up per call so ``builtins.input`` can be replaced
+        super().__init__(lambda: input(""), maxsize)
+
+
+class TailSource(ChatSource):
+    """Lines appended to a chat log file, like ``tail -f``.
+
+    Parameters
+    ----------
+    path : str or Path
+        Log file; it may not exist yet
+    poll_interval : float
+        Seconds between checks when there is no new data
+    from_start : bool
+        Read the existing contents first instead of only new lines
+    """
+
+    name = "tail"
+
+    def __init__(self, path, poll_interval: float = 0.2, from_start: bool = False, encoding: str = "utf-8"):
+        self.path = os.fspath(path)
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self.encoding = encoding
+        self._closed = False
+
+    async def lines(self) -> AsyncIterator[str]:
+        handle = None
+        position = 0 if self.from_start else None
+        partial = ""
+        try:
+            while not self._closed:
+                if handle is None:
+                    try:
+                        handle = open(self.path, "r", encoding=self.encoding, errors="replace")
+                    except FileNotFoundError:
+                        await asyncio.sleep(self.poll_interval)
+                        continue
+                    if position is None:
+                        handle.seek(0, os.SEEK_END)
+                    else:
+                        handle.seek(position)
+
+                chunk = handle.readline()
+                if chunk:
+                    partial += chunk
+                    if partial.endswith("\n"):
+                        line, partial = partial, ""
+                        yield line
+                    continue
+
+                position = handle.tell()
+                try:
+                    size = os.stat(self.path).st_size
+                except FileNotFoundError:
+                    size = -1
+                if size < position:
+                    # Rotated or truncated: start over on the new file
+                    handle.close()
+                    handle, position, partial = None, 0, ""
+                    continue
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class SocketSource(ChatSource):
+    """Lines sent to a local TCP socket, from any number of clients.
+
+    Parameters
+    ----------
+    host, port : str, int
+        Address to listen on; port 0 picks a free port (see :attr:`port`)
+    """
+
+    name = "socket"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, maxsize: int = 1024):
+        self.host = host
+        self.port = port
+        self._maxsize = maxsize
+        self._server = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while not self._closed:
+                data = await reader.readline()
+                if not data:
+                    break
+                await self._queue.put(data.decode("utf-8", errors="replace"))
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Start listening (done by :meth:`lines` if not called first)."""
+        if self._server is not None:
+            return
+        self._queue = asyncio.Queue(self._maxsize)
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self._closed:
+            self._shutdown()
+
+    async def lines(self) -> AsyncIterator[str]:
+        await self.start()
+        try:
+            while not self._closed:
+                line = await self._queue.get()
+                if line is None:
+                    return
+                yield line
+        finally:
+            _drain(self._queue)
+
+    def _shutdown(self) -> None:
+        self._server.close()
+        _wake(self._queue)
+
+    def close(self) -> None:
+        self._closed = True
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._shutdown)
+            except RuntimeError:
+                pass  # event loop already closed
+
+
+class ReplaySource(ChatSource):
+    """Replay recorded lines, optionally at a fixed rate, for benchmarking.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Lines to replay
+    rate : float, optional
+        Lines per second; as fast as possible if omitted
+    repeat : int
+        Times to replay ``lines``
+    """
+
+    name = "replay"
+
+    def __init__(self, lines: Iterable[str], rate: Optional[float] = None, repeat: int = 1):
+        self._lines = list(lines)
+        self.rate = rate
+        self.repeat = repeat
+        self._closed = False
+
+    async def lines(self) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        sent = 0
+        for _ in range(self.repeat):
+            for line in self._lines:
+                if self._closed:
+                    return
+                if self.rate:
+                    ahead = sent / self.rate - (time.perf_counter() - start)
+                    if ahead > 0.001:
+                        await asyncio.sleep(ahead)
+                elif sent % 1000 == 999:
+                    await asyncio.sleep(0)
+                sent += 1
+                yield line
+
+    def close(self) -> None:
+        self._closed = True
+
+
+_STOP = object()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class Subscription:
+    """A subscriber's bounded queue, batching worker and counters."""
+
+    def __init__(self, callback: Callable[[List[ChatEvent]], Any], name: str,
+                 channels: Optional[Iterable[str]] = None, maxsize: int = 1000,
+                 batch_size: int = 50, batch_timeout: float = 0.05, overflow: str = "block"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.callback = callback
+        self.name = name
+        self.channels = {c.lower() for c in channels} if channels is not None else None
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.overflow = overflow
+        self.delivered = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_depth = 0
+        self._queue: Optional[asyncio.Queue] = None
+
+    def wants(self, event: ChatEvent) -> bool:
+        return self.channels is None or event.channel in self.channels
+
+    async def offer(self, event: ChatEvent) -> None:
+        queue = self._queue
+        if self.overflow == "block":
+            await queue.put(event)
+        elif queue.full():
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            queue.get_nowait()
+            queue.put_nowait(event)
+        else:
+            queue.put_nowait(event)
+        depth = queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    async def _deliver(self, batch: List[ChatEvent]) -> None:
+        try:
+            if inspect.iscoroutinefunction(self.callback):
+                await self.callback(batch)
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, self.callback, batch)
+        except Exception:
+            self.errors += 1
+            logger.exception("Chat subscriber %s failed on a batch of %d events", self.name, len(batch))
+        self.batches += 1
+        self.delivered += len(batch)
+
+    async def run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = loop.time() + self.batch_timeout
+            while len(batch) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._deliver(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "max_depth": self.max_depth,
+        }
+
+
+class ChatPipeline:
+    """Read chat sources, parse lines and fan events out to subscribers.
+
+    Parameters
+    ----------
+    sources : iterable of ChatSource, optional
+        Initial sources (more can be added before :meth:`run`)
+    parser : ChatParser, optional
+        Line parser; the default patterns if omitted
+    """
+
+    def __init__(self, sources: Optional[Iterable[ChatSource]] = None, parser: Optional[ChatParser] = None):
+        self.sources: List[ChatSource] = list(sources or [])
+        self.parser = parser or ChatParser()
+        self.subscriptions: List[Subscription] = []
+        self.lines_read = 0
+        self.parse_errors = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List["asyncio.Future[None]"] = []
+
+    def add_source(self, source: ChatSource) -> ChatSource:
+        self.sources.append(source)
+        return source
+
+    def subscribe(self, callback: Callable[[List[ChatEvent]], Any], *, name: Optional[str] = None,
+                  channels: Optional[Iterable[str]] = None, maxsize: int = 1000, batch_size: int = 50,
+                  batch_timeout: float = 0.05, overflow: str = "block") -> Subscription:
+        """
+        Register a callback receiving lists of :class:`ChatEvent`.
+
+        May be called while the pipeline runs, from any thread; the
+        subscriber then receives the events published after its worker
+        starts on the pipeline's loop.
+
+        Parameters
+        ----------
+        callback : callable
+            ``callback(events)``; may be a coroutine function
+        name : str, optional
+            Name used in :meth:`stats`
+        channels : iterable of str, optional
+            Only deliver events on these channels
+        maxsize : int
+            Queue bound for this subscriber
+        batch_size : int
+            Most events per callback call
+        batch_timeout : float
+            Longest wait for a batch to fill, in seconds
+        overflow : str
+            ``"block"``, ``"drop_oldest"`` or ``"drop_newest"``
+
+        Returns
+        -------
+        Subscription
+            Holds the subscriber's delivery counters
+        """
+        subscription = Subscription(callback, name or f"subscriber-{len(self.subscriptions)}", channels,
+                                    maxsize, batch_size, batch_timeout, overflow)
+        loop = self._loop
+        if loop is None:
+            self.subscriptions.append(subscription)
+        elif _running_loop() is loop:
+            self._start(subscription)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._start, subscription)
+            except RuntimeError:
+                # The loop closed after run() returned
+                self.subscriptions.append(subscription)
+        return subscription
+
+    def _start(self, subscription: Subscription) -> None:
+        """Give ``subscription`` a queue and a worker on the running loop.
+
+        Subscriptions are only published to once they have a queue, so a
+        late subscriber is added here, on the loop, rather than by the
+        calling thread.
+        """
+        if self._loop is not None:
+            subscription._queue = asyncio.Queue(subscription.maxsize)
+            self._workers.append(asyncio.ensure_future(subscription.run()))
+        if subscription not in self.subscriptions:
+            self.subscriptions.append(subscription)
+
+    async def _publish(self, event: ChatEvent) -> None:
+        for subscription in self.subscriptions:
+            if subscription.wants(event):
+                await subscription.offer(event)
+
+    async def _ingest(self, source: ChatSource) -> None:
+        parse = self.parser.parse
+        async for line in source.lines():
+            self.lines_read += 1
+            try:
+                event = parse(line)
+            except Exception:
+                self.parse_errors += 1
+                continue
+            await self._publish(event)
+
+    async def run(self) -> None:
+        """Ingest until every source is exhausted or :meth:`stop` is called,
+        then deliver what is still queued."""
+        self.started_at = time.perf_counter()
+        self._loop = asyncio.get_running_loop()
+        self._workers = []
+        for subscription in self.subscriptions:
+            self._start(subscription)
+        try:
+            await asyncio.gather(*(self._ingest(source) for source in self.sources))
+        finally:
+            # Subscribers arriving from now on are registered without a worker
+            self._loop = None
+            for subscription in self.subscriptions:
+                if subscription._queue is not None:
+                    await subscription._queue.put(_STOP)
+            await asyncio.gather(*self._workers)
+            self.finished_at = time.perf_counter()
+
+    def stop(self) -> None:
+        """Close every source; :meth:`run` returns once queues are drained.
+
+        Safe to call from any thread, e.g. while :meth:`start_in_thread`
+        runs the pipeline.
+        """
+        for source in self.sources:
+            source.close()
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run the pipeline on its own event loop in a daemon thread."""
+        thread = threading.Thread(target=lambda: asyncio.run(self.run()), name="chat-pipeline", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "lines": self.lines_read,
+            "parse_errors": self.parse_errors,
+            "elapsed_s": round(elapsed, 4) if elapsed is not None else None,
+            "lines_per_s": round(self.lines_read / elapsed) if elapsed else 0,
+            "subscribers": {s.name: s.stats() for s in self.subscriptions},
+        }
+
+
+__all__ = [
+    "ChatEvent",
+    "ChatParser",
+    "ChatPipeline",
+    "ChatSource",
+    "ReplaySource",
+    "SocketSource",
+    "StdinSource",
+    "Subscription",
+    "TailSource",
+]
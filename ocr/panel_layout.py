@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Layout-Aware Panel Reading
+
+Label/value panels (the stats sheet, the armor panel) keep their rows in
+the same place from one scan to the next; only the numbers change.  The
+helpers here read such a panel in two steps:
+
+* :func:`locate_rows` turns one word-box OCR pass over the panel
+  (``pytesseract.image_to_data`` output) into a :class:`PanelLayout`, the
+  label of every row and the box its value sits in.  This is done once
+  per panel and reused.
+* :func:`stack_cells` crops the value boxes of any number of panels into
+  one vertical strip, so a single digits-only OCR call reads every value,
+  and :func:`assign_words` routes the words of that call back to their
+  rows.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (x1, y1, x2, y2) in panel pixels
+Box = Tuple[int, int, int, int]
+
+LAYOUT_CONFIG = "--oem 3 --psm 6"
+DIGIT_CONFIG = "--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789/"
+
+VALUE_TOKEN = re.compile(r"^\d+(?:/\d*)?$|^/\d+$")
+CURRENT_MAX_PATTERN = re.compile(r"(\d+)\s*/\s*(\d+)")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class Word:
+    """One word of a word-box OCR pass."""
+    text: str
+    box: Box
+    confidence: float
+    line: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def center_y(self) -> float:
+        return (self.box[1] + self.box[3]) / 2
+
+
+@dataclass(frozen=True)
+class LayoutRow:
+    """A panel row: its label and the box holding its value."""
+    label: str
+    value_box: Box
+
+
+@dataclass(frozen=True)
+class PanelLayout:
+    """Rows of a panel, located for panels of ``shape`` (height, width)."""
+    shape: Tuple[int, int]
+    rows: Tuple[LayoutRow, ...]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def words_from_data(data: Dict[str, Sequence[Any]]) -> List[Word]:
+    """Convert ``image_to_data(..., output_type=Output.DICT)`` into words.
+
+    Empty entries and the ``-1`` confidence entries Tesseract emits for
+    blocks and paragraphs are skipped.
+    """
+    words = []
+    has_lines = all(key in data for key in ("block_num", "par_num", "line_num"))
+    for i, text in enumerate(data.get("text", ())):
+        text = str(text).strip()
+        if not text:
+            continue
+        try:
+            confidence = float(data["conf"][i])
+        except (KeyError, IndexError, TypeError, ValueError):
+            confidence = 0.0
+        if confidence < 0:
+            continue
+        left, top = int(data["left"][i]), int(data["top"][i])
+        box = (left, top, left + int(data["width"][i]), top + int(data["height"][i]))
+        line = None
+        if has_lines:
+            line = (int(data["block_num"][i]), int(data["par_num"][i]), int(data["line_num"][i]))
+        words.append(Word(text, box, confidence, line))
+    return words
+
+
+def group_lines(words: Sequence[Word]) -> List[List[Word]]:
+    """Group words into text lines, top to bottom, each sorted left to right.
+
+    Tesseract's line numbers are used when present; otherwise words whose
+    vertical centers fall inside the same line's box are grouped together.
+    """
+    lines: List[List[Word]] = []
+    if words and all(word.line is not None for word in words):
+        by_key: Dict[Tuple[int, int, int], List[Word]] = {}
+        for word in words:
+            by_key.setdefault(word.line, []).append(word)
+        lines = list(by_key.values())
+    else:
+        for word in sorted(words, key=lambda w: w.center_y):
+            if lines and lines[-1][0].box[1] <= word.center_y <= lines[-1][0].box[3]:
+                lines[-1].append(word)
+            else:
+                lines.append([word])
+    lines = [sorted(line, key=lambda w: w.box[0]) for line in lines]
+    lines.sort(key=lambda line: min(w.box[1] for w in line))
+    return lines
+
+
+def locate_rows(data: Dict[str, Sequence[Any]], shape: Tuple[int, ...], margin: int = 2) -> PanelLayout:
+    """Locate the label/value rows of a panel from one word-box OCR pass.
+
+    A row is a text line made of label words followed by value words
+    (``1500/1500``, ``45``).  Lines without both are ignored.  Every value
+    box spans the panel's value column, from the leftmost value found to
+    the panel's right edge, so values wider than the ones seen during
+    layout still fit.
+
+    Parameters
+    ----------
+    data : dict
+        ``image_to_data`` output for the whole panel
+    shape : tuple
+        Shape of the panel image
+    margin : int
+        Pixels added around every value box
+    """
+    height, width = int(shape[0]), int(shape[1])
+    found = []
+    for line in group_lines(words_from_data(data)):
+        split = next((i for i, word in enumerate(line) if VALUE_TOKEN.match(word.text)), None)
+        if not split:
+            continue
+        label = " ".join(word.text for word in line[:split]).strip().rstrip(":").strip()
+        if not label:
+            continue
+        values = line[split:]
+        top = min(word.box[1] for word in line)
+        bottom = max(word.box[3] for word in line)
+        found.append((label, values[0].box[0], top, bottom))
+
+    if not found:
+        return PanelLayout((height, width), ())
+    column = max(0, min(left for _, left, _, _ in found) - margin)
+    rows = tuple(
+        LayoutRow(label, (column, max(0, top - margin), width, min(height, bottom + margin)))
+        for label, _, top, bottom in found
+    )
+    return PanelLayout((height, width), rows)
+
+
+def crop(image: Any, box: Box) -> Any:
+    x1, y1, x2, y2 = box
+    return image[y1:y2, x1:x2]
+
+
+def stack_cells(cells: Sequence[Any], gap: int = 6) -> Tuple[Any, List[Tuple[int, int]]]:
+    """Stack image cells vertically into one strip for a single OCR call.
+
+    Cells are padded to a common width and separated by ``gap`` rows,
+    both by repeating their edge pixels so the padding matches each
+    cell's own background.
+
+    Returns
+    -------
+    tuple
+        The strip and the ``(start, end)`` rows each cell occupies in it
+    """
+    if not cells:
+        raise ValueError("no cells to stack")
+    width = max(cell.shape[1] for cell in cells)
+    parts, bands, offset = [], [], 0
+    for cell in cells:
+        pad = [(gap, gap), (0, width - cell.shape[1])] + [(0, 0)] * (cell.ndim - 2)
+        parts.append(np.pad(cell, pad, mode="edge"))
+        bands.append((offset + gap, offset + gap + cell.shape[0]))
+        offset += cell.shape[0] + 2 * gap
+    return np.concatenate(parts, axis=0), bands
+
+
+def assign_words(words: Sequence[Word], bands: Sequence[Tuple[int, int]]) -> List[List[Word]]:
+    """Route the words of a stacked-strip OCR pass back to their cells.
+
+    A word belongs to the cell whose band contains its vertical center;
+    words that land in the gaps between cells are dropped.
+    """
+    starts = [start for start, _ in bands]
+    cells: List[List[Word]] = [[] for _ in bands]
+    for word in words:
+        index = bisect.bisect_right(starts, word.center_y) - 1
+        if index >= 0 and word.center_y < bands[index][1]:
+            cells[index].append(word)
+    for cell in cells:
+        cell.sort(key=lambda w: w.box[0])
+    return cells
+
+
+def parse_value(text: str) -> Optional[Tuple[int, int]]:
+    """Parse ``current/max`` or a single number; ``None`` if there is none."""
+    match = CURRENT_MAX_PATTERN.search(text)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = NUMBER_PATTERN.search(text)
+    if match:
+        value = int(match.group(0))
+        return value, value
+    return None
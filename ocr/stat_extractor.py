@@ -4,12 +4,21 @@ Stat Extractor for Character Attributes
 
 This module provides functionality to extract character stats and attributes
 from game panels using OCR and macro commands.
+
+Panels can be read in two modes.  ``"text"`` OCRs a panel as one blob of
+text and searches it with the stat patterns.  ``"layout"`` locates the
+panel's label/value rows once from word boxes, then reads only the value
+column with a digits-only OCR pass; :meth:`StatExtractor.extract_panels`
+reads every requested panel from one capture and one OCR call, and keeps
+each character's result until the panel's pixels change.  Macro output
+(``/stats``, ``/armor``) is not part of that capture: each macro is a
+separate command whose reply has to be awaited, so it is read on its own.
 """
 
 import re
 import json
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -19,8 +28,33 @@ import cv2
 import numpy as np
 from PIL import Image
 
-from core.ocr import OCREngine, extract_text_from_screen
-from core.screenshot import capture_screen
+try:
+    from core.ocr import OCREngine, extract_text_from_screen
+    from core.screenshot import capture_screen
+    OCR_AVAILABLE = True
+except ImportError:
+    OCREngine = None
+    extract_text_from_screen = None
+    capture_screen = None
+    OCR_AVAILABLE = False
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+from ocr.panel_layout import (
+    DIGIT_CONFIG,
+    LAYOUT_CONFIG,
+    PanelLayout,
+    assign_words,
+    crop,
+    locate_rows,
+    parse_value,
+    stack_cells,
+    words_from_data,
+)
+from utils.image_digest import frame_digest
 from utils.logging_utils import log_event
 
 
@@ -48,6 +82,31 @@ class StatType(Enum):
     TAPE_STUN = "tape_stun"
 
 
+BASIC_STAT_LABELS = {
+    "health": StatType.HEALTH,
+    "hp": StatType.HEALTH,
+    "action": StatType.ACTION,
+    "ap": StatType.ACTION,
+    "mind": StatType.MIND,
+    "mp": StatType.MIND,
+    "luck": StatType.LUCK,
+}
+RESIST_ELEMENTS = ("energy", "blast", "kinetic", "heat", "cold", "electricity", "acid", "stun")
+
+
+def stat_type_for_label(label: str) -> Optional[StatType]:
+    """Map a panel row label ("Energy Resistance", "Tape Heat", "HP") to a stat."""
+    words = re.findall(r"[a-z]+", label.lower())
+    element = next((word for word in words if word in RESIST_ELEMENTS), None)
+    if element:
+        prefix = "tape" if "tape" in words else "resist"
+        return StatType(f"{prefix}_{element}")
+    for word in words:
+        if word in BASIC_STAT_LABELS:
+            return BASIC_STAT_LABELS[word]
+    return None
+
+
 @dataclass
 class CharacterStat:
     """Individual character stat."""
@@ -85,12 +144,35 @@ class StatExtractor:
     - Stat normalization and validation
     - Confidence scoring for extracted data
     - Support for multiple stat types
+    - Layout-aware, batched panel reading with a per-character cache
     """
     
-    def __init__(self):
-        """Initialize the stat extractor."""
-        self.ocr_engine = OCREngine()
+    def __init__(self, capture: Optional[Callable[[], Any]] = None,
+                 word_boxes: Optional[Callable[[Any, str], Dict[str, List[Any]]]] = None):
+        """
+        Initialize the stat extractor.
+        
+        Parameters
+        ----------
+        capture : callable, optional
+            Screenshot of the game client, used by the layout mode;
+            ``core.screenshot.capture_screen`` if available
+        word_boxes : callable, optional
+            ``word_boxes(image, config)`` returning word boxes in the
+            ``pytesseract.image_to_data`` dict format; pytesseract if
+            available
+        """
+        self.ocr_engine = OCREngine() if OCR_AVAILABLE else None
         self.logger = logging.getLogger(__name__)
+        self.capture = capture or capture_screen
+        self.word_boxes = word_boxes or self._tesseract_word_boxes
+        
+        # Layout mode state: row layouts per (panel, shape) and the last
+        # stats read per (character, panel) with the digest of their pixels
+        self._layouts: Dict[Tuple[str, Tuple[int, int]], PanelLayout] = {}
+        self._panel_cache: Dict[Tuple[str, str], Tuple[str, Dict[StatType, CharacterStat]]] = {}
+        self._layout_counters = {"captures": 0, "layout_passes": 0, "value_passes": 0,
+                                 "panels_read": 0, "cache_hits": 0}
         
         # Stat patterns for OCR recognition
         self.stat_patterns = {
@@ -187,14 +269,15 @@ class StatExtractor:
             ]
         }
         
-        # Panel regions for different stat types
+        # Panel regions for different stat types as (x, y, width, height)
         self.panel_regions = {
             "stats_panel": (100, 100, 400, 300),  # Example coordinates
             "armor_panel": (500, 100, 400, 300),   # Example coordinates
             "character_sheet": (200, 200, 600, 400) # Example coordinates
         }
     
-    def extract_stats_from_panel(self, panel_type: str = "stats_panel") -> Dict[StatType, CharacterStat]:
+    def extract_stats_from_panel(self, panel_type: str = "stats_panel", mode: str = "text",
+                                 character: str = "") -> Dict[StatType, CharacterStat]:
         """
         Extract stats from a specific game panel.
         
@@ -202,12 +285,20 @@ class StatExtractor:
         ----------
         panel_type : str
             Type of panel to scan ("stats_panel", "armor_panel", "character_sheet")
+        mode : str
+            "text" to OCR the panel as text, "layout" to read only its
+            value column (see :meth:`extract_panels`)
+        character : str
+            Character the panel belongs to; keys the layout mode cache
             
         Returns
         -------
         Dict[StatType, CharacterStat]
             Extracted stats with confidence scores
         """
+        if mode == "layout":
+            return self.extract_panels([panel_type], character).get(panel_type, {})
+        
         stats = {}
         
         try:
@@ -234,6 +325,155 @@ class StatExtractor:
         
         return stats
     
+    def extract_panels(self, panel_types: Optional[List[str]] = None, character: str = "",
+                       screen: Any = None) -> Dict[str, Dict[StatType, CharacterStat]]:
+        """
+        Read several panels in layout mode from one capture and one OCR call.
+        
+        The first time a panel is seen its label/value rows are located
+        from a word-box OCR pass.  After that, the value boxes of every
+        panel that needs reading are stacked into one strip and OCR'd
+        together with a digits-only whitelist.  A character's stats for a
+        panel are reused without any OCR until that panel's pixels change.
+        
+        Parameters
+        ----------
+        panel_types : list of str, optional
+            Panels to read; all of ``panel_regions`` by default
+        character : str
+            Character the panels belong to
+        screen : array-like, optional
+            Screenshot to read instead of capturing one
+            
+        Returns
+        -------
+        Dict[str, Dict[StatType, CharacterStat]]
+            Stats per panel type; a panel that could not be read maps to {}
+        """
+        panel_types = list(panel_types or self.panel_regions)
+        results: Dict[str, Dict[StatType, CharacterStat]] = {name: {} for name in panel_types}
+        
+        try:
+            if screen is None:
+                if self.capture is None:
+                    log_event("[STAT_EXTRACTOR] No screen capture available for layout mode")
+                    return results
+                screen = self.capture()
+                self._layout_counters["captures"] += 1
+            screen = np.asarray(screen)
+            
+            pending = []
+            for panel_type in panel_types:
+                region = self.panel_regions.get(panel_type)
+                if not region:
+                    log_event(f"[STAT_EXTRACTOR] Unknown panel type: {panel_type}")
+                    continue
+                x, y, width, height = region
+                image = screen[y:y + height, x:x + width]
+                digest = frame_digest(image)
+                cached = self._panel_cache.get((character, panel_type))
+                if cached and digest is not None and cached[0] == digest:
+                    self._layout_counters["cache_hits"] += 1
+                    results[panel_type] = dict(cached[1])
+                    continue
+                layout = self._panel_layout(panel_type, image)
+                if layout.rows:
+                    pending.append((panel_type, image, digest, layout))
+                elif digest is not None:
+                    # Nothing to read; don't look for rows again until it changes
+                    self._panel_cache[(character, panel_type)] = (digest, {})
+            
+            if pending:
+                results.update(self._read_value_columns(pending, character))
+        
+        except Exception as e:
+            log_event(f"[STAT_EXTRACTOR] Error reading panels in layout mode: {e}")
+        
+        return results
+    
+    def _panel_layout(self, panel_type: str, image: Any) -> PanelLayout:
+        """Rows of ``panel_type``, located once per panel size."""
+        key = (panel_type, tuple(image.shape[:2]))
+        layout = self._layouts.get(key)
+        if layout is None:
+            self._layout_counters["layout_passes"] += 1
+            layout = locate_rows(self.word_boxes(image, LAYOUT_CONFIG), image.shape)
+            if not layout.rows:
+                log_event(f"[STAT_EXTRACTOR] No label/value rows found in {panel_type}")
+                return layout
+            self._layouts[key] = layout
+        return layout
+    
+    def _read_value_columns(self, pending: List[Tuple[str, Any, Optional[str], PanelLayout]],
+                            character: str) -> Dict[str, Dict[StatType, CharacterStat]]:
+        """OCR the value boxes of all pending panels in one digits-only pass."""
+        cells, owners = [], []
+        for panel_type, image, _, layout in pending:
+            for row in layout.rows:
+                cells.append(crop(image, row.value_box))
+                owners.append((panel_type, row.label))
+        
+        strip, bands = stack_cells(cells)
+        self._layout_counters["value_passes"] += 1
+        words_per_cell = assign_words(words_from_data(self.word_boxes(strip, DIGIT_CONFIG)), bands)
+        
+        results: Dict[str, Dict[StatType, CharacterStat]] = {panel_type: {} for panel_type, _, _, _ in pending}
+        for (panel_type, label), words in zip(owners, words_per_cell):
+            stat_type = stat_type_for_label(label)
+            parsed = parse_value("".join(word.text for word in words))
+            if stat_type is None or parsed is None:
+                continue
+            current, maximum = parsed
+            results[panel_type][stat_type] = CharacterStat(
+                stat_type=stat_type,
+                current_value=current,
+                max_value=maximum,
+                percentage=100.0 if current == maximum else (current / maximum * 100 if maximum > 0 else 0.0),
+                confidence=sum(word.confidence for word in words) / len(words),
+                source=panel_type
+            )
+        
+        for panel_type, image, digest, layout in pending:
+            self._layout_counters["panels_read"] += 1
+            stats = results[panel_type]
+            if not stats:
+                # The panel moved or changed size: find its rows again next time
+                self._layouts.pop((panel_type, tuple(image.shape[:2])), None)
+                continue
+            if digest is not None:
+                self._panel_cache[(character, panel_type)] = (digest, dict(stats))
+            log_event(f"[STAT_EXTRACTOR] Extracted {len(stats)} stats from {panel_type} (layout)")
+        return results
+    
+    def _tesseract_word_boxes(self, image: Any, config: str) -> Dict[str, List[Any]]:
+        """Word boxes from pytesseract in the ``image_to_data`` dict format."""
+        if pytesseract is None or not hasattr(pytesseract, "image_to_data"):
+            raise RuntimeError("pytesseract is required for layout mode")
+        return pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+    
+    def invalidate_panel_cache(self, character: Optional[str] = None, layouts: bool = False) -> None:
+        """
+        Forget cached panel stats, for one character or all of them.
+        
+        Parameters
+        ----------
+        character : str, optional
+            Character whose stats to drop; all characters if omitted
+        layouts : bool
+            Also forget the located panel rows
+        """
+        if character is None:
+            self._panel_cache.clear()
+        else:
+            for key in [key for key in self._panel_cache if key[0] == character]:
+                del self._panel_cache[key]
+        if layouts:
+            self._layouts.clear()
+    
+    def layout_stats(self) -> Dict[str, int]:
+        """Captures, OCR passes and cache hits made by the layout mode."""
+        return dict(self._layout_counters)
+    
     def _parse_stats_from_text(self, text: str, source: str, base_confidence: float) -> Dict[StatType, CharacterStat]:
         """Parse stats from OCR text."""
         stats = {}
@@ -388,7 +628,8 @@ class StatExtractor:
             log_event(f"[STAT_EXTRACTOR] Error executing armor macro: {e}")
             return None
     
-    def create_character_profile(self, character_name: str, profession: str = "", level: int = 0) -> CharacterProfile:
+    def create_character_profile(self, character_name: str, profession: str = "", level: int = 0,
+                                 mode: str = "text") -> CharacterProfile:
         """
         Create a complete character profile by scanning all available sources.
         
@@ -400,6 +641,9 @@ class StatExtractor:
             Character profession
         level : int
             Character level
+        mode : str
+            Panel reading mode, "text" or "layout"; in layout mode all
+            panels come from one capture and one OCR call
             
         Returns
         -------
@@ -410,12 +654,13 @@ class StatExtractor:
         confidence_scores = []
         
         # Extract from different sources
-        sources = [
-            ("stats_panel", self.extract_stats_from_panel("stats_panel")),
-            ("armor_panel", self.extract_stats_from_panel("armor_panel")),
-            ("character_sheet", self.extract_stats_from_panel("character_sheet")),
-            ("macro", self.extract_stats_via_macro())
-        ]
+        panel_types = ["stats_panel", "armor_panel", "character_sheet"]
+        if mode == "layout":
+            panels = self.extract_panels(panel_types, character_name)
+        else:
+            panels = {name: self.extract_stats_from_panel(name) for name in panel_types}
+        sources = [(name, panels[name]) for name in panel_types]
+        sources.append(("macro", self.extract_stats_via_macro()))
         
         # Combine stats from all sources
         for source_name, source_stats in sources:
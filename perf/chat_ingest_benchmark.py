@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the chat ingestion pipeline
+
+Replays chat lines through :class:`network.chat_pipeline.ChatPipeline` at
+a target rate (10k lines/s by default) and reports the rate actually
+sustained, delivery latency and what each subscriber received or dropped:
+
+    python -m perf.chat_ingest_benchmark --rate 10000 --seconds 3
+    python -m perf.chat_ingest_benchmark --rate 0          # as fast as possible
+    python -m perf.chat_ingest_benchmark --log chat.log    # replay a recorded log
+
+Two subscribers are attached: a fast one counting whispers and guild chat,
+and a deliberately slow one (``--slow-ms`` per batch) that drops its
+oldest events, to show that it does not hold back ingestion.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from network.chat_pipeline import ChatPipeline, ReplaySource  # noqa: E402
+
+_SENDERS = ["Kessa", "Durn", "Vyl", "Oriana", "Tam", "Brask"]
+_TEMPLATES = [
+    "[{t}] [Guild] {s}: anyone up for the krayt run?",
+    "[{t}] [Spatial] {s}: selling stims, cheap",
+    "[{t}] {s} tells you: are you there?",
+    "[{t}] [Whisper from {s}]: need a heal",
+    "[{t}] [Group] {s}: pull next pack",
+    "[{t}] You gain 120 experience.",
+    "[{t}] [System] Server restart in 10 minutes.",
+]
+
+
+def synthetic_lines(count: int = 5000, seed: int = 48) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        rng.choice(_TEMPLATES).format(t=f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+                                      s=rng.choice(_SENDERS))
+        for _ in range(count)
+    ]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def _run(lines: List[str], rate: Optional[float], seconds: float, slow_ms: float) -> Dict[str, Any]:
+    repeat = 1
+    if rate:
+        repeat = max(1, round(rate * seconds / len(lines)))
+    pipeline = ChatPipeline([ReplaySource(lines, rate=rate or None, repeat=repeat)])
+    latencies: List[float] = []
+
+    async def fast(events):
+        now = time.time()
+        latencies.extend(now - event.received_at for event in events)
+
+    def slow(events):
+        time.sleep(slow_ms / 1000)
+
+    pipeline.subscribe(fast, name="fast", channels=["whisper", "guild", "group"], batch_size=200)
+    pipeline.subscribe(slow, name="slow", maxsize=500, batch_size=100, overflow="drop_oldest")
+    await pipeline.run()
+
+    stats = pipeline.stats()
+    stats["target_rate"] = rate or None
+    stats["latency_ms"] = {
+        "p50": round(statistics.median(latencies) * 1000, 3) if latencies else 0.0,
+        "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+    return stats
+
+
+def run_benchmark(lines: List[str], rate: Optional[float] = 10000, seconds: float = 3.0,
+                  slow_ms: float = 20.0) -> Dict[str, Any]:
+    """Replay ``lines`` through a pipeline and return its stats."""
+    return asyncio.run(_run(lines, rate, seconds, slow_ms))
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    target = f"{result['target_rate']:.0f} lines/s" if result["target_rate"] else "unthrottled"
+    lines = [
+        f"Chat ingestion benchmark ({target}): {result['lines']} lines in {result['elapsed_s']} s "
+        f"= {result['lines_per_s']} lines/s",
+        f"delivery latency (fast subscriber): p50 {result['latency_ms']['p50']} ms, "
+        f"p99 {result['latency_ms']['p99']} ms",
+        "",
+        f"{'subscriber':<10} {'delivered':>10} {'dropped':>8} {'batches':>8} {'max depth':>10}",
+    ]
+    for name, sub in result["subscribers"].items():
+        lines.append(f"{name:<10} {sub['delivered']:>10} {sub['dropped']:>8} {sub['batches']:>8} "
+                     f"{sub['max_depth']:>10}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark chat ingestion with a replay source")
+    parser.add_argument("--log", type=Path, help="recorded chat log to replay instead of synthetic lines")
+    parser.add_argument("--rate", type=float, default=10000, help="lines per second (0 = unthrottled)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="approximate replay length when throttled")
+    parser.add_argument("--slow-ms", type=float, default=20.0, help="time the slow subscriber spends per batch")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    if args.log:
+        lines = args.log.read_text(encoding="utf-8", errors="replace").splitlines()
+        if not lines:
+            parser.error(f"no lines in {args.log}")
+    else:
+        lines = synthetic_lines()
+
+    result = run_benchmark(lines, args.rate or None, args.seconds, args.slow_ms)
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
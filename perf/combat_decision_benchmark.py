@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for combat decisions
+
+Compares the per-tick path (one ``evaluate_state`` call per bot) with the
+compiled decision table deciding the whole batch in one NumPy pass, over
+randomly generated player/target states for a mix of behaviors:
+
+    python -m perf.combat_decision_benchmark --states 10000 --repeat 5
+
+Feature extraction from the state dictionaries is timed separately from
+the table pass, since a host that keeps bot state in arrays skips it.  The
+decisions of both paths are compared and any mismatch is reported.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.ai.combat.decision_table import BEHAVIORS, CompiledEvaluator, feature_matrix  # noqa: E402
+from src.ai.combat.evaluator import evaluate_state  # noqa: E402
+
+ACTIONS = ("heal", "buff", "attack", "retreat", "idle")
+
+
+def random_states(count: int, seed: int = 47) -> Tuple[List[dict], List[dict], List[str], List[List[str]]]:
+    """Player states, target states, behaviors and recent actions for ``count`` bots."""
+    rng = random.Random(seed)
+    players, targets, behaviors, recent = [], [], [], []
+    for _ in range(count):
+        player = {"hp": rng.randint(0, 100)}
+        if rng.random() < 0.5:
+            player["healing_items"] = rng.choice([0, 0, 1, 3])
+        else:
+            player["has_heal"] = rng.random() < 0.5
+        player["buffed" if rng.random() < 0.5 else "is_buffed"] = rng.random() < 0.5
+        players.append(player)
+        targets.append({"hp": rng.choice([0, rng.randint(1, 100)])})
+        behaviors.append(rng.choice(BEHAVIORS))
+        recent.append([rng.choice(ACTIONS) for _ in range(rng.randint(0, 3))])
+    return players, targets, behaviors, recent
+
+
+def _time(func: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_benchmark(states: int = 10000, repeat: int = 5, seed: int = 47) -> Dict[str, Any]:
+    """Time both paths and check that they agree.
+
+    Returns median timings and decisions per second for the per-tick loop,
+    the compiled path including feature extraction, and the table pass on
+    prebuilt features alone.
+    """
+    players, targets, behaviors, recent = random_states(states, seed)
+    evaluator = CompiledEvaluator()
+    X = feature_matrix(players, targets, behaviors, recent)
+
+    def per_tick():
+        return [
+            evaluate_state(p, t, behavior=b, recent_actions=r)
+            for p, t, b, r in zip(players, targets, behaviors, recent)
+        ]
+
+    def compiled():
+        return evaluator.evaluate_batch(players, targets, behaviors, recent)
+
+    def table_only():
+        return evaluator.decide(X)
+
+    mismatches = sum(a != b for a, b in zip(per_tick(), compiled()))
+
+    result: Dict[str, Any] = {"states": states, "repeat": repeat, "mismatches": mismatches}
+    for name, func in (("per_tick", per_tick), ("compiled", compiled), ("table_only", table_only)):
+        seconds = statistics.median(_time(func, repeat))
+        result[name] = {
+            "ms": round(seconds * 1000, 3),
+            "decisions_per_s": round(states / seconds) if seconds else 0,
+        }
+    for name in ("compiled", "table_only"):
+        ms = result[name]["ms"]
+        result[name]["speedup"] = round(result["per_tick"]["ms"] / ms, 2) if ms else 0.0
+    return result
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    lines = [
+        f"Combat decision benchmark: {result['states']} states, median of {result['repeat']} runs, "
+        f"{result['mismatches']} mismatches",
+        "",
+        f"{'path':<12} {'ms':>10} {'decisions/s':>14} {'speedup':>8}",
+    ]
+    for name in ("per_tick", "compiled", "table_only"):
+        row = result[name]
+        speedup = f"{row['speedup']:>7}x" if "speedup" in row else f"{'':>8}"
+        lines.append(f"{name:<12} {row['ms']:>10} {row['decisions_per_s']:>14} {speedup}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-tick versus compiled combat decisions")
+    parser.add_argument("--states", type=int, default=10000, help="player/target states per batch")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per path")
+    parser.add_argument("--seed", type=int, default=47)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.states, args.repeat, args.seed)
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 1 if result["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
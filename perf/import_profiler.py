@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Import-time profiler for MS11 entry points
+
+Runs ``python -X importtime`` in a fresh interpreter and turns its output
+into a per-module and per-package breakdown, plus a cold-start benchmark.
+Used to keep dashboard startup fast:
+
+    python -m perf.import_profiler dashboard.app --top 25
+    python -m perf.import_profiler dashboard.app --benchmark 5
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# Written to stderr right before the profiled import, so modules loaded by
+# interpreter startup (site, .pth hooks) are left out of the profile
+_MARKER = "--ms11-import-profile--"
+
+
+@dataclass
+class ImportRecord:
+    """One module from ``-X importtime`` output (times in microseconds)."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split('.')[0]
+
+
+def parse_importtime(text: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` stderr into records, in import order."""
+    if _MARKER in text:
+        text = text.split(_MARKER, 1)[1]
+    records = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(ImportRecord(
+            module=module,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=max(0, (len(indent) - 1) // 2),
+        ))
+    return records
+
+
+class ImportProfile:
+    """Import-time breakdown for one entry module."""
+
+    def __init__(self, module: str, records: List[ImportRecord]):
+        self.module = module
+        self.records = records
+
+    @property
+    def total_us(self) -> int:
+        """Total import time (sum of self times)."""
+        return sum(r.self_us for r in self.records)
+
+    def top(self, limit: int = 20, by: str = 'self') -> List[ImportRecord]:
+        """Slowest modules by ``self`` or ``cumulative`` time."""
+        key = (lambda r: r.self_us) if by == 'self' else (lambda r: r.cumulative_us)
+        return sorted(self.records, key=key, reverse=True)[:limit]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time summed per top-level package, slowest first."""
+        totals: Dict[str, int] = {}
+        for record in self.records:
+            totals[record.package] = totals.get(record.package, 0) + record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self, limit: int = 20) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "total_ms": round(self.total_us / 1000, 2),
+            "modules_imported": len(self.records),
+            "top_modules": [asdict(r) for r in self.top(limit)],
+            "packages": {name: round(us / 1000, 2) for name, us in self.by_package().items()},
+        }
+
+    def format_report(self, limit: int = 20) -> str:
+        lines = [
+            f"Import profile for {self.module}: {self.total_us / 1000:.1f} ms, "
+            f"{len(self.records)} modules",
+            "",
+            f"{'self ms':>9} {'cumul ms':>9}  module",
+        ]
+        for record in self.top(limit):
+            lines.append(f"{record.self_us / 1000:9.2f} {record.cumulative_us / 1000:9.2f}  {record.module}")
+        lines += ["", f"{'self ms':>9}  package"]
+        for name, us in list(self.by_package().items())[:limit]:
+            lines.append(f"{us / 1000:9.2f}  {name}")
+        return "\n".join(lines)
+
+
+def _run(code: str, extra_args: Optional[List[str]] = None,
+         cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    root = str(cwd or REPO_ROOT)
+    env["PYTHONPATH"] = root + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    return subprocess.run(
+        [sys.executable, *(extra_args or []), "-c", code],
+        cwd=root, env=env, capture_output=True, text=True,
+    )
+
+
+def profile_imports(module: str, cwd: Optional[Path] = None) -> ImportProfile:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``."""
+    code = f"import sys; sys.stderr.write({_MARKER!r} + chr(10)); sys.stderr.flush(); import {module}"
+    result = _run(code, ["-X", "importtime"], cwd)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    return ImportProfile(module, parse_importtime(result.stderr))
+
+
+def benchmark_startup(module: str, runs: int = 5, cwd: Optional[Path] = None) -> Dict[str, float]:
+    """Cold-import ``module`` ``runs`` times and report wall-clock timings.
+
+    The time of an empty interpreter start is measured the same way and
+    reported separately, so ``import_ms`` is what the module itself costs.
+    """
+    def timed(code: str) -> float:
+        start = time.perf_counter()
+        result = _run(code, cwd=cwd)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"benchmark run failed:\n{result.stderr[-2000:]}")
+        return elapsed * 1000
+
+    baseline = [timed("pass") for _ in range(runs)]
+    samples = [timed(f"import {module}") for _ in range(runs)]
+    base_ms = statistics.median(baseline)
+    return {
+        "module": module,
+        "runs": runs,
+        "interpreter_ms": round(base_ms, 2),
+        "min_ms": round(min(samples), 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "max_ms": round(max(samples), 2),
+        "import_ms": round(statistics.median(samples) - base_ms, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile import time of an MS11 module")
+    parser.add_argument("module", nargs="?", default="dashboard.app")
+    parser.add_argument("--top", type=int, default=20, help="modules/packages to list")
+    parser.add_argument("--benchmark", type=int, metavar="RUNS",
+                        help="also time RUNS cold starts")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    profile = profile_imports(args.module)
+    benchmark = benchmark_startup(args.module, args.benchmark) if args.benchmark else None
+
+    if args.json:
+        data = profile.to_dict(args.top)
+        if benchmark:
+            data["benchmark"] = benchmark
+        print(json.dumps(data, indent=2))
+    else:
+        print(profile.format_report(args.top))
+        if benchmark:
+            print("")
+            print(f"Cold start over {benchmark['runs']} runs: median {benchmark['median_ms']} ms "
+                  f"(min {benchmark['min_ms']}, max {benchmark['max_ms']}), "
+                  f"{benchmark['import_ms']} ms above an empty interpreter")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Latency Histograms for MS11
+
+This module provides fixed-bucket (HDR-style) latency histograms used by the
+performance profiler to track tail latencies of instrumented functions:
+- Log-linear buckets with bounded relative error (~3%)
+- Per-thread recording shards so hot paths never take a lock
+- Recent-time queries over fixed (tumbling) time slots alongside lifetime
+  totals
+- p50/p95/p99 percentile queries
+- Prometheus text and JSON exporters
+
+Averages hide the slow OCR passes that cause missed combat ticks, so every
+instrumented call is recorded here in addition to the running totals kept in
+``ModuleProfile``.
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Any, Iterable
+
+# Values are recorded in whole microseconds.  Values below ``SUB_BUCKET_COUNT``
+# get one bucket each; above that every power of two is split into
+# ``SUB_BUCKET_HALF`` linear sub-buckets.
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2
+MAX_TRACKABLE_US = (1 << 36) - 1  # ~19 hours
+MAX_SHIFT = MAX_TRACKABLE_US.bit_length() - SUB_BUCKET_BITS
+BUCKET_COUNT = SUB_BUCKET_COUNT + MAX_SHIFT * SUB_BUCKET_HALF
+
+DEFAULT_PERCENTILES = (50.0, 95.0, 99.0)
+
+
+def bucket_index(value_us: int) -> int:
+    """Return the bucket index for a latency in microseconds."""
+    if value_us < SUB_BUCKET_COUNT:
+        return max(value_us, 0)
+    if value_us > MAX_TRACKABLE_US:
+        value_us = MAX_TRACKABLE_US
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    top = value_us >> shift
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (top - SUB_BUCKET_HALF)
+
+
+def bucket_bounds(index: int) -> tuple:
+    """Return the ``(lower, upper)`` microsecond bounds of a bucket."""
+    if index < SUB_BUCKET_COUNT:
+        return index, index
+    offset = index - SUB_BUCKET_COUNT
+    shift = offset // SUB_BUCKET_HALF + 1
+    top = offset % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+    lower = top << shift
+    return lower, lower + (1 << shift) - 1
+
+
+class _ThreadShard:
+    """Bucket counts owned by a single recording thread."""
+
+    __slots__ = ('total', 'total_sum_us', 'total_min_us', 'total_max_us', 'slices', 'slice_epochs',
+                 'slice_sums', 'slice_mins', 'slice_maxes')
+
+    def __init__(self, num_slices: int):
+        self.total = [0] * BUCKET_COUNT
+        self.total_sum_us = 0
+        self.total_min_us = None
+        self.total_max_us = 0
+        self.slices = [[0] * BUCKET_COUNT for _ in range(num_slices)]
+        self.slice_epochs = [-1] * num_slices
+        self.slice_sums = [0] * num_slices
+        self.slice_mins = [None] * num_slices
+        self.slice_maxes = [0] * num_slices
+
+
+def _min(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with lifetime totals and time slots.
+
+    Besides lifetime totals, samples are counted in ``num_windows`` fixed
+    slots of ``window_seconds`` each (tumbling windows aligned to the epoch,
+    recycled round-robin).  A windowed query therefore covers whole slots:
+    the current, partially filled one plus enough earlier ones to span the
+    requested time, so it reports between ``(n - 1) * window_seconds`` and
+    ``n * window_seconds`` of history rather than an exact sliding window.
+
+    Each recording thread writes into its own shard, so ``record`` only
+    touches thread-owned lists.  The registry lock is taken once per thread
+    (when its shard is created) and when a snapshot merges the shards.
+    """
+
+    def __init__(self,
+                 name: str,
+                 window_seconds: float = 60.0,
+                 num_windows: int = 5):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.num_windows = num_windows
+        self._local = threading.local()
+        self._shards: List[_ThreadShard] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _ThreadShard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _ThreadShard(self.num_windows)
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _epoch(self, now: Optional[float] = None) -> int:
+        return int((time.time() if now is None else now) // self.window_seconds)
+
+    def record(self, seconds: float, now: Optional[float] = None) -> None:
+        """Record one latency sample given in seconds."""
+        value_us = int(seconds * 1_000_000)
+        if value_us < 0:
+            value_us = 0
+        index = bucket_index(value_us)
+        shard = self._shard()
+
+        shard.total[index] += 1
+        shard.total_sum_us += value_us
+        if value_us > shard.total_max_us:
+            shard.total_max_us = value_us
+        if shard.total_min_us is None or value_us < shard.total_min_us:
+            shard.total_min_us = value_us
+
+        epoch = self._epoch(now)
+        slot = epoch % self.num_windows
+        if shard.slice_epochs[slot] != epoch:
+            # Slot belongs to an expired window - recycle it
+            shard.slices[slot] = [0] * BUCKET_COUNT
+            shard.slice_sums[slot] = 0
+            shard.slice_mins[slot] = None
+            shard.slice_maxes[slot] = 0
+            shard.slice_epochs[slot] = epoch
+        shard.slices[slot][index] += 1
+        shard.slice_sums[slot] += value_us
+        if value_us > shard.slice_maxes[slot]:
+            shard.slice_maxes[slot] = value_us
+        if shard.slice_mins[slot] is None or value_us < shard.slice_mins[slot]:
+            shard.slice_mins[slot] = value_us
+
+    def _merged(self, window_seconds: Optional[float], now: Optional[float]) -> tuple:
+        """Merge all thread shards into one ``(counts, sum_us, min_us, max_us)``."""
+        counts = [0] * BUCKET_COUNT
+        sum_us = 0
+        min_us = None
+        max_us = 0
+        with self._lock:
+            shards = list(self._shards)
+
+        if window_seconds is None:
+            for shard in shards:
+                for i, c in enumerate(shard.total):
+                    if c:
+                        counts[i] += c
+                sum_us += shard.total_sum_us
+                min_us = _min(min_us, shard.total_min_us)
+                max_us = max(max_us, shard.total_max_us)
+            return counts, sum_us, min_us, max_us
+
+        current = self._epoch(now)
+        windows = max(1, min(self.num_windows, int(-(-window_seconds // self.window_seconds))))
+        oldest = current - windows + 1
+        for shard in shards:
+            for slot, epoch in enumerate(shard.slice_epochs):
+                if oldest <= epoch <= current:
+                    for i, c in enumerate(shard.slices[slot]):
+                        if c:
+                            counts[i] += c
+                    sum_us += shard.slice_sums[slot]
+                    min_us = _min(min_us, shard.slice_mins[slot])
+                    max_us = max(max_us, shard.slice_maxes[slot])
+        return counts, sum_us, min_us, max_us
+
+    def snapshot(self,
+                 percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+                 window_seconds: Optional[float] = None,
+                 now: Optional[float] = None) -> Dict[str, Any]:
+        """Return count, sum, max and percentiles (in seconds).
+
+        Args:
+            percentiles: Percentiles to compute, e.g. ``(50, 95, 99)``
+            window_seconds: Restrict to the time slots covering the most
+                recent ``window_seconds`` (see the class docstring);
+                ``None`` reports lifetime totals
+            now: Override the current time (used by tests)
+        """
+        counts, sum_us, min_us, max_us = self._merged(window_seconds, now)
+        total = sum(counts)
+        result = {
+            'name': self.name,
+            'count': total,
+            'sum_seconds': sum_us / 1_000_000,
+            'max_seconds': max_us / 1_000_000,
+            'mean_seconds': (sum_us / total / 1_000_000) if total else 0.0,
+            'percentiles': {},
+        }
+        for p in percentiles:
+            result['percentiles'][_percentile_key(p)] = (
+                _value_at_percentile(counts, total, p, min_us, max_us) / 1_000_000
+            )
+        return result
+
+    def percentile(self, p: float, window_seconds: Optional[float] = None) -> float:
+        """Return a single percentile in seconds."""
+        counts, _, min_us, max_us = self._merged(window_seconds, None)
+        return _value_at_percentile(counts, sum(counts), p, min_us, max_us) / 1_000_000
+
+    def reset(self) -> None:
+        """Discard all recorded samples."""
+        with self._lock:
+            self._shards = []
+        self._local = threading.local()
+
+
+def _percentile_key(p: float) -> str:
+    return f"p{p:g}".replace('.', '_')
+
+
+def _value_at_percentile(counts: List[int], total: int, p: float,
+                         min_us: Optional[int] = None, max_us: Optional[int] = None) -> float:
+    """Walk cumulative counts and return the midpoint of the target bucket.
+
+    The midpoint is clamped to the observed ``min_us``/``max_us`` so a
+    percentile never lies outside the recorded samples.
+    """
+    if total == 0:
+        return 0.0
+    target = max(1, int(round(total * min(max(p, 0.0), 100.0) / 100.0)))
+    running = 0
+    value = float(bucket_bounds(len(counts) - 1)[1])
+    for index, count in enumerate(counts):
+        if not count:
+            continue
+        running += count
+        if running >= target:
+            lower, upper = bucket_bounds(index)
+            value = (lower + upper) / 2
+            break
+    if max_us is not None:
+        value = min(value, float(max_us))
+    if min_us is not None:
+        value = max(value, float(min_us))
+    return value
+
+
+class HistogramRegistry:
+    """Named collection of latency histograms with exporters."""
+
+    def __init__(self, window_seconds: float = 60.0, num_windows: int = 5):
+        self.window_seconds = window_seconds
+        self.num_windows = num_windows
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> LatencyHistogram:
+        """Return the histogram for ``name``, creating it on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = LatencyHistogram(name, self.window_seconds, self.num_windows)
+                    self._histograms[name] = histogram
+        return histogram
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a latency sample for ``name``."""
+        self.get(name).record(seconds)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._histograms)
+
+    def snapshot(self, window_seconds: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Snapshot every histogram."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        return {name: histogram.snapshot(window_seconds=window_seconds) for name, histogram in histograms}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+
+    def to_json(self, window_seconds: Optional[float] = None) -> str:
+        """Export lifetime and recent-slot snapshots as JSON.
+
+        The ``rolling`` key holds the time slots covering ``window_seconds``
+        (one slot by default).
+        """
+        rolling = window_seconds or self.window_seconds
+        return json.dumps({
+            'window_seconds': rolling,
+            'lifetime': self.snapshot(),
+            'rolling': self.snapshot(window_seconds=rolling),
+        })
+
+    def to_prometheus(self, prefix: str = 'ms11') -> str:
+        """Export lifetime summaries in Prometheus text exposition format."""
+        metric = f"{prefix}_latency_seconds"
+        lines = [
+            f"# HELP {metric} Latency of instrumented MS11 functions",
+            f"# TYPE {metric} summary",
+        ]
+        for name, snap in self.snapshot().items():
+            label = _escape_label(name)
+            for key, value in snap['percentiles'].items():
+                quantile = float(key[1:].replace('_', '.')) / 100
+                lines.append(f'{metric}{{name="{label}",quantile="{quantile:g}"}} {value}')
+            lines.append(f'{metric}_sum{{name="{label}"}} {snap["sum_seconds"]}')
+            lines.append(f'{metric}_count{{name="{label}"}} {snap["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
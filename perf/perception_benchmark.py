@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark for the capture -> OCR -> parse perception pipelines
+
+Replays a recorded screenshot sequence through the perception code that
+normally reads the live screen, and reports per-stage latency
+percentiles, OCR call counts and frames per second for each scenario:
+
+    python -m perf.perception_benchmark --sequence recordings/session_01
+    python -m perf.perception_benchmark --scenario damage_parser --scenario stat_panels
+    python -m perf.perception_benchmark --ocr tesseract --loops 3
+    python -m perf.perception_benchmark --scenario mypkg.bench:MyScenario
+
+While a scenario runs, ``pyautogui.screenshot`` and ``PIL.ImageGrab.grab``
+return crops of the current replay frame, and ``pytesseract`` calls are
+counted and timed.  No display is needed: when ``pyautogui`` cannot be
+imported (no ``DISPLAY``) a stand-in module carrying only ``screenshot``
+is installed for the duration of the run.  Afterwards the original
+bindings are restored, and modules first imported during the run that
+hold a stand-in or a patched function are unloaded, so the next run (or
+the caller) imports them against the real backends again.
+
+A sequence directory holds frames (``*.png``/``*.jpg``) replayed in name
+order, each with an optional ``<name>.txt`` transcript.  With ``--ocr
+replay`` (the default) OCR calls return the transcript of the current
+frame instead of running Tesseract, optionally after ``--ocr-latency-ms``,
+so the harness measures capture and parsing overhead and counts OCR calls
+headless; ``--ocr tesseract`` runs the real engine.  Without
+``--sequence`` a synthetic sequence is rendered.
+
+Stages are reported per frame: ``capture`` (time inside capture calls),
+``ocr`` (time inside OCR calls), ``parse`` (the rest of the frame) and
+``frame`` (the whole scenario step).
+"""
+
+import argparse
+import importlib
+import json
+import random
+import sys
+import time
+import traceback
+import types
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from perf.latency_histogram import HistogramRegistry  # noqa: E402
+
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.bmp'}
+STAGES = ("capture", "ocr", "parse", "frame")
+_MISSING = object()
+
+
+@dataclass
+class ReplayFrame:
+    """One recorded screenshot (RGB) and its transcript if known."""
+    name: str
+    image: np.ndarray
+    transcript: str = ""
+
+
+def load_sequence(directory: Path) -> List[ReplayFrame]:
+    """Load frames (and ``.txt`` transcripts) from ``directory`` in name order."""
+    import cv2
+
+    frames = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is None:
+            continue
+        transcript = path.with_suffix('.txt')
+        text = transcript.read_text(encoding='utf-8') if transcript.exists() else ""
+        frames.append(ReplayFrame(path.stem, cv2.cvtColor(image, cv2.COLOR_BGR2RGB), text))
+    return frames
+
+
+_NAMES = ["Kessa", "DurnVal", "Vyl42", "OrianaTal", "Brask_Ro"]
+
+
+def synthetic_sequence(count: int = 8, size: Tuple[int, int] = (1080, 1920), seed: int = 50) -> List[ReplayFrame]:
+    """Render ``count`` frames with combat text, names and a stats panel."""
+    import cv2
+
+    rng = random.Random(seed)
+    frames = []
+    for index in range(count):
+        image = np.zeros(size + (3,), dtype=np.uint8)
+        image[:] = rng.randint(10, 50)
+        health = rng.randint(200, 1500)
+        lines = [
+            f"{rng.randint(10, 999)} damage dealt to stormtrooper",
+            f"[Rebel] {rng.choice(_NAMES)}",
+            f"Health: {health}/1500",
+            f"Action: {rng.randint(100, 800)}/800",
+            f"Energy Resistance: {rng.randint(0, 60)}",
+        ]
+        for row, line in enumerate(lines):
+            cv2.putText(image, line, (110, 220 + row * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                        (255, 255, 255), 1)
+        frames.append(ReplayFrame(f"synthetic_{index:03d}", image, "\n".join(lines)))
+    return frames
+
+
+class ReplayCapture:
+    """Capture backend serving crops of the current replay frame.
+
+    ``screenshot`` takes a pyautogui ``region`` (left, top, width, height)
+    and ``grab`` a PIL ``bbox`` (x1, y1, x2, y2).  Captures return PIL
+    images when PIL can build them, like the real backends, and arrays
+    otherwise.
+    """
+
+    def __init__(self, frames: Sequence[ReplayFrame]):
+        if not frames:
+            raise ValueError("no frames to replay")
+        self.frames = list(frames)
+        self.index = 0
+        self.captures = 0
+        self.seconds = 0.0
+        self._to_image = self._image_factory()
+
+    @staticmethod
+    def _image_factory() -> Optional[Callable[[np.ndarray], Any]]:
+        try:
+            from PIL import Image
+        except Exception:
+            return None
+        return getattr(Image, "fromarray", None)
+
+    @property
+    def frame(self) -> ReplayFrame:
+        return self.frames[self.index % len(self.frames)]
+
+    def _crop(self, box: Optional[Tuple[int, int, int, int]]) -> Any:
+        start = time.perf_counter()
+        image = self.frame.image
+        if box is not None:
+            x1, y1, x2, y2 = (int(v) for v in box)
+            image = image[max(0, y1):max(0, y2), max(0, x1):max(0, x2)]
+        image = np.ascontiguousarray(image)
+        if self._to_image is not None:
+            image = self._to_image(image)
+        self.captures += 1
+        self.seconds += time.perf_counter() - start
+        return image
+
+    def screenshot(self, imageFilename: Optional[str] = None, region=None) -> Any:
+        box = None
+        if region is not None:
+            left, top, width, height = region
+            box = (left, top, left + width, top + height)
+        return self._crop(box)
+
+    def grab(self, bbox=None, *args, **kwargs) -> Any:
+        return self._crop(bbox)
+
+    def __call__(self, region=None) -> Any:
+        return self.screenshot(region=region)
+
+
+class OCRCounter:
+    """Counts and times ``pytesseract`` calls, or serves frame transcripts.
+
+    With ``replay=True`` no engine runs: ``image_to_string`` returns the
+    current frame's transcript and ``image_to_data`` lays its words out on
+    a simple grid, both filtered by any ``tessedit_char_whitelist`` in the
+    config and delayed by ``latency`` seconds to stand in for Tesseract.
+    """
+
+    def __init__(self, capture: ReplayCapture, replay: bool = True, latency: float = 0.0,
+                 engine: Any = None):
+        self.capture = capture
+        self.replay = replay
+        self.latency = latency
+        self.engine = engine
+        self.calls = 0
+        self.seconds = 0.0
+
+    def _timed(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.calls += 1
+            self.seconds += time.perf_counter() - start
+
+    @staticmethod
+    def _whitelisted(text: str, config: str) -> str:
+        if "tessedit_char_whitelist=" not in config:
+            return text
+        allowed = set(config.split("tessedit_char_whitelist=", 1)[1].split()[0]) | {" ", "\n"}
+        return "".join(ch for ch in text if ch in allowed)
+
+    def _replay_string(self, image: Any, lang: str = "eng", config: str = "", **kwargs) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._whitelisted(self.capture.frame.transcript, config)
+
+    def _replay_data(self, image: Any, lang: str = "eng", config: str = "", **kwargs) -> Dict[str, List[Any]]:
+        text = self._replay_string(image, lang=lang, config=config)
+        data: Dict[str, List[Any]] = {key: [] for key in (
+            "text", "left", "top", "width", "height", "conf", "block_num", "par_num", "line_num")}
+        for line_num, line in enumerate(text.splitlines(), 1):
+            left = 5
+            for word in line.split():
+                for key, value in (("text", word), ("left", left), ("top", 10 + 16 * (line_num - 1)),
+                                   ("width", 7 * len(word)), ("height", 10), ("conf", 90),
+                                   ("block_num", 1), ("par_num", 1), ("line_num", line_num)):
+                    data[key].append(value)
+                left += 7 * len(word) + 6
+        return data
+
+    def image_to_string(self, image: Any, *args, **kwargs) -> str:
+        func = self._replay_string if self.replay else self.engine.image_to_string
+        return self._timed(func, image, *args, **kwargs)
+
+    def image_to_data(self, image: Any, *args, **kwargs) -> Any:
+        func = self._replay_data if self.replay else self.engine.image_to_data
+        return self._timed(func, image, *args, **kwargs)
+
+
+def _import_or_stand_in(name: str) -> Tuple[Any, bool]:
+    """Import ``name``; if that fails (no display), register an empty stand-in."""
+    try:
+        return importlib.import_module(name), False
+    except Exception:
+        module = types.ModuleType(name)
+        sys.modules[name] = module
+        parent_name, _, child = name.rpartition(".")
+        if parent_name and parent_name in sys.modules:
+            setattr(sys.modules[parent_name], child, module)
+        return module, True
+
+
+def _refers_to(value: Any, stale_ids: Set[int], stale_modules: Set[str]) -> bool:
+    if id(value) in stale_ids:
+        return True
+    if isinstance(value, types.ModuleType):
+        return value.__name__ in stale_modules
+    try:
+        return (getattr(value, "__module__", None) in stale_modules
+                or type(value).__module__ in stale_modules)
+    except Exception:
+        return False
+
+
+def _unload_bound_modules(preloaded: Set[str], stale_objects: Sequence[Any]) -> List[str]:
+    """Unload modules imported since ``preloaded`` that still see a run's
+    stand-ins or patched functions, directly or through another such module.
+
+    ``import pyautogui`` or ``from pytesseract import image_to_string`` at
+    import time binds the run's objects for good; dropping the module makes
+    the next import bind the real ones.
+    """
+    fresh = {name: module for name, module in list(sys.modules.items())
+             if name not in preloaded and isinstance(module, types.ModuleType)}
+    stale_ids = {id(obj) for obj in stale_objects}
+    stale: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for name, module in fresh.items():
+            if name in stale:
+                continue
+            if any(_refers_to(value, stale_ids, stale) for value in list(vars(module).values())):
+                stale.add(name)
+                changed = True
+
+    for name in stale:
+        module = sys.modules.pop(name, None)
+        parent_name, _, child = name.rpartition(".")
+        parent = sys.modules.get(parent_name)
+        if parent is not None and module is not None and getattr(parent, child, None) is module:
+            delattr(parent, child)
+    return sorted(stale)
+
+
+@contextmanager
+def replay_backend(capture: ReplayCapture, ocr: OCRCounter) -> Iterator[None]:
+    """Route screen capture and pytesseract through ``capture`` and ``ocr``."""
+    patches: List[Tuple[Any, str, Any]] = []
+    stand_ins: List[str] = []
+    replacements: List[Any] = []
+    preloaded = set(sys.modules)
+
+    def patch(module: Any, attr: str, value: Any) -> None:
+        patches.append((module, attr, getattr(module, attr, _MISSING)))
+        replacements.append(value)
+        setattr(module, attr, value)
+
+    try:
+        for name, attr, value in (("pyautogui", "screenshot", capture.screenshot),
+                                  ("PIL.ImageGrab", "grab", capture.grab)):
+            module, stand_in = _import_or_stand_in(name)
+            if stand_in:
+                stand_ins.append(name)
+            patch(module, attr, value)
+
+        tesseract, stand_in = _import_or_stand_in("pytesseract")
+        if stand_in:
+            stand_ins.append("pytesseract")
+        if not ocr.replay:
+            ocr.engine = types.SimpleNamespace(image_to_string=tesseract.image_to_string,
+                                               image_to_data=tesseract.image_to_data)
+        patch(tesseract, "image_to_string", ocr.image_to_string)
+        patch(tesseract, "image_to_data", ocr.image_to_data)
+        if not hasattr(tesseract, "Output"):
+            patch(tesseract, "Output", types.SimpleNamespace(DICT="dict", STRING="string"))
+        yield
+    finally:
+        stand_in_modules = [sys.modules[name] for name in stand_ins if name in sys.modules]
+        for module, attr, original in reversed(patches):
+            if original is _MISSING:
+                delattr(module, attr)
+            else:
+                setattr(module, attr, original)
+        for name in stand_ins:
+            sys.modules.pop(name, None)
+            parent_name, _, child = name.rpartition(".")
+            parent = sys.modules.get(parent_name)
+            if parent is not None and isinstance(getattr(parent, child, None), types.ModuleType):
+                delattr(parent, child)
+        _unload_bound_modules(preloaded, replacements + stand_in_modules)
+
+
+class ScenarioUnavailable(Exception):
+    """Raised by :meth:`Scenario.setup` when a scenario cannot run here."""
+
+
+class Scenario:
+    """A perception pipeline driven once per replay frame.
+
+    Subclasses set ``name`` and implement :meth:`run_frame`; ``setup`` runs
+    inside the replay backend, so modules that capture at import time are
+    safe to import there.  Raising :class:`ScenarioUnavailable` or
+    ``ImportError`` from ``setup`` reports the scenario as skipped.
+    """
+
+    name = ""
+    description = ""
+
+    def setup(self) -> None:
+        pass
+
+    def run_frame(self, frame: ReplayFrame) -> Any:
+        raise NotImplementedError
+
+    def teardown(self) -> None:
+        pass
+
+
+SCENARIOS: Dict[str, Type[Scenario]] = {}
+
+
+def register_scenario(cls: Type[Scenario]) -> Type[Scenario]:
+    """Class decorator adding a scenario to :data:`SCENARIOS`."""
+    SCENARIOS[cls.name] = cls
+    return cls
+
+
+def load_scenario(spec: str) -> Scenario:
+    """Instantiate a registered scenario or a ``module:Class`` path."""
+    if spec in SCENARIOS:
+        return SCENARIOS[spec]()
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise KeyError(f"unknown scenario {spec!r}; known: {', '.join(sorted(SCENARIOS))}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+@register_scenario
+class NPCDetectorScenario(Scenario):
+    name = "npc_detector"
+    description = "vision.npc_detector quest icon search and NPC name OCR"
+
+    def setup(self) -> None:
+        from vision.npc_detector import NPCDetector
+        self.detector = NPCDetector()
+
+    def run_frame(self, frame: ReplayFrame) -> Any:
+        return self.detector.detect_quest_npcs()
+
+
+@register_scenario
+class DamageParserScenario(Scenario):
+    name = "damage_parser"
+    description = "utils.ocr_damage_parser region OCR and damage parsing"
+
+    def setup(self) -> None:
+        import pyautogui
+        from utils.ocr_damage_parser import OCRDamageParser
+        self.screenshot = pyautogui.screenshot
+        self.parser = OCRDamageParser()
+
+    def run_frame(self, frame: ReplayFrame) -> Any:
+        return self.parser.scan_for_damage(np.asarray(self.screenshot()))
+
+
+@register_scenario
+class PassiveScanScenario(Scenario):
+    name = "passive_scan"
+    description = "src.ms11.scanners.player_passive_scan region scans"
+
+    def setup(self) -> None:
+        from src.ms11.scanners.player_passive_scan import PassivePlayerScanner
+        self.scanner = PassivePlayerScanner()
+
+    def run_frame(self, frame: ReplayFrame) -> Any:
+        return [self.scanner._scan_region_passive(name, coords)
+                for name, coords in self.scanner.scan_regions.items()]
+
+
+@register_scenario
+class StatPanelScenario(Scenario):
+    name = "stat_panels"
+    description = "ocr.stat_extractor layout-mode panel reading"
+
+    def setup(self) -> None:
+        import pyautogui
+        from ocr.stat_extractor import StatExtractor
+        self.extractor = StatExtractor(capture=lambda: pyautogui.screenshot())
+
+    def run_frame(self, frame: ReplayFrame) -> Any:
+        return self.extractor.extract_panels(character="benchmark")
+
+
+def _stage_report(snapshot: Dict[str, Any]) -> Dict[str, float]:
+    report = {key.replace("_", ".") + "_ms": round(value * 1000, 3)
+              for key, value in snapshot["percentiles"].items()}
+    report["mean_ms"] = round(snapshot["mean_seconds"] * 1000, 3)
+    report["max_ms"] = round(snapshot["max_seconds"] * 1000, 3)
+    return report
+
+
+def run_scenario(scenario: Scenario, frames: Sequence[ReplayFrame], loops: int = 1,
+                 ocr: str = "replay", ocr_latency: float = 0.0, warmup: int = 1) -> Dict[str, Any]:
+    """Replay ``frames`` ``loops`` times through ``scenario``.
+
+    The first ``warmup`` frames are run once unrecorded (imports, caches,
+    lazily built templates), then the sequence is replayed from the start.
+    """
+    capture = ReplayCapture(frames)
+    counter = OCRCounter(capture, replay=(ocr == "replay"), latency=ocr_latency)
+    histograms = HistogramRegistry()
+    result: Dict[str, Any] = {"scenario": scenario.name or type(scenario).__name__, "skipped": None}
+
+    with replay_backend(capture, counter):
+        try:
+            scenario.setup()
+        except (ScenarioUnavailable, ImportError) as e:
+            result["skipped"] = str(e) or type(e).__name__
+            return result
+
+        errors = 0
+        first_error: Optional[str] = None
+        recorded = 0
+        captures = ocr_calls = 0
+        elapsed = 0.0
+        try:
+            for step in range(warmup + loops * len(frames)):
+                capture.index = step if step < warmup else step - warmup
+                capture_before, ocr_before = capture.seconds, counter.seconds
+                calls_before, ocr_calls_before = capture.captures, counter.calls
+                start = time.perf_counter()
+                try:
+                    scenario.run_frame(capture.frame)
+                except Exception:
+                    errors += 1
+                    if first_error is None:
+                        first_error = traceback.format_exc()
+                total = time.perf_counter() - start
+                if step < warmup:
+                    continue
+                capture_s = capture.seconds - capture_before
+                ocr_s = counter.seconds - ocr_before
+                for stage, seconds in (("capture", capture_s), ("ocr", ocr_s),
+                                       ("parse", max(0.0, total - capture_s - ocr_s)), ("frame", total)):
+                    histograms.record(stage, seconds)
+                recorded += 1
+                elapsed += total
+                captures += capture.captures - calls_before
+                ocr_calls += counter.calls - ocr_calls_before
+        finally:
+            scenario.teardown()
+
+    snapshot = histograms.snapshot()
+    result.update({
+        "frames": recorded,
+        "errors": errors,
+        "first_error": first_error,
+        "elapsed_s": round(elapsed, 4),
+        "fps": round(recorded / elapsed, 1) if elapsed else 0.0,
+        "captures": captures,
+        "ocr_calls": ocr_calls,
+        "ocr_calls_per_frame": round(ocr_calls / recorded, 2) if recorded else 0.0,
+        "stages": {stage: _stage_report(snapshot[stage]) for stage in STAGES if stage in snapshot},
+    })
+    return result
+
+
+def run_benchmark(frames: Sequence[ReplayFrame], scenarios: Sequence[Scenario], loops: int = 1,
+                  ocr: str = "replay", ocr_latency: float = 0.0) -> Dict[str, Any]:
+    """Run every scenario over the same replay sequence."""
+    return {
+        "frames": len(frames),
+        "loops": loops,
+        "ocr": ocr,
+        "ocr_latency_ms": round(ocr_latency * 1000, 3),
+        "scenarios": [run_scenario(s, frames, loops, ocr, ocr_latency) for s in scenarios],
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    ocr = result["ocr"]
+    if ocr == "replay" and result["ocr_latency_ms"]:
+        ocr = f"replay, {result['ocr_latency_ms']} ms/call"
+    lines = [f"Perception replay benchmark: {result['frames']} frames x {result['loops']} loops, OCR: {ocr}"]
+    for scenario in result["scenarios"]:
+        lines.append("")
+        if scenario["skipped"]:
+            lines.append(f"{scenario['scenario']}: skipped ({scenario['skipped']})")
+            continue
+        lines.append(f"{scenario['scenario']}: {scenario['frames']} frames, {scenario['fps']} fps, "
+                     f"{scenario['ocr_calls']} OCR calls ({scenario['ocr_calls_per_frame']}/frame), "
+                     f"{scenario['captures']} captures, {scenario['errors']} errors")
+        if scenario["first_error"]:
+            lines.append("  first error:")
+            lines.extend(f"    {line}" for line in scenario["first_error"].rstrip().splitlines())
+        lines.append(f"  {'stage':<8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for stage, row in scenario["stages"].items():
+            lines.append(f"  {stage:<8} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} "
+                         f"{row['max_ms']:>9}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark perception pipelines over a replayed screenshot sequence")
+    parser.add_argument("--sequence", type=Path, help="directory of recorded frames (+ .txt transcripts)")
+    parser.add_argument("--synthetic", type=int, default=8, metavar="N",
+                        help="render N synthetic frames when no sequence is given")
+    parser.add_argument("--scenario", action="append", metavar="NAME",
+                        help=f"scenario to run (repeatable): {', '.join(SCENARIOS)} or module:Class; "
+                             "default all")
+    parser.add_argument("--loops", type=int, default=3, help="times to replay the sequence")
+    parser.add_argument("--ocr", choices=("replay", "tesseract"), default="replay",
+                        help="serve frame transcripts or run Tesseract")
+    parser.add_argument("--ocr-latency-ms", type=float, default=0.0,
+                        help="simulated time per OCR call with --ocr replay")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    frames = load_sequence(args.sequence) if args.sequence else synthetic_sequence(args.synthetic)
+    if not frames:
+        parser.error(f"no frames found in {args.sequence}")
+    try:
+        scenarios = [load_scenario(spec) for spec in (args.scenario or list(SCENARIOS))]
+    except KeyError as e:
+        parser.error(e.args[0])
+    except (ImportError, AttributeError) as e:
+        parser.error(str(e))
+
+    # Scenario modules log to stdout; keep it for the report
+    with redirect_stdout(sys.stderr):
+        result = run_benchmark(frames, scenarios, args.loops, args.ocr, args.ocr_latency_ms / 1000)
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,8 @@ import functools
 import gc
 import os
 
+from perf.latency_histogram import HistogramRegistry
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -71,6 +73,9 @@ class ModuleProfile:
     memory_impact: float
     last_called: datetime
     recommendations: List[str]
+    p50_execution_time: float = 0.0
+    p95_execution_time: float = 0.0
+    p99_execution_time: float = 0.0
 
 
 class PerformanceProfiler:
@@ -94,6 +99,7 @@ class PerformanceProfiler:
         self.ocr_call_count = 0
         self.frame_analysis_count = 0
         self.io_wait_time = 0.0
+        self.latency_histograms = HistogramRegistry()
         
         # Sampling thread
         self.sampling_thread = None
@@ -297,13 +303,17 @@ class PerformanceProfiler:
         except Exception as e:
             logger.error(f"Failed to log sample: {e}")
             
-    def track_ocr_call(self) -> None:
-        """Track an OCR call."""
+    def track_ocr_call(self, duration: Optional[float] = None) -> None:
+        """Track an OCR call, optionally with its latency in seconds."""
         self.ocr_call_count += 1
+        if duration is not None:
+            self.latency_histograms.record('ocr', duration)
         
-    def track_frame_analysis(self) -> None:
-        """Track a frame analysis."""
+    def track_frame_analysis(self, duration: Optional[float] = None) -> None:
+        """Track a frame analysis, optionally with its latency in seconds."""
         self.frame_analysis_count += 1
+        if duration is not None:
+            self.latency_histograms.record('frame_analysis', duration)
         
     def track_io_wait(self, wait_time: float) -> None:
         """Track IO wait time."""
@@ -314,7 +324,7 @@ class PerformanceProfiler:
         def decorator(func):
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.perf_counter()
                 start_cpu = psutil.cpu_percent()
                 start_memory = psutil.virtual_memory().percent
                 
@@ -322,7 +332,7 @@ class PerformanceProfiler:
                     result = func(*args, **kwargs)
                     return result
                 finally:
-                    end_time = time.time()
+                    end_time = time.perf_counter()
                     end_cpu = psutil.cpu_percent()
                     end_memory = psutil.virtual_memory().percent
                     
@@ -366,6 +376,32 @@ class PerformanceProfiler:
         profile.cpu_impact = (profile.cpu_impact + cpu_impact) / 2
         profile.memory_impact = (profile.memory_impact + memory_impact) / 2
         profile.last_called = datetime.now()
+        self.latency_histograms.record(module_name, execution_time)
+        
+    def _refresh_latency_percentiles(self) -> None:
+        """Copy histogram percentiles into the module profiles."""
+        for name, profile in self.module_profiles.items():
+            snapshot = self.latency_histograms.get(name).snapshot()
+            profile.p50_execution_time = snapshot['percentiles']['p50']
+            profile.p95_execution_time = snapshot['percentiles']['p95']
+            profile.p99_execution_time = snapshot['percentiles']['p99']
+            
+    def get_latency_percentiles(self, window_seconds: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Get p50/p95/p99 latencies for every instrumented function.
+        
+        Args:
+            window_seconds: Only include the time slots covering the most
+                recent ``window_seconds``; ``None`` reports lifetime percentiles
+        """
+        return self.latency_histograms.snapshot(window_seconds=window_seconds)
+        
+    def export_latency_prometheus(self) -> str:
+        """Export latency histograms in Prometheus text format."""
+        return self.latency_histograms.to_prometheus()
+        
+    def export_latency_json(self) -> str:
+        """Export lifetime and rolling latency histograms as JSON."""
+        return self.latency_histograms.to_json()
         
     def get_recent_samples(self, count: int = 100) -> List[PerformanceSample]:
         """Get recent performance samples."""
@@ -411,6 +447,7 @@ class PerformanceProfiler:
         
     def export_profile(self, session_id: str) -> Dict[str, Any]:
         """Export performance profile for a session."""
+        self._refresh_latency_percentiles()
         profile_data = {
             'session_id': session_id,
             'export_timestamp': datetime.now().isoformat(),
@@ -422,6 +459,7 @@ class PerformanceProfiler:
                 name: asdict(profile) 
                 for name, profile in self.module_profiles.items()
             },
+            'latency_percentiles': self.get_latency_percentiles(),
             'recent_samples': [
                 asdict(sample) for sample in self.get_recent_samples(50)
             ]
@@ -465,14 +503,14 @@ def stop_profiling() -> None:
     profiler.stop_sampling()
 
 
-def track_ocr_call() -> None:
-    """Track an OCR call."""
-    profiler.track_ocr_call()
+def track_ocr_call(duration: Optional[float] = None) -> None:
+    """Track an OCR call, optionally with its latency in seconds."""
+    profiler.track_ocr_call(duration)
 
 
-def track_frame_analysis() -> None:
-    """Track a frame analysis."""
-    profiler.track_frame_analysis()
+def track_frame_analysis(duration: Optional[float] = None) -> None:
+    """Track a frame analysis, optionally with its latency in seconds."""
+    profiler.track_frame_analysis(duration)
 
 
 def track_io_wait(wait_time: float) -> None:
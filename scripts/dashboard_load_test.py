@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Load-test the dashboard's cached read endpoints with Flask's test client.
+
+Each endpoint is requested repeatedly, first with the response cache
+disabled and then enabled, and once more with ``If-None-Match`` so the
+``304`` path is measured too.  Latency percentiles and the cache's hit
+counters are printed per endpoint.
+
+    python scripts/dashboard_load_test.py --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+DEFAULT_ENDPOINTS = [
+    "/api/builds",
+    "/api/builds/search?category=all",
+    "/api/builds/top-performing?limit=5",
+    "/api/sessions/stats",
+    "/status",
+]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(_percentile(samples, 95) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "rps": round(len(samples) / sum(samples), 1) if sum(samples) else 0.0,
+    }
+
+
+def run(endpoints: List[str], requests_per_endpoint: int) -> Dict[str, Dict]:
+    from dashboard.app import app, response_cache
+
+    client = app.test_client()
+    results = {}
+    for endpoint in endpoints:
+        row = {}
+        for label, enabled, conditional in (
+            ("uncached", False, False),
+            ("cached", True, False),
+            ("conditional", True, True),
+        ):
+            response_cache.enabled = enabled
+            response_cache.clear()
+            response_cache.reset_stats()
+            headers = {"Accept-Encoding": "gzip"}
+            if conditional:
+                etag = client.get(endpoint, headers=headers).headers.get("ETag")
+                if etag:
+                    headers["If-None-Match"] = etag
+
+            samples = []
+            statuses = set()
+            for _ in range(requests_per_endpoint):
+                start = time.perf_counter()
+                response = client.get(endpoint, headers=headers)
+                samples.append(time.perf_counter() - start)
+                statuses.add(response.status_code)
+
+            row[label] = dict(_summary(samples), statuses=sorted(statuses))
+            if enabled:
+                row[label]["cache"] = response_cache.stats()
+        results[endpoint] = row
+    response_cache.enabled = True
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Dashboard response cache load test")
+    parser.add_argument("--requests", type=int, default=100, help="requests per endpoint and mode")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="endpoint to test (repeatable); defaults to the cached read APIs")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args(argv)
+
+    results = run(args.endpoints or DEFAULT_ENDPOINTS, args.requests)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for endpoint, row in results.items():
+        print(endpoint)
+        for label, data in row.items():
+            cache = data.get("cache")
+            hit_rate = f", hit rate {cache['hit_rate']:.0%}" if cache else ""
+            print(f"  {label:<12} p50 {data['p50_ms']:>8} ms  p95 {data['p95_ms']:>8} ms  "
+                  f"{data['rps']:>8} req/s  status {data['statuses']}{hit_rate}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
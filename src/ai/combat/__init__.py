@@ -3,4 +3,12 @@
 from .evaluator import evaluate_state
 from .combat_runtime import CombatRunner
 
-__all__ = ["evaluate_state", "CombatRunner"]
+__all__ = ["evaluate_state", "CombatRunner", "CompiledEvaluator"]
+
+
+def __getattr__(name: str):
+    # The compiled evaluator needs NumPy; import it only when asked for
+    if name == "CompiledEvaluator":
+        from .decision_table import CompiledEvaluator as _CompiledEvaluator
+        return _CompiledEvaluator
+    raise AttributeError(name)
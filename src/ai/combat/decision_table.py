@@ -0,0 +1,315 @@
+"""Compiled decision-table combat evaluator.
+
+:func:`~.evaluator.evaluate_state` and the predicates in
+:mod:`.strategies` are written as ``if`` chains over a handful of numbers
+(player HP, healing items, buff state, target HP and how often an action
+was used recently).  Here those chains are written as data: each rule is a
+set of ``lower <= feature < upper`` bounds plus the action it yields.
+Compiling the rules gives two ``rules x features`` bound matrices, so a
+whole batch of states is decided in one NumPy pass: a state takes the
+action of the first rule whose bounds it satisfies.
+
+This is meant for hosts driving many bots at once and for offline tuning
+over recorded states; a single bot's :class:`~.combat_runtime.CombatRunner`
+keeps using :func:`~.evaluator.evaluate_state`.  Both give the same
+decisions.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+SPAM_LIMIT = 2
+
+FEATURES: Tuple[str, ...] = (
+    "behavior",
+    "hp",
+    "healing",
+    "buffed",
+    "target_hp",
+    "spam_heal",
+    "spam_buff",
+    "spam_attack",
+    # Raw flags read by the strategies predicates
+    "has_heal",
+    "is_buffed",
+)
+
+BEHAVIORS: Tuple[str, ...] = ("aggressive", "defensive", "tactical")
+DEFAULT_BEHAVIOR = "tactical"
+
+Condition = Tuple[str, str, float]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """An action and the conditions (``(feature, op, value)``) it requires."""
+    action: str
+    conditions: Tuple[Condition, ...] = ()
+
+
+def _not_spamming(action: str) -> Condition:
+    return (f"spam_{action}", "<", SPAM_LIMIT)
+
+
+# evaluate_state's branches, in priority order per behavior
+BEHAVIOR_RULES: Dict[str, Tuple[Rule, ...]] = {
+    "aggressive": (
+        Rule("attack", (("target_hp", "<", 20), _not_spamming("attack"))),
+        Rule("buff", (("buffed", "==", 0), _not_spamming("buff"))),
+        Rule("attack"),
+    ),
+    "defensive": (
+        Rule("heal", (("hp", "<", 50), ("healing", "==", 1), _not_spamming("heal"))),
+        Rule("buff", (("buffed", "==", 0), _not_spamming("buff"))),
+        Rule("retreat", (("hp", "<", 30),)),
+        Rule("idle"),
+    ),
+    "tactical": (
+        Rule("heal", (("hp", "<", 35), ("healing", "==", 1), _not_spamming("heal"))),
+        Rule("retreat", (("hp", "<", 20), ("healing", "==", 0))),
+        Rule("buff", (("buffed", "==", 0), _not_spamming("buff"))),
+        Rule("attack", (_not_spamming("attack"),)),
+        Rule("idle"),
+    ),
+}
+
+# The strategies predicates, each evaluated on its own
+STRATEGY_RULES: Tuple[Rule, ...] = (
+    Rule("should_heal", (("hp", "<", 30), ("has_heal", "==", 1))),
+    Rule("should_retreat", (("hp", "<", 30), ("has_heal", "==", 0))),
+    Rule("should_attack", (("target_hp", ">", 0), ("hp", ">=", 30))),
+    Rule("should_buff", (("is_buffed", "==", 0), ("target_hp", "<=", 0))),
+    Rule("should_idle", (("target_hp", "<=", 0),)),
+)
+
+
+def _bounds(op: str, value: float) -> Tuple[float, float]:
+    """``[lower, upper)`` interval equivalent to ``x <op> value``."""
+    value = float(value)
+    above = float(np.nextafter(value, np.inf))
+    if op == "<":
+        return -np.inf, value
+    if op == "<=":
+        return -np.inf, above
+    if op == ">":
+        return above, np.inf
+    if op == ">=":
+        return value, np.inf
+    if op == "==":
+        return value, above
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class DecisionTable:
+    """Rules compiled to ``lower <= x < upper`` bound matrices.
+
+    Parameters
+    ----------
+    rules : sequence of Rule
+        Rules in priority order
+    features : sequence of str
+        Feature (column) names the conditions refer to
+    default : str
+        Action for states that match no rule
+    """
+
+    def __init__(self, rules: Sequence[Rule], features: Sequence[str] = FEATURES, default: str = "idle"):
+        self.rules = tuple(rules)
+        self.features = tuple(features)
+        self.default = default
+        self.actions: List[str] = sorted({rule.action for rule in self.rules} | {default})
+        self._action_codes = np.array([self.actions.index(rule.action) for rule in self.rules] +
+                                      [self.actions.index(default)], dtype=np.intp)
+
+        column = {name: i for i, name in enumerate(self.features)}
+        self.lower = np.full((len(self.rules), len(self.features)), -np.inf)
+        self.upper = np.full((len(self.rules), len(self.features)), np.inf)
+        for row, rule in enumerate(self.rules):
+            for feature, op, value in rule.conditions:
+                lo, hi = _bounds(op, value)
+                index = column[feature]
+                self.lower[row, index] = max(self.lower[row, index], lo)
+                self.upper[row, index] = min(self.upper[row, index], hi)
+        # Only constrained columns are compared
+        self._columns = np.flatnonzero(np.isfinite(self.lower).any(axis=0) | np.isfinite(self.upper).any(axis=0))
+
+    def matches(self, X: np.ndarray) -> np.ndarray:
+        """``rules x states`` boolean matrix of the rules each state satisfies."""
+        X = np.asarray(X, dtype=float)[:, self._columns]
+        lower = self.lower[:, self._columns]
+        upper = self.upper[:, self._columns]
+        return ((X[None, :, :] >= lower[:, None, :]) & (X[None, :, :] < upper[:, None, :])).all(axis=2)
+
+    def first_match(self, X: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        """Index of the first satisfied rule per state (``len(rules)`` if none)."""
+        X = np.asarray(X, dtype=float)
+        result = np.empty(len(X), dtype=np.intp)
+        for start in range(0, len(X), chunk):
+            mask = self.matches(X[start:start + chunk])
+            hit = mask.any(axis=0)
+            result[start:start + chunk] = np.where(hit, mask.argmax(axis=0), len(self.rules))
+        return result
+
+    def decide(self, X: np.ndarray) -> np.ndarray:
+        """Action code (index into :attr:`actions`) per state."""
+        return self._action_codes[self.first_match(X)]
+
+
+def _behavior_code(behavior: Optional[str]) -> int:
+    behavior = (behavior or DEFAULT_BEHAVIOR).lower()
+    return BEHAVIORS.index(behavior if behavior in BEHAVIORS else DEFAULT_BEHAVIOR)
+
+
+def state_features(
+    player_state: Mapping,
+    target_state: Mapping,
+    behavior: str = DEFAULT_BEHAVIOR,
+    recent_actions: Optional[Sequence[str]] = None,
+) -> Tuple[float, ...]:
+    """One feature row, reading the state dictionaries like ``evaluate_state``."""
+    recent_actions = recent_actions or ()
+    healing_count = player_state.get("healing_items")
+    if healing_count is None:
+        healing_count = 1 if player_state.get("has_heal", False) else 0
+    buffed = player_state.get("buffed", player_state.get("is_buffed", False))
+    return (
+        _behavior_code(behavior),
+        player_state.get("hp", 100),
+        1.0 if healing_count > 0 else 0.0,
+        1.0 if buffed else 0.0,
+        target_state.get("hp", 100),
+        recent_actions.count("heal"),
+        recent_actions.count("buff"),
+        recent_actions.count("attack"),
+        1.0 if player_state.get("has_heal", False) else 0.0,
+        1.0 if player_state.get("is_buffed", False) else 0.0,
+    )
+
+
+def feature_matrix(
+    player_states: Sequence[Mapping],
+    target_states: Sequence[Mapping],
+    behaviors: Optional[Iterable[str]] = None,
+    recent_actions: Optional[Sequence[Optional[Sequence[str]]]] = None,
+) -> np.ndarray:
+    """Feature matrix (one :func:`state_features` row per state) for a batch.
+
+    Filled column by column, which is faster than stacking per-state rows.
+    """
+    count = len(player_states)
+    X = np.zeros((count, len(FEATURES)))
+    if not count:
+        return X
+    codes = {name: i for i, name in enumerate(BEHAVIORS)}
+    default_code = codes[DEFAULT_BEHAVIOR]
+    if behaviors is None:
+        X[:, 0] = default_code
+    else:
+        X[:, 0] = [codes.get((b or DEFAULT_BEHAVIOR).lower(), default_code) for b in behaviors]
+    X[:, 1] = [p.get("hp", 100) for p in player_states]
+
+    has_heal = [bool(p.get("has_heal", False)) for p in player_states]
+    healing_items = [p.get("healing_items") for p in player_states]
+    X[:, 2] = [h if n is None else n > 0 for n, h in zip(healing_items, has_heal)]
+    is_buffed = [bool(p.get("is_buffed", False)) for p in player_states]
+    X[:, 3] = [bool(p.get("buffed", b)) for p, b in zip(player_states, is_buffed)]
+    X[:, 4] = [t.get("hp", 100) for t in target_states]
+
+    if recent_actions is not None:
+        for column, action in ((5, "heal"), (6, "buff"), (7, "attack")):
+            X[:, column] = [r.count(action) if r else 0 for r in recent_actions]
+    X[:, 8] = has_heal
+    X[:, 9] = is_buffed
+    return X
+
+
+class CompiledEvaluator:
+    """Batch equivalent of ``evaluate_state`` and the strategies predicates.
+
+    All behaviors share one table (behavior is a feature), so a batch can
+    mix bots with different behaviors.
+    """
+
+    def __init__(self, behavior_rules: Mapping[str, Sequence[Rule]] = BEHAVIOR_RULES,
+                 strategy_rules: Sequence[Rule] = STRATEGY_RULES) -> None:
+        rules = [
+            Rule(rule.action, (("behavior", "==", BEHAVIORS.index(behavior)),) + rule.conditions)
+            for behavior in BEHAVIORS
+            for rule in behavior_rules[behavior]
+        ]
+        self.table = DecisionTable(rules)
+        self.strategies = {rule.action: DecisionTable([rule]) for rule in strategy_rules}
+
+    def decide(self, X: np.ndarray) -> np.ndarray:
+        """Actions (strings) for a :func:`feature_matrix`."""
+        return np.asarray(self.table.actions, dtype=object)[self.table.decide(X)]
+
+    def evaluate_batch(
+        self,
+        player_states: Sequence[Mapping],
+        target_states: Sequence[Mapping],
+        behaviors: Optional[Iterable[str]] = None,
+        recent_actions: Optional[Sequence[Optional[Sequence[str]]]] = None,
+    ) -> List[str]:
+        """
+        Decide actions for many player/target states at once.
+
+        Parameters
+        ----------
+        player_states, target_states : sequence of dict
+            States as passed to ``evaluate_state``
+        behaviors : iterable of str, optional
+            Behavior per state (``"tactical"`` if omitted)
+        recent_actions : sequence, optional
+            Recent-action history per state
+
+        Returns
+        -------
+        List[str]
+            One action per state, as ``evaluate_state`` would return
+        """
+        X = feature_matrix(player_states, target_states, behaviors, recent_actions)
+        return self.decide(X).tolist()
+
+    def evaluate(self, player_state: Mapping, target_state: Mapping, behavior: str = DEFAULT_BEHAVIOR,
+                 recent_actions: Optional[Sequence[str]] = None) -> str:
+        return self.evaluate_batch([player_state], [target_state], [behavior], [recent_actions])[0]
+
+    def strategy_flags(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Boolean array per strategies predicate (``should_heal`` ...)."""
+        X = np.asarray(X, dtype=float)
+        return {name: table.first_match(X) == 0 for name, table in self.strategies.items()}
+
+    def tick(self, runners: Sequence, player_states: Sequence[Mapping],
+             target_states: Sequence[Mapping]) -> List[str]:
+        """Advance many ``CombatRunner`` objects by one tick in one pass.
+
+        Each runner's ``last_action`` and ``recent_actions`` are updated
+        exactly as :meth:`CombatRunner.tick` would.
+        """
+        decisions = self.evaluate_batch(
+            player_states,
+            target_states,
+            [runner.behavior for runner in runners],
+            [runner.recent_actions for runner in runners],
+        )
+        for runner, decision in zip(runners, decisions):
+            runner.last_action = decision
+            runner.recent_actions.append(decision)
+            if len(runner.recent_actions) > runner.memory_size:
+                runner.recent_actions.pop(0)
+        return decisions
+
+
+__all__ = [
+    "BEHAVIOR_RULES",
+    "CompiledEvaluator",
+    "DecisionTable",
+    "FEATURES",
+    "Rule",
+    "STRATEGY_RULES",
+    "feature_matrix",
+    "state_features",
+]
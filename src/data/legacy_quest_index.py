@@ -0,0 +1,270 @@
+"""In-memory indexes over legacy quest records.
+
+The indexes are built once per :class:`~src.data.legacy_quest_manager.LegacyQuestManager`
+load and answer the manager's substring queries without scanning every quest:
+
+* planet and status hash indexes (lowercased value -> quest ids)
+* an NPC token index over ``npc``/``quest_giver``
+* a full-text token index over ``title`` and ``notes`` with a sorted
+  vocabulary for prefix lookups and a trigram index over the vocabulary
+  for in-word fragments
+
+Lookups narrow the candidate set through the indexes and then confirm each
+candidate with the original substring test, so results match a full scan.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_GRAM = 3
+
+CACHE_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lowercase word tokens."""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def quest_npc(quest: Dict[str, Any]) -> str:
+    """Return the NPC/quest giver name for ``quest``."""
+    return quest.get("npc") or quest.get("quest_giver", "")
+
+
+def quest_tokens(quest: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Return the token lists indexed for a single quest."""
+    return {
+        "title": tokenize(quest.get("title", "")),
+        "notes": tokenize(quest.get("notes", "")),
+        "npc": tokenize(quest_npc(quest)),
+    }
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+class _TokenIndex:
+    """Token -> quest id postings with a sorted vocabulary and trigrams."""
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[int]] = {}
+        self._vocab: Optional[List[str]] = None
+        self._trigrams: Optional[Dict[str, Set[str]]] = None
+        self._substring_cache: Dict[str, Set[int]] = {}
+
+    def add(self, qid: int, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(qid)
+        self._vocab = None
+        self._trigrams = None
+        self._substring_cache.clear()
+
+    @property
+    def vocab(self) -> List[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        return self._vocab
+
+    @property
+    def trigrams(self) -> Dict[str, Set[str]]:
+        """Trigram -> vocabulary tokens containing it, built on first use."""
+        if self._trigrams is None:
+            trigrams: Dict[str, Set[str]] = {}
+            for token in self.postings:
+                for gram in _grams(token):
+                    trigrams.setdefault(gram, set()).add(token)
+            self._trigrams = trigrams
+        return self._trigrams
+
+    def exact(self, token: str) -> Set[int]:
+        return self.postings.get(token, set())
+
+    def prefix(self, prefix: str) -> Set[int]:
+        """Return ids of quests with a token starting with ``prefix``."""
+        vocab = self.vocab
+        result: Set[int] = set()
+        start = bisect.bisect_left(vocab, prefix)
+        for token in vocab[start:]:
+            if not token.startswith(prefix):
+                break
+            result |= self.postings[token]
+        return result
+
+    def containing(self, fragment: str) -> Set[int]:
+        """Return ids of quests with a token containing ``fragment``.
+
+        Fragments of three or more characters intersect the trigram sets
+        and confirm the few tokens left; shorter ones scan the vocabulary.
+        """
+        cached = self._substring_cache.get(fragment)
+        if cached is not None:
+            return cached
+        if len(fragment) >= _GRAM:
+            tokens: Optional[Set[str]] = None
+            for gram in sorted(_grams(fragment), key=lambda g: len(self.trigrams.get(g, ()))):
+                matches = self.trigrams.get(gram, set())
+                tokens = set(matches) if tokens is None else tokens & matches
+                if not tokens:
+                    break
+            candidates: Iterable[str] = tokens or ()
+        else:
+            candidates = self.postings
+        result: Set[int] = set()
+        for token in candidates:
+            if fragment in token:
+                result |= self.postings[token]
+        if len(self._substring_cache) > 1024:
+            self._substring_cache.clear()
+        self._substring_cache[fragment] = result
+        return result
+
+
+class LegacyQuestIndex:
+    """Hash and token indexes over a list of quests."""
+
+    def __init__(
+        self,
+        quests: List[Dict[str, Any]],
+        tokens: Optional[List[Dict[str, List[str]]]] = None,
+    ) -> None:
+        self.quests = quests
+        self.planets: Dict[str, List[int]] = {}
+        self.statuses: Dict[str, List[int]] = {}
+        self.npc_tokens = _TokenIndex()
+        self.text_tokens = _TokenIndex()
+        self.title_tokens: List[Set[str]] = []
+
+        if tokens is None:
+            tokens = [quest_tokens(q) for q in quests]
+        for qid, (quest, toks) in enumerate(zip(quests, tokens)):
+            self.planets.setdefault(quest.get("planet", "").lower(), []).append(qid)
+            self.statuses.setdefault(str(quest.get("status", "")).lower(), []).append(qid)
+            self.npc_tokens.add(qid, toks["npc"])
+            self.text_tokens.add(qid, toks["title"])
+            self.text_tokens.add(qid, toks["notes"])
+            self.title_tokens.append(set(toks["title"]))
+
+    @staticmethod
+    def _hash_lookup(index: Dict[str, List[int]], value: str) -> Set[int]:
+        # Distinct planets/statuses are few, so matching the keys keeps the
+        # substring semantics while touching each quest at most once.
+        value = value.lower()
+        result: Set[int] = set()
+        for key, ids in index.items():
+            if value in key:
+                result.update(ids)
+        return result
+
+    def planet_ids(self, planet: str) -> Set[int]:
+        return self._hash_lookup(self.planets, planet)
+
+    def status_ids(self, status: str) -> Set[int]:
+        return self._hash_lookup(self.statuses, status)
+
+    @staticmethod
+    def _token_candidates(index: _TokenIndex, term: str) -> Optional[Set[int]]:
+        """Narrow quests for a substring ``term``; ``None`` means unknown."""
+        words = tokenize(term)
+        if not words:
+            return None
+        candidates: Optional[Set[int]] = None
+        last = len(words) - 1
+        for pos, word in enumerate(words):
+            if pos == 0:
+                ids = index.containing(word)
+            elif pos == last:
+                ids = index.prefix(word)
+            else:
+                ids = index.exact(word)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+        return candidates
+
+    def npc_ids(self, npc: str) -> Set[int]:
+        npc = npc.lower()
+        candidates = self._token_candidates(self.npc_tokens, npc)
+        if candidates is None:
+            candidates = set(range(len(self.quests)))
+        return {i for i in candidates if npc in quest_npc(self.quests[i]).lower()}
+
+    def text_ids(self, term: str) -> Set[int]:
+        term = term.lower()
+        candidates = self._token_candidates(self.text_tokens, term)
+        if candidates is None:
+            candidates = set(range(len(self.quests)))
+        result = set()
+        for i in candidates:
+            quest = self.quests[i]
+            if term in quest.get("title", "").lower() or term in quest.get("notes", "").lower():
+                result.add(i)
+        return result
+
+    def rank(self, ids: Iterable[int], term: Optional[str]) -> List[int]:
+        """Order ids by how well ``term`` matches each quest's title."""
+        ids = sorted(ids)
+        if not term:
+            return ids
+        words = tokenize(term)
+        phrase = term.lower()
+
+        def score(qid: int) -> tuple:
+            quest = self.quests[qid]
+            title = quest.get("title", "").lower()
+            title_tokens = self.title_tokens[qid]
+            points = 0
+            if phrase in title:
+                points += 4
+                if title.startswith(phrase):
+                    points += 2
+            for word in words:
+                if word in title_tokens:
+                    points += 2
+                elif any(t.startswith(word) for t in title_tokens):
+                    points += 1
+            return (-points, qid)
+
+        return sorted(ids, key=score)
+
+
+def _source_signature(source: Path) -> Dict[str, Any]:
+    stat = source.stat()
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def write_cache(cache_path: Path, source: Path, quests: List[Dict[str, Any]]) -> None:
+    """Write ``quests`` and their tokens to ``cache_path``."""
+    payload = {
+        "version": CACHE_VERSION,
+        "source": _source_signature(source),
+        "quests": quests,
+        "tokens": [quest_tokens(q) for q in quests],
+    }
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    tmp.replace(cache_path)
+
+
+def read_cache(cache_path: Path, source: Path) -> Optional[Dict[str, Any]]:
+    """Read ``cache_path`` and return its payload if still valid."""
+    try:
+        payload = json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != CACHE_VERSION:
+        return None
+    try:
+        if payload.get("source") != _source_signature(source):
+            return None
+    except OSError:
+        pass
+    return payload
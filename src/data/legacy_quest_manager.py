@@ -1,19 +1,67 @@
 import argparse
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from src.data.legacy_quest_index import LegacyQuestIndex, read_cache, write_cache
 
-class LegacyQuestManager:
-    """Load and query legacy quest data."""
 
-    def __init__(self, json_path: Path | str | None = None) -> None:
+class LegacyQuestManager:
+    """Load and query legacy quest data.
+
+    Queries are answered from :class:`LegacyQuestIndex`, built once per load.
+    Pass ``lazy=True`` to defer loading until the first query and
+    ``cache_path`` to load from (and maintain) a pre-tokenized cache file.
+    """
+
+    def __init__(
+        self,
+        json_path: Path | str | None = None,
+        *,
+        lazy: bool = False,
+        cache_path: Path | str | None = None,
+    ) -> None:
         if json_path is None:
             root = Path(__file__).resolve().parents[2]
             json_path = root / "data" / "processed" / "legacy_quests.json"
         self.path = Path(json_path)
-        with self.path.open("r", encoding="utf-8") as f:
-            self.quests: List[Dict[str, Any]] = json.load(f)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self._quests: Optional[List[Dict[str, Any]]] = None
+        self._index: Optional[LegacyQuestIndex] = None
+        if not lazy:
+            self._load()
+
+    def _load(self) -> None:
+        tokens = None
+        payload = None
+        if self.cache_path is not None:
+            payload = read_cache(self.cache_path, self.path)
+        if payload is not None:
+            quests = payload["quests"]
+            tokens = payload["tokens"]
+        else:
+            with self.path.open("r", encoding="utf-8") as f:
+                quests = json.load(f)
+            if self.cache_path is not None:
+                write_cache(self.cache_path, self.path, quests)
+        self._quests = quests
+        self._index = LegacyQuestIndex(quests, tokens)
+
+    @property
+    def quests(self) -> List[Dict[str, Any]]:
+        if self._quests is None:
+            self._load()
+        return self._quests
+
+    @property
+    def index(self) -> LegacyQuestIndex:
+        if self._index is None:
+            self._load()
+        return self._index
+
+    def _select(self, ids) -> List[Dict[str, Any]]:
+        quests = self.quests
+        return [quests[i] for i in sorted(ids)]
 
     def list_all_quests(self) -> List[Dict[str, Any]]:
         """Return the raw list of all quests."""
@@ -21,34 +69,55 @@ class LegacyQuestManager:
 
     def find_by_npc(self, npc: str) -> List[Dict[str, Any]]:
         """Return quests matching the given NPC/quest giver name."""
-        npc = npc.lower()
-        results = []
-        for q in self.quests:
-            giver = q.get("npc") or q.get("quest_giver", "")
-            if npc in giver.lower():
-                results.append(q)
-        return results
+        return self._select(self.index.npc_ids(npc))
 
     def find_by_planet(self, planet: str) -> List[Dict[str, Any]]:
         """Return quests located on the given planet."""
-        planet = planet.lower()
-        return [q for q in self.quests if planet in q.get("planet", "").lower()]
+        return self._select(self.index.planet_ids(planet))
 
     def find_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Return quests matching the given completion status."""
-        status = status.lower()
-        return [q for q in self.quests if status in str(q.get("status", "")).lower()]
+        return self._select(self.index.status_ids(status))
 
     def search(self, term: str) -> List[Dict[str, Any]]:
         """Search quests by title or notes."""
-        term = term.lower()
-        results = []
-        for q in self.quests:
-            title = q.get("title", "").lower()
-            notes = q.get("notes", "").lower()
-            if term in title or term in notes:
-                results.append(q)
-        return results
+        return self._select(self.index.text_ids(term))
+
+    def query(
+        self,
+        *,
+        planet: str | None = None,
+        npc: str | None = None,
+        status: str | None = None,
+        term: str | None = None,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return quests matching every given filter, best ``term`` matches first.
+
+        Each filter uses the same substring semantics as the matching
+        ``find_by_*``/``search`` method. Without ``term`` results keep file order.
+        """
+        index = self.index
+        ids: Optional[set] = None
+        for value, lookup in (
+            (planet, index.planet_ids),
+            (status, index.status_ids),
+            (npc, index.npc_ids),
+            (term, index.text_ids),
+        ):
+            if value is None:
+                continue
+            matched = lookup(value)
+            ids = matched if ids is None else ids & matched
+            if not ids:
+                return []
+        if ids is None:
+            ids = range(len(self.quests))
+        ranked = index.rank(ids, term)
+        if limit is not None:
+            ranked = ranked[:limit]
+        quests = self.quests
+        return [quests[i] for i in ranked]
 
 
 def _parse_args(argv=None) -> argparse.Namespace:
@@ -76,11 +145,7 @@ def main(argv=None):
     args = _parse_args(argv)
     manager = LegacyQuestManager()
     if args.list:
-        results = manager.list_all_quests()
-        if args.planet:
-            results = [q for q in results if args.planet.lower() in q.get("planet", "").lower()]
-        if args.status:
-            results = [q for q in results if args.status.lower() in str(q.get("status", "")).lower()]
+        results = manager.query(planet=args.planet, status=args.status)
     elif args.search:
         results = manager.search(args.search)
     elif args.npc:
@@ -9,40 +9,59 @@ stores the current state, see :class:`src.state.StateManager`.
 from __future__ import annotations
 
 import time
-from typing import Callable, Mapping, MutableMapping
+from typing import Any, Callable, Dict, Mapping, MutableMapping, Optional
 
+from src.state.text_monitor import TextStateMonitor, TickTiming
 from src.vision import ocr
 
 
 class StateManager:
-    """Monitor on-screen text and trigger callbacks when keywords appear."""
+    """Monitor on-screen text and trigger callbacks when keywords appear.
+
+    Callbacks fire once per appearance; ``regions`` maps a keyword to its
+    own capture region (see :mod:`src.state.text_monitor`).
+    """
 
     def __init__(
         self,
         callbacks: Mapping[str, Callable[[], None]],
         *,
         region=None,
+        regions: Optional[Mapping[str, Any]] = None,
         interval: float = 1.0,
     ) -> None:
         self.callbacks: MutableMapping[str, Callable[[], None]] = dict(callbacks)
         self.region = region
         self.interval = interval
+        self.monitor = TextStateMonitor(
+            self.callbacks,
+            region=region,
+            regions=regions,
+            capture=lambda r: ocr.capture_screen(region=r),
+            extract_text=lambda image: ocr.extract_text(image),
+        )
         self._running = False
 
-    def _check_once(self) -> None:
-        image = ocr.capture_screen(region=self.region)
-        text = ocr.extract_text(image).lower()
-        for key, cb in list(self.callbacks.items()):
-            if key.lower() in text:
-                cb()
+    def _check_once(self) -> TickTiming:
+        self.monitor.region = self.region
+        return self.monitor.tick()
 
     def run(self, duration: float | None = None) -> None:
         """Run the monitoring loop optionally for ``duration`` seconds."""
         self._running = True
         end_time = time.time() + duration if duration is not None else None
         while self._running and (end_time is None or time.time() < end_time):
-            self._check_once()
-            time.sleep(max(self.interval, 0))
+            timing = self._check_once()
+            time.sleep(max(self.interval - timing.total_ms / 1000, 0))
+
+    @property
+    def last_tick(self) -> Optional[TickTiming]:
+        """Timings of the most recent check."""
+        return self.monitor.last_tick
+
+    def tick_stats(self) -> Dict[str, float]:
+        """Summary of recent check timings and OCR skips."""
+        return self.monitor.tick_stats()
 
     def stop(self) -> None:
         """Stop the monitoring loop."""
@@ -1,10 +1,13 @@
 """Game state helpers."""
 
-__all__ = ["StateManager"]
+__all__ = ["StateManager", "TextStateMonitor"]
 
 
 def __getattr__(name: str):
     if name == "StateManager":
         from .state_manager import StateManager as _StateManager
         return _StateManager
+    if name == "TextStateMonitor":
+        from .text_monitor import TextStateMonitor as _TextStateMonitor
+        return _TextStateMonitor
     raise AttributeError(name)
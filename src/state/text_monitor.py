@@ -0,0 +1,289 @@
+"""Region-scoped, event-driven on-screen text monitoring.
+
+:class:`TextStateMonitor` is the engine behind both ``StateManager``
+classes.  Per tick it
+
+* captures each distinct region once (a phrase may declare its own
+  sub-region, otherwise it uses the monitor's region),
+* skips OCR for a region whose pixels are unchanged since the last tick,
+  and shares OCR text between monitors that look at identical pixels,
+* matches every phrase of a region in one pass over the text with an
+  Aho-Corasick automaton, and
+* fires a callback only when its phrase appears, not on every tick it
+  stays on screen.
+
+Each tick's timings are kept in :attr:`TextStateMonitor.last_tick` and
+summarized by :meth:`TextStateMonitor.tick_stats`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from utils.image_digest import frame_digest
+
+Region = Optional[Tuple[int, int, int, int]]
+
+
+class PhraseAutomaton:
+    """Aho-Corasick matcher for a fixed set of lowercase phrases."""
+
+    def __init__(self, phrases: Iterable[str]) -> None:
+        self.phrases: List[str] = list(phrases)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for char in phrase:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                    self._goto[state][char] = nxt
+                state = nxt
+            self._out[state].add(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        """Indices of the phrases occurring in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        # Empty phrases match any text
+        found |= out[0]
+        return found
+
+
+class SharedTextCache:
+    """OCR text keyed by region and pixel digest, shared between monitors."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Region, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, region: Region, digest: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get((region, digest))
+            if text is not None:
+                self._entries.move_to_end((region, digest))
+            return text
+
+    def put(self, region: Region, digest: str, text: str) -> None:
+        with self._lock:
+            self._entries[(region, digest)] = text
+            self._entries.move_to_end((region, digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+shared_text_cache = SharedTextCache()
+
+
+@dataclass
+class TickTiming:
+    """What one monitor tick did and how long it took (milliseconds)."""
+    total_ms: float = 0.0
+    capture_ms: float = 0.0
+    ocr_ms: float = 0.0
+    match_ms: float = 0.0
+    regions: int = 0
+    ocr_calls: int = 0
+    unchanged: int = 0
+    cache_hits: int = 0
+    fired: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _RegionWatch:
+    region: Region
+    keys: List[str]
+    automaton: PhraseAutomaton
+    digest: Optional[str] = None
+    matched: Set[str] = field(default_factory=set)
+
+
+def _normalize_region(region: Any) -> Region:
+    return tuple(region) if region is not None else None
+
+
+class TextStateMonitor:
+    """Watch screen regions for phrases and fire callbacks on appearance.
+
+    Parameters
+    ----------
+    callbacks : mapping
+        Phrase -> callback.  The mapping is read live, so callbacks added
+        or replaced later are picked up on the next tick.
+    region : tuple, optional
+        Default capture region for phrases without their own
+    regions : mapping, optional
+        Phrase -> sub-region for phrases that only appear in one place
+    capture : callable
+        ``capture(region)`` returning an image
+    extract_text : callable
+        ``extract_text(image)`` returning the OCR text
+    text_cache : SharedTextCache, optional
+        Cache shared with other monitors; ``None`` disables sharing
+    history : int
+        Number of tick timings kept for :meth:`tick_stats`
+    """
+
+    def __init__(
+        self,
+        callbacks: Mapping[str, Callable[[], None]],
+        *,
+        capture: Callable[[Region], Any],
+        extract_text: Callable[[Any], str],
+        region: Any = None,
+        regions: Optional[Mapping[str, Any]] = None,
+        text_cache: Optional[SharedTextCache] = shared_text_cache,
+        history: int = 256,
+    ) -> None:
+        self.callbacks = callbacks
+        self.region = region
+        self.regions: Dict[str, Any] = dict(regions or {})
+        self.capture = capture
+        self.extract_text = extract_text
+        self.text_cache = text_cache
+        self.present: Set[str] = set()
+        self.last_tick: Optional[TickTiming] = None
+        self.timings: deque = deque(maxlen=history)
+        self._watches: List[_RegionWatch] = []
+        self._signature: Optional[tuple] = None
+
+    def _current_signature(self) -> tuple:
+        return (tuple(self.callbacks), _normalize_region(self.region),
+                tuple(sorted((k, _normalize_region(r)) for k, r in self.regions.items())))
+
+    def _compile(self) -> None:
+        groups: Dict[Region, List[str]] = {}
+        for key in self.callbacks:
+            region = _normalize_region(self.regions.get(key, self.region))
+            groups.setdefault(region, []).append(key)
+        self._watches = [
+            _RegionWatch(region, keys, PhraseAutomaton(key.lower() for key in keys))
+            for region, keys in groups.items()
+        ]
+        self.present &= set(self.callbacks)
+        self._signature = self._current_signature()
+
+    def reset(self) -> None:
+        """Forget seen pixels and present phrases, so the next tick re-fires."""
+        self.present.clear()
+        for watch in self._watches:
+            watch.digest = None
+            watch.matched = set()
+
+    def _read_region(self, watch: _RegionWatch, timing: TickTiming) -> Optional[str]:
+        """OCR text for ``watch``'s region, or ``None`` if the pixels are unchanged."""
+        start = time.perf_counter()
+        image = self.capture(watch.region)
+        captured = time.perf_counter()
+        timing.capture_ms += (captured - start) * 1000
+
+        digest = frame_digest(image)
+        if digest is not None and digest == watch.digest:
+            timing.unchanged += 1
+            return None
+        watch.digest = digest
+
+        text = None
+        if digest is not None and self.text_cache is not None:
+            text = self.text_cache.get(watch.region, digest)
+            if text is not None:
+                timing.cache_hits += 1
+        if text is None:
+            text = self.extract_text(image) or ""
+            timing.ocr_calls += 1
+            if digest is not None and self.text_cache is not None:
+                self.text_cache.put(watch.region, digest, text)
+        timing.ocr_ms += (time.perf_counter() - captured) * 1000
+        return text
+
+    def tick(self) -> TickTiming:
+        """Check every region once and fire callbacks for newly seen phrases."""
+        start = time.perf_counter()
+        if self._signature != self._current_signature():
+            self._compile()
+
+        timing = TickTiming(regions=len(self._watches))
+        for watch in self._watches:
+            text = self._read_region(watch, timing)
+            if text is None:
+                continue
+            match_start = time.perf_counter()
+            watch.matched = {watch.keys[i] for i in watch.automaton.find(text.lower())}
+            timing.match_ms += (time.perf_counter() - match_start) * 1000
+
+        present: Set[str] = set()
+        for watch in self._watches:
+            present |= watch.matched
+        appeared = [key for key in self.callbacks if key in present and key not in self.present]
+        self.present = present
+
+        for key in appeared:
+            callback = self.callbacks.get(key)
+            if callback is not None:
+                timing.fired.append(key)
+                callback()
+
+        timing.total_ms = (time.perf_counter() - start) * 1000
+        self.last_tick = timing
+        self.timings.append(timing)
+        return timing
+
+    def tick_stats(self) -> Dict[str, float]:
+        """Summary of recent tick timings and how often OCR was skipped."""
+        ticks = list(self.timings)
+        if not ticks:
+            return {"ticks": 0}
+        totals = sorted(t.total_ms for t in ticks)
+        regions = sum(t.regions for t in ticks)
+        return {
+            "ticks": len(ticks),
+            "mean_ms": round(sum(totals) / len(totals), 3),
+            "p95_ms": round(totals[min(len(totals) - 1, int(0.95 * len(totals)))], 3),
+            "max_ms": round(totals[-1], 3),
+            "ocr_ms": round(sum(t.ocr_ms for t in ticks), 3),
+            "ocr_calls": sum(t.ocr_calls for t in ticks),
+            "ocr_skip_rate": round(1 - sum(t.ocr_calls for t in ticks) / regions, 4) if regions else 0.0,
+        }
+
+
+__all__ = [
+    "PhraseAutomaton",
+    "SharedTextCache",
+    "TextStateMonitor",
+    "TickTiming",
+    "frame_digest",
+    "shared_text_cache",
+]
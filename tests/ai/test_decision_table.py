@@ -0,0 +1,90 @@
+import importlib
+import random
+import sys
+
+import pytest
+
+from ai.combat import CombatRunner, evaluate_state
+from ai.combat import strategies
+
+# conftest stubs numpy; the decision table needs the real library
+_stub = sys.modules.pop("numpy", None)
+try:
+    np = pytest.importorskip("numpy")
+    sys.modules.pop("ai.combat.decision_table", None)
+    decision_table = importlib.import_module("ai.combat.decision_table")
+finally:
+    if _stub is not None:
+        sys.modules["numpy"] = _stub
+
+CompiledEvaluator = decision_table.CompiledEvaluator
+
+
+def _states(count, seed=47):
+    rng = random.Random(seed)
+    players, targets, behaviors, recent = [], [], [], []
+    for _ in range(count):
+        player = {"hp": rng.choice([0, 19, 20, 29, 30, 34, 35, 49, 50, rng.randint(0, 100)])}
+        if rng.random() < 0.5:
+            player["healing_items"] = rng.choice([0, 1, 2])
+        elif rng.random() < 0.7:
+            player["has_heal"] = rng.random() < 0.5
+        if rng.random() < 0.4:
+            player["buffed"] = rng.random() < 0.5
+        if rng.random() < 0.4:
+            player["is_buffed"] = rng.random() < 0.5
+        players.append(player)
+        targets.append({} if rng.random() < 0.1 else {"hp": rng.choice([0, 19, 20, rng.randint(-5, 100)])})
+        behaviors.append(rng.choice(["aggressive", "Defensive", "tactical", "unknown"]))
+        recent.append([rng.choice(["heal", "buff", "attack", "idle"]) for _ in range(rng.randint(0, 3))])
+    return players, targets, behaviors, recent
+
+
+def test_batch_matches_evaluate_state():
+    players, targets, behaviors, recent = _states(2000)
+
+    decisions = CompiledEvaluator().evaluate_batch(players, targets, behaviors, recent)
+
+    expected = [
+        evaluate_state(p, t, behavior=b, recent_actions=r)
+        for p, t, b, r in zip(players, targets, behaviors, recent)
+    ]
+    assert decisions == expected
+
+
+def test_strategy_flags_match_predicates():
+    players, targets, behaviors, recent = _states(500, seed=3)
+    flags = CompiledEvaluator().strategy_flags(decision_table.feature_matrix(players, targets))
+
+    for name in ("should_heal", "should_retreat"):
+        expected = [bool(getattr(strategies, name)(p)) for p in players]
+        assert flags[name].tolist() == expected
+    for name in ("should_attack", "should_buff", "should_idle"):
+        expected = [bool(getattr(strategies, name)(p, t)) for p, t in zip(players, targets)]
+        assert flags[name].tolist() == expected
+
+
+def test_tick_advances_runners_like_combat_runner():
+    players, targets, _, _ = _states(60, seed=11)
+    behaviors = ["tactical", "aggressive", "defensive"] * 4
+    batch = [CombatRunner(behavior=b) for b in behaviors]
+    single = [CombatRunner(behavior=b) for b in behaviors]
+    evaluator = CompiledEvaluator()
+
+    for step in range(5):
+        p = players[step * 12:(step + 1) * 12]
+        t = targets[step * 12:(step + 1) * 12]
+        decisions = evaluator.tick(batch, p, t)
+        assert decisions == [runner.tick(pl, tg) for runner, pl, tg in zip(single, p, t)]
+    assert [r.recent_actions for r in batch] == [r.recent_actions for r in single]
+    assert [r.last_action for r in batch] == [r.last_action for r in single]
+
+
+def test_rules_compile_to_half_open_bounds():
+    table = decision_table.DecisionTable([
+        decision_table.Rule("low", (("hp", "<=", 30),)),
+        decision_table.Rule("mid", (("hp", ">", 30), ("hp", "<", 60))),
+    ], features=("hp",), default="high")
+    X = np.array([[30.0], [30.5], [60.0]])
+
+    assert [table.actions[c] for c in table.decide(X)] == ["low", "mid", "high"]
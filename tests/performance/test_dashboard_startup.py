@@ -0,0 +1,26 @@
+"""Startup benchmark for the dashboard: optional subsystems stay unimported."""
+
+import pytest
+
+pytest.importorskip("flask")
+
+from perf.import_profiler import benchmark_startup, profile_imports
+
+# Subsystems the dashboard only needs once a handler uses them
+DEFERRED_PACKAGES = {"core", "optimizer", "tracking", "profiles"}
+
+
+def test_dashboard_import_defers_optional_subsystems():
+    profile = profile_imports("dashboard.app")
+    imported = {record.module for record in profile.records}
+
+    assert "dashboard.app" in imported
+    # Availability checks may import the (cheap) parent packages, never submodules
+    assert not [m for m in imported if "." in m and m.split(".")[0] in DEFERRED_PACKAGES]
+
+
+def test_dashboard_startup_benchmark():
+    result = benchmark_startup("dashboard.app", runs=2)
+
+    assert result["runs"] == 2
+    assert result["min_ms"] <= result["median_ms"] <= result["max_ms"]
@@ -0,0 +1,90 @@
+"""Tests for the fixed-bucket latency histograms used by the profiler."""
+
+import json
+import threading
+
+from perf.latency_histogram import (
+    HistogramRegistry,
+    LatencyHistogram,
+    bucket_bounds,
+    bucket_index,
+)
+
+
+class TestBuckets:
+    def test_bucket_bounds_contain_value(self):
+        for value in [0, 1, 31, 32, 33, 63, 64, 1000, 12345, 10_000_000]:
+            lower, upper = bucket_bounds(bucket_index(value))
+            assert lower <= value <= upper
+
+    def test_relative_error_is_bounded(self):
+        for value in [100, 5_000, 250_000, 3_000_000]:
+            lower, upper = bucket_bounds(bucket_index(value))
+            assert (upper - lower) / value < 0.07
+
+
+class TestLatencyHistogram:
+    def test_percentiles_follow_distribution(self):
+        hist = LatencyHistogram("ocr")
+        for _ in range(980):
+            hist.record(0.010)
+        for _ in range(20):
+            hist.record(0.500)
+
+        snap = hist.snapshot()
+        assert snap["count"] == 1000
+        assert abs(snap["percentiles"]["p50"] - 0.010) < 0.001
+        assert abs(snap["percentiles"]["p99"] - 0.500) < 0.02
+        assert snap["max_seconds"] == 0.5
+
+    def test_rolling_window_drops_old_samples(self):
+        hist = LatencyHistogram("frame", window_seconds=10, num_windows=3)
+        hist.record(1.0, now=0)
+        hist.record(0.001, now=100)
+
+        rolling = hist.snapshot(window_seconds=30, now=100)
+        assert rolling["count"] == 1
+        assert hist.snapshot()["count"] == 2
+
+    def test_percentiles_stay_within_observed_samples(self):
+        hist = LatencyHistogram("clamp", window_seconds=10)
+        for value in (0.6059, 0.6399, 0.6560):
+            hist.record(value, now=5)
+
+        for snap in (hist.snapshot(), hist.snapshot(window_seconds=10, now=5)):
+            assert snap["max_seconds"] == 0.656
+            assert all(0.6059 <= v <= snap["max_seconds"] for v in snap["percentiles"].values())
+
+    def test_records_from_many_threads(self):
+        hist = LatencyHistogram("threads")
+
+        def worker():
+            for _ in range(500):
+                hist.record(0.002)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert hist.snapshot()["count"] == 2000
+
+
+class TestExporters:
+    def test_prometheus_summary(self):
+        registry = HistogramRegistry()
+        registry.record("ocr", 0.02)
+        text = registry.to_prometheus()
+
+        assert "# TYPE ms11_latency_seconds summary" in text
+        assert 'ms11_latency_seconds{name="ocr",quantile="0.99"}' in text
+        assert 'ms11_latency_seconds_count{name="ocr"} 1' in text
+
+    def test_json_export(self):
+        registry = HistogramRegistry()
+        registry.record("ocr", 0.02)
+        data = json.loads(registry.to_json())
+
+        assert data["lifetime"]["ocr"]["count"] == 1
+        assert data["rolling"]["ocr"]["count"] == 1
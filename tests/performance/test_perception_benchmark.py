@@ -0,0 +1,139 @@
+"""Tests for the replay-driven perception benchmark harness."""
+
+import importlib
+import sys
+
+import pytest
+
+# conftest stubs numpy; replay frames need the real library
+_stub = sys.modules.pop("numpy", None)
+try:
+    np = pytest.importorskip("numpy")
+    sys.modules.pop("perf.perception_benchmark", None)
+    bench = importlib.import_module("perf.perception_benchmark")
+finally:
+    if _stub is not None:
+        sys.modules["numpy"] = _stub
+
+
+def _frames(count=3):
+    frames = []
+    for index in range(count):
+        image = np.full((120, 160, 3), index, dtype=np.uint8)
+        frames.append(bench.ReplayFrame(f"f{index}", image, f"Health: {100 + index}/500"))
+    return frames
+
+
+class ReadsRegions(bench.Scenario):
+    name = "reads_regions"
+
+    def setup(self):
+        import pyautogui
+        import pytesseract
+        from PIL import ImageGrab
+
+        self.backends = (pyautogui, ImageGrab, pytesseract)
+        self.seen = []
+
+    def run_frame(self, frame):
+        pyautogui, image_grab, pytesseract = self.backends
+        region = np.asarray(pyautogui.screenshot(region=(10, 20, 30, 40)))
+        box = np.asarray(image_grab.grab(bbox=(0, 0, 5, 8)))
+        text = pytesseract.image_to_string(region, config="--psm 7 -c tessedit_char_whitelist=0123456789/")
+        words = pytesseract.image_to_data(region, output_type=pytesseract.Output.DICT)["text"]
+        self.seen.append((frame.name, region.shape, box.shape, int(region[0, 0, 0]), text, words))
+
+
+class Unavailable(bench.Scenario):
+    name = "unavailable"
+
+    def setup(self):
+        raise ImportError("needs a game client")
+
+
+def test_replay_serves_frames_and_counts_stages():
+    import pyautogui
+    import pytesseract
+
+    original_screenshot = pyautogui.screenshot
+    scenario = ReadsRegions()
+
+    result = bench.run_scenario(scenario, _frames(), loops=2, warmup=1)
+
+    assert result["frames"] == 6 and result["errors"] == 0
+    assert result["captures"] == 12 and result["ocr_calls"] == 12
+    assert result["ocr_calls_per_frame"] == 2.0
+    assert result["fps"] > 0
+    assert set(result["stages"]) == {"capture", "ocr", "parse", "frame"}
+    assert all(row["p99_ms"] >= row["p50_ms"] for row in result["stages"].values())
+
+    # warmup frame f0, then f0..f2 twice; crops follow region/bbox geometry
+    assert [seen[0] for seen in scenario.seen] == ["f0", "f0", "f1", "f2", "f0", "f1", "f2"]
+    name, region, box, pixel, text, words = scenario.seen[2]
+    assert (region, box, pixel) == ((40, 30, 3), (8, 5, 3), 1)
+    assert text == " 101/500"
+    assert words == ["Health:", "101/500"]
+
+    # backends are restored afterwards
+    assert pyautogui.screenshot is original_screenshot
+    assert not hasattr(pytesseract, "Output")
+    assert "PIL.ImageGrab" not in sys.modules
+
+
+def test_simulated_ocr_latency_and_skipped_scenarios():
+    result = bench.run_benchmark(_frames(2), [ReadsRegions(), Unavailable()], loops=1,
+                                 ocr_latency=0.005)
+
+    ran, skipped = result["scenarios"]
+    assert ran["stages"]["ocr"]["p50_ms"] >= 9.0  # two calls per frame
+    assert skipped["skipped"] == "needs a game client"
+    report = bench.format_report(result)
+    assert "reads_regions: 2 frames" in report and "unavailable: skipped" in report
+
+
+def test_load_scenario_by_name_or_path():
+    assert isinstance(bench.load_scenario("damage_parser"), bench.DamageParserScenario)
+    assert isinstance(bench.load_scenario("perf.perception_benchmark:StatPanelScenario"),
+                      bench.StatPanelScenario)
+    with pytest.raises(KeyError):
+        bench.load_scenario("nope")
+
+
+class FailsOnSecondFrame(bench.Scenario):
+    name = "fails_on_second_frame"
+
+    def run_frame(self, frame):
+        if frame.name == "f1":
+            raise ValueError(f"unreadable frame {frame.name}")
+
+
+def test_scenario_errors_keep_the_first_traceback():
+    result = bench.run_benchmark(_frames(), [FailsOnSecondFrame()], loops=2)
+
+    failed = result["scenarios"][0]
+    assert failed["errors"] == 2
+    assert "ValueError: unreadable frame f1" in failed["first_error"]
+    report = bench.format_report(result)
+    assert "first error:" in report and "    ValueError: unreadable frame f1" in report
+
+
+def test_modules_bound_to_stand_ins_are_reloaded_next_run(tmp_path, monkeypatch):
+    (tmp_path / "bench_probe_capture.py").write_text(
+        "from PIL import ImageGrab\n\n\ndef grab():\n    return ImageGrab.grab(bbox=(0, 0, 5, 8))\n")
+    (tmp_path / "bench_probe_user.py").write_text("from bench_probe_capture import grab\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    class GrabsViaModule(bench.Scenario):
+        name = "grabs_via_module"
+
+        def setup(self):
+            from bench_probe_user import grab
+            self.grab = grab
+
+        def run_frame(self, frame):
+            return np.asarray(self.grab()).shape
+
+    for _ in range(2):
+        result = bench.run_scenario(GrabsViaModule(), _frames(2))
+        assert (result["errors"], result["first_error"]) == (0, None)
+    assert "bench_probe_capture" not in sys.modules and "bench_probe_user" not in sys.modules
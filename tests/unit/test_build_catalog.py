@@ -0,0 +1,147 @@
+"""Tests for the public build catalog."""
+
+import json
+
+import pytest
+
+from api.build_catalog import BuildCatalog
+
+
+def write_build(builds_dir, name, **overrides):
+    build = {
+        "player_name": name,
+        "character_name": "Char",
+        "server": "Basilisk",
+        "faction": "Rebel",
+        "gcw_rank": 5,
+        "professions": {"primary": "Rifleman"},
+        "weapons": [{"name": "T21", "damage_type": "Energy"}],
+        "build_summary": f"{name} ranged build",
+        "performance_metrics": {"pve_rating": 8.0},
+        "tags": ["pve"],
+        "visibility": "public",
+        "rankings": ["top_dps"],
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-01T00:00:00",
+        "views": 0,
+        "likes": 0,
+    }
+    build.update(overrides)
+    path = builds_dir / f"{name}_Char.json"
+    path.write_text(json.dumps(build), encoding="utf-8")
+    return path
+
+
+def test_sync_parses_only_changed_files(tmp_path):
+    write_build(tmp_path, "Alpha")
+    write_build(tmp_path, "Beta", faction="Imperial")
+    catalog = BuildCatalog(tmp_path / "catalog.db")
+
+    assert catalog.sync_directory(tmp_path) == 2
+    assert catalog.sync_directory(tmp_path) == 0
+
+    (tmp_path / "Beta_Char.json").unlink()
+    catalog.sync_directory(tmp_path)
+    assert [b["build_id"] for b in catalog.search()] == ["Alpha_Char"]
+
+
+def test_search_filters(tmp_path):
+    write_build(tmp_path, "Alpha")
+    write_build(tmp_path, "Beta", faction="Imperial", tags=["pvp"],
+                professions={"primary": "Smuggler"},
+                performance_metrics={"pve_rating": 2.0})
+    catalog = BuildCatalog(tmp_path / "catalog.db")
+    catalog.sync_directory(tmp_path)
+
+    def ids(**filters):
+        return [b["build_id"] for b in catalog.search(**filters)]
+
+    assert ids(faction="imperial") == ["Beta_Char"]
+    assert ids(profession="rifleman") == ["Alpha_Char"]
+    assert ids(damage_type="energy") == ["Alpha_Char", "Beta_Char"]
+    assert ids(tags=["PVP", "other"]) == ["Beta_Char"]
+    assert ids(pve_pvp="pve") == ["Alpha_Char"]
+    assert ids(query="BETA ranged") == ["Beta_Char"]
+    assert ids(query="100%") == []
+    assert catalog.search(faction="rebel")[0]["professions"] == ["Rifleman"]
+
+
+def test_counters_are_batched(tmp_path):
+    write_build(tmp_path, "Alpha")
+    write_build(tmp_path, "Beta")
+    catalog = BuildCatalog(tmp_path / "catalog.db", flush_threshold=3)
+    catalog.sync_directory(tmp_path)
+    before = (tmp_path / "Alpha_Char.json").read_text(encoding="utf-8")
+
+    catalog.add_counts("Beta_Char", views=1)
+    catalog.add_counts("Beta_Char", likes=1)
+    assert catalog.counters("Beta_Char") == (1, 1)
+    row = catalog.connection().execute(
+        "SELECT views FROM builds WHERE build_id = 'Beta_Char'"
+    ).fetchone()
+    assert row["views"] == 0
+
+    catalog.add_counts("Alpha_Char", views=1)
+    assert catalog.connection().execute(
+        "SELECT views FROM builds WHERE build_id = 'Beta_Char'"
+    ).fetchone()["views"] == 1
+    assert [b["build_id"] for b in catalog.search(order_by="popularity")] == ["Beta_Char", "Alpha_Char"]
+    assert (tmp_path / "Alpha_Char.json").read_text(encoding="utf-8") == before
+
+    stats = catalog.statistics()
+    assert stats["total_builds"] == 2
+    assert stats["most_liked"][0]["id"] == "Beta_Char"
+
+
+def test_flushed_counters_are_written_back(tmp_path):
+    write_build(tmp_path, "Alpha")
+    written = []
+    catalog = BuildCatalog(tmp_path / "catalog.db", flush_threshold=10, write_back=written.append)
+    catalog.sync_directory(tmp_path)
+
+    catalog.add_counts("Alpha_Char", views=1)
+    catalog.add_counts("Alpha_Char", likes=1)
+    assert written == []
+    assert catalog.flush() == 1
+    assert written == [{"Alpha_Char": (1, 1)}]
+    assert catalog.flush() == 0 and len(written) == 1
+
+
+def test_counters_flush_after_the_interval(tmp_path):
+    write_build(tmp_path, "Alpha")
+    catalog = BuildCatalog(tmp_path / "catalog.db", flush_threshold=100, flush_interval=0)
+    catalog.sync_directory(tmp_path)
+
+    catalog.add_counts("Alpha_Char", views=1)
+    assert catalog.connection().execute(
+        "SELECT views FROM builds WHERE build_id = 'Alpha_Char'"
+    ).fetchone()["views"] == 1
+
+
+def test_browser_persists_counters_to_build_files(tmp_path):
+    pytest.importorskip("flask")
+    from api.public_build_browser import PublicBuildBrowser
+
+    write_build(tmp_path, "Alpha", skills={}, stats={}, armor={}, tapes=[],
+                resists={}, comments=[])
+    write_build(tmp_path, "Beta", skills={}, stats={}, armor={}, tapes=[],
+                resists={}, comments=[])
+    browser = PublicBuildBrowser(builds_dir=str(tmp_path), cache_size=1)
+    browser.get_build("Beta_Char")
+    assert [b.player_name for b in browser.get_all_builds()] == ["Alpha", "Beta"]
+    assert list(browser.builds) == ["Beta_Char"]  # listing does not evict the LRU
+
+    browser.like_build("Alpha_Char")
+    browser.increment_views("Alpha_Char")
+    browser.flush_counters()
+    document = json.loads((tmp_path / "Alpha_Char.json").read_text(encoding="utf-8"))
+    assert (document["views"], document["likes"]) == (1, 1)
+    assert document["updated_at"] > "2025-01-01T00:00:00"
+    assert browser.catalog.sync_directory(tmp_path) == 0
+
+    # The build files alone rebuild the counters
+    for path in tmp_path.glob("build_catalog.db*"):
+        path.unlink()
+    reopened = PublicBuildBrowser(builds_dir=str(tmp_path))
+    alpha = reopened.get_build("Alpha_Char")
+    assert (alpha.views, alpha.likes) == (1, 1)
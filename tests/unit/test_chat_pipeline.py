@@ -0,0 +1,185 @@
+"""Tests for the asynchronous chat ingestion pipeline."""
+
+import asyncio
+import logging
+import socket
+import time
+
+from network.chat_pipeline import ChatParser, ChatPipeline, ReplaySource, SocketSource, TailSource
+from network.chat_pipeline import _ThreadedReader
+
+LINES = [
+    "[12:00:01] [Guild] Kessa: krayt run tonight?",
+    "Durn tells you: are you there?",
+    "[Whisper from Vyl]: need a heal",
+    "<Oriana whispers>: hi",
+    "[Spatial] Tam: selling stims",
+    "You gain 120 experience.",
+    "[12:00:05] [System] Server restart in 10 minutes.",
+]
+
+
+def test_parser_extracts_channel_and_sender():
+    events = [ChatParser().parse(line) for line in LINES]
+
+    assert [(e.channel, e.sender) for e in events] == [
+        ("guild", "Kessa"),
+        ("whisper", "Durn"),
+        ("whisper", "Vyl"),
+        ("whisper", "Oriana"),
+        ("spatial", "Tam"),
+        ("system", None),
+        ("system", None),
+    ]
+    assert events[0].message == "krayt run tonight?"
+    assert events[0].log_time == "12:00:01"
+    assert events[6].message == "Server restart in 10 minutes."
+
+
+def test_batches_keep_order_and_filter_channels():
+    received, whispers = [], []
+    pipeline = ChatPipeline([ReplaySource(LINES, repeat=30)])
+    pipeline.subscribe(lambda batch: received.append(batch), batch_size=16)
+    pipeline.subscribe(lambda batch: whispers.extend(batch), channels=["whisper"])
+
+    asyncio.run(pipeline.run())
+
+    assert [e.raw for batch in received for e in batch] == LINES * 30
+    assert max(len(batch) for batch in received) <= 16
+    assert len(whispers) == 3 * 30 and all(e.is_whisper for e in whispers)
+    assert pipeline.stats()["lines"] == len(LINES) * 30
+
+
+def test_slow_subscriber_drops_instead_of_stalling_others():
+    fast = []
+    pipeline = ChatPipeline([ReplaySource(LINES, repeat=100)])
+
+    async def record(batch):
+        fast.extend(batch)
+
+    pipeline.subscribe(record, name="fast")
+    slow = pipeline.subscribe(lambda batch: time.sleep(0.05), name="slow", maxsize=5, batch_size=5,
+                              overflow="drop_oldest")
+
+    started = time.perf_counter()
+    asyncio.run(pipeline.run())
+
+    assert len(fast) == len(LINES) * 100
+    assert slow.dropped > 0
+    assert slow.delivered + slow.dropped == len(LINES) * 100
+    assert time.perf_counter() - started < 2.0
+
+
+def test_tail_source_follows_appended_lines(tmp_path):
+    log = tmp_path / "chat.log"
+    log.write_text("[Guild] Kessa: old line\n")
+    received = []
+
+    async def scenario():
+        source = TailSource(log, poll_interval=0.01)
+        pipeline = ChatPipeline([source])
+        pipeline.subscribe(lambda batch: received.extend(batch), batch_timeout=0.01)
+        task = asyncio.ensure_future(pipeline.run())
+        await asyncio.sleep(0.05)
+        with open(log, "a") as handle:
+            handle.write("Durn tells you: new line\n[Group] Tam: par")
+            handle.flush()
+            await asyncio.sleep(0.05)
+            handle.write("tial line\n")
+        await asyncio.sleep(0.1)
+        pipeline.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+
+    assert [(e.channel, e.message) for e in received] == [("whisper", "new line"), ("group", "partial line")]
+
+
+def test_socket_source_reads_clients():
+    received = []
+
+    async def scenario():
+        source = SocketSource(port=0)
+        pipeline = ChatPipeline([source])
+        pipeline.subscribe(lambda batch: received.extend(batch), batch_timeout=0.01)
+        await source.start()
+        task = asyncio.ensure_future(pipeline.run())
+        _, writer = await asyncio.open_connection("127.0.0.1", source.port)
+        writer.write("[Guild] Kessa: hello\nVyl tells you: psst\n".encode())
+        await writer.drain()
+        writer.close()
+        await asyncio.sleep(0.1)
+        pipeline.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+
+    assert [e.sender for e in received] == ["Kessa", "Vyl"]
+
+
+def test_stop_from_another_thread_ends_blocked_sources():
+    class Endless(_ThreadedReader):
+        name = "endless"
+
+        def __init__(self):
+            super().__init__(lambda: "[Guild] Kessa: spam", maxsize=1)
+
+    socket_source = SocketSource(port=0, maxsize=1)
+    pipeline = ChatPipeline([Endless(), socket_source])
+    pipeline.subscribe(lambda batch: time.sleep(0.01), maxsize=1, batch_size=1)
+    thread = pipeline.start_in_thread()
+    deadline = time.monotonic() + 2
+    while socket_source._server is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    client = socket.create_connection(("127.0.0.1", socket_source.port))
+    client.sendall(b"Vyl tells you: psst\n" * 100)
+    time.sleep(0.2)
+
+    pipeline.stop()  # both hand-off queues are full here
+    thread.join(2)
+    client.close()
+
+    assert not thread.is_alive()
+    assert pipeline.lines_read > 0
+
+
+def test_failing_subscriber_is_logged(caplog):
+    def explode(batch):
+        raise RuntimeError("boom")
+
+    pipeline = ChatPipeline([ReplaySource(LINES)])
+    failing = pipeline.subscribe(explode, name="explode", batch_size=len(LINES))
+    with caplog.at_level(logging.ERROR, logger="network.chat_pipeline"):
+        asyncio.run(pipeline.run())
+
+    assert failing.errors == 1
+    assert "Chat subscriber explode failed" in caplog.text
+    assert "RuntimeError: boom" in caplog.text
+
+
+def test_subscriber_added_while_running_gets_later_events():
+    source = SocketSource(port=0)
+    pipeline = ChatPipeline([source])
+    early, late_events = [], []
+    pipeline.subscribe(lambda batch: early.extend(batch), batch_timeout=0.01)
+    thread = pipeline.start_in_thread()
+    deadline = time.monotonic() + 2
+    while source._server is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    late = pipeline.subscribe(lambda batch: late_events.extend(batch), name="late", batch_timeout=0.01)
+    while late._queue is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    client = socket.create_connection(("127.0.0.1", source.port))
+    client.sendall(b"[Guild] Kessa: hello\nVyl tells you: psst\n")
+    while len(late_events) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert thread.is_alive()
+    pipeline.stop()
+    thread.join(2)
+    client.close()
+
+    assert not thread.is_alive()
+    assert [e.sender for e in late_events] == [e.sender for e in early] == ["Kessa", "Vyl"]
+    assert pipeline.stats()["subscribers"]["late"]["delivered"] == 2
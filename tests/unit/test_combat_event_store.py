@@ -0,0 +1,78 @@
+"""Tests for the columnar combat event store and its session manager use."""
+
+from modules.combat_metrics.combat_logger import CombatLogger, CombatEventType
+from modules.combat_metrics.event_store import (
+    ColumnarEventStore,
+    read_footer,
+    session_file_name,
+)
+from modules.combat_metrics.session_manager import CombatSessionManager
+
+
+def _run_session(logs_dir, session_id="s1", columnar=True):
+    combat = CombatLogger(str(logs_dir), columnar=columnar)
+    combat.start_session(session_id)
+    combat.log_ability_use("headshot", target="stormtrooper", damage_dealt=400, damage_type="kinetic")
+    combat.log_ability_use("headshot", target="stormtrooper", damage_dealt=350)
+    combat.log_ability_use("burst", target="trooper", damage_dealt=100, success=False)
+    combat.log_enemy_kill("stormtrooper", xp_gained=255)
+    combat.end_session()
+    return combat
+
+
+def test_columns_are_dictionary_encoded(tmp_path):
+    combat = CombatLogger(str(tmp_path), columnar=True)
+    combat.start_session("s1")
+    combat.log_ability_use("headshot", target="stormtrooper", damage_dealt=400)
+    combat.log_ability_use("headshot", target="stormtrooper", damage_dealt=350)
+    store = combat.event_store
+
+    assert len(store) == 3  # session start + two ability uses
+    assert store.strings.count("headshot") == 1
+    assert store.ability_usage() == {"headshot": 2}
+    assert store.damage_by_ability() == {"headshot": 750}
+    assert store.count(CombatEventType.ABILITY_USE) == 2
+
+
+def test_default_writes_only_the_indented_json(tmp_path):
+    combat = _run_session(tmp_path, columnar=False)
+
+    assert combat.event_store is None
+    assert not (tmp_path / session_file_name("s1")).exists()
+    text = (tmp_path / "combat_stats_s1.json").read_text()
+    assert text.startswith('{\n  "session_id": "s1"')
+
+
+def test_round_trip_through_binary_file(tmp_path):
+    _run_session(tmp_path)
+    path = tmp_path / session_file_name("s1")
+
+    footer = read_footer(path)
+    assert footer["rows"] == 6
+    assert footer["summary"]["total_damage_dealt"] == 850
+    assert footer["summary"]["abilities_used"] == {"headshot": 2, "burst": 1}
+
+    store = ColumnarEventStore.read(path)
+    events = list(store.iter_events())
+    assert events[1].ability_name == "headshot"
+    assert events[1].damage_type == "kinetic"
+    assert events[3].success is False
+    assert events[4].enemy_type == "stormtrooper"
+    assert events[0].damage_dealt is None
+
+
+def test_session_manager_reads_footers_only(tmp_path):
+    _run_session(tmp_path, "s1")
+    _run_session(tmp_path, "s2")
+    (tmp_path / "combat_stats_s1.json").unlink()
+    (tmp_path / "combat_stats_s2.json").write_text("not json")
+
+    manager = CombatSessionManager(str(tmp_path))
+
+    assert {s.session_id for s in manager.get_recent_sessions()} == {"s1", "s2"}
+    assert manager.sessions == {}
+    assert "burst" in manager.find_dead_skills(threshold=0.4)
+
+    session = manager.load_session("s1")
+    assert session["total_damage_dealt"] == 850
+    assert len(session["events"]) == 6
@@ -0,0 +1,65 @@
+"""Tests for lazy startup and the summary sidecar index of CombatSessionManager."""
+
+import json
+from datetime import datetime, timedelta
+
+from modules.combat_metrics import session_manager as sm
+from modules.combat_metrics.session_manager import CombatSessionManager
+
+
+def _write_session(logs_dir, session_id, damage=1000):
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    data = {
+        "session_id": session_id,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=10)).isoformat(),
+        "total_damage_dealt": damage,
+        "total_xp_gained": 500,
+        "kills": 3,
+        "deaths": 0,
+        "abilities_used": {"headshot": 4},
+        "targets_engaged": ["stormtrooper"],
+        "session_state": "completed",
+        "events": [{"event_type": "ability_use"}] * 50,
+    }
+    (logs_dir / f"combat_stats_{session_id}.json").write_text(json.dumps(data))
+
+
+def test_startup_uses_sidecar_index(tmp_path, monkeypatch):
+    for i in range(3):
+        _write_session(tmp_path, f"s{i}")
+
+    first = CombatSessionManager(str(tmp_path))
+    assert len(first.session_summaries) == 3
+    assert first.sessions == {}
+    assert (tmp_path / sm.SESSION_INDEX_FILE).exists()
+
+    reads = []
+    original = CombatSessionManager._read_summary_data
+    monkeypatch.setattr(
+        CombatSessionManager,
+        "_read_summary_data",
+        lambda self, path: reads.append(path.name) or original(self, path),
+    )
+
+    second = CombatSessionManager(str(tmp_path))
+    assert reads == []
+    assert second.get_session_summary("s1").total_damage_dealt == 1000
+
+    _write_session(tmp_path, "s3")
+    _write_session(tmp_path, "s1", damage=12345)
+    third = CombatSessionManager(str(tmp_path))
+    assert sorted(reads) == ["combat_stats_s1.json", "combat_stats_s3.json"]
+    assert third.get_session_summary("s1").total_damage_dealt == 12345
+
+
+def test_full_payloads_load_on_demand_into_bounded_cache(tmp_path):
+    for i in range(4):
+        _write_session(tmp_path, f"s{i}")
+
+    manager = CombatSessionManager(str(tmp_path), max_cached_sessions=2)
+    for i in range(4):
+        assert len(manager.load_session(f"s{i}")["events"]) == 50
+
+    assert list(manager.sessions) == ["s2", "s3"]
+    assert manager.compare_sessions(["s0", "s1"])["sessions_compared"] == 2
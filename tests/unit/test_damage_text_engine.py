@@ -0,0 +1,117 @@
+"""Tests for the single-pass damage extraction engine."""
+
+import importlib
+import sys
+
+import pytest
+
+
+# conftest stubs numpy and cv2 for modules that only need them importable;
+# this engine needs the real libraries, so import it with them and then
+# put the stubs back for the rest of the suite.
+_stubs = {name: sys.modules.pop(name, None) for name in ("numpy", "cv2")}
+try:
+    np = pytest.importorskip("numpy")
+    cv2 = pytest.importorskip("cv2")
+    sys.modules.pop("utils.damage_text_engine", None)
+    engine = importlib.import_module("utils.damage_text_engine")
+finally:
+    for name, stub in _stubs.items():
+        if stub is not None:
+            sys.modules[name] = stub
+
+DamageTextExtractor = engine.DamageTextExtractor
+ThresholdPreprocessor = engine.ThresholdPreprocessor
+
+
+class TestDamageTextExtractor:
+    def test_one_hit_per_number(self):
+        tokens = DamageTextExtractor(min_amount=10).extract("400 damage dealt to target")
+
+        assert len(tokens) == 1
+        token = tokens[0]
+        assert (token.amount, token.unit, token.target) == (400, "dealt", "target")
+        assert token.qualified
+
+    @pytest.mark.parametrize("text, unit, damage_type", [
+        ("183", None, None),
+        ("250 DMG", "dmg", None),
+        ("75 pt", "pts", None),
+        ("75 pts", "pts", None),
+        ("312 damage", "damage", None),
+        ("88 (heat)", None, "heat"),
+        ("88 damage (heat)", "damage", "heat"),
+    ])
+    def test_suffix_forms(self, text, unit, damage_type):
+        (token,) = DamageTextExtractor().extract(text)
+        assert token.unit == unit
+        assert token.damage_type == damage_type
+
+    def test_multiple_numbers_and_threshold(self):
+        tokens = DamageTextExtractor(min_amount=10).extract("You hit 5 times: 120 DMG, 64 pts and 9")
+        assert [t.amount for t in tokens] == [120, 64]
+
+    def test_large_hits_are_read_whole(self):
+        tokens = DamageTextExtractor().extract("Crit! 12500 damage, 1,048,576 dmg and 123456")
+        assert [(t.amount, t.unit) for t in tokens] == [(12500, "damage"), (1048576, "dmg"), (123456, None)]
+
+    def test_separators_only_group_thousands(self):
+        tokens = DamageTextExtractor().extract("hits of 100, 200 and 1,23")
+        assert [t.amount for t in tokens] == [100, 200, 1, 23]
+
+    def test_suffix_needs_word_boundary(self):
+        (token,) = DamageTextExtractor().extract("40 ptsx")
+        assert token.unit is None
+
+    def test_target_requires_separate_word(self):
+        (token,) = DamageTextExtractor().extract("400 total")
+        assert token.target is None
+
+
+class TestThresholdPreprocessor:
+    def _crop(self, shape=(60, 160, 3)):
+        image = np.zeros(shape, dtype=np.uint8)
+        cv2.putText(image, "400", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        return image
+
+    def test_binarizes_color_and_gray_input(self):
+        pre = ThresholdPreprocessor()
+        color = pre.process(self._crop()).copy()
+        gray = pre.process(cv2.cvtColor(self._crop(), cv2.COLOR_RGB2GRAY))
+
+        assert color.shape == (60, 160)
+        assert ((color == 0) | (color == 255)).all()
+        assert np.array_equal(color, gray)
+
+    def test_reuses_buffers_per_shape(self):
+        pre = ThresholdPreprocessor()
+        first = pre.process(self._crop())
+        second = pre.process(self._crop())
+        other = pre.process(self._crop((40, 100, 3)))
+
+        assert first is second
+        assert other is not first
+        assert len(pre._buffers) == 2
+
+    def test_enhancement_kernel_folds_contrast_into_sharpen(self):
+        kernel = engine.enhancement_kernel(2.0, 2.0)
+
+        # The sharpen blend sums to 1, so the kernel sums to the contrast gain
+        assert abs(float(kernel.sum()) - 2.0) < 1e-6
+        assert kernel[1, 1] > 2.0 and kernel[0, 0] < 0
+
+
+class TestColorClassification:
+    def test_region_is_classified_from_hsv_means(self):
+        image = np.zeros((20, 20, 3), dtype=np.uint8)
+        image[:, :] = [0, 0, 255]  # BGR red
+
+        means = engine.region_hsv_means(image, (0, 0, 20, 20))
+        assert engine.classify_damage_color(means) == "physical"
+
+    def test_grayscale_or_empty_region_is_unknown(self):
+        gray = np.zeros((20, 20), dtype=np.uint8)
+        assert engine.classify_damage_color(engine.region_hsv_means(gray, (0, 0, 20, 20))) == "unknown"
+
+        color = np.zeros((20, 20, 3), dtype=np.uint8)
+        assert engine.region_hsv_means(color, (30, 30, 5, 5)) is None
@@ -0,0 +1,129 @@
+"""Tests for deferred imports, lazy URL rules and the import-time profiler."""
+
+import sys
+
+import pytest
+
+from dashboard.lazy_imports import LazyImport, loaded_imports, module_available, resolve
+from perf.import_profiler import parse_importtime, ImportProfile
+
+
+def test_lazy_import_defers_until_first_use():
+    sys.modules.pop("colorsys", None)
+    hls = LazyImport("colorsys", "rgb_to_hls")
+
+    assert "colorsys" not in sys.modules
+    assert not hls.loaded
+    assert hls(1.0, 0.0, 0.0) == (0.0, 0.5, 1.0)
+    assert hls.loaded and "colorsys" in sys.modules
+
+
+def test_lazy_import_fallbacks_and_factories():
+    missing = LazyImport("ms11_no_such_module", "thing", fallback={"demo": True})
+    assert missing["demo"] is True
+    assert resolve(missing) == {"demo": True}
+
+    class Fallback:
+        pass
+
+    manager = LazyImport("ms11_no_such_module", "Manager", fallback=Fallback,
+                         factory=lambda cls: cls())
+    assert isinstance(resolve(manager), Fallback)
+
+    required = LazyImport("ms11_no_such_module", "Enum")
+    with pytest.raises(ImportError):
+        required("value")
+    with pytest.raises(ImportError):
+        LazyImport("json", "no_such_name").resolve()
+
+
+def test_lazy_import_supports_iteration_and_attributes():
+    Enum = LazyImport("enum", "Enum")
+    signals = LazyImport("signal", "Signals")
+    assert loaded_imports({"Enum": Enum, "signals": signals, "other": 1}) == {
+        "Enum": False, "signals": False
+    }
+
+    assert Enum.__name__ == "Enum"
+    assert any(member.name == "SIGINT" for member in signals)
+    assert loaded_imports({"Enum": Enum}) == {"Enum": True}
+
+
+def test_module_available_does_not_import():
+    sys.modules.pop("wave", None)
+    assert module_available("json", "wave")
+    assert "wave" not in sys.modules
+    assert not module_available("json", "ms11_no_such_module")
+    assert not module_available("ms11_no_such_package.child")
+
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       900 |        900 |   site
+--ms11-import-profile--
+import time:       300 |        300 |     json.scanner
+import time:       200 |        500 |   json
+import time:      1000 |       1000 |   flask
+import time:      4000 |       5500 | dashboard.app
+"""
+
+
+def test_parse_importtime_breakdown():
+    profile = ImportProfile("dashboard.app", parse_importtime(IMPORTTIME))
+
+    assert [r.module for r in profile.records] == ["json.scanner", "json", "flask", "dashboard.app"]
+    assert [r.depth for r in profile.records] == [2, 1, 1, 0]
+    assert profile.total_us == 5500
+    assert profile.top(1)[0].module == "dashboard.app"
+    assert profile.by_package() == {"dashboard": 4000, "flask": 1000, "json": 500}
+    assert "dashboard.app" in profile.format_report(5)
+
+
+def test_lazy_map_compiles_rules_on_first_request():
+    pytest.importorskip("flask")
+    from dashboard.lazy_routes import LazyRoutesFlask
+
+    app = LazyRoutesFlask(__name__)
+
+    @app.route("/items/<int:item_id>")
+    def item(item_id):
+        return {"id": item_id}
+
+    assert app.url_map.pending_rules == 2  # static + item
+    assert "item" in app.view_functions
+    with pytest.raises(AssertionError):
+        app.add_url_rule("/other", "item", lambda: "")
+
+    with app.test_client() as client:
+        assert client.get("/items/7").get_json() == {"id": 7}
+    assert app.url_map.pending_rules == 0
+    with app.test_request_context():
+        from flask import url_for
+        assert url_for("item", item_id=3) == "/items/3"
+
+
+def test_lazy_map_never_matches_a_partly_compiled_map(monkeypatch):
+    pytest.importorskip("flask")
+    import threading
+    import time
+    from werkzeug.routing import Map, Rule
+    from dashboard.lazy_routes import LazyMap
+
+    url_map = LazyMap([Rule(f"/r{i}", endpoint=f"r{i}") for i in range(5)])
+    started = threading.Event()
+    real_add = Map.add
+
+    def slow_add(self, rulefactory):
+        started.set()
+        time.sleep(0.01)
+        real_add(self, rulefactory)
+
+    monkeypatch.setattr(Map, "add", slow_add)
+    compiling = threading.Thread(target=url_map.compile_pending)
+    compiling.start()
+    started.wait()
+    assert url_map.bind("localhost").match("/r4") == ("r4", {})
+    compiling.join()
+
+    url_map.add(Rule("/late", endpoint="late"))
+    assert url_map.bind("localhost").match("/late") == ("late", {})
@@ -0,0 +1,216 @@
+"""Tests for the dashboard response cache and conditional GETs."""
+
+import gzip
+import json
+import os
+
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask, jsonify, request
+
+from dashboard.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def setup(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"value": 1}))
+    clock = FakeClock()
+    cache = ResponseCache(gzip_min_size=200, clock=clock)
+    app = Flask(__name__)
+    calls = []
+
+    @app.route("/items")
+    @cache.cached(lambda: [tmp_path])
+    def items():
+        calls.append(request.args.to_dict())
+        payload = json.loads(data_file.read_text())
+        return jsonify({"value": payload["value"], "padding": "x" * int(request.args.get("pad", 0))})
+
+    @app.route("/ttl")
+    @cache.cached(lambda: [], ttl=5)
+    def ttl():
+        calls.append("ttl")
+        return jsonify({"ok": True})
+
+    @app.route("/broken")
+    @cache.cached(lambda: [tmp_path])
+    def broken():
+        calls.append("broken")
+        return jsonify({"error": "nope"}), 500
+
+    return app.test_client(), cache, calls, data_file, clock
+
+
+def test_hits_until_data_file_changes(setup):
+    client, cache, calls, data_file, clock = setup
+
+    assert client.get("/items?b=2&a=1").get_json()["value"] == 1
+    assert client.get("/items?a=1&b=2").get_json()["value"] == 1
+    assert len(calls) == 1
+
+    data_file.write_text(json.dumps({"value": 22}))
+    os.utime(data_file, ns=(1, 1))
+    clock.now += 1
+    assert client.get("/items?a=1&b=2").get_json()["value"] == 22
+    assert len(calls) == 2
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["invalidations"] == 1
+    assert stats["hit_rate"] == round(1 / 3, 4)
+
+
+def test_conditional_requests(setup):
+    client, cache, calls, _, _ = setup
+
+    first = client.get("/items")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    not_modified = client.get("/items", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert not_modified.status_code == 304
+    assert client.get("/items", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert cache.stats()["not_modified"] == 2
+    assert len(calls) == 1
+
+
+def test_files_are_rechecked_once_per_interval(setup, monkeypatch):
+    client, cache, calls, data_file, clock = setup
+    from dashboard import response_cache
+    walks = []
+    real = response_cache.fingerprint
+    monkeypatch.setattr(response_cache, "fingerprint", lambda paths: walks.append(1) or real(paths))
+
+    for _ in range(3):
+        client.get("/items")
+    data_file.write_text(json.dumps({"value": 5}))
+    assert client.get("/items").get_json()["value"] == 1  # within the interval
+    assert len(walks) == 1
+
+    clock.now += 1
+    assert client.get("/items").get_json()["value"] == 5
+    assert len(walks) == 2
+
+
+def test_deleting_a_file_is_never_answered_with_304(setup, tmp_path):
+    client, cache, calls, data_file, clock = setup
+    extra = tmp_path / "extra.json"
+    extra.write_text("{}")
+    os.utime(data_file, (1_000_000_000, 1_000_000_000))
+    first = client.get("/items")
+
+    extra.unlink()
+    clock.now += 1
+    again = client.get("/items", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert again.status_code == 200
+    assert again.headers["ETag"] != first.headers["ETag"]
+    assert client.get("/items", headers={"If-None-Match": first.headers["ETag"]}).status_code == 200
+
+
+def test_large_payloads_are_gzipped(setup):
+    client, _, _, _, _ = setup
+
+    plain = client.get("/items?pad=500")
+    assert "Content-Encoding" not in plain.headers
+    zipped = client.get("/items?pad=500", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+
+    small = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+
+def test_errors_are_not_cached_and_ttl_expires(setup):
+    client, cache, calls, _, clock = setup
+
+    client.get("/broken")
+    client.get("/broken")
+    assert calls.count("broken") == 2
+    assert cache.stats()["uncacheable"] == 2
+
+    client.get("/ttl")
+    client.get("/ttl")
+    assert calls.count("ttl") == 1
+    clock.now += 6
+    client.get("/ttl")
+    assert calls.count("ttl") == 2
+
+
+def test_session_stats_endpoint_is_cached(monkeypatch, tmp_path):
+    app_module = pytest.importorskip("dashboard.app")
+    loads = []
+
+    class SessionDashboard:
+        def load_all_sessions(self):
+            loads.append(1)
+            return [json.loads(p.read_text()) for p in sorted(tmp_path.glob("*.json"))]
+
+        def filter_sessions(self, sessions, filters):
+            return sessions
+
+        def calculate_aggregate_stats(self, sessions):
+            return {"count": len(sessions)}
+
+    monkeypatch.setattr(app_module, "session_dashboard", SessionDashboard())
+    monkeypatch.setattr(app_module, "LOG_DIRS", [tmp_path])
+    monkeypatch.setattr(app_module.response_cache, "check_interval", 0)
+    app_module.response_cache.clear()
+    (tmp_path / "session_1.json").write_text("{}")
+
+    with app_module.app.test_client() as client:
+        assert client.get("/api/sessions/stats").get_json() == {"count": 1}
+        assert client.get("/api/sessions/stats").get_json() == {"count": 1}
+        assert len(loads) == 1
+
+        (tmp_path / "session_2.json").write_text("{}")
+        assert client.get("/api/sessions/stats").get_json() == {"count": 2}
+        assert len(loads) == 2
+        assert client.get("/api/cache/stats").get_json()["hits"] >= 1
+
+
+def test_growing_text_logs_do_not_invalidate_session_stats(monkeypatch, tmp_path):
+    app_module = pytest.importorskip("dashboard.app")
+    loads = []
+
+    class SessionDashboard:
+        def load_all_sessions(self):
+            loads.append(1)
+            return [json.loads(p.read_text()) for p in sorted(tmp_path.glob("*.json"))]
+
+        def filter_sessions(self, sessions, filters):
+            return sessions
+
+        def calculate_aggregate_stats(self, sessions):
+            return {"count": len(sessions)}
+
+    monkeypatch.setattr(app_module, "session_dashboard", SessionDashboard())
+    monkeypatch.setattr(app_module, "LOG_DIRS", [tmp_path])
+    monkeypatch.setattr(app_module.response_cache, "check_interval", 0)
+    app_module.response_cache.clear()
+    (tmp_path / "session_1.json").write_text("{}")
+    text_log = tmp_path / "ms11.log"
+    (tmp_path / "archive").mkdir()
+
+    with app_module.app.test_client() as client:
+        assert client.get("/api/sessions/stats").get_json() == {"count": 1}
+        with text_log.open("a") as f:
+            f.write("tick\n")
+        (tmp_path / "archive" / "session_0.json").write_text("{}")
+        assert client.get("/api/sessions/stats").get_json() == {"count": 1}
+        assert len(loads) == 1
+
+        (tmp_path / "session_1.json").write_text('{"mode": "combat"}')
+        assert client.get("/api/sessions/stats").get_json() == {"count": 1}
+        assert len(loads) == 2
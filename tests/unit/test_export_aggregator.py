@@ -0,0 +1,165 @@
+"""Tests for single-pass, checkpointed public data aggregation."""
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("android_ms11.utils.logging_utils")
+
+from exporters import export_aggregator
+from exporters.export_aggregator import ExportAggregator, Reducer, default_reducers
+from exporters.public_data_exporter import PublicDataExporter
+
+
+PROGRESS = {
+    "checklists": {
+        "Quest Line": {"items": [
+            {"name": "A", "status": "completed", "xp_reward": 50, "category": "story"},
+            {"name": "B", "status": "in_progress"},
+        ]},
+        "Heroics": {"items": [{"name": "Axkva Min", "status": "completed"}]},
+    }
+}
+
+HEROICS = {
+    "heroics": {
+        "axkva": {"name": "Axkva Min", "level_requirement": 80, "planet": "dathomir"},
+        "ig88": {"name": "IG-88", "level_requirement": 75, "planet": "lok"},
+    }
+}
+
+
+def write_session(directory, index, xp=100, success=0.5, start_hour=10):
+    (directory / f"session_{index}.json").write_text(json.dumps({
+        "session_id": f"s{index}",
+        "start_time": f"2025-01-{index + 1:02d}T{start_hour:02d}:00:00",
+        "end_time": f"2025-01-{index + 1:02d}T{start_hour + 2:02d}:00:00",
+        "total_xp_gained": xp,
+        "total_credits_gained": 10,
+        "success_rate": success,
+        "efficiency_score": 1.0,
+        "profession": "rifleman",
+        "character_level": 50 + index,
+    }))
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "enhanced_progress_tracker.json").write_text(json.dumps(PROGRESS))
+    logs = tmp_path / "session_logs"
+    logs.mkdir()
+    for i in range(3):
+        write_session(logs, i)
+    return PublicDataExporter(str(data_dir), str(logs))
+
+
+def count_session_reads(monkeypatch):
+    seen = []
+    original = export_aggregator.BotMetricsReducer.feed_session
+
+    def counting(self, state, session):
+        seen.append(session["session_id"])
+        original(self, state, session)
+
+    monkeypatch.setattr(export_aggregator.BotMetricsReducer, "feed_session", counting)
+    return seen
+
+
+def test_export_all_data_summaries(exporter):
+    data = exporter.export_all_data()
+
+    assert data["quest_tracking"]["total_quests"] == 3
+    assert data["quest_tracking"]["completed_quests"] == 2
+    assert data["quest_tracking"]["active_quests"] == 1
+    assert data["quest_tracking"]["total_xp_from_quests"] == 50
+    assert data["bot_metrics"]["session_count"] == 3
+    assert data["bot_metrics"]["total_xp_gained"] == 300
+    assert data["bot_metrics"]["average_session_duration"] == 2.0
+    assert data["bot_metrics"]["profession_levels"] == {"rifleman": 52}
+    assert [s["session_id"] for s in data["bot_metrics"]["recent_activity"]] == ["s2", "s1", "s0"]
+    assert (exporter.export_dir / "public_data_summary.md").exists()
+    assert json.loads((exporter.export_dir / "bot_metrics.json").read_text())["session_count"] == 3
+
+
+def test_only_new_session_logs_are_processed(exporter, monkeypatch):
+    exporter.export_all_data()
+    seen = count_session_reads(monkeypatch)
+
+    rerun = PublicDataExporter(str(exporter.data_dir), str(exporter.session_logs_dir))
+    write_session(exporter.session_logs_dir, 3, xp=1000)
+    metrics = rerun.export_bot_metrics()
+
+    assert seen == ["s3"]
+    assert metrics.session_count == 4
+    assert metrics.total_xp_gained == 1300
+    assert metrics.recent_activity[0]["session_id"] == "s3"
+
+
+def test_changed_or_removed_log_triggers_rebuild(exporter, monkeypatch):
+    exporter.export_all_data()
+    seen = count_session_reads(monkeypatch)
+
+    path = exporter.session_logs_dir / "session_0.json"
+    write_session(exporter.session_logs_dir, 0, xp=5)
+    os.utime(path, ns=(1, 1))
+    metrics = exporter.export_bot_metrics()
+    assert sorted(seen) == ["s0", "s1", "s2"]
+    assert metrics.total_xp_gained == 205
+    assert exporter.aggregator.last_run["rebuilt"]
+
+    (exporter.session_logs_dir / "session_1.json").unlink()
+    assert exporter.export_bot_metrics().session_count == 2
+
+
+def test_snapshot_sources_are_shared_by_reducers(tmp_path):
+    aggregator = ExportAggregator(default_reducers())
+    results = aggregator.run({"progress": PROGRESS, "heroics": HEROICS}, [])
+
+    assert results["quest_tracking"]["completed_quests"] == 2
+    assert results["heroic_readiness"]["completed_heroics"] == 1
+    assert [h["name"] for h in results["heroic_readiness"]["recommended_heroics"]] == ["IG-88"]
+    assert results["bot_metrics"] is None
+
+
+def test_custom_reducer(tmp_path):
+    class CountReducer(Reducer):
+        name = "count"
+        incremental = True
+
+        def initial_state(self):
+            return {"n": 0}
+
+        def feed_session(self, state, session):
+            state["n"] += 1
+
+        def finalize(self, state):
+            return state["n"]
+
+    for i in range(2):
+        write_session(tmp_path, i)
+    aggregator = ExportAggregator(default_reducers() + [CountReducer()], tmp_path / "ckpt.json")
+    results = aggregator.run({}, tmp_path.glob("session_*.json"))
+
+    assert results["count"] == 2
+    assert results["quest_tracking"] is None
+    assert "count" in json.loads((tmp_path / "ckpt.json").read_text())["states"]
+
+
+def test_malformed_timestamps_are_skipped(tmp_path):
+    progress = {"checklists": {"Quest Line": {"items": [
+        {"name": "A", "status": "completed", "completed_at": 1736000000},
+        {"name": "B", "status": "completed", "completed_at": "yesterday"},
+    ]}}}
+    (tmp_path / "session_0.json").write_text(json.dumps({
+        "session_id": "s0", "start_time": 1736000000, "end_time": "2025-01-01T12:00:00",
+        "total_xp_gained": 10,
+    }))
+    aggregator = ExportAggregator(default_reducers())
+    results = aggregator.run({"progress": progress}, [tmp_path / "session_0.json"])
+
+    assert results["quest_tracking"]["completed_quests"] == 2
+    assert results["bot_metrics"]["total_xp_gained"] == 10
@@ -0,0 +1,67 @@
+"""Tests for the background health collector."""
+
+import time
+
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("flask")
+
+from api.health import HealthChecker, HealthCollector
+
+
+@pytest.fixture
+def checker(monkeypatch):
+    checker = HealthChecker()
+    calls = []
+
+    def run_check(name):
+        calls.append(name)
+        return {'status': 'healthy', 'message': name, 'alert': False, 'metrics': {}}
+
+    monkeypatch.setattr(checker, 'run_check', run_check)
+    checker.calls = calls
+    return checker
+
+
+def test_snapshot_never_runs_checks(checker):
+    collector = HealthCollector(checker)
+    assert collector.snapshot()['status'] == 'starting'
+    assert not collector.is_ready()
+
+    collector.collect()
+    calls = len(checker.calls)
+    for _ in range(100):
+        health = collector.snapshot()
+    assert len(checker.calls) == calls
+    assert health['status'] == 'healthy'
+    assert set(health['checks']) == {name for name, _ in HealthChecker.CHECKS}
+    assert collector.is_ready()
+
+
+def test_stale_checks_are_reported(checker):
+    collector = HealthCollector(checker, intervals={'cpu': 0.01}, stale_factor=1.0)
+    collector.collect()
+    time.sleep(0.03)
+
+    health = collector.snapshot()
+    assert health['stale_checks'] == ['cpu']
+    assert health['checks']['cpu']['stale']
+    assert not health['checks']['memory']['stale']
+    assert health['status'] == 'warning'
+
+
+def test_background_thread_refreshes_due_checks(checker):
+    intervals = {name: 60.0 for name, _ in HealthChecker.CHECKS}
+    intervals['memory'] = 0.05
+    collector = HealthCollector(checker, intervals=intervals)
+    collector.start()
+    try:
+        deadline = time.time() + 2
+        while checker.calls.count('memory') < 3 and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        collector.stop()
+
+    assert checker.calls.count('memory') >= 3
+    assert checker.calls.count('disk') == 1
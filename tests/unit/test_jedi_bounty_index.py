@@ -0,0 +1,139 @@
+"""Tests for the Jedi bounty kill index."""
+
+from types import SimpleNamespace
+
+from api.jedi_bounty_index import JediKillIndex
+
+
+def make_kill(kill_id, hunter, target, planet, day, season="s1", reward=1000):
+    return SimpleNamespace(
+        kill_id=kill_id,
+        hunter_name=hunter,
+        target_name=target,
+        planet=planet,
+        kill_method="Lightsaber Duel",
+        season_id=season,
+        reward_earned=reward,
+        timestamp=f"2025-01-{day:02d}T12:00:00Z",
+    )
+
+
+def sample_kills():
+    return [
+        make_kill("k1", "Boba", "Kael Dusk", "Dathomir", 1),
+        make_kill("k2", "Boba", "Ryn Vos", "Tatooine", 2, reward=3000),
+        make_kill("k3", "Dengar", "Kael Dusk", "Dathomir", 3),
+        make_kill("k4", "Bossk", "Ilya Tren", "Naboo", 4, season="s2"),
+        make_kill("k5", "Dengar", "Ryn Vos", "Dathomir", 5),
+    ]
+
+
+def test_filters_match_original_substring_semantics():
+    index = JediKillIndex(sample_kills())
+
+    result = index.query(hunter_name="eng", planet="dath")
+    assert [k.kill_id for k in result["kills"]] == ["k3", "k5"]
+    assert result["total_count"] == 2
+
+    assert index.query(season_id="s2")["total_count"] == 1
+    assert index.query(target_name="nobody")["kills"] == []
+
+
+def test_date_range_and_keyset_pagination():
+    index = JediKillIndex(sample_kills())
+
+    ranged = index.query(date_from="2025-01-02T00:00:00Z", date_to="2025-01-04T12:00:00Z")
+    assert [k.kill_id for k in ranged["kills"]] == ["k2", "k3", "k4"]
+
+    seen = []
+    cursor = None
+    while True:
+        page = index.query(limit=2, cursor=cursor)
+        seen.extend(k.kill_id for k in page["kills"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["k1", "k2", "k3", "k4", "k5"]
+    assert [k.kill_id for k in index.query(limit=2, offset=2)["kills"]] == ["k3", "k4"]
+    assert [k.kill_id for k in index.query(planet="dath", offset=1)["kills"]] == ["k3", "k5"]
+
+
+def test_incremental_updates_keep_recorded_order():
+    kills = sample_kills()
+    index = JediKillIndex(kills)
+
+    index.add(make_kill("k6", "Dengar", "Ryn Vos", "Naboo", 6))
+    index.remove("k2")
+    index.remove("k1")
+    assert [k.kill_id for k in index.query()["kills"]] == ["k3", "k4", "k5", "k6"]
+    assert index.query(hunter_name="boba")["total_count"] == 0
+    assert index.query(date_from="2025-01-05T00:00:00Z")["total_count"] == 2
+
+
+def test_substring_filters_are_lookups():
+    index = JediKillIndex(sample_kills())
+
+    assert index.query(hunter_name="B")["total_count"] == 3  # Boba, Bossk
+    assert index.query(target_name="dusk")["total_count"] == 2
+    assert index.query(target_name="ael du")["total_count"] == 2
+    assert index.query(planet="athomi")["total_count"] == 3
+    assert index.query(planet="athomix")["total_count"] == 0
+
+    index.remove("k4")
+    assert "bossk" not in index.by_hunter.ids
+    assert all("bossk" not in keys for keys in index.by_hunter.grams.values())
+
+
+def test_date_filters_use_the_timestamp_index():
+    kills = sample_kills()
+    kills.append(make_kill("k0", "Boba", "Old Jedi", "Naboo", 1))  # recorded late
+    index = JediKillIndex(kills)
+
+    assert [t[2] for t in index.by_time][:2] == ["k1", "k0"]
+    result = index.query(date_to="2025-01-01T12:00:00Z")
+    assert [k.kill_id for k in result["kills"]] == ["k1", "k0"]
+    assert index.query(date_from="2025-01-03T00:00:00Z", hunter_name="dengar")["total_count"] == 2
+    page = index.query(date_from="2025-01-02T00:00:00Z", limit=2)
+    assert [k.kill_id for k in page["kills"]] == ["k2", "k3"]
+    rest = index.query(date_from="2025-01-02T00:00:00Z", limit=2, cursor=page["next_cursor"])
+    assert [k.kill_id for k in rest["kills"]] == ["k4", "k5"] and rest["next_cursor"] is None
+
+
+def test_leaderboards_update_incrementally():
+    index = JediKillIndex(sample_kills())
+
+    board = index.leaderboard("s1")
+    assert [(e["hunter_name"], e["total_kills"], e["total_rewards"]) for e in board] == [
+        ("Boba", 2, 4000), ("Dengar", 2, 2000)]
+    assert board[1]["planets"] == ["Dathomir"]
+    assert board[1]["last_kill"] == "2025-01-05T12:00:00Z"
+
+    index.add(make_kill("k6", "Dengar", "Ryn Vos", "Naboo", 6))
+    leader = index.leaderboard("s1", limit=1)
+    assert [(e["hunter_name"], e["planets"]) for e in leader] == [("Dengar", ["Dathomir", "Naboo"])]
+
+    index.remove("k6")
+    index.remove("k5")
+    dengar = [e for e in index.leaderboard("s1") if e["hunter_name"] == "Dengar"][0]
+    assert (dengar["total_kills"], dengar["last_kill"]) == (1, "2025-01-03T12:00:00Z")
+    index.remove("k3")
+    assert [e["hunter_name"] for e in index.leaderboard("s1")] == ["Boba"]
+    assert index.leaderboard("nope") == []
+
+
+def test_staleness_detection():
+    kills = sample_kills()
+    index = JediKillIndex(kills)
+    assert not index.is_stale(kills)
+
+    kills.append(make_kill("k9", "Boba", "X", "Y", 9))
+    assert index.is_stale(kills)
+    index.add(kills[-1])
+    index.sync_source(kills)
+    assert not index.is_stale(kills)
+
+    kills[-1] = make_kill("k10", "Boba", "X", "Y", 10)
+    assert index.is_stale(kills)
+    index.rebuild(kills)
+    assert not index.is_stale(kills)
+    assert index.query(hunter_name="boba")["total_count"] == 3
@@ -1,3 +1,4 @@
+import json
 import sys
 from importlib import reload
 
@@ -18,3 +19,57 @@ def test_search_cli(monkeypatch, capsys):
     legacy_quest_manager.main()
     captured = capsys.readouterr()
     assert "Corellia" in captured.out
+
+
+SAMPLE_QUESTS = [
+    {"title": "Krayt Dragon Hunt", "planet": "Tatooine", "npc": "Ben Kenobi", "status": "active", "notes": "Dune sea"},
+    {"title": "Gungan Relics", "planet": "Naboo", "quest_giver": "Boss Nass", "status": "completed", "notes": "Otoh Gunga"},
+    {"title": "Dragon Pearls", "planet": "Tatooine", "npc": "Jabba", "status": "active", "notes": "krayt pearl"},
+    {"title": "Corellian Smuggler", "planet": "Corellia", "npc": "Han", "status": "failed", "notes": ""},
+]
+
+
+def _write_sample(tmp_path):
+    path = tmp_path / "quests.json"
+    path.write_text(json.dumps(SAMPLE_QUESTS))
+    return path
+
+
+def _scan(field_fn, term):
+    return [q for q in SAMPLE_QUESTS if term.lower() in field_fn(q).lower()]
+
+
+def test_indexed_lookups_match_full_scan(tmp_path):
+    mgr = legacy_quest_manager.LegacyQuestManager(_write_sample(tmp_path))
+
+    for term in ["tatoo", "naboo", "ia", ""]:
+        assert mgr.find_by_planet(term) == _scan(lambda q: q.get("planet", ""), term)
+    for term in ["ben ken", "nass", "a", "obi"]:
+        assert mgr.find_by_npc(term) == _scan(lambda q: q.get("npc") or q.get("quest_giver", ""), term)
+    for term in ["dragon", "ayt drag", "rago", "earls", "pearl", "sea", "zzz", "ra"]:
+        expected = [q for q in SAMPLE_QUESTS if term in q["title"].lower() or term in q["notes"].lower()]
+        assert mgr.search(term) == expected
+    assert mgr.find_by_status("active") == [SAMPLE_QUESTS[0], SAMPLE_QUESTS[2]]
+
+
+def test_compound_query_ranks_title_matches_first(tmp_path):
+    mgr = legacy_quest_manager.LegacyQuestManager(_write_sample(tmp_path))
+
+    results = mgr.query(planet="tatooine", term="krayt")
+    assert [q["title"] for q in results] == ["Krayt Dragon Hunt", "Dragon Pearls"]
+    assert mgr.query(planet="tatooine", npc="jabba", term="krayt") == [SAMPLE_QUESTS[2]]
+    assert mgr.query(planet="naboo", term="krayt") == []
+    assert len(mgr.query(planet="tatooine", limit=1)) == 1
+
+
+def test_lazy_load_from_pretokenized_cache(tmp_path):
+    source = _write_sample(tmp_path)
+    cache = tmp_path / "cache" / "quests.idx.json"
+
+    first = legacy_quest_manager.LegacyQuestManager(source, lazy=True, cache_path=cache)
+    assert first._quests is None
+    assert first.find_by_planet("naboo") == [SAMPLE_QUESTS[1]]
+    assert cache.exists()
+
+    second = legacy_quest_manager.LegacyQuestManager(source, cache_path=cache)
+    assert second.search("dragon") == [SAMPLE_QUESTS[0], SAMPLE_QUESTS[2]]
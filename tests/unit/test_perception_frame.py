@@ -0,0 +1,155 @@
+"""Tests for the per-tick perception frame shared by the combat engines."""
+
+from combat.combat_manager import CombatManager
+from combat.combat_range import CombatRangeIntelligence, WeaponType
+from combat.perception_frame import DEFAULT_REGIONS, PerceptionFrameBuilder, parse_distance
+from combat.rotation_engine import CombatProfile, RotationEngine, SkillInfo, StanceType
+from combat.rotation_engine import WeaponType as RotationWeaponType
+
+
+class Screen:
+    """Fake client: OCR text per region box, counting captures and OCR calls."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.captures = 0
+        self.ocr_calls = []
+
+    def capture(self):
+        self.captures += 1
+        return object()
+
+    def ocr(self, image, region):
+        self.ocr_calls.append(region)
+        return self.texts.get(region, "")
+
+
+def _screen():
+    return Screen({
+        DEFAULT_REGIONS["toolbar"]: "Headshot  Burst Shot  Heal",
+        DEFAULT_REGIONS["action_log"]: "You used Headshot\nStormtrooper evades",
+        DEFAULT_REGIONS["minimap"]: "Target 42m",
+        DEFAULT_REGIONS["target_frame"]: "Stormtrooper (lvl 12) 85%",
+        (100, 100, 200, 150): "E-11 Blaster Rifle",
+        None: "Rifleman (4)\nMarksman: 3",
+    })
+
+
+def _rotation_engine(tmp_path):
+    engine = RotationEngine(profiles_dir=str(tmp_path))
+    engine.current_profile = CombatProfile(
+        name="rifle",
+        weapon_type=RotationWeaponType.RANGED,
+        stance=StanceType.KNEELING,
+        rotation=["headshot", "burst shot"],
+        skills={name: SkillInfo(name=name, cooldown=5) for name in ["headshot", "burst shot", "sniper shot"]},
+    )
+    return engine
+
+
+def test_regions_are_read_once_per_tick():
+    screen = _screen()
+    frame = PerceptionFrameBuilder(capture=screen.capture, ocr=screen.ocr).build()
+
+    assert frame.captures == 0  # nothing read yet
+    for _ in range(3):
+        assert frame.minimap_distance == 42.0
+        assert frame.toolbar_text.startswith("headshot")
+    assert frame.target.name == "Stormtrooper"
+    assert (frame.target.level, frame.target.health_percent) == (12, 85.0)
+    assert frame.action_log_lines == ["you used headshot", "stormtrooper evades"]
+
+    assert screen.captures == 1
+    assert len(screen.ocr_calls) == len(set(screen.ocr_calls)) == 4
+
+
+def test_engines_share_one_frame(tmp_path):
+    screen = _screen()
+    builder = PerceptionFrameBuilder(capture=screen.capture, ocr=screen.ocr)
+    rotation = _rotation_engine(tmp_path)
+    combat_range = CombatRangeIntelligence(config_path=str(tmp_path / "ranges.yaml"))
+    manager = CombatManager()
+    manager.profiles_dir = tmp_path
+
+    frame = builder.build()
+    assert rotation.scan_toolbar_skills(frame) == ["headshot", "burst shot"]
+    assert rotation.check_action_log("headshot", frame)
+    assert not rotation.check_action_log("burst shot", frame)
+    assert combat_range.check_combat_range(frame=frame).current_distance == 42.0
+    assert combat_range.detect_equipped_weapon(frame).weapon_type == WeaponType.RIFLE
+    assert manager.detect_current_build(frame) is not None
+    assert rotation.scan_toolbar_skills(frame) == ["headshot", "burst shot"]
+
+    assert screen.captures == 1
+    assert len(screen.ocr_calls) == len(set(screen.ocr_calls))
+
+    builder.build().minimap_distance
+    stats = builder.stats()
+    assert (stats["ticks"], stats["captures"]) == (2, 2)
+    assert stats["ocr_calls"] == len(screen.ocr_calls)
+
+
+def test_frame_without_backend_reads_nothing(tmp_path):
+    frame = PerceptionFrameBuilder(capture=lambda: None, ocr=lambda image, region: "10m").build()
+    combat_range = CombatRangeIntelligence(config_path=str(tmp_path / "ranges.yaml"))
+
+    assert frame.read("minimap").text == ""
+    assert frame.minimap_distance is None
+    assert combat_range._detect_distance_from_minimap(frame) == 0.0
+    assert frame.ocr_calls == 0
+
+
+def test_parse_distance_formats():
+    assert parse_distance("Range: 30") == 30.0
+    assert parse_distance("12 meters away") == 12.0
+    assert parse_distance("distance: 7.5") == 7.5
+    assert parse_distance("no target") is None
+
+
+def test_skill_is_confirmed_against_the_log_after_the_cast(tmp_path):
+    screen = _screen()
+    screen.texts[DEFAULT_REGIONS["action_log"]] = "Stormtrooper evades"
+    rotation = _rotation_engine(tmp_path)
+    frame = PerceptionFrameBuilder(capture=screen.capture, ocr=screen.ocr).build()
+    assert frame.action_log_lines == ["stormtrooper evades"]
+    assert frame.minimap_distance == 42.0
+
+    screen.texts[DEFAULT_REGIONS["action_log"]] = "You used Burst Shot"
+    assert rotation.execute_skill("burst shot", frame)
+
+    assert screen.captures == 2
+    assert screen.ocr_calls.count(DEFAULT_REGIONS["action_log"]) == 2
+    assert frame.minimap_distance == 42.0
+    assert screen.ocr_calls.count(DEFAULT_REGIONS["minimap"]) == 1
+
+
+def test_minimap_distance_uses_the_configured_region(tmp_path):
+    screen = _screen()
+    screen.texts[(300, 200, 520, 420)] = "Range: 18"
+    combat_range = CombatRangeIntelligence(config_path=str(tmp_path / "ranges.yaml"))
+    combat_range.minimap_regions["distance_indicators"] = (300, 200, 520, 420)
+    frame = PerceptionFrameBuilder(capture=screen.capture, ocr=screen.ocr).build()
+
+    assert combat_range.check_combat_range(frame=frame).current_distance == 18.0
+    assert screen.ocr_calls == [(300, 200, 520, 420)]
+
+
+def test_combat_tick_captures_the_screen_once(tmp_path):
+    screen = _screen()
+    screen.texts[DEFAULT_REGIONS["action_log"]] = "You used Headshot"
+    builder = PerceptionFrameBuilder(capture=screen.capture, ocr=screen.ocr)
+    rotation = _rotation_engine(tmp_path)
+    combat_range = CombatRangeIntelligence(config_path=str(tmp_path / "ranges.yaml"))
+    manager = CombatManager()
+    manager.profiles_dir = tmp_path
+    manager.ocr_interval = 0
+
+    tick = rotation.tick(builder, range_intelligence=combat_range, combat_manager=manager)
+
+    assert tick.executed == ["headshot"]
+    assert tick.range_check.current_distance == 42.0
+    assert manager.current_build is not None
+    assert screen.captures == tick.frame.captures == 1
+
+    rotation.tick(builder, range_intelligence=combat_range, combat_manager=manager)
+    assert screen.captures == builder.stats()["captures"] == 2
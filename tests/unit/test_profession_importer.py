@@ -4,7 +4,9 @@ import types
 from pathlib import Path
 
 # Provide a stub for the requests module if it's missing
-if "requests" not in sys.modules:
+try:
+    import requests  # noqa: F401
+except ImportError:
     requests_mod = types.ModuleType("requests")
     requests_mod.get = lambda *a, **k: None
     sys.modules["requests"] = requests_mod
@@ -0,0 +1,110 @@
+"""Tests for the cooldown-aware rotation scheduler."""
+
+from combat.rotation_engine import CombatProfile, RotationEngine, SkillInfo, StanceType, WeaponType
+from combat.rotation_scheduler import (
+    TIER_EMERGENCY,
+    TIER_FALLBACK,
+    TIER_ROTATION,
+    RotationScheduler,
+    simulate_rotation,
+)
+
+
+def _profile(cooldowns=None, rotation=("headshot", "burst", "aim"), fallback="shot", emergency=None):
+    cooldowns = cooldowns or {"headshot": 6, "burst": 4, "aim": 10, "shot": 0, "heal": 30}
+    return CombatProfile(
+        name="rifle",
+        weapon_type=WeaponType.RANGED,
+        stance=StanceType.KNEELING,
+        rotation=list(rotation),
+        fallback=fallback,
+        skills={name: SkillInfo(name=name, cooldown=cd) for name, cd in cooldowns.items()},
+        emergency_skills=emergency or {},
+    )
+
+
+def _polling_reference(profile, minutes, action_time, emergency=()):
+    """Scan every skill's cooldown at each step, as the engine used to."""
+    ready_at = {name: 0.0 for name in profile.skills}
+    timeline, now, end = [], 0.0, minutes * 60.0
+    while now < end:
+        ready = [name for name in profile.skills if ready_at[name] <= now]
+        choice = next((n for n in emergency if n in ready), None)
+        choice = choice or next((n for n in profile.rotation if n in ready), None)
+        if choice is None and profile.fallback in ready:
+            choice = profile.fallback
+        if choice is None:
+            now = min(ready_at.values())
+            continue
+        timeline.append((now, choice))
+        ready_at[choice] = now + (profile.skills[choice].cooldown or 0.1)
+        now += action_time
+    return timeline
+
+
+def test_tiers_and_next_event():
+    profile = _profile()
+    scheduler = RotationScheduler(profile, emergency=["heal"], clock=lambda: 0.0)
+
+    assert scheduler.next_action(0.0) == (TIER_EMERGENCY, "heal")
+    scheduler.mark_used("heal", 0.0)
+    assert scheduler.next_action(0.0) == (TIER_ROTATION, "headshot")
+    for name in ("headshot", "burst", "aim"):
+        scheduler.mark_used(name, 0.0)
+    assert scheduler.next_action(0.0) == (TIER_FALLBACK, "shot")
+    scheduler.mark_used("shot", 0.0)
+
+    assert scheduler.next_action(0.05) is None
+    assert scheduler.next_event_time(0.05) == 0.1
+    assert scheduler.time_until_next(0.05, emergency=False) == 0.1 - 0.05
+    assert scheduler.ready_rotation(4.0) == ["burst"]
+    assert scheduler.ready_skills(6.0) == ["headshot", "burst", "shot"]
+
+
+def test_simulation_matches_polling_reference():
+    profile = _profile(emergency={"critical_heal": "heal"})
+
+    result = simulate_rotation(profile, minutes=10, action_time=1.5, emergency=["heal"])
+
+    assert result.timeline == _polling_reference(profile, 10, 1.5, emergency=["heal"])
+    assert result.casts["heal"] == 20
+    assert result.total_casts == len(result.timeline)
+    # The profile itself is untouched
+    assert all(info.is_ready and info.last_used == 0.0 for info in profile.skills.values())
+
+
+def test_simulation_skips_idle_time():
+    profile = _profile(cooldowns={"headshot": 60}, rotation=["headshot"], fallback="")
+
+    result = simulate_rotation(profile, minutes=5, action_time=1.0)
+
+    assert [t for t, _ in result.timeline] == [0.0, 60.0, 120.0, 180.0, 240.0]
+    assert result.idle_time == 5 * 60.0 - 5 * 1.0
+
+
+def test_engine_uses_scheduler(tmp_path):
+    engine = RotationEngine(profiles_dir=str(tmp_path))
+    engine.enable_test_mode()
+    engine.current_profile = _profile()
+
+    assert engine.execute_rotation() == ["headshot"]
+    assert engine.execute_rotation() == ["burst"]
+    assert engine.execute_rotation() == ["aim"]
+    assert engine.execute_rotation() == ["shot"]
+    assert engine.get_available_skills() == ["heal"]
+    assert 0.0 < engine.time_until_next_skill() <= 0.1
+
+    engine.current_profile = _profile()
+    assert engine.scheduler.profile is engine.current_profile
+    assert engine.get_available_skills() == ["headshot", "burst", "aim", "shot", "heal"]
+
+
+def test_run_sleeps_until_next_skill(tmp_path):
+    engine = RotationEngine(profiles_dir=str(tmp_path))
+    engine.enable_test_mode()
+    engine.current_profile = _profile(cooldowns={"headshot": 30, "burst": 30}, rotation=["headshot", "burst"],
+                                      fallback="")
+
+    executed = engine.run(duration=0.2)
+
+    assert executed == ["headshot", "burst"]
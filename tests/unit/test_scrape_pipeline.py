@@ -0,0 +1,91 @@
+"""Tests for the cached, rate-limited wiki scraping pipeline."""
+
+import types
+
+import pytest
+
+from importers.scrape_pipeline import CachedFetcher, HTMLCache, HostRateLimiter, TokenBucket
+
+
+class FakeSession:
+    """Serves pages and honours If-None-Match like a wiki server would."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        self.requests.append((url, dict(headers)))
+        if url not in self.pages:
+            return types.SimpleNamespace(status_code=404, content=b"", headers={})
+        etag = f'"{hash(self.pages[url])}"'
+        if headers.get("If-None-Match") == etag:
+            return types.SimpleNamespace(status_code=304, content=b"", headers={})
+        return types.SimpleNamespace(
+            status_code=200, content=self.pages[url], headers={"ETag": etag}
+        )
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=1.0, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        bucket.acquire()
+
+    assert abs(sum(slept) - 1.0) < 1e-9
+
+
+def test_conditional_requests_use_cache(tmp_path):
+    pages = {"https://wiki.test/Quest_A": b"<h1>A</h1>"}
+    session = FakeSession(pages)
+    fetcher = CachedFetcher(session, HTMLCache(tmp_path), HostRateLimiter(1000, 10))
+
+    first = fetcher.fetch("https://wiki.test/Quest_A")
+    second = fetcher.fetch("https://wiki.test/Quest_A")
+
+    assert first.content == second.content == b"<h1>A</h1>"
+    assert second.status == 304 and second.from_cache
+    assert "If-None-Match" in session.requests[1][1]
+    assert fetcher.stats["not_modified"] == 1
+
+
+def test_fetch_many_preserves_order_and_reports_errors(tmp_path):
+    pages = {f"https://wiki.test/Q{i}": f"<h1>{i}</h1>".encode() for i in range(6)}
+    fetcher = CachedFetcher(
+        FakeSession(pages), HTMLCache(tmp_path), HostRateLimiter(1000, 10), max_workers=3
+    )
+
+    urls = list(pages) + ["https://wiki.test/missing"]
+    results = fetcher.fetch_many(urls)
+
+    assert [r.url for r in results] == urls
+    assert all(r.ok for r in results[:-1])
+    assert results[-1].status == 404 and not results[-1].ok
+
+
+def test_replay_mode_never_touches_network(tmp_path):
+    cache = HTMLCache(tmp_path)
+    cache.put("https://wiki.test/Quest_A", b"<h1>A</h1>", {"ETag": '"1"'})
+    fetcher = CachedFetcher(session=None, cache=cache, replay=True)
+
+    assert fetcher.fetch("https://wiki.test/Quest_A").content == b"<h1>A</h1>"
+    assert not fetcher.fetch("https://wiki.test/other").ok
+
+    with pytest.raises(ValueError):
+        CachedFetcher(session=None, cache=None, replay=True)
+
+
+def test_cache_directory_is_created_on_first_write(tmp_path):
+    cache = HTMLCache(tmp_path / "html")
+    assert not (tmp_path / "html").exists()
+    assert cache.get("https://wiki.test/Quest_A") is None
+
+    cache.put("https://wiki.test/Quest_A", b"<h1>A</h1>", {})
+    assert (tmp_path / "html").is_dir()
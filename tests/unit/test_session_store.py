@@ -0,0 +1,100 @@
+"""Tests for the pooled, SQL-filtered session store behind SessionAPI."""
+
+import sqlite3
+import threading
+
+from api.session_store import SessionStore
+
+
+def _session(session_id, start, planets=(), professions=(), xp=100, character="Jek"):
+    return {
+        "session_id": session_id,
+        "character_name": character,
+        "start_time": start,
+        "duration_minutes": 30,
+        "location_data": {"location_events": [{"planet": p} for p in planets]},
+        "xp_data": {"total_xp_gained": xp, "profession_breakdown": {p: xp for p in professions}},
+        "credit_data": {"total_credits_gained": 10},
+        "event_data": {"stuck_events": [{}], "communication_events": []},
+    }
+
+
+def _store(tmp_path):
+    store = SessionStore(tmp_path / "sessions.db")
+    store.insert_session("u1", _session("a", "2026-01-01T10:00", ["tatooine"], ["medic"]))
+    store.insert_session("u1", _session("b", "2026-01-02T10:00", ["naboo"], ["rifleman"], xp=300))
+    store.insert_session("u1", _session("c", "2026-01-03T10:00", ["tatooine", "naboo"], ["medic"]))
+    store.insert_session("u2", _session("d", "2026-01-04T10:00", ["tatooine"], ["medic"]))
+    return store
+
+
+def test_wal_mode_and_per_thread_connections(tmp_path):
+    store = _store(tmp_path)
+    mode = store.connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(store.connection()))
+    thread.start()
+    thread.join()
+    assert seen[0] is not store.connection()
+
+
+def test_planet_and_profession_filters_run_in_sql(tmp_path):
+    store = _store(tmp_path)
+
+    sessions, _ = store.list_sessions("u1", {"planet": "tatooine"})
+    assert [s["session_id"] for s in sessions] == ["c", "a"]
+
+    sessions, _ = store.list_sessions("u1", {"planet": "naboo", "profession": "medic"})
+    assert [s["session_id"] for s in sessions] == ["c"]
+
+
+def test_keyset_pagination(tmp_path):
+    store = _store(tmp_path)
+
+    page1, cursor = store.list_sessions("u1", {"limit": 2})
+    page2, last = store.list_sessions("u1", {"limit": 2}, cursor)
+
+    assert [s["session_id"] for s in page1] == ["c", "b"]
+    assert [s["session_id"] for s in page2] == ["a"]
+    assert last is None
+
+
+def test_statistics_are_sql_aggregates(tmp_path):
+    store = _store(tmp_path)
+    stats = store.statistics("u1")
+
+    assert stats["total_sessions"] == 3
+    assert stats["total_xp_gained"] == 500
+    assert stats["total_stuck_events"] == 3
+    assert sorted(stats["planets"]) == ["naboo", "tatooine"]
+    assert sorted(stats["professions"]) == ["medic", "rifleman"]
+    assert store.statistics("u1", {"profession": "rifleman"})["total_xp_gained"] == 300
+
+
+def test_replace_and_delete_keep_side_tables_in_sync(tmp_path):
+    store = _store(tmp_path)
+    store.insert_session("u1", _session("a", "2026-01-01T10:00", ["corellia"], ["medic"]))
+    assert store.list_sessions("u1", {"planet": "tatooine"})[0][0]["session_id"] == "c"
+
+    assert store.delete_session("u1", "c")
+    assert store.list_sessions("u1", {"planet": "tatooine"})[0] == []
+
+
+def test_existing_database_is_migrated(tmp_path):
+    db = tmp_path / "old.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT UNIQUE NOT NULL, "
+            "user_hash TEXT NOT NULL, character_name TEXT, start_time TEXT, end_time TEXT, "
+            "duration_minutes REAL, session_data TEXT, upload_timestamp TEXT, created_at TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO sessions (session_id, user_hash, start_time, session_data) VALUES (?, ?, ?, ?)",
+            ["old", "u1", "2025-01-01", '{"session_id": "old", "location_data": '
+             '{"location_events": [{"planet": "lok"}]}}'],
+        )
+
+    store = SessionStore(db)
+    assert [s["session_id"] for s in store.list_sessions("u1", {"planet": "lok"})[0]] == ["old"]
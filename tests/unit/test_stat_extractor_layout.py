@@ -0,0 +1,154 @@
+"""Tests for the layout-aware, batched stat panel reading."""
+
+import importlib
+import sys
+
+import pytest
+
+# conftest stubs numpy; panel images need the real library
+_stub = sys.modules.pop("numpy", None)
+try:
+    np = pytest.importorskip("numpy")
+    for _name in ("ocr.panel_layout", "ocr.stat_extractor"):
+        sys.modules.pop(_name, None)
+    stat_extractor = importlib.import_module("ocr.stat_extractor")
+finally:
+    if _stub is not None:
+        sys.modules["numpy"] = _stub
+
+StatExtractor = stat_extractor.StatExtractor
+StatType = stat_extractor.StatType
+
+STATS_ROWS = [("Health:", "1500/1500"), ("Action:", "640/800"), ("Mind:", "600/600"), ("Luck:", "25")]
+ARMOR_ROWS = [
+    ("Energy Resistance:", "45"),
+    ("Kinetic Resistance:", "25"),
+    ("Stun Resistance:", "0"),
+    ("Energy Tape:", "15"),
+    ("Tape Acid:", "1"),
+]
+
+
+def _draw(image, x, y, text):
+    """Draw words as columns of character codes, 8 pixels tall."""
+    for word in text.split():
+        codes = [ord(ch) for ch in word]
+        image[y:y + 8, x:x + len(codes)] = codes
+        x += len(codes) + 4
+
+
+def _panel(rows, shape=(300, 400)):
+    image = np.zeros(shape, dtype=np.uint8)
+    for i, (label, value) in enumerate(rows):
+        _draw(image, 5, 10 + i * 16, label)
+        _draw(image, 200, 10 + i * 16, value)
+    return image
+
+
+def _screen(stats_rows=STATS_ROWS, armor_rows=ARMOR_ROWS):
+    screen = np.zeros((1080, 1920), dtype=np.uint8)
+    screen[100:400, 100:500] = _panel(stats_rows)
+    screen[100:400, 500:900] = _panel(armor_rows)
+    return screen
+
+
+class FakeOCR:
+    """Reads back what ``_draw`` wrote, honouring a character whitelist."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, image, config):
+        self.calls.append((image.shape, config))
+        allowed = config.split("tessedit_char_whitelist=")[1] if "whitelist=" in config else None
+        data = {key: [] for key in ("text", "left", "top", "width", "height", "conf",
+                                    "block_num", "par_num", "line_num")}
+        inked = np.flatnonzero(image.any(axis=1))
+        bands = np.split(inked, np.flatnonzero(np.diff(inked) > 1) + 1) if inked.size else []
+        for line, band in enumerate(bands, 1):
+            top, bottom = int(band[0]), int(band[-1]) + 1
+            row = image[top]
+            cols = np.flatnonzero(row)
+            for run in np.split(cols, np.flatnonzero(np.diff(cols) > 1) + 1):
+                text = "".join(chr(v) for v in row[run])
+                if allowed is not None:
+                    text = "".join(ch for ch in text if ch in allowed)
+                for key, value in (("text", text), ("left", int(run[0])), ("top", top),
+                                   ("width", len(run)), ("height", bottom - top), ("conf", 91),
+                                   ("block_num", 1), ("par_num", 1), ("line_num", line)):
+                    data[key].append(value)
+        return data
+
+
+def _extractor(screens):
+    ocr = FakeOCR()
+    frames = iter(screens)
+    return StatExtractor(capture=lambda: next(frames), word_boxes=ocr), ocr
+
+
+def test_panels_read_from_one_capture_and_one_value_pass():
+    extractor, ocr = _extractor([_screen()])
+
+    panels = extractor.extract_panels(["stats_panel", "armor_panel"], "Kessa")
+
+    stats = panels["stats_panel"]
+    assert (stats[StatType.HEALTH].current_value, stats[StatType.HEALTH].max_value) == (1500, 1500)
+    assert stats[StatType.ACTION].percentage == 80.0
+    assert stats[StatType.LUCK].current_value == 25
+    armor = panels["armor_panel"]
+    assert {t: s.current_value for t, s in armor.items()} == {
+        StatType.RESIST_ENERGY: 45,
+        StatType.RESIST_KINETIC: 25,
+        StatType.RESIST_STUN: 0,
+        StatType.TAPE_ENERGY: 15,
+        StatType.TAPE_ACID: 1,
+    }
+    assert armor[StatType.RESIST_ENERGY].source == "armor_panel"
+    assert extractor.layout_stats() == {"captures": 1, "layout_passes": 2, "value_passes": 1,
+                                        "panels_read": 2, "cache_hits": 0}
+    value_shape, value_config = ocr.calls[-1]
+    assert "tessedit_char_whitelist=0123456789/" in value_config
+    assert value_shape[1] < 400  # only the value column
+
+
+def test_cache_holds_until_panel_pixels_change():
+    changed = [("Health:", "12000/12500")] + STATS_ROWS[1:]
+    extractor, ocr = _extractor([_screen(), _screen(), _screen(changed)])
+    extractor.extract_panels(character="Kessa")
+    calls = len(ocr.calls)
+
+    again = extractor.extract_panels(character="Kessa")
+    assert len(ocr.calls) == calls
+    assert again["stats_panel"][StatType.HEALTH].current_value == 1500
+
+    updated = extractor.extract_panels(character="Kessa")
+    assert len(ocr.calls) == calls + 1  # value pass only, layout reused
+    health = updated["stats_panel"][StatType.HEALTH]
+    assert (health.current_value, health.max_value) == (12000, 12500)
+    assert updated["armor_panel"][StatType.RESIST_ENERGY].current_value == 45
+    assert extractor.layout_stats()["cache_hits"] == 5  # blank character_sheet included
+
+
+def test_cache_is_per_character():
+    screen = _screen()
+    extractor, ocr = _extractor([])
+    extractor.extract_panels(["stats_panel"], "Kessa", screen=screen)
+    extractor.extract_panels(["stats_panel"], "Durn", screen=screen)
+    extractor.extract_panels(["stats_panel"], "Kessa", screen=screen)
+
+    assert extractor.layout_stats()["value_passes"] == 2
+    extractor.invalidate_panel_cache("Kessa")
+    extractor.extract_panels(["stats_panel"], "Kessa", screen=screen)
+    assert extractor.layout_stats()["value_passes"] == 3
+
+
+def test_single_panel_layout_mode_and_labels():
+    extractor, _ = _extractor([_screen()])
+
+    stats = extractor.extract_stats_from_panel("stats_panel", mode="layout", character="Kessa")
+
+    assert set(stats) == {StatType.HEALTH, StatType.ACTION, StatType.MIND, StatType.LUCK}
+    assert stat_extractor.stat_type_for_label("Heat Resistance") is StatType.RESIST_HEAT
+    assert stat_extractor.stat_type_for_label("Tape Cold") is StatType.TAPE_COLD
+    assert stat_extractor.stat_type_for_label("HP") is StatType.HEALTH
+    assert stat_extractor.stat_type_for_label("Credits") is None
@@ -0,0 +1,111 @@
+"""Tests for the region-scoped, event-driven text state monitor."""
+
+from src.state.text_monitor import PhraseAutomaton, SharedTextCache, TextStateMonitor
+
+
+class Frame:
+    """Minimal image: pixels are the OCR text itself."""
+
+    def __init__(self, text):
+        self.text = text
+        self.shape = (1, len(text))
+
+    def tobytes(self):
+        return self.text.encode()
+
+
+class Screen:
+    def __init__(self, regions):
+        self.regions = dict(regions)
+        self.ocr_calls = 0
+
+    def capture(self, region):
+        return Frame(self.regions.get(region, ""))
+
+    def extract_text(self, image):
+        self.ocr_calls += 1
+        return image.text
+
+
+def _monitor(screen, callbacks, **kwargs):
+    kwargs.setdefault("text_cache", None)
+    return TextStateMonitor(callbacks, capture=screen.capture, extract_text=screen.extract_text, **kwargs)
+
+
+def test_automaton_finds_overlapping_phrases():
+    automaton = PhraseAutomaton(["he", "she", "his", "hers", "quest accepted"])
+    assert automaton.find("ushers") == {0, 1, 3}
+    assert automaton.find("quest accepted!") == {4}
+    assert automaton.find("nothing") == set()
+
+
+def test_callbacks_fire_on_transitions_only():
+    screen = Screen({None: "Quest Accepted"})
+    fired = []
+    monitor = _monitor(screen, {"quest accepted": lambda: fired.append("quest")})
+
+    for _ in range(3):
+        monitor.tick()
+    assert fired == ["quest"]
+
+    screen.regions[None] = "idle"
+    monitor.tick()
+    screen.regions[None] = "quest accepted again"
+    monitor.tick()
+    assert fired == ["quest", "quest"]
+
+
+def test_unchanged_pixels_skip_ocr():
+    screen = Screen({None: "mission board"})
+    monitor = _monitor(screen, {"mission board": lambda: None})
+
+    first = monitor.tick()
+    second = monitor.tick()
+
+    assert (first.ocr_calls, second.ocr_calls) == (1, 0)
+    assert second.unchanged == 1
+    assert monitor.present == {"mission board"}
+    assert monitor.tick_stats()["ocr_skip_rate"] == 0.5
+
+
+def test_phrases_use_their_own_sub_regions():
+    screen = Screen({(0, 0, 10, 10): "error", (50, 50, 10, 10): "quest completed"})
+    fired = []
+    monitor = _monitor(
+        screen,
+        {"error": lambda: fired.append("error"), "quest completed": lambda: fired.append("done")},
+        region=(0, 0, 10, 10),
+        regions={"quest completed": (50, 50, 10, 10)},
+    )
+
+    timing = monitor.tick()
+
+    assert timing.regions == 2
+    assert sorted(fired) == ["done", "error"]
+
+
+def test_monitors_share_ocr_for_identical_pixels():
+    screen = Screen({None: "quest accepted"})
+    cache = SharedTextCache()
+    first = _monitor(screen, {"quest": lambda: None}, text_cache=cache)
+    second = _monitor(screen, {"accepted": lambda: None}, text_cache=cache)
+
+    first.tick()
+    timing = second.tick()
+
+    assert screen.ocr_calls == 1
+    assert timing.cache_hits == 1
+    assert second.present == {"accepted"}
+
+
+def test_callbacks_added_later_are_compiled():
+    screen = Screen({None: "error: target lost"})
+    callbacks = {"quest": lambda: None}
+    fired = []
+    monitor = _monitor(screen, callbacks)
+    monitor.tick()
+
+    callbacks["target lost"] = lambda: fired.append("lost")
+    monitor.tick()
+
+    assert fired == ["lost"]
@@ -0,0 +1,226 @@
+"""Tests for resumable/segmented update downloads and delta staging."""
+
+import hashlib
+import importlib
+import json
+import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+
+from updater.download_engine import (
+    DownloadEngine, DownloadError, PACKAGE_MANIFEST, UnsafePathError, install_path
+)
+
+
+class PackageServer:
+    """Local HTTP server with Range/ETag support and injectable failures."""
+
+    def __init__(self, packages, ranges=True):
+        self.packages = packages
+        self.ranges = ranges
+        self.fail_after = None  # drop the next GET after this many bytes
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _headers(self, body, status=200, extra=None):
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", '"%s"' % hashlib.md5(server.packages[self.path]).hexdigest())
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                for key, value in (extra or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+
+            def do_HEAD(self):
+                if self.path not in server.packages:
+                    self.send_error(404)
+                    return
+                self._headers(server.packages[self.path])
+
+            def do_GET(self):
+                if self.path not in server.packages:
+                    self.send_error(404)
+                    return
+                data = server.packages[self.path]
+                range_header = self.headers.get("Range")
+                server.requests.append(range_header)
+                if range_header and server.ranges:
+                    start, end = range_header.split("=")[1].split("-")
+                    start, end = int(start), int(end or len(data) - 1)
+                    body = data[start:end + 1]
+                    self._headers(body, 206, {
+                        "Content-Range": f"bytes {start}-{end}/{len(data)}"
+                    })
+                else:
+                    body = data
+                    self._headers(body)
+                if server.fail_after is not None:
+                    cut, server.fail_after = server.fail_after, None
+                    self.wfile.write(body[:cut])
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+                    return
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(300_000)
+
+
+@pytest.fixture
+def server(payload):
+    server = PackageServer({"/pkg.zip": payload})
+    yield server
+    server.close()
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_single_stream_download_hashes_while_streaming(server, payload, tmp_path):
+    engine = DownloadEngine(segments=1, chunk_size=8192)
+    result = engine.download(server.url + "/pkg.zip", tmp_path / "pkg.zip",
+                             expected_sha256=sha256(payload))
+
+    assert result.sha256 == sha256(payload)
+    assert (tmp_path / "pkg.zip").read_bytes() == payload
+    assert not (tmp_path / "pkg.zip.part").exists()
+
+
+def test_parallel_segments(server, payload, tmp_path):
+    engine = DownloadEngine(segments=4, min_segment_size=50_000, chunk_size=4096)
+    result = engine.download(server.url + "/pkg.zip", tmp_path / "pkg.zip",
+                             expected_sha256=sha256(payload))
+
+    assert result.segments == 4
+    assert (tmp_path / "pkg.zip").read_bytes() == payload
+    assert len([r for r in server.requests if r]) == 4
+
+
+def test_interrupted_download_resumes_with_range(server, payload, tmp_path):
+    server.fail_after = 100_000
+    engine = DownloadEngine(segments=1, chunk_size=4096, state_interval=1)
+    result = engine.download(server.url + "/pkg.zip", tmp_path / "pkg.zip",
+                             expected_sha256=sha256(payload))
+
+    assert (tmp_path / "pkg.zip").read_bytes() == payload
+    resumed_from = int(server.requests[-1].split("=")[1].split("-")[0])
+    assert resumed_from > 0
+
+
+def test_partial_file_resumes_across_engines(server, payload, tmp_path):
+    server.fail_after = 120_000
+    engine = DownloadEngine(segments=1, chunk_size=4096, max_retries=1, state_interval=1)
+    with pytest.raises(DownloadError):
+        engine.download(server.url + "/pkg.zip", tmp_path / "pkg.zip")
+    assert (tmp_path / "pkg.zip.part.json").exists()
+
+    result = DownloadEngine(segments=1).download(
+        server.url + "/pkg.zip", tmp_path / "pkg.zip", expected_sha256=sha256(payload)
+    )
+    assert result.resumed_bytes > 0
+    assert (tmp_path / "pkg.zip").read_bytes() == payload
+
+
+def test_checksum_mismatch_and_server_without_ranges(payload, tmp_path):
+    server = PackageServer({"/pkg.zip": payload}, ranges=False)
+    try:
+        engine = DownloadEngine(segments=4, min_segment_size=10_000)
+        with pytest.raises(DownloadError):
+            engine.download(server.url + "/pkg.zip", tmp_path / "bad.zip", expected_sha256="0" * 64)
+
+        result = engine.download(server.url + "/pkg.zip", tmp_path / "pkg.zip",
+                                 expected_sha256=sha256(payload))
+        assert result.segments == 1
+    finally:
+        server.close()
+
+
+def make_package(path, files, removed=(), include=None):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in include if include is not None else files:
+            zf.writestr(name, files[name])
+        zf.writestr(PACKAGE_MANIFEST, json.dumps({
+            "files": {name: sha256(content) for name, content in files.items()},
+            "removed": list(removed),
+        }))
+
+
+def make_version(update_client):
+    return update_client.VersionInfo(
+        version="2.0.0", build_number=2, release_date="", channel=update_client.UpdateChannel.STABLE,
+        download_url="", file_size=0, checksum="", changelog=[], is_mandatory=False,
+        min_compatible_version="1.0.0"
+    )
+
+
+def test_delta_package_replaces_only_changed_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    update_client = importlib.import_module("updater.update_client")
+    client = update_client.UpdateClient(config_path="config/update.json")
+    Path("app").mkdir()
+    Path("app/same.py").write_bytes(b"same")
+    Path("app/old.py").write_bytes(b"old")
+    Path("app/gone.py").write_bytes(b"gone")
+
+    files = {"app/same.py": b"same", "app/old.py": b"new", "app/added.py": b"added"}
+    make_package(client.update_dir / "update_2.0.0_ready.zip", files,
+                 removed=["app/gone.py"], include=["app/old.py", "app/added.py"])
+    version = make_version(update_client)
+
+    assert client.stage_update(version)
+    manifest = json.loads((client.update_dir / "update_manifest.json").read_text())
+    assert manifest["changed_files"] == ["app/added.py", "app/old.py"]
+    assert sorted(p.name for p in (client.update_dir / "staging").rglob("*.py")) == ["added.py", "old.py"]
+
+    same_mtime = Path("app/same.py").stat().st_mtime_ns
+    assert client.apply_update()
+    assert Path("app/old.py").read_bytes() == b"new"
+    assert Path("app/added.py").read_bytes() == b"added"
+    assert not Path("app/gone.py").exists()
+    assert Path("app/same.py").stat().st_mtime_ns == same_mtime
+
+
+def test_manifest_paths_must_stay_inside_the_install(tmp_path, monkeypatch):
+    root = tmp_path / "install"
+    (root / "app").mkdir(parents=True)
+    (tmp_path / "outside.py").write_bytes(b"keep")
+    (root / "app" / "link").symlink_to(tmp_path)
+
+    assert install_path(root, "app/new.py") == (root / "app" / "new.py").resolve()
+    for path in ("../outside.py", "app/../../outside.py", "/etc/passwd", "C:\\evil.py",
+                 "app\\..\\..\\outside.py", "app/link/outside.py", ""):
+        with pytest.raises(UnsafePathError):
+            install_path(root, path)
+
+    monkeypatch.chdir(root)
+    update_client = importlib.import_module("updater.update_client")
+    client = update_client.UpdateClient(config_path="config/update.json")
+    make_package(client.update_dir / "update_2.0.0_ready.zip", {"app/ok.py": b"ok"},
+                 removed=["../outside.py"])
+
+    assert not client.stage_update(make_version(update_client))
+    assert "Unsafe path" in client.update_progress.error_message
+    assert (tmp_path / "outside.py").read_bytes() == b"keep"
@@ -0,0 +1,98 @@
+"""Tests for the incrementally maintained vote tallies."""
+
+from api.vote_tally import ReadCache, VoteTallyStore, etag_matches
+
+
+def test_votes_update_counters_and_rankings():
+    store = VoteTallyStore()
+    store.record_vote("v1", "build", "b1", "thumbs_up")
+    store.record_vote("v2", "build", "b1", "thumbs_up")
+    store.record_vote("v3", "build", "b2", "thumbs_up")
+    store.record_vote("v4", "build", "b3", "thumbs_down")
+    store.record_vote("v5", "guide", "g1", "neutral")
+
+    top = store.top("build", limit=2)
+    assert [e["content_id"] for e in top] == ["b1", "b2"]
+    assert top[0]["score"] == 2 and top[0]["popularity_rank"] == 1
+    assert store.popularity_rank("build", "b3") == 3
+
+    # Changing a vote moves it rather than double counting
+    store.record_vote("v3", "build", "b2", "thumbs_down")
+    assert store.get("build", "b2").total_votes == 1
+    assert [e["content_id"] for e in store.top("build")] == ["b1", "b2", "b3"]
+
+    stats = store.statistics()
+    assert stats["total_votes"] == 5
+    assert stats["active_votes"] == 5
+    assert stats["total_summaries"] == 4
+    assert stats["content_breakdown"] == {"build": 4, "guide": 1}
+
+
+def test_delete_and_flag_adjust_tallies():
+    store = VoteTallyStore()
+    for vote_id in ("o1", "o2", "o3"):
+        store.load_vote(vote_id, "build", "old", "thumbs_up")
+    store.record_vote("v1", "build", "b1", "thumbs_up")
+    store.flag_vote("v1")
+    assert store.statistics()["flagged_votes"] == 1
+
+    assert store.delete_vote("v1")
+    assert store.get("build", "b1").total_votes == 0
+    assert [e["content_id"] for e in store.top("build")] == ["old"]
+    assert store.statistics()["flagged_votes"] == 0
+
+    assert not store.delete_vote("unknown")
+    assert store.stale
+
+
+def test_min_votes_and_etag_versions():
+    store = VoteTallyStore()
+    store.load_vote("a1", "build", "b1", "thumbs_up")
+    store.load_vote("a2", "build", "b2", "thumbs_up")
+    store.load_vote("a3", "build", "b2", "thumbs_down")
+    assert [e["content_id"] for e in store.top("build", min_votes=2)] == ["b2"]
+
+    build_tag = store.etag("build")
+    guide_tag = store.etag("guide")
+    store.record_vote("v1", "build", "b1", "thumbs_up")
+    assert store.etag("build") != build_tag
+    assert store.etag("guide") == guide_tag
+
+
+def test_loaded_records_keep_flags_and_absorb_revotes():
+    store = VoteTallyStore()
+    store.load_vote("v1", "build", "b1", "thumbs_up", status="flagged")
+    store.load_vote("v2", "build", "b1", "thumbs_up")
+    store.load_vote("v3", "build", "b1", "thumbs_down", status="deleted")
+
+    stats = store.statistics()
+    assert (stats["total_votes"], stats["active_votes"], stats["flagged_votes"]) == (3, 1, 1)
+
+    # A re-vote after a restart replaces the stored vote
+    store.record_vote("v2", "build", "b1", "thumbs_down")
+    tally = store.get("build", "b1")
+    assert (tally.thumbs_up, tally.thumbs_down, tally.total_votes) == (1, 1, 2)
+    assert store.delete_vote("v1") and store.statistics()["flagged_votes"] == 0
+    assert store.delete_vote("v3") and not store.stale
+
+
+def test_if_none_match_compares_whole_tags():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"abc"', '"x", W/"abc"')
+    assert etag_matches('"abc"', '*')
+    assert not etag_matches('"abc"', '"abcd"')
+    assert not etag_matches('"ab"', '"abc"')
+    assert not etag_matches('"abc"', '')
+
+
+def test_read_cache_expires_and_tracks_version():
+    now = [0.0]
+    cache = ReadCache(ttl=5, clock=lambda: now[0])
+    body, etag = cache.put("/top/build", "v1", {"a": 1})
+
+    assert cache.get("/top/build", "v1") == (body, etag)
+    assert cache.get("/top/build", "v2") is None
+
+    cache.put("/top/build", "v2", {"a": 2})
+    now[0] = 6.0
+    assert cache.get("/top/build", "v2") is None
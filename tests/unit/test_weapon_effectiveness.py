@@ -0,0 +1,114 @@
+"""Tests for the precomputed weapon effectiveness matrix."""
+
+import importlib
+import random
+import sys
+
+import pytest
+
+# conftest stubs numpy for modules that only need it importable; the matrix
+# needs the real library, so import it with numpy and restore the stub.
+_stub = sys.modules.pop("numpy", None)
+try:
+    np = pytest.importorskip("numpy")
+    sys.modules.pop("modules.weapon_effectiveness", None)
+    effectiveness = importlib.import_module("modules.weapon_effectiveness")
+finally:
+    if _stub is not None:
+        sys.modules["numpy"] = _stub
+
+EffectivenessMatrix = effectiveness.EffectivenessMatrix
+
+
+class Weapon:
+    def __init__(self, damage_type, range, condition=100.0, current_ammo=30):
+        self.damage_type = damage_type
+        self.range = range
+        self.condition = condition
+        self.current_ammo = current_ammo
+
+
+class Resistance:
+    def __init__(self, **values):
+        for column in effectiveness.RESISTANCE_COLUMNS:
+            setattr(self, f"{column}_resistance", values.get(column, 0.0))
+
+
+def reference_score(weapon, resistances, enemy_type, distance):
+    """The swap system's original per-weapon calculation."""
+    score = 1.0
+    if distance > weapon.range:
+        score *= 0.3
+    elif distance < weapon.range * 0.3:
+        score *= 0.8
+    if enemy_type in resistances and weapon.damage_type in ("kinetic", "energy", "explosive", "melee"):
+        score *= 1.0 - getattr(resistances[enemy_type], f"{weapon.damage_type}_resistance")
+    score *= weapon.condition / 100.0
+    if weapon.current_ammo == 0:
+        score *= 0.1
+    return max(0.0, min(1.0, score))
+
+
+@pytest.fixture
+def setup():
+    rng = random.Random(113)
+    damage_types = list(effectiveness.RESISTANCE_COLUMNS)
+    weapons = {
+        f"w{i}": Weapon(rng.choice(damage_types), rng.choice([20, 50, 100]),
+                        condition=rng.uniform(20, 100), current_ammo=rng.choice([0, 5, 30]))
+        for i in range(12)
+    }
+    resistances = {
+        name: Resistance(**{c: rng.uniform(0, 0.6) for c in damage_types})
+        for name in ("stormtrooper", "droid", "beast", "boss")
+    }
+    return weapons, resistances
+
+
+def test_scores_match_reference(setup):
+    weapons, resistances = setup
+    matrix = EffectivenessMatrix(weapons, resistances)
+
+    for enemy in ["stormtrooper", "droid", "boss", "unknown", None]:
+        for distance in [5.0, 25.0, 60.0, 150.0]:
+            scores = matrix.scores(enemy, distance)
+            expected = [reference_score(w, resistances, enemy, distance) for w in weapons.values()]
+            assert np.allclose(scores, expected)
+
+
+def test_best_is_first_highest_scoring_weapon(setup):
+    weapons, resistances = setup
+    matrix = EffectivenessMatrix(weapons, resistances)
+    rows = matrix.indices(["w3", "w7", "missing", "w1"])
+
+    assert len(rows) == 3
+    name, score = matrix.best("droid", 40.0, rows)
+    candidates = {n: reference_score(weapons[n], resistances, "droid", 40.0) for n in ["w3", "w7", "w1"]}
+    assert np.isclose(score, max(candidates.values()))
+    assert name == max(candidates, key=candidates.get)
+    assert matrix.best("droid", 40.0, matrix.indices([])) == (None, 0.0)
+
+
+def test_condition_and_ammo_updates_without_rebuild(setup):
+    weapons, resistances = setup
+    matrix = EffectivenessMatrix(weapons, resistances)
+    weapons["w0"].condition, weapons["w0"].current_ammo = 50.0, 0
+    matrix.set_condition("w0", 50.0)
+    matrix.set_ammo("w0", 0)
+
+    assert np.isclose(matrix.score("w0", "beast", 30.0),
+                      reference_score(weapons["w0"], resistances, "beast", 30.0))
+    assert matrix.score("nope", "beast", 30.0) == 0.0
+
+
+def test_score_enemies_batches_per_enemy_rows(setup):
+    weapons, resistances = setup
+    matrix = EffectivenessMatrix(weapons, resistances)
+    group = ["stormtrooper", "beast", "unknown", "boss"]
+    distances = [10.0, None, 80.0, 200.0]
+
+    batch = matrix.score_enemies(group, distances)
+
+    assert batch.shape == (len(group), len(weapons))
+    for row, (enemy, distance) in enumerate(zip(group, distances)):
+        assert np.allclose(batch[row], matrix.scores(enemy, distance))
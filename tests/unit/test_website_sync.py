@@ -0,0 +1,112 @@
+"""Tests for incremental SWGDB website sync and content-addressed backups."""
+
+import json
+
+import pytest
+
+pytest.importorskip("android_ms11.utils.logging_utils")
+
+from website_sync import sync_to_swgdb
+from website_sync.sync_to_swgdb import SWGDBSync, WebsiteConfig
+
+
+@pytest.fixture
+def sync(tmp_path):
+    config = WebsiteConfig(
+        target_directory=str(tmp_path / "site"),
+        backup_directory=str(tmp_path / "backups"),
+        allowed_file_types=[".json", ".md"],
+        max_file_size=1024 * 1024,
+        sync_interval=60,
+        enable_backup=True,
+        enable_validation=True,
+        copy_workers=4,
+        backups_to_keep=2,
+    )
+    handler = SWGDBSync(config)
+    handler.export_dir = tmp_path / "exported"
+    handler.export_dir.mkdir()
+    return handler
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def count_hashes(monkeypatch):
+    calls = []
+    original = sync_to_swgdb.file_sha256
+
+    def counting(path, *args, **kwargs):
+        calls.append(path.name)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(sync_to_swgdb, "file_sha256", counting)
+    return calls
+
+
+def test_unchanged_files_are_not_rehashed(sync, monkeypatch):
+    for i in range(20):
+        write(sync.export_dir / f"item_{i}.json", {"id": i})
+
+    status = sync.sync_exported_data()
+    assert status.success_count == 20
+    assert not list(sync.target_dir.glob(".*.tmp"))
+
+    calls = count_hashes(monkeypatch)
+    # The hash manifest persists across instances
+    handler = SWGDBSync(sync.config)
+    handler.export_dir = sync.export_dir
+    status = handler.sync_exported_data()
+    assert status.success_count == 0
+    assert calls == []
+
+    write(sync.export_dir / "item_3.json", {"id": 3, "changed": True})
+    status = handler.sync_exported_data()
+    assert status.files_synced == ["item_3.json"]
+    assert calls == ["item_3.json"]
+    assert json.loads((sync.target_dir / "item_3.json").read_text())["changed"]
+
+
+def test_only_changed_files_are_validated(sync):
+    write(sync.export_dir / "good.json", {"ok": True})
+    sync.sync_exported_data()
+
+    (sync.export_dir / "bad.json").write_text("{not json")
+    status = sync.sync_exported_data()
+    assert status.status == "failed"
+    assert len(status.error_messages) == 1 and "bad.json" in status.error_messages[0]
+
+
+def test_backups_are_deduplicated_and_restorable(sync):
+    write(sync.export_dir / "a.json", {"v": 1})
+    write(sync.export_dir / "b.json", {"v": 1})
+    sync.sync_exported_data()
+
+    write(sync.export_dir / "a.json", {"v": 2})
+    sync.sync_exported_data()
+    write(sync.export_dir / "c.json", {"v": 3})
+    sync.sync_exported_data()
+
+    # b.json and a.json's original content share a single blob
+    blobs = list(sync.objects_dir.glob("*/*"))
+    assert len(blobs) == 2
+    backups = sync.list_backups()
+    assert len(backups) == 2
+
+    assert sync.restore_backup(backups[-1])
+    assert json.loads((sync.target_dir / "a.json").read_text()) == {"v": 1}
+    assert not (sync.target_dir / "c.json").exists()
+
+
+def test_old_backups_and_unreferenced_blobs_are_removed(sync):
+    for version in range(5):
+        write(sync.export_dir / "a.json", {"v": version})
+        sync.sync_exported_data()
+
+    assert len(sync.list_backups()) == 2
+    referenced = set()
+    for name in sync.list_backups():
+        snapshot = json.loads((sync.snapshots_dir / f"{name}.json").read_text())
+        referenced.update(snapshot["files"].values())
+    assert {blob.name for blob in sync.objects_dir.glob("*/*")} == referenced
@@ -0,0 +1,122 @@
+"""Tests for the time-indexed XP event store and its use by the XP tracker."""
+
+from datetime import datetime
+
+import pytest
+
+from modules.xp_event_store import XPEventStore, profession_skill_key
+
+T0 = datetime(2025, 8, 4, 12, 0, 0).timestamp()
+
+
+def _fill(store, gains):
+    for offset, amount, skill, zone, source in gains:
+        store.append(T0 + offset, amount, skill, "marksman", zone=zone, source=source)
+
+
+def test_xp_since_matches_a_scan():
+    store = XPEventStore()
+    gains = [(i * 90, 10 + i, "rifle", "naboo", "combat") for i in range(100)]
+    _fill(store, gains)
+
+    for cutoff in (T0 - 1, T0, T0 + 900, T0 + 4500, T0 + 9000):
+        expected = sum(amount for offset, amount, *_ in gains if T0 + offset > cutoff)
+        assert store.xp_since(cutoff) == expected
+    assert store.rate_per_hour(2, T0 + 99 * 90) == store.xp_since(T0 + 99 * 90 - 7200) / 2
+
+
+def test_rolling_window_per_key():
+    store = XPEventStore(window_seconds=3600)
+    _fill(store, [
+        (0, 100, "rifle", "naboo", "combat"),
+        (1800, 50, "pistol", "tatooine", "quest"),
+        (3000, 25, "rifle", "naboo", "quest"),
+    ])
+
+    assert store.window_total(T0 + 3000) == 175
+    assert store.window_total(T0 + 3600, "skill", "rifle") == 25  # first gain expired
+    assert store.window_total(T0 + 3600, "zone", "tatooine") == 50
+    assert store.window_total(T0 + 7200) == 0
+    assert store.totals("skill") == {"rifle": 125, "pistol": 50}
+    assert store.key_stats("source", "quest").events == 2
+    assert store.key_stats("skill", "rifle").quest_rate == 0.5
+
+
+def test_hourly_and_daily_buckets():
+    store = XPEventStore()
+    _fill(store, [
+        (0, 10, "rifle", None, "combat"),
+        (1200, 20, "rifle", None, "combat"),
+        (3600, 30, "rifle", None, "combat"),
+    ])
+
+    assert [xp for _, xp in store.hourly_series()] == [30, 30]
+    assert store.day_total(T0) == 60
+    times, cumulative = store.cumulative_series()
+    assert cumulative == [10, 30, 60]
+    assert times[0] == datetime.fromtimestamp(T0)
+
+
+def test_out_of_order_timestamps_are_clamped():
+    store = XPEventStore()
+    store.append(T0 + 10, 5, "rifle", "marksman")
+    store.append(T0, 7, "rifle", "marksman")
+
+    assert list(store.timestamps) == [T0 + 10, T0 + 10]
+    assert store.xp_since(T0 + 5) == 12
+
+
+def test_compaction_keeps_totals_and_window():
+    store = XPEventStore(window_seconds=600, max_events=50)
+    for i in range(500):
+        store.append(T0 + i * 60, 1, "rifle", "marksman")
+
+    assert len(store) < 100
+    assert store.total_xp == 500
+    assert store.window_total(T0 + 499 * 60) == 10
+    assert store.xp_since(T0 + 489 * 60) == 10
+    assert store.to_dict()["events"] == 500
+
+
+def test_slowdown_means():
+    store = XPEventStore()
+    for amount in [100] * 10 + [10] * 5:
+        store.append(T0, amount, "rifle", "marksman")
+
+    recent, historical = store.key_stats("skill", "rifle").recent_and_historical_means()
+    assert (recent, historical) == (10, 100)
+
+
+def test_shared_skill_names_are_split_by_profession():
+    store = XPEventStore()
+    store.append(T0, 100, "novice", "marksman")
+    store.append(T0 + 60, 30, "novice", "medic")
+
+    assert store.key_stats("skill", "novice").total_xp == 130
+    marksman = profession_skill_key("marksman", "novice")
+    assert store.key_stats("profession_skill", marksman).total_xp == 100
+    assert store.window_total(T0 + 120, "profession_skill", profession_skill_key("medic", "novice")) == 30
+
+
+def test_tracker_reads_store(tmp_path):
+    pytest.importorskip("android_ms11.utils.logging_utils")
+    from modules.experimental_xp_tracker import ExperimentalXPTracker
+
+    tracker = ExperimentalXPTracker(config_path=str(tmp_path / "xp_config.json"))
+    tracker.start_session("s1")
+    for _ in range(3):
+        tracker.record_xp_gain(100, "marksman", "combat_marksman_novice", source="combat", zone="naboo")
+    event = tracker.record_xp_gain(40, "medic", "science_medic_novice", source="quest", zone="talus")
+
+    assert event.xp_rate_per_hour == 300
+    assert tracker.calculate_xp_rate_per_hour() == 340
+    summary = tracker.generate_xp_summary()
+    assert summary["total_xp"] == 340
+    assert summary["xp_by_zone"] == {"naboo": 300, "talus": 40}
+    assert summary["xp_by_source"] == {"combat": 300, "quest": 40}
+    assert tracker.get_profession_analytics("medic").quest_completion_rate == 1.0
+
+    tracker.record_xp_gain(25, "medic", "combat_marksman_novice", source="quest", zone="talus")
+    shared = tracker.skill_progress["marksman_combat_marksman_novice"]
+    assert shared.progress_rate == 300 and shared.quest_completion_rate == 0.0
+    assert tracker.skill_progress["medic_combat_marksman_novice"].progress_rate == 25
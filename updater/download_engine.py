@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Download Engine for the MS11 Auto-Updater
+
+This module provides the transfer side of the updater:
+- HTTP Range resume from a ``.part`` file and its state sidecar
+- Optional parallel range segments on servers that accept ranges
+- SHA-256 computed while streaming (no second pass over the file)
+- Per-segment retries that continue from the last byte received
+
+It also holds the per-file manifest helpers used for delta packages.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Dict, List, Optional, Any, Callable
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Name of the per-file manifest inside update packages
+PACKAGE_MANIFEST = "files_manifest.json"
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or verified."""
+
+
+class UnsafePathError(ValueError):
+    """Raised when a package manifest names a path outside the install root."""
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a completed download."""
+    path: Path
+    size: int
+    sha256: str
+    resumed_bytes: int = 0
+    segments: int = 1
+
+
+class _Segment:
+    """Byte range ``[start, end]`` and how far it has been written.
+
+    ``end`` is ``None`` while the length is unknown (no Content-Length).
+    """
+
+    def __init__(self, start: int, end: Optional[int], position: Optional[int] = None):
+        self.start = start
+        self.end = end
+        self.position = start if position is None else position
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None and self.position > self.end
+
+    def to_list(self) -> List[int]:
+        return [self.start, self.end, self.position]
+
+
+class _OrderedHasher:
+    """SHA-256 over a file whose byte ranges may complete out of order.
+
+    Bytes that arrive exactly at the hashed frontier are hashed from memory
+    as they stream in; anything written ahead of it (later segments) is
+    read back from the file once the gap before it has been filled.
+    """
+
+    def __init__(self, path: Path, segments: List[_Segment]):
+        self.path = path
+        self.segments = segments
+        self.hashed_upto = 0
+        self._hash = hashlib.sha256()
+        self._lock = threading.Lock()
+
+    def _contiguous_end(self) -> int:
+        for segment in self.segments:
+            if not segment.done:
+                return segment.position
+        return self.segments[-1].end + 1 if self.segments else 0
+
+    def reset(self) -> None:
+        """Start over (the server sent the whole body again)."""
+        with self._lock:
+            self.hashed_upto = 0
+            self._hash = hashlib.sha256()
+
+    def _catch_up(self, limit: int) -> None:
+        if self.hashed_upto >= limit:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.hashed_upto)
+            while self.hashed_upto < limit:
+                block = f.read(min(1024 * 1024, limit - self.hashed_upto))
+                if not block:
+                    break
+                self._hash.update(block)
+                self.hashed_upto += len(block)
+
+    def update(self, offset: int, data: bytes) -> None:
+        """Note that ``data`` was written at ``offset``."""
+        with self._lock:
+            if offset == self.hashed_upto:
+                self._hash.update(data)
+                self.hashed_upto += len(data)
+            self._catch_up(self._contiguous_end())
+
+    def hexdigest(self) -> str:
+        with self._lock:
+            self._catch_up(self._contiguous_end())
+            return self._hash.hexdigest()
+
+
+class DownloadEngine:
+    """Resumable, optionally segmented HTTP downloader."""
+
+    def __init__(self,
+                 session: Optional[Any] = None,
+                 segments: int = 4,
+                 min_segment_size: int = 4 * 1024 * 1024,
+                 chunk_size: int = 64 * 1024,
+                 max_retries: int = 3,
+                 timeout: float = 300.0,
+                 state_interval: int = 64):
+        """Initialize the engine.
+
+        Parameters
+        ----------
+        session : requests.Session-like, optional
+            HTTP session (a new ``requests.Session`` by default)
+        segments : int
+            Maximum parallel range requests per download
+        min_segment_size : int
+            Files smaller than twice this are downloaded on one connection
+        chunk_size : int
+            Streaming read size in bytes
+        max_retries : int
+            Attempts per segment before the download fails
+        state_interval : int
+            Chunks between writes of the resume sidecar
+        """
+        self.session = session or requests.Session()
+        self.segments = max(1, segments)
+        self.min_segment_size = min_segment_size
+        self.chunk_size = chunk_size
+        self.max_retries = max(1, max_retries)
+        self.timeout = timeout
+        self.state_interval = state_interval
+
+    @staticmethod
+    def _part_paths(dest: Path):
+        return dest.with_name(dest.name + '.part'), dest.with_name(dest.name + '.part.json')
+
+    @staticmethod
+    def _load_state(state_path: Path, url: str, size: int,
+                    validator: Optional[str]) -> Optional[List[_Segment]]:
+        try:
+            state = json.loads(state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if state.get('url') != url or state.get('size') != size:
+            return None
+        if validator and state.get('validator') and state['validator'] != validator:
+            return None
+        return [_Segment(*seg) for seg in state.get('segments', [])]
+
+    @staticmethod
+    def _save_state(state_path: Path, url: str, size: int, validator: Optional[str],
+                    segments: List[_Segment]) -> None:
+        tmp = state_path.with_name(state_path.name + '.tmp')
+        tmp.write_text(json.dumps({
+            'url': url,
+            'size': size,
+            'validator': validator,
+            'segments': [seg.to_list() for seg in segments]
+        }))
+        os.replace(tmp, state_path)
+
+    def _probe(self, url: str) -> Dict[str, Any]:
+        """HEAD the URL for size, range support and a validator."""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            logger.debug(f"HEAD {url} failed: {e}")
+            return {'size': None, 'ranges': False, 'validator': None}
+        headers = response.headers
+        length = headers.get('Content-Length')
+        return {
+            'size': int(length) if length and length.isdigit() else None,
+            'ranges': headers.get('Accept-Ranges', '').lower() == 'bytes',
+            'validator': headers.get('ETag') or headers.get('Last-Modified')
+        }
+
+    def _plan(self, size: int, ranges: bool) -> List[_Segment]:
+        count = 1
+        if ranges and size >= 2 * self.min_segment_size:
+            count = min(self.segments, size // self.min_segment_size)
+        step = size // count
+        segments = []
+        for i in range(count):
+            start = i * step
+            end = size - 1 if i == count - 1 else start + step - 1
+            segments.append(_Segment(start, end))
+        return segments
+
+    def _fetch_segment(self, url: str, part_path: Path, segment: _Segment,
+                       hasher: _OrderedHasher, validator: Optional[str],
+                       ranged: bool, on_bytes: Callable[[int], None],
+                       checkpoint: Callable[[], None]) -> None:
+        attempts = 0
+        while not segment.done:
+            if not ranged and segment.position != segment.start:
+                # No range support: a retry has to start from the beginning
+                segment.position = segment.start
+                hasher.reset()
+            headers = {}
+            if ranged:
+                headers['Range'] = f'bytes={segment.position}-{segment.end}'
+                if validator:
+                    headers['If-Range'] = validator
+            try:
+                with self.session.get(url, headers=headers, stream=True,
+                                      timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    if ranged and response.status_code != 206:
+                        if segment.start != 0 or len(hasher.segments) > 1:
+                            raise DownloadError("Server ignored range request")
+                        # Full body: start this (only) segment over
+                        segment.position = 0
+                        hasher.reset()
+                    with open(part_path, 'r+b') as f:
+                        f.seek(segment.position)
+                        chunks = 0
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            if not chunk:
+                                continue
+                            if segment.end is not None:
+                                chunk = chunk[:segment.end + 1 - segment.position]
+                            offset = segment.position
+                            f.write(chunk)
+                            f.flush()
+                            segment.position += len(chunk)
+                            hasher.update(offset, chunk)
+                            on_bytes(len(chunk))
+                            chunks += 1
+                            if chunks % self.state_interval == 0:
+                                checkpoint()
+                            if segment.done:
+                                break
+                if segment.end is None:
+                    # Unknown length: the stream ending completes the download
+                    segment.end = segment.position - 1
+                if not segment.done:
+                    raise DownloadError("Connection closed before segment completed")
+            except DownloadError:
+                checkpoint()
+                attempts += 1
+                if attempts >= self.max_retries:
+                    raise
+            except Exception as e:
+                checkpoint()
+                attempts += 1
+                if attempts >= self.max_retries:
+                    raise DownloadError(f"Segment {segment.start}-{segment.end} failed: {e}")
+                logger.warning(f"Retrying segment at byte {segment.position}: {e}")
+
+    def download(self, url: str, dest: Path,
+                 expected_size: Optional[int] = None,
+                 expected_sha256: Optional[str] = None,
+                 progress: Optional[Callable[[int, int], None]] = None) -> DownloadResult:
+        """Download ``url`` to ``dest``, resuming a previous partial download.
+
+        Parameters
+        ----------
+        url : str
+            Package URL
+        dest : Path
+            Final file path; data is written to ``dest.part`` until verified
+        expected_size : int, optional
+            Size to use when the server does not report one
+        expected_sha256 : str, optional
+            Checksum the completed file must match
+        progress : callable, optional
+            Called as ``progress(downloaded_bytes, total_bytes)``
+
+        Returns
+        -------
+        DownloadResult
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path, state_path = self._part_paths(dest)
+
+        info = self._probe(url)
+        size = info['size'] or expected_size
+        validator = info['validator']
+        ranged = bool(info['ranges'] and size)
+
+        segments = None
+        if ranged and part_path.exists():
+            segments = self._load_state(state_path, url, size, validator)
+        if segments is None:
+            if size:
+                segments = self._plan(size, ranged)
+            else:
+                segments = [_Segment(0, None)]
+            with open(part_path, 'wb') as f:
+                if size:
+                    f.truncate(size)
+        resumed = sum(seg.position - seg.start for seg in segments)
+
+        hasher = _OrderedHasher(part_path, segments)
+        downloaded = [resumed]
+        lock = threading.Lock()
+
+        def on_bytes(count: int) -> None:
+            with lock:
+                downloaded[0] += count
+                total = downloaded[0]
+            if progress:
+                progress(total, size or 0)
+
+        def checkpoint() -> None:
+            if size and ranged:
+                with lock:
+                    self._save_state(state_path, url, size, validator, segments)
+
+        if resumed:
+            logger.info(f"Resuming download of {url} at {resumed} bytes")
+            if progress:
+                progress(resumed, size or 0)
+
+        pending = [seg for seg in segments if not seg.done]
+        if len(pending) <= 1:
+            for segment in pending:
+                self._fetch_segment(url, part_path, segment, hasher, validator,
+                                    ranged, on_bytes, checkpoint)
+        else:
+            errors: List[Exception] = []
+
+            def worker(segment: _Segment) -> None:
+                try:
+                    self._fetch_segment(url, part_path, segment, hasher, validator,
+                                        ranged, on_bytes, checkpoint)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [
+                threading.Thread(target=worker, args=(seg,), name=f"UpdateSegment-{i}", daemon=True)
+                for i, seg in enumerate(pending)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if errors:
+                raise errors[0]
+
+        actual_size = part_path.stat().st_size
+        if size and actual_size != size:
+            raise DownloadError(f"Size mismatch: expected {size}, got {actual_size}")
+
+        checksum = hasher.hexdigest()
+        if expected_sha256 and checksum != expected_sha256:
+            part_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise DownloadError("Checksum verification failed")
+
+        os.replace(part_path, dest)
+        state_path.unlink(missing_ok=True)
+        return DownloadResult(dest, actual_size, checksum, resumed, len(segments))
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileHashCache:
+    """Local file hashes keyed by relative path, reused while mtime/size match."""
+
+    def __init__(self, cache_path: Path, root: Path = Path('.')):
+        self.cache_path = Path(cache_path)
+        self.root = Path(root)
+        try:
+            self.entries: Dict[str, List[Any]] = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, relative_path: str) -> Optional[str]:
+        """Hash of the installed file, or ``None`` if it does not exist."""
+        path = self.root / relative_path
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cached = self.entries.get(relative_path)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            return cached[2]
+        digest = file_sha256(path)
+        self.entries[relative_path] = [stat.st_mtime, stat.st_size, digest]
+        return digest
+
+    def save(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        tmp.write_text(json.dumps(self.entries))
+        os.replace(tmp, self.cache_path)
+
+
+def install_path(root: Path, relative_path: str) -> Path:
+    """Resolve a manifest path under ``root``.
+
+    Absolute paths, drive-qualified paths and ``..`` parts are rejected, as
+    is anything that resolves (e.g. through a symlink) outside ``root``.
+    """
+    posix, windows = PurePosixPath(relative_path), PureWindowsPath(relative_path)
+    if (not relative_path or posix.is_absolute() or windows.drive or windows.root
+            or '..' in posix.parts or '..' in windows.parts):
+        raise UnsafePathError(f"Unsafe path in package manifest: {relative_path!r}")
+    base = Path(root).resolve()
+    target = (base / relative_path).resolve()
+    if target != base and base not in target.parents:
+        raise UnsafePathError(f"Package path escapes install root: {relative_path!r}")
+    return target
+
+
+def changed_files(manifest_files: Dict[str, str], hashes: FileHashCache) -> List[str]:
+    """Paths whose installed hash differs from the package manifest."""
+    return sorted(
+        relative_path for relative_path, digest in manifest_files.items()
+        if hashes.get(relative_path) != digest
+    )
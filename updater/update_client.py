@@ -6,6 +6,7 @@ This module provides seamless update functionality with support for:
 - Stable and canary update channels
 - Version checking and comparison
 - Secure download with hash verification
+- Resumable, parallel-range downloads and file-level delta packages
 - Staged application on next launch
 - Automatic rollback on failure
 - Dashboard integration for update status
@@ -29,6 +30,11 @@ from enum import Enum
 import threading
 import time
 
+from updater.download_engine import (
+    DownloadEngine, DownloadError, FileHashCache, PACKAGE_MANIFEST, changed_files, file_sha256,
+    install_path
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -66,6 +72,10 @@ class VersionInfo:
     changelog: List[str]
     is_mandatory: bool
     min_compatible_version: str
+    delta_base_version: Optional[str] = None
+    delta_download_url: Optional[str] = None
+    delta_file_size: int = 0
+    delta_checksum: Optional[str] = None
 
 
 @dataclass
@@ -137,6 +147,7 @@ class UpdateClient:
             "check_interval_hours": 24,
             "download_timeout_seconds": 300,
             "max_retry_attempts": 3,
+            "download_segments": 4,
             "keep_backups_count": 2,
             "update_servers": {
                 "stable": {
@@ -224,6 +235,7 @@ class UpdateClient:
             response.raise_for_status()
             
             version_data = response.json()
+            delta = version_data.get("delta") or {}
             available_version = VersionInfo(
                 version=version_data["version"],
                 build_number=version_data["build_number"],
@@ -234,7 +246,15 @@ class UpdateClient:
                 checksum=version_data["checksum"],
                 changelog=version_data["changelog"],
                 is_mandatory=version_data.get("is_mandatory", False),
-                min_compatible_version=version_data.get("min_compatible_version", "1.0.0")
+                min_compatible_version=version_data.get("min_compatible_version", "1.0.0"),
+                delta_base_version=delta.get("base_version"),
+                delta_download_url=(
+                    f"{server_config['base_url']}{server_config['download_endpoint']}"
+                    f"/{version_data['version']}/delta/{delta['base_version']}"
+                    if delta.get("base_version") else None
+                ),
+                delta_file_size=delta.get("file_size", 0),
+                delta_checksum=delta.get("checksum")
             )
             
             # Check if update is needed
@@ -307,8 +327,48 @@ class UpdateClient:
             
         return cleaned
             
+    def _download_engine(self) -> DownloadEngine:
+        """Create a download engine from the update configuration."""
+        return DownloadEngine(
+            segments=self.config.get("download_segments", 4),
+            max_retries=self.config.get("max_retry_attempts", 3),
+            timeout=self.config.get("download_timeout_seconds", 300)
+        )
+        
+    def _package_candidates(self, version_info: VersionInfo) -> List[Tuple[str, int, str]]:
+        """Packages to try in order: a delta from our version, then the full zip."""
+        candidates = []
+        if (version_info.delta_download_url and version_info.delta_checksum
+                and version_info.delta_base_version == self.current_version):
+            candidates.append((
+                version_info.delta_download_url,
+                version_info.delta_file_size,
+                version_info.delta_checksum
+            ))
+        candidates.append((version_info.download_url, version_info.file_size, version_info.checksum))
+        return candidates
+        
+    def _on_download_progress(self, downloaded: int, total: int) -> None:
+        """Update progress tracking from the download engine."""
+        self.update_progress.downloaded_bytes = downloaded
+        self.update_progress.total_bytes = total
+        if total:
+            self.update_progress.progress_percent = downloaded / total * 100
+            
+        # Calculate estimated time remaining
+        if self.update_progress.start_time:
+            elapsed = (datetime.now() - self.update_progress.start_time).total_seconds()
+            if elapsed > 0 and downloaded:
+                rate = downloaded / elapsed
+                self.update_progress.estimated_time_remaining = max(0, total - downloaded) / rate
+                
     def download_update(self, version_info: VersionInfo) -> bool:
-        """Download update package."""
+        """Download update package.
+        
+        Prefers a delta package built against the installed version. Partial
+        downloads resume from where they stopped, and the checksum is computed
+        while streaming.
+        """
         try:
             self.update_progress.status = UpdateStatus.DOWNLOADING
             self.update_progress.current_step = "Downloading update"
@@ -316,44 +376,33 @@ class UpdateClient:
             self.update_progress.downloaded_bytes = 0
             self.update_progress.total_bytes = version_info.file_size
             
-            # Create temporary file
-            temp_file = self.update_dir / f"update_{version_info.version}.zip"
-            
-            # Download with progress tracking
-            response = requests.get(
-                version_info.download_url,
-                stream=True,
-                timeout=self.config.get("download_timeout_seconds", 300)
-            )
-            response.raise_for_status()
-            
-            with open(temp_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        self.update_progress.downloaded_bytes += len(chunk)
-                        self.update_progress.progress_percent = (
-                            self.update_progress.downloaded_bytes / version_info.file_size * 100
-                        )
-                        
-                        # Calculate estimated time remaining
-                        if self.update_progress.start_time:
-                            elapsed = (datetime.now() - self.update_progress.start_time).total_seconds()
-                            if elapsed > 0:
-                                rate = self.update_progress.downloaded_bytes / elapsed
-                                remaining_bytes = version_info.file_size - self.update_progress.downloaded_bytes
-                                self.update_progress.estimated_time_remaining = remaining_bytes / rate
-                            
-            # Verify checksum
-            if not self._verify_checksum(temp_file, version_info.checksum):
-                raise Exception("Checksum verification failed")
-                
-            # Move to final location
+            engine = self._download_engine()
             final_file = self.update_dir / f"update_{version_info.version}_ready.zip"
-            shutil.move(temp_file, final_file)
             
-            logger.info(f"Update downloaded successfully: {version_info.version}")
-            return True
+            last_error = None
+            for url, size, checksum in self._package_candidates(version_info):
+                try:
+                    result = engine.download(
+                        url,
+                        self.update_dir / f"update_{version_info.version}_{checksum[:12]}.zip",
+                        expected_size=size,
+                        expected_sha256=checksum,
+                        progress=self._on_download_progress
+                    )
+                except DownloadError as e:
+                    logger.warning(f"Download of {url} failed: {e}")
+                    last_error = e
+                    continue
+                    
+                # Move to final location
+                shutil.move(result.path, final_file)
+                logger.info(
+                    f"Update downloaded successfully: {version_info.version} "
+                    f"({result.size} bytes, {result.resumed_bytes} resumed)"
+                )
+                return True
+                
+            raise last_error or DownloadError("No update package available")
             
         except Exception as e:
             logger.error(f"Failed to download update: {e}")
@@ -379,19 +428,51 @@ class UpdateClient:
             logger.error(f"Checksum verification failed: {e}")
             return False
             
+    def _plan_file_update(self, zip_ref: zipfile.ZipFile) -> Optional[Dict[str, Any]]:
+        """Work out which installed files a package actually changes.
+        
+        Returns ``None`` for packages without a per-file manifest, which are
+        staged and applied in full.
+        """
+        if PACKAGE_MANIFEST not in zip_ref.namelist():
+            return None
+            
+        package_manifest = json.loads(zip_ref.read(PACKAGE_MANIFEST))
+        for path in list(package_manifest.get("files", {})) + package_manifest.get("removed", []):
+            install_path(Path("."), path)
+        hashes = FileHashCache(self.update_dir / "installed_files.json")
+        changed = changed_files(package_manifest.get("files", {}), hashes)
+        hashes.save()
+        
+        packaged = set(zip_ref.namelist())
+        missing = [path for path in changed if path not in packaged]
+        if missing:
+            raise Exception(f"Package is missing changed files: {missing[:5]}")
+            
+        removed = [
+            path for path in package_manifest.get("removed", [])
+            if (Path(".") / path).exists()
+        ]
+        return {
+            "files": package_manifest.get("files", {}),
+            "changed_files": changed,
+            "added_files": [path for path in changed if not (Path(".") / path).exists()],
+            "removed_files": removed
+        }
+        
     def stage_update(self, version_info: VersionInfo) -> bool:
-        """Stage update for next launch."""
+        """Stage update for next launch.
+        
+        Packages carrying a per-file manifest only stage (and back up) the
+        files whose hashes differ from the installed ones.
+        """
         try:
             self.update_progress.status = UpdateStatus.STAGING
             self.update_progress.current_step = "Staging update"
             
-            # Create backup of current installation
             backup_name = f"backup_{self.current_version}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             backup_path = self.backup_dir / backup_name
             
-            # Backup current files (excluding update-related directories)
-            self._create_backup(backup_path)
-            
             # Extract update package
             update_file = self.update_dir / f"update_{version_info.version}_ready.zip"
             if not update_file.exists():
@@ -399,10 +480,26 @@ class UpdateClient:
                 
             # Extract to staging directory
             staging_dir = self.update_dir / "staging"
-            staging_dir.mkdir(exist_ok=True)
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir)
+            staging_dir.mkdir(parents=True)
             
             with zipfile.ZipFile(update_file, 'r') as zip_ref:
-                zip_ref.extractall(staging_dir)
+                plan = self._plan_file_update(zip_ref)
+                
+                if plan is None:
+                    # Backup current files (excluding update-related directories)
+                    self._create_backup(backup_path)
+                    zip_ref.extractall(staging_dir)
+                else:
+                    # Back up only what the update replaces or removes
+                    self._create_file_backup(
+                        backup_path,
+                        [p for p in plan["changed_files"] if p not in plan["added_files"]]
+                        + plan["removed_files"]
+                    )
+                    for relative_path in plan["changed_files"]:
+                        zip_ref.extract(relative_path, staging_dir)
                 
             # Create update manifest
             manifest = {
@@ -412,6 +509,14 @@ class UpdateClient:
                 "timestamp": datetime.now().isoformat(),
                 "channel": version_info.channel.value
             }
+            if plan is not None:
+                manifest.update({
+                    "backup_mode": "files",
+                    "changed_files": plan["changed_files"],
+                    "added_files": plan["added_files"],
+                    "removed_files": plan["removed_files"],
+                    "file_hashes": {p: plan["files"][p] for p in plan["changed_files"]}
+                })
             
             manifest_file = self.update_dir / "update_manifest.json"
             with open(manifest_file, 'w') as f:
@@ -422,7 +527,10 @@ class UpdateClient:
             
             self.update_progress.status = UpdateStatus.READY
             self.update_progress.current_step = "Update ready to apply"
-            logger.info(f"Update staged successfully: {version_info.version}")
+            logger.info(
+                f"Update staged successfully: {version_info.version}"
+                + (f" ({len(plan['changed_files'])} changed files)" if plan else "")
+            )
             return True
             
         except Exception as e:
@@ -431,6 +539,16 @@ class UpdateClient:
             self.update_progress.error_message = str(e)
             return False
             
+    def _create_file_backup(self, backup_path: Path, relative_paths: List[str]) -> None:
+        """Back up individual installed files."""
+        backup_path.mkdir(parents=True, exist_ok=True)
+        for relative_path in relative_paths:
+            source = install_path(Path("."), relative_path)
+            if source.is_file():
+                target = backup_path / relative_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, target)
+                
     def _create_backup(self, backup_path: Path) -> None:
         """Create backup of current installation."""
         backup_path.mkdir(parents=True, exist_ok=True)
@@ -479,7 +597,11 @@ class UpdateClient:
                 raise Exception("Staging directory not found")
                 
             # Apply update files
-            self._apply_update_files(staging_dir)
+            self._apply_update_files(
+                staging_dir,
+                file_hashes=manifest.get("file_hashes"),
+                removed_files=manifest.get("removed_files")
+            )
             
             # Update version file
             version_file = Path("version.txt")
@@ -502,15 +624,31 @@ class UpdateClient:
             self._rollback_update()
             return False
             
-    def _apply_update_files(self, staging_dir: Path) -> None:
-        """Apply update files from staging directory."""
+    def _apply_update_files(self, staging_dir: Path,
+                            file_hashes: Optional[Dict[str, str]] = None,
+                            removed_files: Optional[List[str]] = None) -> None:
+        """Apply update files from staging directory.
+        
+        For delta-aware packages the staging directory only holds changed
+        files; each is checked against its manifest hash before it replaces
+        the installed copy.
+        """
         current_dir = Path(".")
         
+        # The manifest on disk is re-checked; nothing may land outside the install
+        for relative_path in list(file_hashes or {}) + list(removed_files or []):
+            install_path(current_dir, relative_path)
+        
+        if file_hashes:
+            for relative_path, expected in file_hashes.items():
+                if file_sha256(staging_dir / relative_path) != expected:
+                    raise Exception(f"Staged file failed verification: {relative_path}")
+        
         for item in staging_dir.rglob("*"):
             if item.is_file():
                 # Calculate relative path
                 relative_path = item.relative_to(staging_dir)
-                target_path = current_dir / relative_path
+                target_path = install_path(current_dir, relative_path.as_posix())
                 
                 # Create parent directory if needed
                 target_path.parent.mkdir(parents=True, exist_ok=True)
@@ -518,6 +656,11 @@ class UpdateClient:
                 # Copy file
                 shutil.copy2(item, target_path)
                 
+        for relative_path in removed_files or []:
+            target_path = install_path(current_dir, relative_path)
+            if target_path.is_file():
+                target_path.unlink()
+                
     def _rollback_update(self) -> None:
         """Rollback to previous version."""
         try:
@@ -537,7 +680,10 @@ class UpdateClient:
                 raise Exception("Backup not found for rollback")
                 
             # Restore from backup
-            self._restore_from_backup(backup_path)
+            if manifest.get("backup_mode") == "files":
+                self._restore_files_from_backup(backup_path, manifest.get("added_files", []))
+            else:
+                self._restore_from_backup(backup_path)
             
             # Clean up
             manifest_file.unlink()
@@ -572,6 +718,21 @@ class UpdateClient:
             elif item.is_dir():
                 shutil.copytree(item, current_dir / item.name)
                 
+    def _restore_files_from_backup(self, backup_path: Path, added_files: List[str]) -> None:
+        """Restore individually backed-up files and drop files the update added."""
+        current_dir = Path(".")
+        
+        for relative_path in added_files:
+            target_path = install_path(current_dir, relative_path)
+            if target_path.is_file():
+                target_path.unlink()
+                
+        for item in backup_path.rglob("*"):
+            if item.is_file():
+                target_path = current_dir / item.relative_to(backup_path)
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(item, target_path)
+                
     def get_update_status(self) -> Dict[str, Any]:
         """Get current update status for dashboard."""
         return {
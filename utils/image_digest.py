@@ -0,0 +1,29 @@
+"""Pixel digests for skipping work on unchanged screen captures."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+
+def frame_digest(image: Any) -> Optional[str]:
+    """Digest of an image's pixels, ``None`` if it cannot be fingerprinted.
+
+    Works with anything exposing ``tobytes()`` (numpy arrays, PIL images);
+    the shape or size is part of the digest so equal bytes in a different
+    layout do not collide.
+    """
+    if image is None:
+        return None
+    tobytes = getattr(image, "tobytes", None)
+    if tobytes is None:
+        return None
+    try:
+        raw = tobytes()
+    except Exception:
+        return None
+    shape = getattr(image, "shape", None) or getattr(image, "size", None)
+    return f"{shape}:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+
+__all__ = ["frame_digest"]
@@ -9,9 +9,17 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter
 import json
 
+from utils.damage_text_engine import (
+    DAMAGE_TOKEN_PATTERN,
+    DamageTextExtractor,
+    DamageToken,
+    ThresholdPreprocessor,
+    classify_damage_color,
+    region_hsv_means,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +54,11 @@ class OCRDamageParser:
         """Initialize OCR damage parser."""
         self.config = self._load_config(config_file)
         self.damage_patterns = self._compile_damage_patterns()
+        self.extractor = DamageTextExtractor(
+            min_amount=self.config['damage_threshold'],
+            pattern=self.damage_patterns[0]
+        )
+        self.preprocessor = ThresholdPreprocessor()
         self.damage_history: List[DamageEvent] = []
         self.last_processed_time: Optional[datetime] = None
         
@@ -87,46 +100,17 @@ class OCRDamageParser:
         return default_config
     
     def _compile_damage_patterns(self) -> List[re.Pattern]:
-        """Compile regex patterns for damage detection."""
-        patterns = [
-            r'(\d{1,4})',  # Basic damage numbers
-            r'(\d{1,4})\s*damage',  # "damage" suffix
-            r'(\d{1,4})\s*DMG',  # "DMG" suffix
-            r'(\d{1,4})\s*pts?',  # "pts" or "pt" suffix
-            r'(\d{1,4})\s*damage\s*dealt',  # "damage dealt" suffix
-            r'(\d{1,4})\s*to\s*(\w+)',  # "X to target" format
-            r'(\d{1,4})\s*\((\w+)\)',  # "X (type)" format
-        ]
-        
-        return [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        """Compile regex patterns for damage detection.
+
+        A single alternation pattern covers bare numbers and the "damage",
+        "DMG", "pts", "damage dealt", "to target" and "(type)" forms, so
+        each number is matched once.
+        """
+        return [DAMAGE_TOKEN_PATTERN]
     
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Preprocess image for better OCR results."""
-        # Convert to PIL Image for processing
-        pil_image = Image.fromarray(image)
-        
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(pil_image)
-        pil_image = enhancer.enhance(2.0)
-        
-        # Enhance sharpness
-        enhancer = ImageEnhance.Sharpness(pil_image)
-        pil_image = enhancer.enhance(2.0)
-        
-        # Apply slight blur to reduce noise
-        pil_image = pil_image.filter(ImageFilter.GaussianBlur(radius=0.5))
-        
-        # Convert back to numpy array
-        processed_image = np.array(pil_image)
-        
-        # Convert to grayscale if needed
-        if len(processed_image.shape) == 3:
-            processed_image = cv2.cvtColor(processed_image, cv2.COLOR_RGB2GRAY)
-        
-        # Apply threshold to create binary image
-        _, binary_image = cv2.threshold(processed_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        return binary_image
+        return self.preprocessor.process(image).copy()
     
     def extract_text_from_region(self, image: np.ndarray, region: Tuple[int, int, int, int]) -> str:
         """Extract text from a specific region of the image."""
@@ -145,8 +129,8 @@ class OCRDamageParser:
         # Extract region
         region_image = image[y:y+height, x:x+width]
         
-        # Preprocess the region
-        processed_region = self.preprocess_image(region_image)
+        # Preprocess the region (into the preprocessor's reused buffers)
+        processed_region = self.preprocessor.process(region_image)
         
         try:
             # Perform OCR
@@ -159,69 +143,22 @@ class OCRDamageParser:
             logger.error(f"OCR error: {e}")
             return ""
     
+    def extract_damage_tokens(self, text: str) -> List[DamageToken]:
+        """Extract damage tokens (amount, unit, type, target) from text."""
+        return self.extractor.extract(text)
+    
     def parse_damage_from_text(self, text: str) -> List[Tuple[int, float]]:
         """Parse damage amounts from text."""
-        damage_matches = []
-        
-        for pattern in self.damage_patterns:
-            matches = pattern.findall(text)
-            for match in matches:
-                try:
-                    # Extract the damage number
-                    if isinstance(match, tuple):
-                        damage_str = match[0]
-                    else:
-                        damage_str = match
-                    
-                    damage_amount = int(damage_str)
-                    
-                    # Validate damage amount
-                    if damage_amount >= self.config['damage_threshold']:
-                        # Calculate confidence based on pattern match
-                        confidence = min(1.0, len(text) / 50.0)  # Simple confidence calculation
-                        damage_matches.append((damage_amount, confidence))
-                        
-                except (ValueError, TypeError) as e:
-                    logger.debug(f"Could not parse damage from '{match}': {e}")
-                    continue
+        tokens = self.extract_damage_tokens(text)
+        if not tokens:
+            return []
         
-        return damage_matches
+        confidence = min(1.0, len(text) / 50.0)  # Simple confidence calculation
+        return [(token.amount, confidence) for token in tokens]
     
     def detect_damage_type_from_color(self, image: np.ndarray, region: Tuple[int, int, int, int]) -> str:
         """Detect damage type based on color analysis."""
-        x, y, width, height = region
-        
-        # Extract region
-        region_image = image[y:y+height, x:x+width]
-        
-        if len(region_image.shape) == 3:
-            # Convert to HSV for better color analysis
-            hsv = cv2.cvtColor(region_image, cv2.COLOR_BGR2HSV)
-            
-            # Calculate average hue and saturation
-            avg_hue = np.mean(hsv[:, :, 0])
-            avg_sat = np.mean(hsv[:, :, 1])
-            avg_val = np.mean(hsv[:, :, 2])
-            
-            # Simple color-based damage type detection
-            if avg_hue < 10 or avg_hue > 170:  # Red range
-                if avg_sat > 100:
-                    return 'physical' if avg_val > 150 else 'heat'
-                else:
-                    return 'physical'
-            elif 100 < avg_hue < 130:  # Blue range
-                if avg_sat > 100:
-                    return 'energy' if avg_val > 150 else 'cold'
-                else:
-                    return 'energy'
-            elif 30 < avg_hue < 90:  # Green range
-                return 'acid'
-            elif 20 < avg_hue < 30:  # Yellow range
-                return 'electric'
-            else:
-                return 'kinetic'  # Default for unknown colors
-        
-        return 'unknown'
+        return classify_damage_color(region_hsv_means(image, region))
     
     def scan_for_damage(self, image: np.ndarray) -> List[DamageEvent]:
         """Scan image for damage events."""
@@ -239,11 +176,13 @@ class OCRDamageParser:
             if text:
                 # Parse damage from text
                 damage_matches = self.parse_damage_from_text(text)
+                damage_type = None
                 
                 for damage_amount, confidence in damage_matches:
                     if confidence >= self.config['min_confidence']:
-                        # Detect damage type
-                        damage_type = self.detect_damage_type_from_color(image, region_coords)
+                        # Detect damage type (once per region and scan)
+                        if damage_type is None:
+                            damage_type = self.detect_damage_type_from_color(image, region_coords)
                         
                         # Create damage event
                         damage_event = DamageEvent(
@@ -2,14 +2,23 @@
 
 This module provides functionality to sync exported MS11 data to the SWGDB public website,
 including file transfer, validation, and status reporting.
+
+Unchanged files are detected from a persistent hash manifest keyed on
+(path, mtime, size), changed files are copied in parallel through
+temporary files and atomic renames, and backups are stored as
+content-addressed blobs referenced by small per-backup snapshot files.
 """
 
 import json
+import os
 import shutil
 import hashlib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 from dataclasses import dataclass, asdict
 
 from android_ms11.utils.logging_utils import log_event
@@ -40,6 +49,79 @@ class WebsiteConfig:
     sync_interval: int  # in seconds
     enable_backup: bool
     enable_validation: bool
+    copy_workers: int = 8
+    backups_to_keep: int = 5
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashManifest:
+    """Persistent file hashes keyed by path, reused while mtime/size match."""
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self.entries: Dict[str, List[Any]] = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, path: Path) -> Optional[str]:
+        """Hash of ``path``, or ``None`` if it can't be read.
+
+        The file is only rehashed when its mtime or size differ from the
+        recorded entry.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            cached = self.entries.get(str(path))
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        try:
+            digest = file_sha256(path)
+        except OSError:
+            return None
+        self.record(path, digest, stat)
+        return digest
+
+    def record(self, path: Path, digest: str, stat: Optional[os.stat_result] = None) -> None:
+        """Record a hash that is already known, e.g. for a file just copied."""
+        stat = stat or path.stat()
+        with self._lock:
+            self.entries[str(path)] = [stat.st_mtime_ns, stat.st_size, digest]
+            self._dirty = True
+
+    def prune(self, directory: Path, keep: Iterable[Path]) -> None:
+        """Drop entries under ``directory`` that aren't in ``keep``."""
+        prefix = str(directory) + os.sep
+        keep_keys = {str(path) for path in keep}
+        with self._lock:
+            for key in [k for k in self.entries if k.startswith(prefix) and k not in keep_keys]:
+                del self.entries[key]
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self.entries)
+            self._dirty = False
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        tmp.write_text(data)
+        os.replace(tmp, self.manifest_path)
 
 
 class SWGDBSync:
@@ -68,11 +150,16 @@ class SWGDBSync:
         self.target_dir = Path(config.target_directory)
         self.backup_dir = Path(config.backup_directory)
         self.export_dir = Path("data/exported")
+        self.objects_dir = self.backup_dir / "objects"
+        self.snapshots_dir = self.backup_dir / "snapshots"
         
         # Create directories
         self.target_dir.mkdir(parents=True, exist_ok=True)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         
+        # Hashes of source and target files from previous runs
+        self.hash_manifest = HashManifest(self.backup_dir / "sync_manifest.json")
+        
         # Track sync history
         self.sync_history = []
         
@@ -108,15 +195,21 @@ class SWGDBSync:
                 log_event("[SWGDB_SYNC] No files to sync")
                 return self._create_success_sync_status(sync_id, [], sync_start)
             
+            # Only changed files need validating, backing up and copying
+            pending = [f for f in files_to_sync if self._should_sync_file(f, force_sync)]
+            skipped = len(files_to_sync) - len(pending)
+            if skipped:
+                log_event(f"[SWGDB_SYNC] Skipped {skipped} unchanged files")
+            
             # Validate files before sync
-            if self.config.enable_validation:
-                validation_errors = self._validate_files(files_to_sync)
+            if self.config.enable_validation and pending:
+                validation_errors = self._validate_files(pending)
                 if validation_errors:
                     log_event(f"[SWGDB_SYNC] Validation errors: {validation_errors}")
                     return self._create_failed_sync_status(sync_id, validation_errors)
             
             # Create backup if enabled
-            if self.config.enable_backup:
+            if self.config.enable_backup and pending:
                 self._create_backup()
             
             # Sync files
@@ -124,23 +217,16 @@ class SWGDBSync:
             failed_files = []
             error_messages = []
             
-            for file_path in files_to_sync:
-                try:
-                    if self._should_sync_file(file_path, force_sync):
-                        success = self._sync_single_file(file_path)
-                        if success:
-                            synced_files.append(file_path.name)
-                            log_event(f"[SWGDB_SYNC] Synced: {file_path.name}")
-                        else:
-                            failed_files.append(file_path.name)
-                            error_messages.append(f"Failed to sync {file_path.name}")
-                    else:
-                        log_event(f"[SWGDB_SYNC] Skipped (no changes): {file_path.name}")
-                        
-                except Exception as e:
+            for file_path, error in self._sync_files(pending):
+                if error is None:
+                    synced_files.append(file_path.name)
+                    log_event(f"[SWGDB_SYNC] Synced: {file_path.name}")
+                else:
                     failed_files.append(file_path.name)
-                    error_messages.append(f"Error syncing {file_path.name}: {str(e)}")
-                    log_event(f"[SWGDB_SYNC] Error syncing {file_path.name}: {e}")
+                    error_messages.append(error)
+            
+            self.hash_manifest.prune(self.export_dir, files_to_sync)
+            self.hash_manifest.save()
             
             # Calculate sync duration
             sync_duration = (datetime.now() - sync_start).total_seconds()
@@ -232,67 +318,203 @@ class SWGDBSync:
         if not target_file.exists():
             return True
         
-        # Compare file hashes
-        source_hash = self._get_file_hash(file_path)
-        target_hash = self._get_file_hash(target_file)
+        # Compare file hashes (cached while mtime/size are unchanged)
+        source_hash = self.hash_manifest.get(file_path)
+        target_hash = self.hash_manifest.get(target_file)
         
-        return source_hash != target_hash
+        return source_hash is None or source_hash != target_hash
 
     def _get_file_hash(self, file_path: Path) -> str:
-        """Get MD5 hash of a file."""
+        """Get SHA-256 hash of a file."""
         try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+            return file_sha256(file_path)
         except Exception:
             return ""
 
+    def _sync_files(self, files: List[Path]) -> List[Tuple[Path, Optional[str]]]:
+        """Copy ``files`` in parallel.
+
+        Returns
+        -------
+        list of tuple
+            ``(file_path, error_message)`` pairs in input order; the error
+            is ``None`` for files that were copied
+        """
+        def sync(file_path: Path) -> Tuple[Path, Optional[str]]:
+            try:
+                if self._sync_single_file(file_path):
+                    return file_path, None
+                return file_path, f"Failed to sync {file_path.name}"
+            except Exception as e:
+                log_event(f"[SWGDB_SYNC] Error syncing {file_path.name}: {e}")
+                return file_path, f"Error syncing {file_path.name}: {str(e)}"
+
+        if len(files) <= 1 or self.config.copy_workers <= 1:
+            return [sync(file_path) for file_path in files]
+        with ThreadPoolExecutor(max_workers=self.config.copy_workers) as executor:
+            return list(executor.map(sync, files))
+
     def _sync_single_file(self, file_path: Path) -> bool:
-        """Sync a single file to the target directory."""
+        """Sync a single file to the target directory.
+
+        The file is copied to a temporary name next to the target and
+        renamed over it, so readers never see a partially written file.
+        """
+        target_file = self.target_dir / file_path.name
+        tmp_file = self.target_dir / f".{file_path.name}.{uuid.uuid4().hex}.tmp"
         try:
-            target_file = self.target_dir / file_path.name
+            source_hash = self.hash_manifest.get(file_path)
             
             # Copy file
-            shutil.copy2(file_path, target_file)
+            shutil.copy2(file_path, tmp_file)
             
             # Verify copy
-            if target_file.exists() and target_file.stat().st_size == file_path.stat().st_size:
-                return True
-            else:
+            if tmp_file.stat().st_size != file_path.stat().st_size:
+                tmp_file.unlink()
                 return False
+            
+            os.replace(tmp_file, target_file)
+            if source_hash:
+                self.hash_manifest.record(target_file, source_hash)
+            return True
                 
         except Exception as e:
             log_event(f"[SWGDB_SYNC] Error copying {file_path.name}: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
             return False
 
-    def _create_backup(self) -> None:
-        """Create backup of current website data."""
+    def _blob_path(self, digest: str) -> Path:
+        """Location of a backup blob in the content-addressed store."""
+        return self.objects_dir / digest[:2] / digest
+
+    def _store_blob(self, file_path: Path, digest: str) -> None:
+        """Copy a file into the blob store unless its content is already there."""
+        blob = self._blob_path(digest)
+        if blob.exists():
+            return
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_blob = blob.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        shutil.copy2(file_path, tmp_blob)
+        os.replace(tmp_blob, blob)
+
+    def _create_backup(self) -> Optional[str]:
+        """Create backup of current website data.
+
+        Each backup is a snapshot mapping file names to content hashes;
+        file contents are stored once in the blob store, so only files
+        whose content was never backed up before are copied.
+        """
         try:
             if not self.target_dir.exists():
-                return
+                return None
             
-            backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            backup_path = self.backup_dir / backup_name
+            backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
             
-            # Copy target directory to backup
-            shutil.copytree(self.target_dir, backup_path)
-            
-            # Clean old backups (keep last 5)
+            files = {}
+            target_files = []
+            for file_path in self.target_dir.iterdir():
+                if not file_path.is_file() or file_path.name.startswith("."):
+                    continue
+                target_files.append(file_path)
+                digest = self.hash_manifest.get(file_path)
+                if digest is None:
+                    continue
+                self._store_blob(file_path, digest)
+                files[file_path.name] = digest
+            self.hash_manifest.prune(self.target_dir, target_files)
+            
+            self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+            snapshot_path = self.snapshots_dir / f"{backup_name}.json"
+            tmp_path = snapshot_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({
+                "created": datetime.now().isoformat(),
+                "files": files
+            }))
+            os.replace(tmp_path, snapshot_path)
+            
+            # Clean old backups
             self._cleanup_old_backups()
             
-            log_event(f"[SWGDB_SYNC] Created backup: {backup_name}")
+            log_event(f"[SWGDB_SYNC] Created backup: {backup_name} ({len(files)} files)")
+            return backup_name
             
         except Exception as e:
             log_event(f"[SWGDB_SYNC] Error creating backup: {e}")
+            return None
+
+    def list_backups(self) -> List[str]:
+        """Return backup names, newest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        return sorted((p.stem for p in self.snapshots_dir.glob("backup_*.json")), reverse=True)
+
+    def restore_backup(self, backup_name: Optional[str] = None) -> bool:
+        """Restore the website data to a backup (the newest by default).
+
+        Files whose content already matches the backup are left alone and
+        files that were not part of the backup are removed.
+        """
+        try:
+            if backup_name is None:
+                backups = self.list_backups()
+                if not backups:
+                    return False
+                backup_name = backups[0]
+            
+            snapshot = json.loads((self.snapshots_dir / f"{backup_name}.json").read_text())
+            files = snapshot["files"]
+            
+            for file_path in self.target_dir.iterdir():
+                if file_path.is_file() and not file_path.name.startswith(".") and file_path.name not in files:
+                    file_path.unlink()
+            
+            for name, digest in files.items():
+                target_file = self.target_dir / name
+                if self.hash_manifest.get(target_file) == digest:
+                    continue
+                tmp_file = self.target_dir / f".{name}.{uuid.uuid4().hex}.tmp"
+                shutil.copy2(self._blob_path(digest), tmp_file)
+                os.replace(tmp_file, target_file)
+                self.hash_manifest.record(target_file, digest)
+            
+            self.hash_manifest.save()
+            log_event(f"[SWGDB_SYNC] Restored backup: {backup_name}")
+            return True
+            
+        except Exception as e:
+            log_event(f"[SWGDB_SYNC] Error restoring backup {backup_name}: {e}")
+            return False
 
     def _cleanup_old_backups(self) -> None:
-        """Clean up old backup directories."""
+        """Clean up old backup snapshots and blobs no longer referenced."""
         try:
-            backups = sorted(self.backup_dir.iterdir(), key=lambda x: x.stat().st_mtime, reverse=True)
+            keep = self.config.backups_to_keep
+            backups = self.list_backups()
+            
+            # Full-copy backup directories from older versions
+            for legacy in sorted(self.backup_dir.glob("backup_*"), reverse=True)[keep:]:
+                if legacy.is_dir():
+                    shutil.rmtree(legacy)
+                    log_event(f"[SWGDB_SYNC] Removed old backup: {legacy.name}")
+            
+            if len(backups) <= keep:
+                return
+            
+            for backup_name in backups[keep:]:
+                (self.snapshots_dir / f"{backup_name}.json").unlink()
+                log_event(f"[SWGDB_SYNC] Removed old backup: {backup_name}")
+            
+            referenced = set()
+            for backup_name in backups[:keep]:
+                snapshot = json.loads((self.snapshots_dir / f"{backup_name}.json").read_text())
+                referenced.update(snapshot["files"].values())
             
-            # Keep only the last 5 backups
-            for backup in backups[5:]:
-                shutil.rmtree(backup)
-                log_event(f"[SWGDB_SYNC] Removed old backup: {backup.name}")
+            for blob in self.objects_dir.glob("*/*"):
+                if blob.name not in referenced:
+                    blob.unlink()
                 
         except Exception as e:
             log_event(f"[SWGDB_SYNC] Error cleaning up backups: {e}")
@@ -409,6 +631,7 @@ def create_swgdb_sync(config: WebsiteConfig = None) -> SWGDBSync:
 
 __all__ = [
     "SWGDBSync",
+    "HashManifest",
     "create_swgdb_sync",
     "SyncStatus",
     "WebsiteConfig"